@@ -0,0 +1,88 @@
+import argparse
+import hashlib
+import os
+import time
+
+from constants import SHA_256
+from savegem.common.util.file import file_checksums
+
+
+def serial_checksum(file_paths: list[str]):
+    """
+    Save checksum calculated the way it was done before
+    parallel hashing engine was introduced.
+    """
+
+    checksum = hashlib.new(SHA_256)
+
+    for file_path in file_paths:
+        file_hash = hashlib.new(SHA_256)
+
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(8192), b""):
+                file_hash.update(chunk)
+
+        checksum.update(file_hash.hexdigest().encode())
+
+    return checksum.hexdigest()
+
+
+def parallel_checksum(file_paths: list[str]):
+    """
+    Save checksum calculated using parallel hashing engine.
+    """
+
+    checksum = hashlib.new(SHA_256)
+
+    for digest in file_checksums(file_paths):
+        checksum.update(digest.encode())
+
+    return checksum.hexdigest()
+
+
+def measure(function, file_paths: list[str], repeat: int):
+    """
+    Used to get best execution time and result of function.
+    """
+
+    timings = []
+    result = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(file_paths)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares serial and parallel save checksum calculation.")
+    parser.add_argument("directory", help="Directory with save files.")
+    parser.add_argument("--repeat", type=int, default=5, help="Amount of runs of each implementation.")
+    args = parser.parse_args()
+
+    file_paths = [
+        os.path.join(args.directory, file_name)
+        for file_name in sorted(os.listdir(args.directory))
+        if os.path.isfile(os.path.join(args.directory, file_name))
+    ]
+    total_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+
+    print(f"{len(file_paths)} file(s), {total_size / 1024 / 1024:.1f} MiB")
+
+    serial_time, serial_result = measure(serial_checksum, file_paths, args.repeat)
+    parallel_time, parallel_result = measure(parallel_checksum, file_paths, args.repeat)
+
+    if serial_result != parallel_result:
+        raise RuntimeError("Parallel checksum doesn't match serial checksum.")
+
+    for name, elapsed in [("serial", serial_time), ("parallel", parallel_time)]:
+        throughput = total_size / 1024 / 1024 / elapsed if elapsed > 0 else float("inf")
+        print(f"{name:>10}: {elapsed:.3f}s ({throughput:.1f} MiB/s)")
+
+    print(f"{'speedup':>10}: {serial_time / parallel_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
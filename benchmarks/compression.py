@@ -0,0 +1,86 @@
+import argparse
+import os
+import tempfile
+import time
+
+from savegem.common.util.archive import ZipStream, ZipExtractor, Compression
+
+CODECS = ["store", "deflate:1", "deflate:6", "deflate:9", "lzma", "zstd:3", "zstd:19"]
+
+
+def compress(file_paths: list[str], compression: Compression, concurrency: int):
+    """
+    Used to archive files the same way they are archived during upload.
+    """
+    return ZipStream(file_paths, compression=compression, concurrency=concurrency).read()
+
+
+def extract(archive: bytes):
+    """
+    Used to extract archive the same way it's extracted during download.
+    """
+
+    with tempfile.TemporaryDirectory() as target_directory:
+        extractor = ZipExtractor(target_directory)
+
+        for offset in range(0, len(archive), ZipExtractor.BlockSize):
+            extractor.write(archive[offset:offset + ZipExtractor.BlockSize])
+
+        extractor.close()
+
+
+def measure(function, argument, repeat: int):
+    """
+    Used to get best execution time and result of function.
+    """
+
+    timings = []
+    result = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*argument)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares compression codecs of save archives.")
+    parser.add_argument("directory", help="Directory with save files.")
+    parser.add_argument("--repeat", type=int, default=3, help="Amount of runs of each codec.")
+    parser.add_argument("--codecs", nargs="+", default=CODECS, help="Codecs to compare, e.g. deflate:9.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Amount of compression workers.")
+    args = parser.parse_args()
+
+    file_paths = [
+        os.path.join(args.directory, file_name)
+        for file_name in sorted(os.listdir(args.directory))
+        if os.path.isfile(os.path.join(args.directory, file_name))
+    ]
+    total_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+    total_mib = total_size / 1024 / 1024
+
+    print(f"{len(file_paths)} file(s), {total_mib:.1f} MiB")
+    print(f"{'codec':>10} {'ratio':>7} {'size MiB':>9} {'compress':>14} {'extract':>14}")
+
+    for codec in args.codecs:
+        compression = Compression.parse(codec)
+
+        if not compression.is_supported:
+            print(f"{codec:>10} not supported by this Python version")
+            continue
+
+        compress_time, archive = measure(compress, (file_paths, compression, args.concurrency), args.repeat)
+        extract_time, _ = measure(extract, (archive,), args.repeat)
+
+        ratio = len(archive) / total_size if total_size > 0 else 1
+        compress_speed = total_mib / compress_time if compress_time > 0 else float("inf")
+        extract_speed = total_mib / extract_time if extract_time > 0 else float("inf")
+
+        print(f"{codec:>10} {ratio:>7.3f} {len(archive) / 1024 / 1024:>9.1f} "
+              f"{compress_speed:>8.1f} MiB/s {extract_speed:>8.1f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -57,6 +57,13 @@ class File:
 
     AppConfig: Final = "app.json"
     AppState: Final = "state.json"
+    ChecksumCache: Final = "checksums.json"
+    GDriveWatcherState: Final = "gdrive_watcher.json"
+    DriveFileCache: Final = "drive_cache.json"
+    UploadJournal: Final = "uploads.json"
+    BackupStore: Final = "backups"
+    StagingArea: Final = "staging.json"
+    RateLimiter: Final = "rate_limit.json"
     Style: Final = "style.json"
 
     GUIInitializedFlag: Final = "gui_init.flag"
@@ -76,6 +83,9 @@ JSON_EXTENSION: Final = ".json"
 ZIP_EXTENSION: Final = "zip"
 ZIP_MIME_TYPE: Final = "application/zip"
 JSON_MIME_TYPE: Final = "application/json"
+CHUNKS_MIME_TYPE: Final = "application/vnd.savegem.chunks+json"
+BINARY_MIME_TYPE: Final = "application/octet-stream"
+FOLDER_MIME_TYPE: Final = "application/vnd.google-apps.folder"
 
 UTF_8: Final = "utf-8"
 SHA_256: Final = "sha256"
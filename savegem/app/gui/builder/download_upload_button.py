@@ -112,8 +112,11 @@ class DownloadUploadButtonBuilder(UIBuilder):
         """
 
         def callback(event: DoneEvent):
+            if event.kind == EventKind.AlreadyUpToDate:
+                notification(tr("notification_SaveIsAlreadyUpToDate"))
+
             # Only show notification if there was no error.
-            if event.success:
+            elif event.success:
                 notification(tr(message))
 
         return callback
@@ -141,3 +144,6 @@ class DownloadUploadButtonBuilder(UIBuilder):
 
         elif event.kind == EventKind.ErrorUploadingToDrive:
             notification(tr("notification_ErrorUploadingToDrive"))
+
+        elif event.kind == EventKind.ErrorDownloadingFromDrive:
+            notification(tr("notification_ErrorDownloadingFromDrive"))
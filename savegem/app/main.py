@@ -8,10 +8,13 @@ from savegem.app.gui.style import load_stylesheet
 from savegem.app.gui.window import gui
 from savegem.app.ipc_socket import ui_socket
 from savegem.common.core.holders import prop
+from savegem.common.core.drive_file_cache import drive_file_cache
 from savegem.common.core.ipc_socket import IPCCommand
+from savegem.common.core.staging_area import staging_area
 from savegem.common.util.file import cleanup_directory
 from savegem.common.util.logger import get_logger
-from savegem.common.service.gdrive import GDrive
+from savegem.common.util.metrics import metrics
+from savegem.common.service.storage import storage
 from savegem.common.core.context import app
 
 _logger = get_logger("app")
@@ -26,9 +29,10 @@ def main():
     _logger.info("version %s", prop("version"))
 
     # Startup initialization.
-    app().user.initialize(GDrive.get_current_user)
+    staging_area().sweep()
+    app().user.initialize(storage().get_current_user)
     app().games.download()
-    app().games.current.meta.drive.refresh()
+    app().games.refresh_drive_metadata()
     app().activity.refresh()
 
     application = QApplication(sys.argv)
@@ -43,6 +47,8 @@ def main():
 
 
 def teardown():
+    _logger.info("Google Drive requests:\n%s", metrics().summary())
+    _logger.info("Drive file cache: %d hit(s), %d miss(es).", drive_file_cache().hits, drive_file_cache().misses)
     _logger.info("Cleaning up 'output' directory.")
     cleanup_directory(Directory().Output)
 
@@ -1,7 +1,8 @@
 import json
 
 from savegem.common.core.app_data import AppData
-from savegem.common.service.gdrive import GDrive
+from savegem.common.core.drive_file_cache import drive_file_cache
+from savegem.common.service.storage import storage
 from savegem.common.util.logger import get_logger
 
 
@@ -32,25 +33,22 @@ class Activity(AppData):
         Used to update activity of current user.
         """
 
-        with GDrive.download_file(self._app.config.activity_log_file_id) as log_bytes:
-            log_bytes.seek(0)
-            activity_log: dict = json.load(log_bytes)
+        activity_log = self.__download()
+        _logger.debug("Log Before: %s", activity_log)
 
-            _logger.debug("Log Before: %s", activity_log)
+        if len(game_names) > 0:
+            activity_log[self._app.user.machine_id] = {
+                self.NAME_PROP: self._app.user.name,
+                self.GAMES_PROP: game_names
+            }
 
-            if len(game_names) > 0:
-                activity_log[self._app.user.machine_id] = {
-                    self.NAME_PROP: self._app.user.name,
-                    self.GAMES_PROP: game_names
-                }
+        # If there are no games running then remove
+        # user entry from activity log.
+        elif self._app.user.machine_id in activity_log:
+            del activity_log[self._app.user.machine_id]
 
-            # If there are no games running then remove
-            # user entry from activity log.
-            elif self._app.user.machine_id in activity_log:
-                del activity_log[self._app.user.machine_id]
-
-            _logger.debug("Log After: %s", activity_log)
-            GDrive.update_file(self._app.config.activity_log_file_id, json.dumps(activity_log, indent=2))
+        _logger.debug("Log After: %s", activity_log)
+        storage().update_file(self._app.config.activity_log_file_id, json.dumps(activity_log, indent=2))
 
     def refresh(self):
         """
@@ -59,16 +57,24 @@ class Activity(AppData):
 
         self.__players.clear()
 
-        with GDrive.download_file(self._app.config.activity_log_file_id) as log_bytes:
-            log_bytes.seek(0)
-            activity_log: dict = json.load(log_bytes)
+        for machine_id, activity in self.__download().items():
+
+            # Do not display current user.
+            # Only list other players that are online.
+            if machine_id == self._app.user.machine_id:
+                continue
+
+            if self._app.games.current.name in activity.get(self.GAMES_PROP):
+                self.__players.append(activity.get(self.NAME_PROP, ""))
+
+    def __download(self) -> dict:
+        """
+        Used to get activity log, which is downloaded only when it has changed.
+        """
 
-            for machine_id, activity in activity_log.items():
+        activity_log = drive_file_cache().fetch(self._app.config.activity_log_file_id)
 
-                # Do not display current user.
-                # Only list other players that are online.
-                if machine_id == self._app.user.machine_id:
-                    continue
+        if activity_log is None:
+            raise RuntimeError("Failed to download activity log.")
 
-                if self._app.games.current.name in activity.get(self.GAMES_PROP):
-                    self.__players.append(activity.get(self.NAME_PROP, ""))
+        return json.loads(activity_log.content)
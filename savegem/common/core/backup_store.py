@@ -0,0 +1,272 @@
+import os
+import re
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from typing import Final, Optional
+
+from constants import File
+from savegem.common.core.checksum_cache import checksum_cache
+from savegem.common.core.holders import prop
+from savegem.common.util.file import resolve_app_data, read_file, save_file, clone_file
+from savegem.common.util.logger import get_logger
+
+_logger = get_logger(__name__)
+_backup_store: Optional["BackupStore"] = None
+
+
+@dataclass
+class Snapshot:
+    """
+    Represents local backup of game saves.
+    """
+
+    id: str
+    created_time: datetime
+    path: str
+
+
+class BackupStore:
+    """
+    Versioned store of local backups of game saves located in AppData.
+
+    Each snapshot is complete copy of saves directory, files that
+    didn't change since previous snapshot are shared by hard links,
+    so keeping many snapshots costs little more disk than one.
+    """
+
+    Manifest: Final = "manifest.json"
+    DataDirectory: Final = "data"
+    Files: Final = "files"
+    CreatedTime: Final = "createdTime"
+
+    DefaultMaxSnapshots: Final = 20
+    DefaultMaxAgeDays: Final = 30
+    DefaultMaxSizeMb: Final = 1024
+
+    __SNAPSHOT_ID_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+    def __init__(self, store_directory: str):
+        self.__store_directory = store_directory
+
+    def snapshot(self, game_name: str, directory: str):
+        """
+        Used to store snapshot of directory with game saves.
+        Old snapshots are evicted once snapshot is stored.
+        """
+
+        created_time = datetime.now(timezone.utc)
+        snapshot_id = created_time.strftime(self.__SNAPSHOT_ID_FORMAT)
+        snapshot_path = os.path.join(self.__game_directory(game_name), snapshot_id)
+        staging_path = snapshot_path + ".tmp"
+
+        snapshots = self.list(game_name)
+        previous = self.__read_manifest(snapshots[0].path) if snapshots else {}
+        previous_files = previous.get(self.Files, {})
+        previous_data = os.path.join(snapshots[0].path, self.DataDirectory) if snapshots else None
+
+        file_names = self.__list_files(directory)
+        file_paths = [os.path.join(directory, file_name) for file_name in file_names]
+        files = {}
+        linked_count = 0
+
+        shutil.rmtree(staging_path, ignore_errors=True)
+
+        for file_name, file_path, digest in zip(file_names, file_paths, checksum_cache().digests(file_paths)):
+            target_path = os.path.join(staging_path, self.DataDirectory, file_name)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+
+            files[file_name] = digest
+
+            if previous_files.get(file_name) == digest and self.__link(
+                    os.path.join(previous_data, file_name), target_path):
+                linked_count += 1
+                continue
+
+            clone_file(file_path, target_path)
+
+        os.makedirs(staging_path, exist_ok=True)
+        save_file(
+            os.path.join(staging_path, self.Manifest),
+            {self.CreatedTime: created_time.isoformat(), self.Files: files},
+            as_json=True
+        )
+
+        # Snapshot only becomes visible once it's complete.
+        os.rename(staging_path, snapshot_path)
+
+        _logger.info("Stored snapshot %s of %s, %d of %d file(s) shared with previous snapshot.",
+                     snapshot_id, game_name, linked_count, len(files))
+
+        self.evict(game_name)
+
+        return Snapshot(snapshot_id, created_time, snapshot_path)
+
+    def list(self, game_name: str):
+        """
+        Used to get snapshots of the game, latest first.
+        """
+
+        game_directory = self.__game_directory(game_name)
+
+        if not os.path.isdir(game_directory):
+            return []
+
+        snapshots = []
+
+        for snapshot_id in os.listdir(game_directory):
+            snapshot_path = os.path.join(game_directory, snapshot_id)
+
+            try:
+                created_time = datetime.strptime(snapshot_id, self.__SNAPSHOT_ID_FORMAT).replace(tzinfo=timezone.utc)
+
+            except ValueError:
+                # Unfinished snapshot or foreign file.
+                continue
+
+            snapshots.append(Snapshot(snapshot_id, created_time, snapshot_path))
+
+        return sorted(snapshots, key=lambda snapshot: snapshot.created_time, reverse=True)
+
+    def restore(self, game_name: str, snapshot_id: str, target_directory: str):
+        """
+        Used to replace contents of target directory with snapshot.
+        Current contents of target directory are snapshot beforehand.
+        """
+
+        snapshot = next((snapshot for snapshot in self.list(game_name) if snapshot.id == snapshot_id), None)
+
+        if snapshot is None:
+            raise ValueError(f"Snapshot {snapshot_id} of {game_name} doesn't exist.")
+
+        staging_directory = target_directory + ".restoring"
+        replaced_directory = target_directory + ".replaced"
+
+        shutil.rmtree(staging_directory, ignore_errors=True)
+
+        # Files are cloned, so modification of restored
+        # save files never affects stored snapshots.
+        for file_name in self.__read_manifest(snapshot.path).get(self.Files, {}):
+            target_path = os.path.join(staging_directory, file_name)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            clone_file(os.path.join(snapshot.path, self.DataDirectory, file_name), target_path)
+
+        os.makedirs(staging_directory, exist_ok=True)
+
+        if os.path.exists(target_directory):
+            self.snapshot(game_name, target_directory)
+            os.rename(target_directory, replaced_directory)
+
+        os.rename(staging_directory, target_directory)
+        shutil.rmtree(replaced_directory, ignore_errors=True)
+
+        _logger.info("Restored snapshot %s of %s.", snapshot_id, game_name)
+
+    def evict(self, game_name: str):
+        """
+        Used to remove snapshots exceeding configured amount, age or size.
+        Latest snapshot is never removed.
+        """
+
+        max_snapshots = prop("backups.maxSnapshots") or self.DefaultMaxSnapshots
+        max_age = timedelta(days=prop("backups.maxAgeDays") or self.DefaultMaxAgeDays)
+        max_size = (prop("backups.maxSizeMb") or self.DefaultMaxSizeMb) * 1024 * 1024
+
+        now = datetime.now(timezone.utc)
+        counted_files = set()
+        total_size = 0
+
+        for index, snapshot in enumerate(self.list(game_name)):
+            # Files shared between snapshots are counted only once.
+            total_size += self.__unique_size(snapshot.path, counted_files)
+
+            if index == 0:
+                continue
+
+            if index < max_snapshots and now - snapshot.created_time <= max_age and total_size <= max_size:
+                continue
+
+            _logger.info("Evicting snapshot %s of %s.", snapshot.id, game_name)
+            shutil.rmtree(snapshot.path, ignore_errors=True)
+
+    def __game_directory(self, game_name: str):
+        """
+        Used to get directory with snapshots of the game.
+        """
+
+        # Game name could contain characters not allowed in file names.
+        return os.path.join(self.__store_directory, re.sub(r'[<>:"/\\|?*]', "_", game_name))
+
+    def __read_manifest(self, snapshot_path: str):
+        """
+        Used to read manifest of the snapshot.
+        """
+
+        try:
+            return read_file(os.path.join(snapshot_path, self.Manifest), as_json=True)
+
+        except (OSError, RuntimeError, ValueError) as error:
+            _logger.warning("Manifest of snapshot %s is corrupted: %s", snapshot_path, error)
+            return {}
+
+    @staticmethod
+    def __list_files(directory: str):
+        """
+        Used to get relative paths of all files in directory.
+        """
+
+        file_names = []
+
+        for root, _, names in os.walk(directory):
+            for name in names:
+                file_names.append(os.path.relpath(os.path.join(root, name), directory).replace(os.path.sep, "/"))
+
+        return sorted(file_names)
+
+    @staticmethod
+    def __link(source_path: str, target_path: str):
+        """
+        Used to create hard link to the file.
+        Returns whether link has been created.
+        """
+
+        try:
+            os.link(source_path, target_path)
+            return True
+
+        except OSError as error:
+            _logger.debug("Failed to link %s: %s", source_path, error)
+            return False
+
+    @staticmethod
+    def __unique_size(snapshot_path: str, counted_files: set):
+        """
+        Used to get size of snapshot files which
+        aren't shared with already counted snapshots.
+        """
+
+        size = 0
+
+        for root, _, names in os.walk(snapshot_path):
+            for name in names:
+                stat = os.stat(os.path.join(root, name))
+                key = (stat.st_dev, stat.st_ino)
+
+                if key not in counted_files:
+                    counted_files.add(key)
+                    size += stat.st_size
+
+        return size
+
+
+def backup_store():
+    """
+    Used to get global backup store instance.
+    """
+
+    global _backup_store
+
+    if _backup_store is None:
+        _backup_store = BackupStore(resolve_app_data(File.BackupStore))
+
+    return _backup_store
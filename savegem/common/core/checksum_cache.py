@@ -0,0 +1,112 @@
+import os
+import time
+from typing import Final, Optional
+
+from constants import File
+from savegem.common.util.file import resolve_app_data, read_file, save_file, file_checksums
+from savegem.common.util.logger import get_logger
+
+_logger = get_logger(__name__)
+_checksum_cache: Optional["ChecksumCache"] = None
+
+
+class ChecksumCache:
+    """
+    Persistent cache of save file digests stored in AppData.
+    Shared by UI application and background processes.
+
+    Digest of file is reused as long as its size, modification
+    time and inode are the same as when it was calculated.
+    """
+
+    # Files modified within this interval are not cached, since
+    # they could be modified again without mtime being changed.
+    RacyIntervalNs: Final = 2 * 10 ** 9
+
+    def __init__(self, cache_path: str):
+        self.__cache_path = cache_path
+
+    def digests(self, file_paths: list[str]):
+        """
+        Used to get digests of provided files.
+        Only files which were changed since
+        last time are being hashed.
+        """
+
+        entries = self.__load()
+        digests = {}
+        modified_files = {}
+        is_modified = False
+        racy_after = time.time_ns() - self.RacyIntervalNs
+
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            key = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+            entry = entries.get(file_path)
+
+            if entry is not None and entry[:3] == key:
+                digests[file_path] = entry[3]
+                continue
+
+            modified_files[file_path] = stat
+
+        _logger.debug("Calculating checksum of %d file(s).", len(modified_files))
+
+        for file_path, digest in zip(modified_files, file_checksums(list(modified_files))):
+            stat = modified_files[file_path]
+            digests[file_path] = digest
+
+            if stat.st_mtime_ns < racy_after:
+                entries[file_path] = [stat.st_size, stat.st_mtime_ns, stat.st_ino, digest]
+                is_modified = True
+
+        if is_modified:
+            self.__save(entries)
+
+        return [digests[file_path] for file_path in file_paths]
+
+    def __load(self):
+        """
+        Used to read cache entries.
+        Cache is read each time, since it
+        could be modified by other processes.
+        """
+
+        if not os.path.exists(self.__cache_path):
+            return {}
+
+        try:
+            return read_file(self.__cache_path, as_json=True)
+
+        except (OSError, RuntimeError, ValueError) as error:
+            _logger.warning("Checksum cache is corrupted, it will be rebuilt: %s", error)
+            return {}
+
+    def __save(self, entries: dict):
+        """
+        Used to store cache entries.
+        Entries of files that no longer exist are dropped.
+        """
+
+        entries = {file_path: entry for file_path, entry in entries.items() if os.path.exists(file_path)}
+
+        try:
+            save_file(self.__cache_path, entries, as_json=True, atomic=True)
+
+        except OSError as error:
+            # Cache is only an optimization, failing
+            # to store it shouldn't fail calling code.
+            _logger.warning("Failed to store checksum cache: %s", error)
+
+
+def checksum_cache():
+    """
+    Used to get global checksum cache instance.
+    """
+
+    global _checksum_cache
+
+    if _checksum_cache is None:
+        _checksum_cache = ChecksumCache(resolve_app_data(File.ChecksumCache))
+
+    return _checksum_cache
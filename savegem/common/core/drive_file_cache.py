@@ -0,0 +1,159 @@
+import base64
+import io
+import os
+import threading
+from dataclasses import dataclass
+from typing import Final, Optional
+
+from constants import File
+from savegem.common.service.storage import storage
+from savegem.common.util.file import resolve_app_data, read_file, save_file
+from savegem.common.util.logger import get_logger
+
+_logger = get_logger(__name__)
+_drive_file_cache: Optional["DriveFileCache"] = None
+
+
+@dataclass(frozen=True)
+class CachedFile:
+    """
+    Represents content of Google Drive file along with its version.
+    """
+
+    version: dict
+    content: bytes
+
+    def open(self):
+        """
+        Used to get content as file-like object.
+        """
+        return io.BytesIO(self.content)
+
+
+class DriveFileCache:
+    """
+    Cache of small, frequently read Google Drive files,
+    such as game configuration or activity log.
+
+    Only metadata of file is requested each time, file itself is
+    downloaded only when its version has changed. Cache is stored
+    in AppData keyed by file ID and is shared between processes.
+    """
+
+    Version: Final = "version"
+    Content: Final = "content"
+
+    VersionFields: Final = "md5Checksum, modifiedTime, version"
+
+    def __init__(self, cache_path: str):
+        self.__cache_path = cache_path
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self):
+        """
+        Used to get amount of fetches served from cache by current process.
+        """
+        return self.__hits
+
+    @property
+    def misses(self):
+        """
+        Used to get amount of fetches which required download by current process.
+        """
+        return self.__misses
+
+    def fetch(self, file_id: str) -> Optional[CachedFile]:
+        """
+        Used to get file by its ID, cached content is reused when file hasn't changed.
+        None is returned when file is not accessible.
+
+        File could be modified between metadata request and download,
+        in that case newer content is stored under older version,
+        so it's simply downloaded again on the next fetch.
+        """
+
+        version = storage().get_metadata(file_id, self.VersionFields)
+
+        if version is None:
+            return None
+
+        entry = self.__load().get(file_id) or {}
+
+        if entry.get(self.Version) == version:
+            try:
+                content = base64.b64decode(entry[self.Content], validate=True)
+                self.__count(hit=True)
+
+                return CachedFile(version, content)
+
+            except (KeyError, TypeError, ValueError) as error:
+                _logger.warning("Cached content of file %s is corrupted, it will be downloaded: %s", file_id, error)
+
+        self.__count(hit=False)
+        file = storage().download_file(file_id)
+
+        if file is None:
+            return None
+
+        content = file.getvalue()
+
+        # Cache is read again, since it could be modified by other processes meanwhile.
+        entries = self.__load()
+        entries[file_id] = {self.Version: version, self.Content: base64.b64encode(content).decode("ascii")}
+        self.__store(entries)
+
+        return CachedFile(version, content)
+
+    def __count(self, hit: bool):
+        """
+        Used to count fetch as either hit or miss.
+        """
+
+        with self.__lock:
+            if hit:
+                self.__hits += 1
+            else:
+                self.__misses += 1
+
+    def __load(self):
+        """
+        Used to read cached files.
+        """
+
+        if not os.path.exists(self.__cache_path):
+            return {}
+
+        try:
+            entries = read_file(self.__cache_path, as_json=True)
+            return entries if isinstance(entries, dict) else {}
+
+        except (OSError, RuntimeError, ValueError) as error:
+            _logger.warning("Drive file cache is corrupted, it will be reset: %s", error)
+            return {}
+
+    def __store(self, entries: dict):
+        """
+        Used to store cached files.
+        """
+
+        try:
+            save_file(self.__cache_path, entries, as_json=True, atomic=True)
+
+        except OSError as error:
+            _logger.warning("Failed to store drive file cache: %s", error)
+
+
+def drive_file_cache():
+    """
+    Used to get global drive file cache instance.
+    """
+
+    global _drive_file_cache
+
+    if _drive_file_cache is None:
+        _drive_file_cache = DriveFileCache(resolve_app_data(File.DriveFileCache))
+
+    return _drive_file_cache
@@ -15,7 +15,7 @@ class EditableJsonConfigHolder(JsonConfigHolder):
         Used to set json property in configuration.
         """
         self._data[property_name] = value
-        save_file(self._config_path, self._data, as_json=True)
+        save_file(self._config_path, self._data, as_json=True, atomic=True)
 
     def set(self, value: any):
         """
@@ -23,7 +23,7 @@ class EditableJsonConfigHolder(JsonConfigHolder):
         This will fully replace existing configuration.
         """
         self._data = value
-        save_file(self._config_path, self._data, as_json=True)
+        save_file(self._config_path, self._data, as_json=True, atomic=True)
 
     def _before_file_open(self):
 
@@ -31,4 +31,4 @@ class EditableJsonConfigHolder(JsonConfigHolder):
         os.makedirs(os.path.dirname(self._config_path), exist_ok=True)
 
         if not os.path.exists(self._config_path):
-            save_file(self._config_path, {}, as_json=True)
+            save_file(self._config_path, {}, as_json=True, atomic=True)
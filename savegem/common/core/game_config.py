@@ -1,12 +1,15 @@
 import json
 import os
 import re
-from typing import Final
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Final, Optional, Iterable
 
 from constants import File
 from savegem.common.core.app_data import AppData
+from savegem.common.core.drive_file_cache import drive_file_cache
 from savegem.common.core.save_meta import LocalMetadata, DriveMetadata, MetadataWrapper
-from savegem.common.service.gdrive import GDrive
+from savegem.common.util.archive import Compression
 from savegem.common.util.file import delete_file, resolve_app_data
 from savegem.common.util.logger import get_logger
 
@@ -27,39 +30,111 @@ class GameConfig(AppData):
     __PROCES_NAME: Final = "process"
     __HIDDEN: Final = "hidden"
     __AUTO_MODE_ALLOWED: Final = "allowAutoMode"
+    __COMPRESSION: Final = "compression"
+    __RETENTION: Final = "retention"
 
     def __init__(self):
         super().__init__()
         self.__games_by_name: dict[str, Game] = dict()
+        self.__version = None
 
     def download(self):
         """
         Used to download game configuration from Google Drive.
+
+        Only metadata of configuration file is requested each time,
+        file itself is downloaded only when it has changed. Downloaded
+        configuration is cached in AppData and shared between processes.
         """
 
-        _logger.debug("Downloading game configuration from drive.")
-        game_config = GDrive.download_file(self._app.config.games_config_file_id)
+        file_id = self._app.config.games_config_file_id
+        game_config = drive_file_cache().fetch(file_id)
 
         if game_config is None:
-            message = "Configuration file ID is invalid, is missing or you don't have access."
-            # Remove token when failed to remove game config.
-            # Since there is a chance that user used wrong account to
-            # authenticate we remove token so that he could log in again.
-            delete_file(resolve_app_data(File.GDriveToken))
+            self.__on_download_failed()
+
+        version = {**game_config.version, "fileId": file_id}
+
+        if version == self.__version:
+            _logger.debug("Game configuration hasn't changed.")
+            return
+
+        self.__load(json.loads(game_config.content))
+        self.__version = version
+
+    @property
+    def empty(self) -> bool:
+        """
+        Used to get list of game configurations.
+        """
+        return len(self.__games_by_name) == 0
+
+    @property
+    def list(self):
+        """
+        Used to return list of all games currently
+        registered in application.
+        """
+        return list(self.__games_by_name.values())
+
+    @property
+    def current(self):
+        """
+        Used to get currently selected game configuration.
+        """
+        return self.by_name(self._app.state.game_name)
+
+    def by_name(self, game_name: str):
+        """
+        Used to get game by its name.
+        """
+        return self.__games_by_name.get(game_name)
+
+    @property
+    def names(self):
+        """
+        Used to get list of game names that are
+        available for the user.
+        """
+        return list(self.__games_by_name.keys())
+
+    def refresh(self):
+        """
+        Used to reload metadata for all
+        registered games.
+        """
+        for game in self.list:
+            game.meta.local.refresh()
+
+    def refresh_drive_metadata(self, games: Optional[Iterable["Game"]] = None):
+        """
+        Used to download latest save metadata of provided
+        games (all registered games by default) in single batch.
+        """
+
+        games = self.list if games is None else list(games)
+
+        if len(games) == 0:
+            return
 
-            _logger.error(message)
-            raise RuntimeError(message)
+        DriveMetadata.refresh_all([game.meta.drive for game in games])
+
+    def __load(self, games):
+        """
+        Used to build games from raw configuration.
+        """
 
-        game_config.seek(0)
         self.__games_by_name.clear()
 
-        for game in json.load(game_config):
+        for game in games:
             name = game.get(self.__GAME_NAME)
             local_path = game.get(self.__LOCAL_PATH)
             drive_directory = game.get(self.__PARENT_DIR)
             process_name = game.get(self.__PROCES_NAME)
             allow_auto_mode = game.get(self.__AUTO_MODE_ALLOWED, True)
             files_filter = game.get(self.__FILES_FILTER, [])
+            compression = self.__parse_compression(name, game.get(self.__COMPRESSION))
+            retention = self.__parse_retention(name, game.get(self.__RETENTION))
 
             hidden = game.get(self.__HIDDEN, False)
             players = game.get(self.__PLAYERS, [])
@@ -79,54 +154,118 @@ class GameConfig(AppData):
                 local_path,
                 drive_directory,
                 files_filter,
-                allow_auto_mode
+                allow_auto_mode,
+                compression,
+                retention
             )
 
         _logger.debug("Configuration for following game(s) was found = %s", ", ".join(self.names))
 
-    @property
-    def empty(self) -> bool:
+    @staticmethod
+    def __parse_compression(game_name: str, value: Optional[str]):
         """
-        Used to get list of game configurations.
+        Used to parse compression of game archives,
+        default compression is used when it's invalid.
         """
-        return len(self.__games_by_name) == 0
 
-    @property
-    def list(self):
+        try:
+            compression = Compression.parse(value)
+
+        except ValueError as error:
+            _logger.warning("Invalid compression of '%s', using default one: %s", game_name, error)
+            return Compression()
+
+        if not compression.is_supported:
+            _logger.warning("Compression %s of '%s' is not supported, using default one.", compression, game_name)
+            return Compression()
+
+        return compression
+
+    @staticmethod
+    def __parse_retention(game_name: str, value: Optional[dict]):
         """
-        Used to return list of all games currently
-        registered in application.
+        Used to parse retention policy of game saves,
+        all saves are kept when it's invalid.
         """
-        return list(self.__games_by_name.values())
 
-    @property
-    def current(self):
+        if value is None:
+            return Retention()
+
+        try:
+            return Retention.parse(value)
+
+        except ValueError as error:
+            _logger.warning("Invalid retention of '%s', all saves will be kept: %s", game_name, error)
+            return Retention()
+
+    @staticmethod
+    def __on_download_failed():
         """
-        Used to get currently selected game configuration.
+        Used to handle case when game configuration is not accessible.
         """
-        return self.by_name(self._app.state.game_name)
 
-    def by_name(self, game_name: str):
+        message = "Configuration file ID is invalid, is missing or you don't have access."
+        # Remove token when failed to remove game config.
+        # Since there is a chance that user used wrong account to
+        # authenticate we remove token so that he could log in again.
+        delete_file(resolve_app_data(File.GDriveToken))
+
+        _logger.error(message)
+        raise RuntimeError(message)
+
+
+@dataclass(frozen=True)
+class Retention:
+    """
+    Represents retention policy of game saves on Google Drive.
+    Save is kept while it's one of the last saves or while
+    it's newer than maximum age, the latest save is always kept.
+    """
+
+    keep_last: Optional[int] = None
+    max_age_days: Optional[int] = None
+
+    __KEEP_LAST = "keepLast"
+    __MAX_AGE_DAYS = "maxAgeDays"
+
+    @classmethod
+    def parse(cls, value: dict):
         """
-        Used to get game by its name.
+        Used to parse policy from game configuration,
+        e.g. {"keepLast": 10, "maxAgeDays": 30}.
         """
-        return self.__games_by_name.get(game_name)
+
+        if not isinstance(value, dict):
+            raise ValueError(f"Retention should be an object, got {value!r}.")
+
+        limits = [value.get(cls.__KEEP_LAST), value.get(cls.__MAX_AGE_DAYS)]
+
+        for limit in limits:
+            if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+                raise ValueError(f"Retention limit should be a positive number, got {limit!r}.")
+
+        return cls(*limits)
 
     @property
-    def names(self):
+    def is_enabled(self):
         """
-        Used to get list of game names that are
-        available for the user.
+        Used to check whether any saves should be removed.
         """
-        return list(self.__games_by_name.keys())
+        return self.keep_last is not None or self.max_age_days is not None
 
-    def refresh(self):
+    def is_retained(self, index: int, created_time: datetime, now: datetime):
         """
-        Used to reload metadata for all
-        registered games.
+        Used to check whether save should be kept,
+        index is position of save starting from the latest one.
         """
-        for game in self.list:
-            game.meta.local.refresh()
+
+        if index == 0 or not self.is_enabled:
+            return True
+
+        if self.keep_last is not None and index < self.keep_last:
+            return True
+
+        return self.max_age_days is not None and now - created_time <= timedelta(days=self.max_age_days)
 
 
 class Game:
@@ -143,13 +282,17 @@ class Game:
                  local_path: str,
                  drive_directory: str,
                  files_filter: list[str],
-                 auto_mode_allowed: bool):
+                 auto_mode_allowed: bool,
+                 compression: Compression = Compression(),
+                 retention: Retention = Retention()):
         self._name = name
         self.__local_path = local_path
         self.__drive_directory = drive_directory
         self.__files_filter = files_filter
         self._process_name = process_name
         self._auto_mode_allowed = auto_mode_allowed
+        self.__compression = compression
+        self.__retention = retention
 
         self._metadata = MetadataWrapper(LocalMetadata(self), DriveMetadata(self))
 
@@ -200,6 +343,22 @@ class Game:
         """
         return self._auto_mode_allowed
 
+    @property
+    def compression(self):
+        """
+        Used to get compression of
+        save archives of the game.
+        """
+        return self.__compression
+
+    @property
+    def retention(self):
+        """
+        Used to get retention policy
+        of saves of the game.
+        """
+        return self.__retention
+
     @property
     def file_list(self):
         """
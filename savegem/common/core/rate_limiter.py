@@ -0,0 +1,134 @@
+import json
+import time
+from enum import Enum
+from typing import Final, Optional
+
+from constants import File, UTF_8
+from savegem.common.core.holders import prop
+from savegem.common.util.file import resolve_app_data, locked_file
+from savegem.common.util.logger import get_logger
+
+_logger = get_logger(__name__)
+_rate_limiter: Optional["RateLimiter"] = None
+
+
+class Priority(Enum):
+    """
+    Contains priorities of requests, interactive requests
+    are initiated by user and shouldn't wait for background ones.
+    """
+
+    Interactive = "interactive"
+    Background = "background"
+
+
+class RateLimiter:
+    """
+    Token bucket which limits rate of requests to Google Drive,
+    so UI and background services together don't exceed API quota.
+
+    State of the bucket is stored in locked file in AppData,
+    so it's shared between all processes of application.
+    Background requests can't take tokens reserved for interactive ones,
+    so user actions go ahead of polling when quota is nearly exhausted.
+    """
+
+    Tokens: Final = "tokens"
+    UpdatedTime: Final = "updatedTime"
+
+    DefaultRequestsPerSecond: Final = 10
+    DefaultBurst: Final = 50
+    DefaultInteractiveReserve: Final = 10
+
+    def __init__(self, state_path: str, priority: Priority = Priority.Interactive):
+        self.__state_path = state_path
+        self.priority = priority
+
+    def acquire(self, tokens: int = 1, priority: Optional[Priority] = None):
+        """
+        Used to take tokens from bucket, waits until enough tokens are available.
+        Priority of current process is used when it's not provided.
+
+        Request costing more than the whole bucket takes it
+        into debt, so following requests wait until it's repaid.
+        """
+
+        priority = priority or self.priority
+        rate = prop("rateLimit.requestsPerSecond") or self.DefaultRequestsPerSecond
+        burst = prop("rateLimit.burst") or self.DefaultBurst
+        reserve = prop("rateLimit.interactiveReserve")
+
+        # Reserve could be disabled, so only missing reserve is defaulted.
+        if reserve is None or reserve == {}:
+            reserve = self.DefaultInteractiveReserve
+
+        reserve = 0 if priority == Priority.Interactive else min(reserve, burst - 1)
+        required = reserve + min(tokens, burst - reserve)
+
+        while True:
+            try:
+                delay = self.__try_acquire(tokens, required, rate, burst)
+
+            except OSError as error:
+                # Requests shouldn't be blocked because of limiter itself, server limits them anyway.
+                _logger.warning("Failed to access rate limiter state, request is not limited: %s", error)
+                return
+
+            if delay <= 0:
+                return
+
+            _logger.debug("Rate limit reached, waiting %.2f second(s) for %s request.", delay, priority.value)
+            time.sleep(delay)
+
+    def __try_acquire(self, tokens: int, required: float, rate: float, burst: float):
+        """
+        Used to take tokens when at least required amount is available.
+        Returns 0 when tokens were taken, otherwise delay
+        in seconds until required amount is refilled.
+        """
+
+        with locked_file(self.__state_path) as file:
+            now = time.time()
+            available = self.__refill(file.read(), now, rate, burst)
+
+            if available >= required:
+                available -= tokens
+                delay = 0
+            else:
+                delay = (required - available) / rate
+
+            file.seek(0)
+            file.truncate()
+            file.write(json.dumps({self.Tokens: available, self.UpdatedTime: now}).encode(UTF_8))
+
+            return delay
+
+    def __refill(self, data: bytes, now: float, rate: float, burst: float):
+        """
+        Used to get amount of tokens available at the moment,
+        bucket starts full when its state is missing or corrupted.
+        """
+
+        try:
+            state = json.loads(data.decode(UTF_8))
+            tokens = float(state[self.Tokens])
+            updated_time = float(state[self.UpdatedTime])
+
+        except (KeyError, TypeError, ValueError):
+            return burst
+
+        # Clock could go backwards, e.g. after it's synchronized.
+        return min(burst, tokens + max(now - updated_time, 0) * rate)
+
+
+def rate_limiter():
+    """
+    Used to get global rate limiter instance.
+    """
+
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(resolve_app_data(File.RateLimiter))
+
+    return _rate_limiter
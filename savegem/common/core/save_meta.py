@@ -1,12 +1,14 @@
 import abc
 import hashlib
+import json
+import os.path
 from enum import Enum, auto
-from typing import Final, TYPE_CHECKING
+from typing import Final, TYPE_CHECKING, Optional
 
-from constants import ZIP_MIME_TYPE, SHA_256
+from constants import ZIP_MIME_TYPE, CHUNKS_MIME_TYPE, SHA_256, UTF_8
+from savegem.common.core.checksum_cache import checksum_cache
 from savegem.common.core.editable_json_config_holder import EditableJsonConfigHolder
-from savegem.common.service.gdrive import GDrive
-from savegem.common.util.file import file_checksum
+from savegem.common.service.storage import storage
 from savegem.common.util.logger import get_logger
 
 if TYPE_CHECKING:
@@ -36,6 +38,8 @@ class SaveMetaProp:
     Owner: Final = "owner"
     CreatedTime: Final = "createdTime"
     Checksum: Final = "checksum"
+    Manifest: Final = "manifest"
+    Compression: Final = "compression"
 
 
 class MetadataWrapper:
@@ -90,6 +94,27 @@ class MetadataWrapper:
         elif current_checksum != drive_save_checksum:
             return SyncStatus.NeedsUpload
 
+    @property
+    def diverging_files(self):
+        """
+        Used to get names of save files that differ from save on
+        Google Drive, without downloading the save itself.
+        Returns None when manifest of the save is not available.
+        """
+
+        drive_manifest = self.__drive.manifest
+
+        if drive_manifest is None:
+            return None
+
+        local_manifest = self.__local.calculate_manifest()
+        file_names = set(local_manifest) | set(drive_manifest)
+
+        return sorted(
+            file_name for file_name in file_names
+            if local_manifest.get(file_name) != drive_manifest.get(file_name)
+        )
+
 
 class Metadata(abc.ABC):  # pragma: no cover
     """
@@ -168,22 +193,34 @@ class LocalMetadata(Metadata):
         """
 
         checksum = hashlib.new(SHA_256)
+        # Don't include metadata when calculating checksum.
+        file_paths = [file_path for file_path in self._game.file_list if file_path != self._game.metadata_file_path]
 
-        for file_path in self._game.file_list:
-            # Don't include metadata when calculating checksum.
-            if file_path == self._game.metadata_file_path:
-                continue
-
-            checksum.update(file_checksum(file_path).encode())
+        for digest in checksum_cache().digests(file_paths):
+            checksum.update(digest.encode())
 
         return checksum.hexdigest()
 
+    def calculate_manifest(self):
+        """
+        Used to get size and digest of each save file.
+        """
+
+        file_paths = [file_path for file_path in self._game.file_list if file_path != self._game.metadata_file_path]
+
+        return {
+            os.path.basename(file_path): [os.path.getsize(file_path), digest]
+            for file_path, digest in zip(file_paths, checksum_cache().digests(file_paths))
+        }
+
     def refresh(self):
         self.__metadata = EditableJsonConfigHolder(self._game.metadata_file_path)
 
 
 class DriveMetadata(Metadata):
 
+    Fields: Final = "id, mimeType, appProperties, createdTime, size"
+    MimeTypes: Final = (ZIP_MIME_TYPE, CHUNKS_MIME_TYPE)
     __ID_PROP: Final = "id"
 
     def __init__(self, game: "Game"):
@@ -193,6 +230,11 @@ class DriveMetadata(Metadata):
         self.__owner = None
         self.__created_time = None
         self.__checksum = None
+        self.__size = None
+        self.__is_chunked = False
+        self.__compression = None
+        self.__manifest_id = None
+        self.__manifest = None
 
         self.__is_present = False
 
@@ -216,36 +258,140 @@ class DriveMetadata(Metadata):
     def checksum(self):
         return self.__checksum
 
+    @property
+    def size(self):
+        """
+        Size of save archive in bytes.
+        """
+        return self.__size
+
+    @property
+    def is_chunked(self):
+        """
+        Used to check whether save is stored as
+        list of chunks instead of archive.
+        """
+        return self.__is_chunked
+
+    @property
+    def compression(self):
+        """
+        Compression of save archive, None
+        for saves compressed with default one.
+        """
+        return self.__compression
+
+    @property
+    def manifest(self):
+        """
+        Manifest of the save, maps name of each save file to
+        its size and digest. Manifest is downloaded on first access,
+        None is returned for saves uploaded without manifest.
+        """
+
+        if self.__manifest_id is None:
+            return None
+
+        if self.__manifest is None:
+            self.__manifest = self.__download_manifest()
+
+        return self.__manifest
+
     def refresh(self):
         """
         Used to download latest save
         metadata from Google Drive.
         """
+        self.apply(self.__list_latest([self])[0])
 
-        metadata = GDrive.query_single(
-            f"mimeType='{ZIP_MIME_TYPE}' and '{self._game.drive_directory}' in parents and trashed=false",
-            "files(id, appProperties, createdTime)"
-        )
+    @classmethod
+    def refresh_all(cls, metadata: list["DriveMetadata"]):
+        """
+        Used to download latest save metadata of multiple games at once.
+        Game which failed to be refreshed is marked as missing on Google
+        Drive, so single inaccessible game doesn't affect other games.
+        """
+
+        for meta, file_meta in zip(metadata, cls.__list_latest(metadata)):
+            try:
+                meta.apply(file_meta)
+
+            except RuntimeError:
+                # Error is already logged.
+                continue
+
+    @classmethod
+    def __list_latest(cls, metadata: list["DriveMetadata"]):
+        """
+        Used to get metadata of the latest save of each game.
+        """
 
-        if metadata is None:
-            message = "Error downloading metadata. Either configuration is incorrect or you don't have access."
+        # Save is published once its checksum is set.
+        return storage().list_latest(
+            [meta._game.drive_directory for meta in metadata], cls.Fields, cls.MimeTypes, SaveMetaProp.Checksum
+        )
 
-            _logger.error(message)
-            raise RuntimeError(message)
+    def apply(self, file_meta: Optional[dict]):
+        """
+        Used to populate metadata from metadata of latest save,
+        empty metadata means that there are no saves yet.
+        Allows to refresh metadata of multiple games in one batch.
+        """
 
-        files_meta = metadata.get("files")
+        if file_meta is None:
+            _logger.error("Error downloading metadata of %s. Either configuration is incorrect or you don't have access.",
+                          self._game.name)
+            self.__is_present = False
+            raise RuntimeError(f"Error downloading metadata of {self._game.name}.")
 
-        if len(files_meta) == 0:
+        if len(file_meta) == 0:
             _logger.warning("There are no saves on Google Drive for %s.", self._game.name)
             self.__is_present = False
             return
 
-        file_meta = files_meta[0]
         properties = file_meta.get("appProperties") or {}
 
         self.__id = file_meta.get(self.__ID_PROP)
         self.__owner = properties.get(SaveMetaProp.Owner)
         self.__created_time = file_meta.get(SaveMetaProp.CreatedTime)
         self.__checksum = properties.get(SaveMetaProp.Checksum)
+        self.__size = int(file_meta.get("size")) if file_meta.get("size") is not None else None
+        self.__is_chunked = file_meta.get("mimeType") == CHUNKS_MIME_TYPE
+        self.__compression = properties.get(SaveMetaProp.Compression)
+
+        if self.__manifest_id != properties.get(SaveMetaProp.Manifest):
+            self.__manifest_id = properties.get(SaveMetaProp.Manifest)
+            self.__manifest = None
 
         self.__is_present = True
+
+    def __download_manifest(self):
+        """
+        Used to download manifest of the save.
+        """
+
+        data = storage().download_file(self.__manifest_id)
+
+        if data is None:
+            return None
+
+        try:
+            return json.loads(data.getvalue().decode(UTF_8))
+
+        except ValueError as error:
+            _logger.warning("Manifest of %s save is corrupted: %s", self._game.name, error)
+            return None
+
+
+def manifest_checksum(manifest: dict):
+    """
+    Used to calculate checksum of the save from its manifest.
+    Checksum is the same as calculated from save files.
+    """
+
+    checksum = hashlib.new(SHA_256)
+
+    for file_name in sorted(manifest):
+        checksum.update(manifest[file_name][1].encode())
+
+    return checksum.hexdigest()
@@ -0,0 +1,180 @@
+import json
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+from typing import Final, Optional, Callable
+
+import psutil
+
+from constants import File, UTF_8
+from savegem.common.core.holders import prop
+from savegem.common.util.file import resolve_app_data, locked_file
+from savegem.common.util.logger import get_logger
+
+_logger = get_logger(__name__)
+_staging_area: Optional["StagingArea"] = None
+
+
+class StagingArea:
+    """
+    Registry of per-operation workspaces, in which files are
+    prepared before they become visible, e.g. downloaded
+    save files before they replace saves directory.
+
+    Each operation gets its own workspace, so concurrent operations
+    never collide. Workspaces are registered in locked file in AppData
+    along with process that owns them, so workspaces left by crashed
+    processes are found and removed on the next sweep.
+    """
+
+    Pid: Final = "pid"
+    CreateTime: Final = "createTime"
+    Size: Final = "size"
+
+    DefaultMaxSizeMb: Final = 4096
+
+    __WORKSPACE_SUFFIX = ".staging"
+
+    def __init__(self, index_path: str):
+        self.__index_path = index_path
+
+    @contextmanager
+    def workspace(self, directory: str, size: int = 0):
+        """
+        Used to create unique workspace next to directory, so its
+        contents could be renamed into place. Workspace is removed
+        once operation is finished, whether it succeeded or not.
+
+        Size expected to be written into workspace is reserved
+        from quota, RuntimeError is raised when quota is exceeded.
+        Size is provided by caller, it could be an estimate when
+        exact size is not known upfront.
+        """
+
+        workspace_path = f"{directory}{self.__WORKSPACE_SUFFIX}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.__register(workspace_path, size)
+
+        try:
+            os.makedirs(workspace_path)
+            yield workspace_path
+
+        finally:
+            shutil.rmtree(workspace_path, ignore_errors=True)
+            self.__unregister(workspace_path)
+
+    def sweep(self):
+        """
+        Used to remove workspaces of processes that are no longer running.
+        """
+        self.__update(self.__remove_orphans)
+
+    def __remove_orphans(self, entries: dict):
+        """
+        Used to remove workspaces of processes that are no longer running from registry.
+        """
+
+        orphans = [path for path, entry in entries.items() if not self.__is_owner_running(entry)]
+
+        for workspace_path in orphans:
+            _logger.info("Removing orphaned staging workspace %s.", workspace_path)
+            shutil.rmtree(workspace_path, ignore_errors=True)
+            entries.pop(workspace_path)
+
+    def __register(self, workspace_path: str, size: int):
+        """
+        Used to register workspace of current process,
+        workspace is registered before it's created, so it's
+        never left behind unregistered.
+        """
+
+        def register(entries: dict):
+            # Orphans are removed first, so they don't take up the quota.
+            self.__remove_orphans(entries)
+
+            max_size = (prop("staging.maxSizeMb") or self.DefaultMaxSizeMb) * 1024 * 1024
+            reserved_size = sum(entry.get(self.Size, 0) for entry in entries.values())
+
+            if reserved_size + size > max_size:
+                raise RuntimeError(f"Staging quota exceeded, {reserved_size} of {max_size} byte(s) are in use.")
+
+            entries[workspace_path] = {
+                self.Pid: os.getpid(),
+                self.CreateTime: psutil.Process().create_time(),
+                self.Size: size
+            }
+
+        self.__update(register)
+
+    def __unregister(self, workspace_path: str):
+        """
+        Used to remove workspace from registry.
+        """
+        self.__update(lambda entries: entries.pop(workspace_path, None))
+
+    def __is_owner_running(self, entry: dict):
+        """
+        Used to check if process that owns workspace is still running.
+        Creation time is compared, since ID of process could be reused.
+        """
+
+        try:
+            return psutil.Process(entry.get(self.Pid)).create_time() == entry.get(self.CreateTime)
+
+        except (psutil.Error, TypeError, ValueError):
+            return False
+
+    def __update(self, modify: Callable[[dict], None]):
+        """
+        Used to modify registered workspaces. Registry is shared by
+        processes, so it's locked while it's read, modified and stored.
+        Registry is treated as empty when it's not accessible.
+        """
+
+        is_modified = False
+
+        try:
+            with locked_file(self.__index_path) as file:
+                entries = self.__parse(file.read())
+                modify(entries)
+                is_modified = True
+
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(entries, indent=2).encode(UTF_8))
+
+        except OSError as error:
+            _logger.warning("Failed to update staging registry: %s", error)
+
+            if not is_modified:
+                modify({})
+
+    @staticmethod
+    def __parse(data: bytes):
+        """
+        Used to parse registered workspaces.
+        """
+
+        if len(data) == 0:
+            return {}
+
+        try:
+            entries = json.loads(data.decode(UTF_8))
+            return entries if isinstance(entries, dict) else {}
+
+        except ValueError as error:
+            _logger.warning("Staging registry is corrupted, it will be reset: %s", error)
+            return {}
+
+
+def staging_area():
+    """
+    Used to get global staging area instance.
+    """
+
+    global _staging_area
+
+    if _staging_area is None:
+        _staging_area = StagingArea(resolve_app_data(File.StagingArea))
+
+    return _staging_area
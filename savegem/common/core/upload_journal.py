@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+from typing import Final, Optional
+
+from constants import File, SHA_256
+from savegem.common.util.file import resolve_app_data, read_file, save_file
+from savegem.common.util.logger import get_logger
+
+_logger = get_logger(__name__)
+_upload_journal: Optional["UploadJournal"] = None
+
+
+class UploadJournal:
+    """
+    Persistent journal of unfinished uploads stored in AppData.
+    Used to continue upload of the game saves once process
+    was restarted, instead of uploading archive from scratch.
+    """
+
+    Fingerprint: Final = "fingerprint"
+    FileName: Final = "fileName"
+    CreatedTime: Final = "createdTime"
+
+    def __init__(self, journal_path: str):
+        self.__journal_path = journal_path
+
+    def get(self, game_name: str, fingerprint: str) -> Optional[dict]:
+        """
+        Used to get unfinished upload of the game.
+        Upload is only returned when it was made
+        from save files with same fingerprint.
+        """
+
+        entry = self.__load().get(game_name)
+
+        if entry is None:
+            return None
+
+        if entry.get(self.Fingerprint) != fingerprint:
+            _logger.info("Save files of %s were modified since upload was interrupted.", game_name)
+            self.remove(game_name)
+            return None
+
+        return entry
+
+    def save(self, game_name: str, entry: dict):
+        """
+        Used to store progress of the upload.
+        """
+
+        entries = self.__load()
+        entries[game_name] = entry
+
+        self.__store(entries)
+
+    def remove(self, game_name: str):
+        """
+        Used to remove upload from journal.
+        """
+
+        entries = self.__load()
+
+        if entries.pop(game_name, None) is not None:
+            self.__store(entries)
+
+    @staticmethod
+    def fingerprint(file_paths: list[str]):
+        """
+        Used to get fingerprint of save files.
+        Changes whenever any of the files is
+        added, removed or modified.
+        """
+
+        stats = []
+
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            stats.append([file_path, stat.st_size, stat.st_mtime_ns])
+
+        return hashlib.new(SHA_256, json.dumps(stats).encode()).hexdigest()
+
+    def __load(self):
+        """
+        Used to read journal entries.
+        Journal is read each time, since it
+        could be modified by other processes.
+        """
+
+        if not os.path.exists(self.__journal_path):
+            return {}
+
+        try:
+            return read_file(self.__journal_path, as_json=True)
+
+        except (OSError, RuntimeError, ValueError) as error:
+            _logger.warning("Upload journal is corrupted, it will be reset: %s", error)
+            return {}
+
+    def __store(self, entries: dict):
+        """
+        Used to store journal entries.
+        """
+
+        try:
+            save_file(self.__journal_path, entries, as_json=True, atomic=True)
+
+        except OSError as error:
+            # Upload could still succeed, it just
+            # won't be possible to resume it.
+            _logger.warning("Failed to store upload journal: %s", error)
+
+
+def upload_journal():
+    """
+    Used to get global upload journal instance.
+    """
+
+    global _upload_journal
+
+    if _upload_journal is None:
+        _upload_journal = UploadJournal(resolve_app_data(File.UploadJournal))
+
+    return _upload_journal
@@ -0,0 +1,313 @@
+import hashlib
+import os.path
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Final, Optional, Callable, Iterable
+
+from constants import FOLDER_MIME_TYPE, BINARY_MIME_TYPE, SHA_256
+from savegem.common.core.context import app
+from savegem.common.core.save_meta import SaveMetaProp
+from savegem.common.service.storage import storage
+from savegem.common.util.chunking import split_chunks, chunk_digest
+from savegem.common.util.logger import get_logger
+
+_logger = get_logger(__name__)
+
+
+class ChunkStore:
+    """
+    Deduplicated store of save file chunks in Google Drive.
+
+    Chunks are located in 'chunks' folder of game directory, each
+    chunk is compressed and named after digest of its data. Version
+    of the save only references chunks, so chunks that are already
+    in the store are never uploaded again.
+    """
+
+    FolderName: Final = "chunks"
+    ChunkFields: Final = "id, name, createdTime, appProperties"
+
+    Files: Final = "files"
+    Size: Final = "size"
+    Digest: Final = "digest"
+    Chunks: Final = "chunks"
+
+    def __init__(self, drive_directory: str, concurrency: int):
+        self.__drive_directory = drive_directory
+        self.__concurrency = max(concurrency, 1)
+
+        self.__folder_id = None
+        # Maps digest of chunk to ID of file in Google Drive.
+        self.__chunks: Optional[dict[str, Optional[str]]] = None
+
+    def upload_files(self, file_paths: list[str], subscriber: Optional[Callable[[float], None]] = None):
+        """
+        Used to split files into chunks and upload chunks missing in store.
+        Returns entry of each file, which contains its size,
+        digest and list of digests of its chunks.
+        """
+
+        self.__load(create=True)
+
+        total_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+        processed_size = 0
+        uploaded_count = 0
+        files = {}
+
+        pending = deque()
+
+        def wait_next_upload():
+            chunk_id, file_id = pending.popleft().result()
+            self.__chunks[chunk_id] = file_id
+
+        with ThreadPoolExecutor(self.__concurrency) as executor:
+            try:
+                for file_path in file_paths:
+                    file_hash = hashlib.new(SHA_256)
+                    file_size = 0
+                    chunk_ids = []
+
+                    with open(file_path, "rb") as file:
+                        for chunk in split_chunks(file):
+                            chunk_id = chunk_digest(chunk)
+                            file_hash.update(chunk)
+                            chunk_ids.append(chunk_id)
+                            file_size += len(chunk)
+                            processed_size += len(chunk)
+
+                            if chunk_id not in self.__chunks:
+                                # Chunk could repeat within the same upload.
+                                self.__chunks[chunk_id] = None
+                                pending.append(executor.submit(self.__upload_chunk, chunk_id, chunk))
+                                uploaded_count += 1
+
+                                if len(pending) == self.__concurrency:
+                                    wait_next_upload()
+
+                            if subscriber is not None and total_size > 0:
+                                subscriber(processed_size / total_size)
+
+                    files[os.path.basename(file_path)] = {
+                        self.Size: file_size,
+                        self.Digest: file_hash.hexdigest(),
+                        self.Chunks: chunk_ids
+                    }
+
+                while pending:
+                    wait_next_upload()
+
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        _logger.info("Uploaded %d new chunk(s) of %d file(s).", uploaded_count, len(files))
+        return files
+
+    def download_files(self, files: dict, target_directory: str, local_paths: list[str],
+                       subscriber: Optional[Callable[[float], None]] = None):
+        """
+        Used to restore files from their chunks into target directory.
+        Chunks present in local files are read from them, only
+        missing chunks are downloaded from the store.
+        """
+
+        self.__load(create=False)
+
+        local_chunks = self.__index_local_chunks(local_paths)
+        total_size = sum(entry[self.Size] for entry in files.values())
+        processed_size = 0
+
+        with ThreadPoolExecutor(self.__concurrency) as executor:
+            for file_name, entry in files.items():
+                # Record only contains names of files in saves directory.
+                if file_name in ("", ".", "..") or os.path.basename(file_name) != file_name:
+                    raise ValueError(f"Unsafe file name {file_name}.")
+
+                file_hash = hashlib.new(SHA_256)
+
+                with open(os.path.join(target_directory, file_name), "wb") as file:
+                    for chunk in self.__read_chunks(executor, entry[self.Chunks], local_chunks):
+                        file_hash.update(chunk)
+                        file.write(chunk)
+                        processed_size += len(chunk)
+
+                        if subscriber is not None and total_size > 0:
+                            subscriber(processed_size / total_size)
+
+                if file_hash.hexdigest() != entry[self.Digest]:
+                    raise ValueError(f"Digest of {file_name} doesn't match digest of the save.")
+
+    def find_unreferenced(self, referenced_ids: Iterable[str], created_before: datetime):
+        """
+        Used to find chunks of the player, which aren't referenced by any
+        version of the save. Chunks created after provided time are kept,
+        since they could belong to upload which isn't published yet.
+
+        Returns IDs of files of unreferenced chunks.
+        """
+
+        folder_id = self.__find_folder()
+
+        if folder_id is None:
+            return []
+
+        chunks = storage().list_files(folder_id, self.ChunkFields)
+
+        if chunks is None:
+            raise RuntimeError("Failed to list chunks.")
+
+        referenced_ids = set(referenced_ids)
+        file_ids = []
+
+        for chunk in chunks:
+            properties = chunk.get("appProperties") or {}
+            created_time = datetime.fromisoformat(chunk.get("createdTime").replace("Z", "+00:00"))
+
+            # Only owner of the chunk could remove it, same as the save.
+            if chunk.get("name") in referenced_ids or created_time > created_before or \
+                    properties.get(SaveMetaProp.Owner) != app().user.name:
+                continue
+
+            file_ids.append(chunk.get("id"))
+
+        return file_ids
+
+    def __read_chunks(self, executor: ThreadPoolExecutor, chunk_ids: list[str], local_chunks: dict):
+        """
+        Used to read chunks in order, while next chunks are being
+        read in background, at most one chunk per worker is kept in memory.
+        """
+
+        pending = deque()
+
+        try:
+            for chunk_id in chunk_ids:
+                pending.append(executor.submit(self.__read_chunk, chunk_id, local_chunks.get(chunk_id)))
+
+                if len(pending) == self.__concurrency:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def __read_chunk(self, chunk_id: str, location: Optional[tuple[str, int, int]]):
+        """
+        Used to read chunk from local file, chunk is
+        downloaded when local file has been modified.
+        """
+
+        if location is not None:
+            file_path, offset, size = location
+
+            with open(file_path, "rb") as file:
+                file.seek(offset)
+                chunk = file.read(size)
+
+            if chunk_digest(chunk) == chunk_id:
+                return chunk
+
+        return self.__download_chunk(chunk_id)
+
+    def __upload_chunk(self, chunk_id: str, chunk: bytes):
+        """
+        Used to upload compressed chunk into store.
+        """
+
+        file_id = storage().create_file(
+            chunk_id,
+            zlib.compress(chunk),
+            self.__folder_id,
+            BINARY_MIME_TYPE,
+            properties={SaveMetaProp.Owner: app().user.name}
+        )
+        return chunk_id, file_id
+
+    def __download_chunk(self, chunk_id: str):
+        """
+        Used to download chunk from store.
+        """
+
+        file_id = self.__chunks.get(chunk_id)
+
+        if file_id is None:
+            raise ValueError(f"Chunk {chunk_id} is missing in the store.")
+
+        data = storage().download_file(file_id)
+
+        if data is None:
+            raise ValueError(f"Failed to download chunk {chunk_id}.")
+
+        try:
+            chunk = zlib.decompress(data.getvalue())
+
+        except zlib.error as error:
+            raise ValueError(f"Chunk {chunk_id} is corrupted: {error}")
+
+        if chunk_digest(chunk) != chunk_id:
+            raise ValueError(f"Chunk {chunk_id} is corrupted.")
+
+        return chunk
+
+    @staticmethod
+    def __index_local_chunks(file_paths: list[str]):
+        """
+        Used to find location of each chunk in local files.
+        """
+
+        local_chunks = {}
+
+        for file_path in file_paths:
+            offset = 0
+
+            with open(file_path, "rb") as file:
+                for chunk in split_chunks(file):
+                    local_chunks.setdefault(chunk_digest(chunk), (file_path, offset, len(chunk)))
+                    offset += len(chunk)
+
+        return local_chunks
+
+    def __load(self, create: bool):
+        """
+        Used to find chunks folder and list chunks in it.
+        Folder is created when it's missing and creation is requested.
+        """
+
+        if self.__chunks is not None:
+            return
+
+        self.__folder_id = self.__find_folder()
+
+        if self.__folder_id is None and create:
+            _logger.info("Creating chunks folder.")
+            self.__folder_id = storage().create_folder(self.FolderName, self.__drive_directory)
+            self.__chunks = {}
+            return
+
+        if self.__folder_id is None:
+            raise RuntimeError("Chunks folder is missing.")
+
+        chunks = storage().list_files(self.__folder_id, "id, name")
+
+        if chunks is None:
+            raise RuntimeError("Failed to list chunks.")
+
+        self.__chunks = {chunk.get("name"): chunk.get("id") for chunk in chunks}
+
+    def __find_folder(self):
+        """
+        Used to find ID of chunks folder, returns None when it's missing.
+        """
+
+        folders = storage().list_files(self.__drive_directory, "id, name", (FOLDER_MIME_TYPE,))
+
+        if folders is None:
+            raise RuntimeError("Failed to find chunks folder.")
+
+        folder_ids = [folder.get("id") for folder in folders if folder.get("name") == self.FolderName]
+        return folder_ids[0] if len(folder_ids) > 0 else None
@@ -4,11 +4,15 @@ import sys
 import time
 from typing import Final
 
-from constants import JSON_EXTENSION, File
+from constants import JSON_EXTENSION
 from savegem.common.core.holders import prop
 from savegem.common.core.json_config_holder import JsonConfigHolder
-from savegem.common.util.file import resolve_config, resolve_app_data
+from savegem.common.core.rate_limiter import rate_limiter, Priority
+from savegem.common.core.staging_area import staging_area
+from savegem.common.service.storage import storage
+from savegem.common.util.file import resolve_config
 from savegem.common.util.logger import get_logger
+from savegem.common.util.metrics import metrics
 from savegem.common.util.process import is_process_already_running
 from savegem.common.util.test import ExitTestLoop
 
@@ -20,6 +24,7 @@ class Daemon(abc.ABC):
     """
 
     DefaultInterval: Final = 5
+    MetricsLogPolls: Final = 720
 
     def __init__(self, service_name: str, requires_auth: bool):
 
@@ -51,29 +56,56 @@ class Daemon(abc.ABC):
         self._logger.info("Starting service '%s' version %s.", self.__service_name, prop("version"))
         self._logger.info("Polling rate '%s' seconds.", self.__interval)
 
-        while True:
-            try:
-
-                # There are scenarios where we don't want to trigger authentication flow once user installs
-                # application and background processes start.
-                # Once user authenticates thorough UI it will create
-                # token file, only then service can start doing their job.
-                if self.__requires_auth and not os.path.exists(resolve_app_data(File.GDriveToken)):
-                    self._logger.debug(
-                        "Authentication has not been completed. Sleeping for %d second(s).",
-                        self.interval
-                    )
-                    time.sleep(self.__interval)
-                    continue
-
-                self._work()
-            except ExitTestLoop as error:
-                raise error
-
-            except Exception as error:
-                self._logger.error("Exception in '%s' service: %s", self.__service_name, error, exc_info=True)
-
-            time.sleep(self.__interval)
+        # Workspaces of crashed processes would otherwise stay on disk.
+        staging_area().sweep()
+        # Requests of background services shouldn't delay requests made by user.
+        rate_limiter().priority = Priority.Background
+
+        polls = 0
+
+        try:
+            while True:
+                try:
+
+                    # There are scenarios where we don't want to trigger authentication flow once user installs
+                    # application and background processes start.
+                    # Once user authenticates thorough UI it will create
+                    # token file, only then service can start doing their job.
+                    if self.__requires_auth and not storage().is_authenticated():
+                        self._logger.debug(
+                            "Authentication has not been completed. Sleeping for %d second(s).",
+                            self.interval
+                        )
+                        time.sleep(self.__interval)
+                        continue
+
+                    self._work()
+                except ExitTestLoop as error:
+                    raise error
+
+                except Exception as error:
+                    self._logger.error("Exception in '%s' service: %s", self.__service_name, error, exc_info=True)
+
+                polls += 1
+
+                # Background services are rarely shut down gracefully, so metrics are logged periodically too.
+                if polls % self.MetricsLogPolls == 0:
+                    self.__log_metrics()
+
+                time.sleep(self.__interval)
+
+        finally:
+            self.__log_metrics()
+
+    def __log_metrics(self):
+        """
+        Used to log metrics of remote calls made by daemon.
+        """
+
+        summary = metrics().summary()
+
+        if summary:
+            self._logger.info("Google Drive requests of '%s' service:\n%s", self.__service_name, summary)
 
     @property
     def interval(self):
@@ -1,12 +1,22 @@
+import hashlib
+import json
 import os.path
 import shutil
-from typing import Final
+import zipfile
+from typing import Final, Optional
 
-from constants import ZIP_EXTENSION
+from googleapiclient.errors import HttpError
+
+from constants import SHA_256, UTF_8
+from savegem.common.core.backup_store import backup_store
 from savegem.common.core.game_config import Game
-from savegem.common.service.gdrive import GDrive
+from savegem.common.core.holders import prop
+from savegem.common.core.staging_area import staging_area
+from savegem.common.service.chunk_store import ChunkStore
+from savegem.common.service.storage import storage
 from savegem.common.service.subscriptable import SubscriptableService, ErrorEvent, DoneEvent, EventKind
-from savegem.common.util.file import resolve_temp_file, cleanup_directory, save_file
+from savegem.common.util.archive import ZipExtractor, Compression
+from savegem.common.util.file import clone_file
 from savegem.common.util.logger import get_logger
 
 _logger = get_logger(__name__)
@@ -18,6 +28,11 @@ class Downloader(SubscriptableService):
     """
 
     BackupSuffix: Final = "_backup"
+    DefaultConcurrency: Final = 4
+    DefaultBackupsCount: Final = 1
+
+    # Download stage is completed once save files are extracted, so partial progress never completes it.
+    __MAX_PARTIAL_COMPLETION: Final = 0.99
 
     def download(self, game: Game):
         """
@@ -26,15 +41,15 @@ class Downloader(SubscriptableService):
         """
 
         # 1 - Download last save meta
-        # 2 - Download save archive
-        # 3 - Save archive in file system
-        # 4 - Backup existing save
-        # 5 - Extract downloaded archive
-        # 6 - Update in-memory save files metadata.
-        self._set_stages(6)
+        # 2 - Download and extract save archive into staging directory
+        # 3 - Verify extracted save files
+        # 4 - Store snapshot of existing save
+        # 5 - Carry over files that are not part of the save
+        # 6 - Swap saves directory with staging directory
+        # 7 - Update in-memory save files metadata.
+        self._set_stages(7)
 
         saves_directory = game.local_path
-        temp_zip_file_path = resolve_temp_file(f"save.{ZIP_EXTENSION}")
 
         _logger.debug("savesDirectory = %s", saves_directory)
 
@@ -50,53 +65,382 @@ class Downloader(SubscriptableService):
             self._send_event(ErrorEvent(EventKind.DriveMetadataMissing))
             return
 
-        # Download file and write it to zip file locally (in output directory)
-        _logger.info("Downloading save archive.")
-        file = GDrive.download_file(
-            game.meta.drive.id,
-            subscriber=lambda completion: self._complete_stage(completion)
-        ).getvalue()
+        try:
+            # Workspace is removed on failure as well, so existing save stays untouched.
+            with staging_area().workspace(saves_directory, self.__staging_size(game)) as staging_directory:
+                is_replaced = self.__replace_saves(game, staging_directory)
+
+        except RuntimeError as error:
+            _logger.error("Failed to prepare staging workspace: %s", error)
+            is_replaced = False
+
+        if not is_replaced:
+            self._send_event(ErrorEvent(EventKind.ErrorDownloadingFromDrive))
+            return
 
-        _logger.info("Storing file in output directory.")
-        save_file(temp_zip_file_path, file, binary=True)
+        # Archive doesn't contain metadata, so it's populated from the drive.
+        game.meta.local.checksum = game.meta.drive.checksum
+        game.meta.local.owner = game.meta.drive.owner
+        game.meta.local.created_time = game.meta.drive.created_time
         self._complete_stage()
 
-        # Make backup of existing save files, just in case.
-        self.__backup_directory(saves_directory)
+        self._send_event(DoneEvent(None))
+
+    def __replace_saves(self, game: Game, staging_directory: str):
+        """
+        Used to download save files into staging directory, which then
+        replaces saves directory. Returns whether saves directory was replaced.
+        """
+
+        try:
+            if game.meta.drive.is_chunked:
+                digests = self.__restore_chunks(game, staging_directory)
+
+            else:
+                digests = self.__extract(game, staging_directory)
+
+        except (zipfile.BadZipFile, HttpError, ValueError, KeyError, RuntimeError) as error:
+            _logger.error("Downloaded save archive is corrupted: %s", error)
+            digests = None
+
+        if digests is None:
+            return False
+
+        _logger.info("Save archive extracted into staging directory.")
         self._complete_stage()
 
-        # Extract archive contents to the target directory
-        _logger.info("Extracting archive into saves directory.")
-        shutil.unpack_archive(
-            temp_zip_file_path,
-            saves_directory,
-            ZIP_EXTENSION
-        )
+        if not self.__verify_checksum(game, digests):
+            return False
+
         self._complete_stage()
 
-        # Update metadata in memory.
-        game.meta.local.checksum = game.meta.drive.checksum
+        self.__snapshot(game)
         self._complete_stage()
 
-        self._send_event(DoneEvent(None))
+        # Files which are not part of the save, like game
+        # settings, should remain in the saves directory.
+        self.__carry_over_files(game.local_path, staging_directory)
+        self._complete_stage()
+
+        # Existing saves directory becomes the latest backup,
+        # so save files are never copied or partially replaced.
+        self.__swap_directories(game.local_path, staging_directory)
+        self._complete_stage()
+
+        return True
+
+    def __extract(self, game: Game, staging_directory: str):
+        """
+        Used to extract save archive into staging directory. Only changed
+        files are extracted when manifest of the save is available.
+
+        Returns digests of save files or None when download failed.
+        """
+
+        compression = Compression.parse(game.meta.drive.compression)
+
+        # Archive could be compressed with codec missing in this runtime.
+        if not compression.is_supported:
+            raise ValueError(f"Compression {compression} of save archive is not supported.")
+
+        manifest = game.meta.drive.manifest
+        changed_files = self.__changed_files(game, manifest)
+
+        if changed_files is not None:
+            return self.__extract_changed_files(game, staging_directory, manifest, changed_files)
+
+        return self.__extract_archive(game, staging_directory)
+
+    def __restore_chunks(self, game: Game, staging_directory: str):
+        """
+        Used to restore save files stored as chunks into staging
+        directory. Chunks of local save files are reused,
+        so only chunks that differ are downloaded.
+
+        Returns digests of save files or None when download failed.
+        """
+
+        _logger.info("Restoring save files from chunks.")
+        record = storage().download_file(game.meta.drive.id)
+
+        if record is None:
+            return None
+
+        files = json.loads(record.getvalue().decode(UTF_8)).get(ChunkStore.Files, {})
+        store = ChunkStore(game.drive_directory, prop("chunkedStorage.concurrency") or self.DefaultConcurrency)
+
+        store.download_files(
+            files,
+            staging_directory,
+            [file_path for file_path in game.file_list if os.path.isfile(file_path)],
+            subscriber=self.__update_download_stage
+        )
+
+        metadata_file_name = os.path.basename(game.metadata_file_path)
+        return {
+            file_name: entry[ChunkStore.Digest]
+            for file_name, entry in files.items() if file_name != metadata_file_name
+        }
+
+    def __extract_archive(self, game: Game, staging_directory: str):
+        """
+        Used to download whole save archive and extract it into staging
+        directory. Archive is extracted while it's being downloaded,
+        so it's never stored on disk or fully loaded into memory.
+
+        Returns digests of extracted files or None when download failed.
+        """
+
+        _logger.info("Downloading and extracting save archive.")
+        digests = {}
+
+        def on_file_extracted(file_path: str, digest: str):
+            digests[os.path.relpath(file_path, staging_directory)] = digest
+
+        with ZipExtractor(staging_directory, on_file_extracted=on_file_extracted) as extractor:
+            result = storage().download_file_parallel(
+                game.meta.drive.id,
+                extractor,
+                game.meta.drive.size,
+                prop("downloadConcurrency") or self.DefaultConcurrency,
+                subscriber=self.__update_download_stage
+            )
+
+            if result is None:
+                return None
+
+            extractor.close()
+
+        return digests
+
+    def __extract_changed_files(self, game: Game, staging_directory: str, manifest: dict, changed_files: list[str]):
+        """
+        Used to extract only save files that differ from local ones.
+        Archive is read remotely, so only central directory
+        and changed files are being downloaded.
+
+        Returns digests of all save files listed in manifest.
+        """
+
+        _logger.info("Downloading %d of %d changed save file(s).", len(changed_files), len(manifest))
+        metadata_file_name = os.path.basename(game.metadata_file_path)
+
+        with storage().open_file(game.meta.drive.id, game.meta.drive.size) as stream, zipfile.ZipFile(stream) as archive:
+            file_names = list(changed_files)
+
+            if metadata_file_name in archive.namelist():
+                file_names.append(metadata_file_name)
+
+            for index, file_name in enumerate(file_names):
+                digest = self.__extract_member(archive, file_name, staging_directory)
+
+                if file_name in manifest and digest != manifest[file_name][1]:
+                    raise zipfile.BadZipFile(f"Digest of {file_name} doesn't match manifest of the save.")
+
+                self.__update_download_stage((index + 1) / len(file_names))
+
+        # Unchanged files are carried over from saves directory.
+        return {file_name: entry[1] for file_name, entry in manifest.items()}
+
+    def __update_download_stage(self, completion: float):
+        """
+        Used to report partial progress of download stage.
+        """
+        self._complete_stage(min(completion, self.__MAX_PARTIAL_COMPLETION))
+
+    @staticmethod
+    def __staging_size(game: Game):
+        """
+        Used to get size of save files once they're extracted into staging directory.
+        Without manifest size of the archive is used as an estimate.
+        """
+
+        manifest = game.meta.drive.manifest
+
+        if manifest is not None:
+            return sum(entry[0] for entry in manifest.values())
+
+        return game.meta.drive.size or 0
+
+    @staticmethod
+    def __changed_files(game: Game, manifest: Optional[dict]):
+        """
+        Used to get names of save files that differ from save on Google
+        Drive. Returns None when whole archive should be downloaded.
+        """
+
+        if manifest is None or game.meta.drive.size is None:
+            return None
+
+        local_manifest = game.meta.local.calculate_manifest()
+        changed_files = [
+            file_name for file_name in sorted(manifest)
+            if local_manifest.get(file_name) != manifest[file_name]
+        ]
+
+        # Archive is downloaded in one pass when all of the files differ.
+        if len(changed_files) == len(manifest):
+            return None
+
+        return changed_files
+
+    @staticmethod
+    def __extract_member(archive: zipfile.ZipFile, file_name: str, staging_directory: str):
+        """
+        Used to extract single archive member.
+        Returns digest of extracted file.
+        """
+
+        # Manifest only contains names of files in saves directory.
+        if file_name in ("", ".", "..") or os.path.basename(file_name) != file_name:
+            raise zipfile.BadZipFile(f"Unsafe file name {file_name}.")
+
+        digest = hashlib.new(SHA_256)
+        target_path = os.path.join(staging_directory, file_name)
+
+        with archive.open(file_name) as member, open(target_path, "wb") as target:
+            for chunk in iter(lambda: member.read(ZipExtractor.BlockSize), b""):
+                digest.update(chunk)
+                target.write(chunk)
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def __verify_checksum(game: Game, digests: dict[str, str]):
+        """
+        Used to check that checksum of extracted
+        save files matches checksum of the save.
+        """
+
+        if game.meta.drive.checksum is None:
+            return True
+
+        checksum = hashlib.new(SHA_256)
+        metadata_file_name = os.path.basename(game.metadata_file_path)
+
+        # Checksum of the save is calculated from save
+        # files sorted by name, metadata is not included.
+        for file_name in sorted(digests):
+            if file_name != metadata_file_name:
+                checksum.update(digests[file_name].encode())
+
+        if checksum.hexdigest() != game.meta.drive.checksum:
+            _logger.error("Checksum of extracted save files doesn't match checksum of the save.")
+            return False
+
+        return True
+
+    @staticmethod
+    def __snapshot(game: Game):
+        """
+        Used to store snapshot of existing save in backup store.
+        """
+
+        try:
+            backup_store().snapshot(game.name, game.local_path)
+
+        except OSError as error:
+            # Saves directory itself still becomes a backup,
+            # so download shouldn't fail because of snapshot.
+            _logger.warning("Failed to store snapshot of %s: %s", game.name, error)
+
+    @staticmethod
+    def __carry_over_files(saves_directory: str, staging_directory: str):
+        """
+        Used to clone files of saves directory which are missing in
+        staging directory into it. Files are never hard linked, since
+        saves directory becomes a backup, which shouldn't share files
+        with the live saves directory.
+        """
+
+        for root, _, file_names in os.walk(saves_directory):
+            staging_root = os.path.join(staging_directory, os.path.relpath(root, saves_directory))
+            os.makedirs(staging_root, exist_ok=True)
+
+            for file_name in file_names:
+                staging_path = os.path.join(staging_root, file_name)
+
+                if os.path.exists(staging_path):
+                    continue
+
+                clone_file(os.path.join(root, file_name), staging_path)
+
+    def __swap_directories(self, saves_directory: str, staging_directory: str):
+        """
+        Used to replace saves directory with staging directory.
+        Saves directory is renamed into the latest backup,
+        while older backups are rotated.
+        """
+
+        backup_directory = self.backup_directory(saves_directory)
+        _logger.debug("backupDirectory = %s", backup_directory)
+
+        self.__rotate_backups(saves_directory)
+
+        try:
+            os.rename(saves_directory, backup_directory)
+
+        except OSError as error:
+            # Directory can't be renamed while some of its files are in
+            # use, so save files are copied and replaced one by one instead.
+            _logger.warning("Failed to rename saves directory, save files will be copied: %s", error)
+
+            shutil.copytree(saves_directory, backup_directory)
+            self.__move_files(staging_directory, saves_directory)
+            return
+
+        try:
+            os.rename(staging_directory, saves_directory)
+
+        except OSError as error:
+            # Existing save is put back, otherwise there would be
+            # no saves directory once staging directory is removed.
+            os.rename(backup_directory, saves_directory)
+            raise RuntimeError(f"Failed to replace saves directory: {error}") from error
+
+        _logger.info("Saves directory replaced with downloaded save files.")
+
+    def __rotate_backups(self, saves_directory: str):
+        """
+        Used to shift existing backups making place for the
+        latest one, the oldest backup is being removed.
+        """
+
+        backups_count = max(prop("backupsCount") or self.DefaultBackupsCount, 1)
+        backup_directories = [self.backup_directory(saves_directory, index) for index in range(backups_count)]
+
+        if os.path.exists(backup_directories[-1]):
+            _logger.info("Removing the oldest backup directory.")
+            shutil.rmtree(backup_directories[-1])
+
+        for index in range(backups_count - 1, 0, -1):
+            if os.path.exists(backup_directories[index - 1]):
+                os.rename(backup_directories[index - 1], backup_directories[index])
+
+    @classmethod
+    def backup_directory(cls, saves_directory: str, index: int = 0):
+        """
+        Used to get path of the backup of saves directory,
+        backups with higher index are older.
+        """
+
+        if index == 0:
+            return saves_directory + cls.BackupSuffix
+
+        return f"{saves_directory}{cls.BackupSuffix}_{index}"
 
     @staticmethod
-    def __backup_directory(saves_directory: str):
+    def __move_files(source_directory: str, target_directory: str):
         """
-        Used to create backup of provided directory
-        will copy directory in the same location and add
-        '_backup' suffix.
+        Used to move files from source directory into target
+        directory, existing files are being replaced.
         """
 
-        # Make backup of existing save, just in case.
-        backup_dir = saves_directory + Downloader.BackupSuffix
-        _logger.debug("backupDirectory = %s", backup_dir)
+        for root, _, file_names in os.walk(source_directory):
+            target_root = os.path.join(target_directory, os.path.relpath(root, source_directory))
+            os.makedirs(target_root, exist_ok=True)
 
-        # Need to remove directory if it exists since shutil wil create it.
-        if os.path.exists(backup_dir):
-            _logger.info("Removing backup directory and its contents.")
-            cleanup_directory(backup_dir)
-            os.removedirs(backup_dir)
+            for file_name in file_names:
+                os.replace(os.path.join(root, file_name), os.path.join(target_root, file_name))
 
-        _logger.info("Copying old save to backup directory.")
-        shutil.copytree(saves_directory, backup_dir)
+        shutil.rmtree(source_directory, ignore_errors=True)
@@ -1,17 +1,28 @@
 import io
 import json
 import logging
+import hashlib
 import os.path
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final, Optional, Callable
 
+import httplib2
 from google.auth.exceptions import RefreshError
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload, MediaFileUpload, MediaIoBaseUpload
+from googleapiclient.http import MediaIoBaseDownload, MediaFileUpload, MediaIoBaseUpload, MediaUpload
 
-from constants import ZIP_MIME_TYPE, JSON_MIME_TYPE, File, UTF_8
+from constants import ZIP_MIME_TYPE, JSON_MIME_TYPE, FOLDER_MIME_TYPE, File, UTF_8, SHA_256
+from savegem.common.core.rate_limiter import rate_limiter
+from savegem.common.service.retry import RetryPolicy, call_with_retry
+from savegem.common.service.storage_backend import StorageBackend, UploadSession, has_property, stream_progress
 from savegem.common.util.file import resolve_app_data, resolve_project_data, file_name_from_path, save_file
 from savegem.common.util.logger import get_logger
 from savegem.common.util.profiler import measure_time
@@ -24,66 +35,470 @@ GDRIVE_SCOPES = [
 ]
 
 
-class GDrive:
+class StreamUpload(MediaUpload):
+    """
+    Resumable media upload of a stream with unknown size.
+
+    Stream is read strictly sequentially, only bytes
+    that were not yet acknowledged by Google Drive are kept
+    in memory, so failed chunk could be re-sent.
+
+    Digest of acknowledged bytes is being calculated, when
+    upload is resumed it's used to verify that stream has
+    produced the same bytes as were uploaded before.
+    """
+
+    def __init__(self, stream, mimetype: str, chunksize: int, offset: int = 0, digest: Optional[str] = None):
+        super().__init__()
+
+        self.__stream = stream
+        self.__mimetype = mimetype
+        self.__chunksize = chunksize
+        self.__expected_offset = offset
+        self.__expected_digest = digest
+
+        self.__buffer = bytearray()
+        self.__buffer_offset = 0
+        self.__is_exhausted = False
+        self.__digest = hashlib.new(SHA_256)
+
+    @property
+    def digest(self):
+        """
+        Used to get digest of acknowledged bytes.
+        """
+        return self.__digest.hexdigest()
+
+    def chunksize(self):
+        # Google API client treats chunk as last one only when it's shorter
+        # than chunk size. When stream ends exactly on chunk boundary
+        # chunk size is extended, so that last chunk is still recognized.
+        return self.__chunksize + 1 if self.__is_exhausted else self.__chunksize
+
+    def mimetype(self):
+        return self.__mimetype
+
+    def size(self):
+        # Size is not known until stream is fully read.
+        return None
+
+    def resumable(self):
+        return True
+
+    def has_stream(self):
+        return False
+
+    def getbytes(self, begin, length):
+        """
+        Used to get bytes of the stream starting from provided offset.
+        Bytes before offset are considered committed and are discarded.
+        """
+
+        self.commit(begin)
+
+        # Read one byte ahead to know whether this chunk is the last one.
+        while not self.__is_exhausted and len(self.__buffer) <= length:
+            data = self.__stream.read(length + 1 - len(self.__buffer))
+
+            if len(data) == 0:
+                self.__is_exhausted = True
+
+            self.__buffer += data
+
+        return bytes(self.__buffer[:length])
+
+    def commit(self, offset: int):
+        """
+        Used to mark bytes before offset as acknowledged.
+        Those bytes are discarded and can't be read again.
+        """
+
+        if offset < self.__buffer_offset:
+            raise ValueError(f"Can't rewind stream to {offset}, it's already at {self.__buffer_offset}.")
+
+        while self.__buffer_offset < offset:
+            if len(self.__buffer) == 0:
+                self.__buffer += self.__stream.read(min(offset - self.__buffer_offset, self.__chunksize))
+
+                if len(self.__buffer) == 0:
+                    raise ValueError(f"Stream has ended before offset {offset}.")
+
+            commit_to = offset
+
+            # Stop at offset of previous session, so digest could be verified.
+            if self.__buffer_offset < self.__expected_offset < offset:
+                commit_to = self.__expected_offset
+
+            size = min(commit_to - self.__buffer_offset, len(self.__buffer))
+            self.__digest.update(self.__buffer[:size])
+
+            del self.__buffer[:size]
+            self.__buffer_offset += size
+
+            if self.__buffer_offset == self.__expected_offset and self.__expected_digest is not None:
+                self.__verify()
+
+    def __verify(self):
+        """
+        Used to check that acknowledged bytes are the
+        same as bytes uploaded in previous session.
+        """
+
+        if self.digest != self.__expected_digest:
+            raise ValueError(f"Stream doesn't match previous session at offset {self.__expected_offset}.")
+
+
+class _SharedCredentials:
+    """
+    Credentials shared between threads.
+
+    Each thread has its own authorized transport, while
+    token is applied and refreshed under lock, so only
+    one thread refreshes expired token at a time.
+    """
+
+    def __init__(self, credentials: Credentials):
+        self.__credentials = credentials
+        self.__lock = threading.Lock()
+
+    def before_request(self, request, method, url, headers):
+        with self.__lock:
+            self.__credentials.before_request(request, method, url, headers)
+
+    def refresh(self, request):
+        with self.__lock:
+            self.__credentials.refresh(request)
+
+    def __getattr__(self, name):
+        return getattr(self.__credentials, name)
+
+
+class GDrive(StorageBackend):
     """
     Class that has most of the Google Drive interaction logic defined.
     """
 
     ChunkSize = 10 * 1024 * 1024
-    __drive = None
+    # Maximum page size allowed by Changes API.
+    ChangesPageSize = 1000
+    # Maximum page size allowed by Files API.
+    ListPageSize = 1000
+    # Maximum amount of calls allowed in single batch request.
+    BatchSize = 100
+    # Socket timeout in seconds, used both for connect and read.
+    Timeout = 60
+    # Read ahead when file is read partially, keeps amount of requests low.
+    ReadBufferSize = 256 * 1024
+    # Property of directory, which points to its latest file.
+    LatestFileProp: Final = "latestSave"
+    LatestOrderBy: Final = "createdTime desc"
+    # Amount of the latest files checked for required property when directory has no pointer.
+    LatestPageSize = 10
+
+    # Policies of retrying failed requests.
+    DefaultRetry = RetryPolicy()
+    CreateRetry = RetryPolicy(is_idempotent=False)
+    ChunkRetry = RetryPolicy(max_attempts=8)
+
+    __local = threading.local()
+    __credentials = None
+    __credentials_lock = threading.Lock()
+
+    @classmethod
+    def is_authenticated(cls):
+        """
+        Used to check whether user has already granted access to Google Drive.
+        """
+        return os.path.exists(resolve_app_data(File.GDriveToken))
 
     @classmethod
     def get_current_user(cls):
         """
         Used to get information about authenticated user.
         """
-        response = cls.__get_drive().about() \
-            .get(fields="user") \
-            .execute()
+        response = cls.__execute(cls.__get_drive().about().get(fields="user"), "about.get")
 
         return response.get("user")
 
     @classmethod
-    def query_single(cls, q: str, fields: str):
+    def query_single(cls, q: str, fields: str, order_by: Optional[str] = None):
         """
         Used to query metadata of single file from Google Drive.
+        Order should be provided when query matches many files.
         """
 
         try:
-            return cls.__get_drive().files().list(
+            return cls.__execute(cls.__get_drive().files().list(
                 q=q,
                 spaces="drive",
                 fields=fields,
+                orderBy=order_by,
                 pageToken=None,
                 pageSize=1
-            ).execute()
+            ), "files.list")
 
         except HttpError as error:
             _logger.error("Error querying file metadata: %s", error, exc_info=True)
             return None
 
+    @classmethod
+    def query_all(cls, q: str, fields: str, order_by: Optional[str] = None):
+        """
+        Used to query metadata of all files matching query.
+        Fields should include 'nextPageToken'.
+        """
+
+        files = []
+        page_token = None
+
+        try:
+            while True:
+                response = cls.__execute(cls.__get_drive().files().list(
+                    q=q,
+                    spaces="drive",
+                    fields=fields,
+                    orderBy=order_by,
+                    pageToken=page_token,
+                    pageSize=cls.ListPageSize
+                ), "files.list")
+
+                files.extend(response.get("files", []))
+                page_token = response.get("nextPageToken")
+
+                if page_token is None:
+                    return files
+
+        except HttpError as error:
+            _logger.error("Error querying files metadata: %s", error, exc_info=True)
+            return None
+
+    @classmethod
+    def query_batch(cls, queries: list[tuple[str, str]], order_by: Optional[str] = None, page_size: int = 1):
+        """
+        Used to query metadata of single file (or single page of files)
+        for each of provided queries (query and fields pairs).
+
+        Queries are sent through batch endpoint, so it takes
+        one round trip per batch instead of one per query.
+        Result is returned in same order as queries, failed
+        queries are returned as None.
+        """
+
+        files = cls.__get_drive().files()
+
+        return cls.__execute_batch([
+            files.list(q=q, spaces="drive", fields=fields, orderBy=order_by, pageToken=None, pageSize=page_size)
+            for q, fields in queries
+        ])
+
+    @classmethod
+    def list_files(cls, directory_id: str, fields: str, mime_types: Optional[tuple[str, ...]] = None):
+        """
+        Used to list metadata of all files in directory starting from the latest one.
+        """
+        return cls.query_all(cls.__directory_query(directory_id, mime_types), f"nextPageToken, files({fields})",
+                             order_by=cls.LatestOrderBy)
+
+    @classmethod
+    def list_latest(cls, directory_ids: list[str], fields: str, mime_types: tuple[str, ...],
+                    required_property: Optional[str] = None):
+        """
+        Used to get metadata of latest file in each directory in batches.
+
+        Latest file is found by pointer stored in properties of directory,
+        so it takes the same time regardless of amount of files. Files of
+        directories without valid pointer are found by query instead, only
+        a page of the latest files is checked for required property then.
+        """
+
+        results: list[Optional[dict]] = [None] * len(directory_ids)
+        directories = cls.get_metadata_batch(directory_ids, "appProperties")
+        latest_ids = [
+            ((directory or {}).get("appProperties") or {}).get(cls.LatestFileProp) for directory in directories
+        ]
+
+        pointed = [(idx, latest_id) for idx, latest_id in enumerate(latest_ids) if latest_id is not None]
+        unresolved = [idx for idx, latest_id in enumerate(latest_ids) if latest_id is None]
+
+        if len(pointed) > 0:
+            files = cls.get_metadata_batch([latest_id for _, latest_id in pointed], f"{fields}, trashed")
+
+            for (idx, latest_id), file in zip(pointed, files):
+                # File could be removed manually, pointer is stale then.
+                if file is None or file.get("trashed"):
+                    _logger.warning("Latest file %s of directory %s is missing.", latest_id, directory_ids[idx])
+                    unresolved.append(idx)
+                    continue
+
+                results[idx] = file
+
+        if len(unresolved) > 0:
+            if required_property is not None and "appProperties" not in fields:
+                fields = f"{fields}, appProperties"
+
+            responses = cls.query_batch(
+                [(cls.__directory_query(directory_ids[idx], mime_types), f"files({fields})") for idx in unresolved],
+                order_by=cls.LatestOrderBy,
+                page_size=1 if required_property is None else cls.LatestPageSize
+            )
+
+            for idx, response in zip(unresolved, responses):
+                if response is not None:
+                    results[idx] = next(
+                        (file for file in response.get("files") or [] if has_property(file, required_property)),
+                        {}
+                    )
+
+        return results
+
+    @classmethod
+    def set_latest(cls, directory_id: str, file_id: str):
+        """
+        Used to point directory to its latest file.
+        """
+        cls.update_properties(directory_id, {cls.LatestFileProp: file_id})
+
+    @classmethod
+    def get_metadata_batch(cls, file_ids: list[str], fields: str):
+        """
+        Used to get metadata of multiple files by their IDs in batches.
+        Result is returned in same order as IDs, metadata of
+        files that failed to be retrieved is returned as None.
+        """
+
+        files = cls.__get_drive().files()
+        return cls.__execute_batch([files.get(fileId=file_id, fields=fields) for file_id in file_ids])
+
+    @classmethod
+    def delete_batch(cls, file_ids: list[str]):
+        """
+        Used to permanently delete multiple files in batches.
+        Returns IDs of files that have been deleted.
+        """
+
+        files = cls.__get_drive().files()
+        responses = cls.__execute_batch([files.delete(fileId=file_id) for file_id in file_ids])
+
+        return [file_id for file_id, response in zip(file_ids, responses) if response is not None]
+
+    @classmethod
+    def get_metadata(cls, file_id: str, fields: str):
+        """
+        Used to get metadata of single file by its ID.
+        Only requested fields are being returned.
+        """
+
+        try:
+            return cls.__execute(cls.__get_drive().files().get(fileId=file_id, fields=fields), "files.get")
+
+        except HttpError as error:
+            _logger.error("Error getting file metadata: %s", error, exc_info=True)
+            return None
+
     @classmethod
     @measure_time(when=logging.DEBUG)
-    def download_file(cls, file_id, subscriber=None):
+    def download_file(cls, file_id, subscriber=None, sink=None):
         """
         Used to in the first place to download archives.
+
+        When sink (any writable file-like object) is provided
+        chunks are written directly into it as they arrive,
+        so memory usage is bounded by chunk size.
+        Otherwise file is collected in memory.
         """
 
         done = False
-        file = io.BytesIO()
+        file = sink if sink is not None else io.BytesIO()
         request = cls.__get_drive().files().get_media(fileId=file_id)
         downloader = MediaIoBaseDownload(file, request, chunksize=cls.ChunkSize)
 
         try:
             while not done:
-                _, done = cls.__next_chunk(downloader, subscriber)
+                _, done = cls.__next_chunk(downloader, "files.get_media", subscriber)
 
         except HttpError as error:
             _logger.error("Failed to download file from drive: %s", error, exc_info=True)
             return None
-        
+
         return file
 
+    @classmethod
+    @measure_time(when=logging.DEBUG)
+    def download_file_parallel(cls, file_id: str, sink, size: Optional[int], concurrency: int, subscriber=None):
+        """
+        Used to download large file into provided sink.
+
+        File is split into ranges of chunk size which are being
+        downloaded concurrently, each with its own connection.
+        Ranges are written into sink strictly in order, so it
+        could be consumed as a stream, at most one range per
+        connection is kept in memory. Small files (or files
+        of unknown size) are downloaded sequentially.
+
+        Returns sink once file is downloaded.
+        """
+
+        if size is None or size <= cls.ChunkSize or concurrency <= 1:
+            return cls.download_file(file_id, subscriber, sink)
+
+        ranges = [(start, min(start + cls.ChunkSize, size) - 1) for start in range(0, size, cls.ChunkSize)]
+        pending = deque()
+        downloaded_bytes = 0
+
+        def write_next_range():
+            nonlocal downloaded_bytes
+
+            data = pending.popleft().result()
+            sink.write(data)
+            downloaded_bytes += len(data)
+
+            if subscriber is not None:
+                subscriber(downloaded_bytes / size)
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            try:
+                for start, end in ranges:
+                    pending.append(executor.submit(cls.download_range, file_id, start, end))
+
+                    if len(pending) == concurrency:
+                        write_next_range()
+
+                while pending:
+                    write_next_range()
+
+            except (HttpError, ValueError) as error:
+                _logger.error("Failed to download file from drive: %s", error, exc_info=True)
+                return None
+
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        return sink
+
+    @classmethod
+    def download_range(cls, file_id: str, start: int, end: int):
+        """
+        Used to download range of file bytes, both ends are inclusive.
+        """
+
+        request = cls.__get_drive().files().get_media(fileId=file_id)
+        request.headers["range"] = f"bytes={start}-{end}"
+        data = cls.__execute(request, "files.get_media")
+
+        if len(data) != end - start + 1:
+            raise ValueError(f"Expected {end - start + 1} bytes of range {start}-{end}, got {len(data)}.")
+
+        return data
+
+    @classmethod
+    def open_file(cls, file_id: str, size: int):
+        """
+        Used to open file in Google Drive as seekable binary stream.
+        Only parts of file that are being read are downloaded.
+        """
+        return io.BufferedReader(DriveFileReader(file_id, size), buffer_size=cls.ReadBufferSize)
+
     @classmethod
     @measure_time(when=logging.DEBUG)
     def upload_file(cls, file_path: str, parent_directory_id: str, mime_type=ZIP_MIME_TYPE,
@@ -113,12 +528,149 @@ class GDrive:
             )
 
             while not done:
-                _, done = cls.__next_chunk(request, subscriber)
+                _, done = cls.__next_chunk(request, "files.create", subscriber)
 
         except HttpError as error:
             _logger.error("Error uploading file to drive: %s", error, exc_info=True)
             raise error
 
+    @classmethod
+    @measure_time(when=logging.DEBUG)
+    def upload_stream(cls, stream, file_name: str, parent_directory_id: str, mime_type=ZIP_MIME_TYPE,
+                      properties: dict = None, subscriber=None, session: Optional[dict] = None,
+                      on_session_update: Optional[Callable[[dict], None]] = None):
+        """
+        Used to upload contents of stream to Google Drive into provided directory.
+        Stream should have 'read' method and could optionally
+        provide 'progress' property, which is used to report progress.
+
+        Upload could be continued from previously saved session,
+        stream is expected to produce the same bytes as before.
+        Session is provided to callback once each chunk is uploaded.
+
+        Returns ID of created file.
+        """
+
+        response = None
+        session = session or {}
+        media = StreamUpload(
+            stream,
+            mime_type,
+            cls.ChunkSize,
+            session.get(UploadSession.Offset, 0),
+            session.get(UploadSession.Digest)
+        )
+        metadata = {
+            "name": file_name,
+            "parents": [parent_directory_id],
+            "appProperties": properties
+        }
+
+        try:
+            request = cls.__get_drive().files().create(
+                body=metadata,
+                media_body=media,
+                fields="id"
+            )
+
+            if session.get(UploadSession.Uri) is not None:
+                # Client queries status of the session
+                # before next chunk when it's in error state.
+                request.resumable_uri = session.get(UploadSession.Uri)
+                request._in_error_state = True  # noqa
+
+            while response is None:
+                # Progress reported by Google Drive is unavailable
+                # since size of stream is not known upfront.
+                _, response = cls.__next_chunk(request, "files.create")
+
+                if response is None:
+                    media.commit(request.resumable_progress)
+
+                    if on_session_update is not None:
+                        on_session_update({
+                            UploadSession.Uri: request.resumable_uri,
+                            UploadSession.Offset: request.resumable_progress,
+                            UploadSession.Digest: media.digest
+                        })
+
+                if subscriber is not None:
+                    subscriber(1 if response is not None else stream_progress(stream))
+
+            return response.get("id")
+
+        except HttpError as error:
+            _logger.error("Error uploading stream to drive: %s", error, exc_info=True)
+            raise error
+
+    @classmethod
+    def create_file(cls, file_name: str, data: str | bytes, parent_directory_id: str, mime_type=JSON_MIME_TYPE,
+                    properties: dict = None):
+        """
+        Used to create small file in Google Drive from provided data.
+        Returns ID of created file.
+        """
+
+        data = data.encode(UTF_8) if isinstance(data, str) else data
+        media = MediaIoBaseUpload(io.BytesIO(data), mime_type)
+        metadata = {
+            "name": file_name,
+            "parents": [parent_directory_id],
+            "appProperties": properties
+        }
+
+        try:
+            # File is created again when retried, so it's only retried when request was rejected.
+            return cls.__execute(
+                cls.__get_drive().files().create(body=metadata, media_body=media, fields="id"),
+                "files.create",
+                cls.CreateRetry
+            ).get("id")
+
+        except HttpError as error:
+            _logger.error("Error creating file in drive: %s", error, exc_info=True)
+            raise error
+
+    @classmethod
+    def create_folder(cls, folder_name: str, parent_directory_id: str):
+        """
+        Used to create folder in Google Drive.
+        Returns ID of created folder.
+        """
+
+        metadata = {
+            "name": folder_name,
+            "parents": [parent_directory_id],
+            "mimeType": FOLDER_MIME_TYPE
+        }
+
+        try:
+            return cls.__execute(
+                cls.__get_drive().files().create(body=metadata, fields="id"),
+                "files.create",
+                cls.CreateRetry
+            ).get("id")
+
+        except HttpError as error:
+            _logger.error("Error creating folder in drive: %s", error, exc_info=True)
+            raise error
+
+    @classmethod
+    def update_properties(cls, file_id: str, properties: dict):
+        """
+        Used to update app properties of existing file in Google Drive.
+        """
+
+        try:
+            cls.__execute(
+                cls.__get_drive().files().update(fileId=file_id, body={"appProperties": properties}),
+                "files.update"
+            )
+
+        except HttpError as error:
+            _logger.error("Error updating file properties in drive: %s", error, exc_info=True)
+            raise error
+
     @classmethod
     def update_file(cls, file_id: str, data: str, mime_type=JSON_MIME_TYPE, subscriber=None):
         """
@@ -136,7 +688,7 @@ class GDrive:
             )
 
             while not done:
-                _, done = cls.__next_chunk(request, subscriber)
+                _, done = cls.__next_chunk(request, "files.update", subscriber)
 
         except HttpError as error:
             _logger.error("Error updating file in drive: %s", error, exc_info=True)
@@ -148,27 +700,149 @@ class GDrive:
         Used to get changes from specified.
         Start page token used to specify starting point
         of changes that needs to be retrieved.
+
+        All pages of change feed are being read, so returned
+        new start page token always points to the end of feed.
         """
 
         if start_page_token is None:
-            start_page_token = cls.__get_drive().changes() \
-                .getStartPageToken() \
-                .execute() \
-                .get("startPageToken")
+            start_page_token = cls.get_start_page_token()
+
+        changes = []
+        page_token = start_page_token
 
-        return cls.__get_drive().changes().list(
-            pageToken=start_page_token,
-            fields="changes(file(id, name, parents), removed), newStartPageToken"
-        ).execute()
+        while page_token is not None:
+            response = cls.__execute(cls.__get_drive().changes().list(
+                pageToken=page_token,
+                pageSize=cls.ChangesPageSize,
+                spaces="drive",
+                fields="nextPageToken, newStartPageToken, changes(removed, file(id, parents))"
+            ), "changes.list")
+
+            changes.extend(response.get("changes", []))
+            page_token = response.get("nextPageToken")
+
+        return {
+            "changes": changes,
+            "newStartPageToken": response.get("newStartPageToken")
+        }
+
+    @classmethod
+    def get_start_page_token(cls):
+        """
+        Used to get token that points to the
+        current end of Google Drive change feed.
+        """
+
+        return cls.__execute(
+            cls.__get_drive().changes().getStartPageToken(),
+            "changes.getStartPageToken"
+        ).get("startPageToken")
+
+    @classmethod
+    def __execute(cls, request, endpoint: str, policy: Optional[RetryPolicy] = None):
+        """
+        Used to execute request, which is retried according to policy.
+        """
+        return call_with_retry(cls.__throttled(request.execute), endpoint, policy or cls.DefaultRetry)
+
+    @classmethod
+    def __execute_batch(cls, requests: list):
+        """
+        Used to execute requests through batch endpoint, so it takes
+        one round trip per batch instead of one per request.
+        Requests failed due to temporary errors (e.g. rate limit)
+        are sent again in next batch.
+
+        Result is returned in same order as requests,
+        failed requests are returned as None.
+        """
+
+        results = [None] * len(requests)
+        pending = list(range(len(requests)))
+
+        for attempt in range(cls.DefaultRetry.max_attempts):
+            errors = {}
+
+            def on_response(request_id: str, response, error):
+                if error is not None:
+                    errors[int(request_id)] = error
+                    return
+
+                # Requests without response body (e.g. delete) succeed with empty response.
+                results[int(request_id)] = response if response is not None else {}
+
+            for batch_start in range(0, len(pending), cls.BatchSize):
+                batch = cls.__get_drive().new_batch_http_request(callback=on_response)
+
+                for idx in pending[batch_start:batch_start + cls.BatchSize]:
+                    batch.add(requests[idx], request_id=str(idx))
+
+                # Each request of batch is counted against quota separately.
+                cost = len(pending[batch_start:batch_start + cls.BatchSize])
+
+                try:
+                    call_with_retry(cls.__throttled(batch.execute, cost), "batch", cls.DefaultRetry)
+
+                except HttpError as error:
+                    _logger.error("Error executing batch request: %s", error, exc_info=True)
+
+            is_last_attempt = attempt + 1 == cls.DefaultRetry.max_attempts
+            pending = [
+                idx for idx, error in errors.items()
+                if not is_last_attempt and cls.DefaultRetry.should_retry(error)
+            ]
+
+            for idx, error in errors.items():
+                if idx not in pending:
+                    _logger.error("Error executing batched request: %s", error)
+
+            if len(pending) == 0:
+                break
+
+            delay = max(cls.DefaultRetry.delay(attempt, errors[idx]) for idx in pending)
+            _logger.warning("%d batched request(s) failed, retrying in %.1f second(s).", len(pending), delay)
+            time.sleep(delay)
+
+        return results
 
     @staticmethod
-    def __next_chunk(request, subscriber=None):
+    def __directory_query(directory_id: str, mime_types: Optional[tuple[str, ...]]):
+        """
+        Used to build query of files in directory, optionally filtered by their types.
+        """
+
+        query = f"'{directory_id}' in parents and trashed=false"
+
+        if not mime_types:
+            return query
+
+        return "(" + " or ".join(f"mimeType='{mime_type}'" for mime_type in mime_types) + f") and {query}"
+
+    @staticmethod
+    def __throttled(function: Callable, cost: int = 1):
+        """
+        Used to wrap request, so each attempt waits for
+        its share of API quota before it's sent.
+        """
+
+        def throttled():
+            rate_limiter().acquire(cost)
+            return function()
+
+        return throttled
+
+    @classmethod
+    def __next_chunk(cls, request, endpoint: str, subscriber=None):
         """
         Wrapper method which formats progress into percentage number from 0 to 100.
         Accepts subscriber callback which could be used to respond to download/upload progress.
+
+        Failed chunk is retried, it's safe for resumable uploads, since
+        client queries offset acknowledged by server before next chunk.
         """
 
-        status, done = request.next_chunk()
+        status, done = call_with_retry(cls.__throttled(request.next_chunk), endpoint, cls.ChunkRetry)
 
         if subscriber is not None:
 
@@ -187,12 +861,31 @@ class GDrive:
     def __get_drive(cls):
         """
         Used to get raw Google Drive service.
+
+        Service is not thread safe, so each thread gets its own
+        instance with separate keep-alive connection.
+        """
+
+        drive = getattr(cls.__local, "drive", None)
+
+        if drive is None:
+            http = AuthorizedHttp(cls.__get_shared_credentials(), http=httplib2.Http(timeout=cls.Timeout))
+            drive = build("drive", "v3", http=http)
+            cls.__local.drive = drive
+
+        return drive
+
+    @classmethod
+    def __get_shared_credentials(cls):
+        """
+        Used to get credentials shared by all threads.
         """
 
-        if cls.__drive is None:
-            cls.__drive = build("drive", "v3", credentials=cls.__get_credentials())
+        with cls.__credentials_lock:
+            if cls.__credentials is None:
+                cls.__credentials = _SharedCredentials(cls.__get_credentials())
 
-        return cls.__drive
+            return cls.__credentials
 
     @staticmethod
     def __get_credentials():
@@ -238,3 +931,51 @@ class GDrive:
             raise RuntimeError(f"Google Cloud credentials are missing in root of the project. Add {File.GDriveCreds}.")
 
         return creds
+
+
+class DriveFileReader(io.RawIOBase):
+    """
+    Seekable binary stream of file in Google Drive.
+    Each read downloads requested range of the file.
+    """
+
+    def __init__(self, file_id: str, size: int):
+        super().__init__()
+
+        self.__file_id = file_id
+        self.__size = size
+        self.__position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.__position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+
+        elif whence == io.SEEK_END:
+            offset += self.__size
+
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}.")
+
+        self.__position = offset
+        return self.__position
+
+    def readinto(self, buffer):
+        length = min(len(buffer), self.__size - self.__position)
+
+        if length <= 0:
+            return 0
+
+        data = GDrive.download_range(self.__file_id, self.__position, self.__position + length - 1)
+        buffer[:length] = data
+        self.__position += length
+
+        return length
@@ -0,0 +1,753 @@
+import hashlib
+import io
+import json
+import os
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Final, Optional, Callable
+
+from constants import ZIP_MIME_TYPE, JSON_MIME_TYPE, FOLDER_MIME_TYPE, UTF_8, SHA_256
+from savegem.common.service.storage_backend import StorageBackend, StorageError, UploadSession, has_property, \
+    stream_progress
+from savegem.common.util.file import read_file, save_file, locked_file
+from savegem.common.util.logger import get_logger
+
+_logger = get_logger(__name__)
+
+
+class LocalStorage(StorageBackend):
+    """
+    Storage in local or shared network directory, used to sync
+    saves between players on the same network or to run
+    whole sync pipeline without network.
+
+    Contents and metadata of each file are stored next to each
+    other under ID of the file, each directory has index of its files,
+    so only metadata of files in listed directory is read.
+
+    Each modification is appended to change log, which is locked while
+    it's accessed, so directory could be shared by processes of multiple
+    players. Changes read by all players are removed from the log.
+    """
+
+    ChunkSize: Final = 1024 * 1024
+    MaxChangesSize: Final = 1024 * 1024
+    ConsumerExpiration: Final = timedelta(days=30)
+
+    __FILES_DIRECTORY: Final = "files"
+    __UPLOADS_DIRECTORY: Final = "uploads"
+    __LATEST_DIRECTORY: Final = "latest"
+    __DIRECTORIES_DIRECTORY: Final = "directories"
+    __CONSUMERS_DIRECTORY: Final = "consumers"
+    __INDEXED_FILE: Final = ".indexed"
+    __CHANGES_FILE: Final = "changes.log"
+    __CHANGES_BASE_FILE: Final = "changes.base"
+    __METADATA_EXTENSION: Final = ".json"
+    __UPLOAD_EXTENSION: Final = ".part"
+
+    def __init__(self, root: str, user_name: str, user_email: Optional[str] = None):
+        self.__root = root
+        self.__user_name = user_name
+        self.__user_email = user_email
+
+    def is_authenticated(self):
+        """
+        Local storage doesn't require authentication.
+        """
+        return True
+
+    def get_current_user(self):
+        """
+        Used to get configured user of local storage.
+        """
+        return {"displayName": self.__user_name, "emailAddress": self.__user_email}
+
+    def get_metadata(self, file_id: str, fields: str):
+        """
+        Used to get metadata of single file by its ID.
+        """
+
+        try:
+            return self.__read_metadata(file_id)
+
+        except (OSError, RuntimeError, ValueError) as error:
+            _logger.error("Error getting file metadata: %s", error)
+            return None
+
+    def get_metadata_batch(self, file_ids: list[str], fields: str):
+        """
+        Used to get metadata of multiple files by their IDs.
+        """
+        return [self.get_metadata(file_id, fields) for file_id in file_ids]
+
+    def list_files(self, directory_id: str, fields: str, mime_types: Optional[tuple[str, ...]] = None):
+        """
+        Used to list metadata of all files in directory starting from the latest one.
+        """
+
+        try:
+            files = self.__list_metadata(directory_id)
+
+        except OSError as error:
+            _logger.error("Error listing files: %s", error)
+            return None
+
+        return sorted(
+            (file for file in files if self.__is_in_directory(file, directory_id, mime_types)),
+            key=lambda file: file.get("createdTime"),
+            reverse=True
+        )
+
+    def list_latest(self, directory_ids: list[str], fields: str, mime_types: tuple[str, ...],
+                    required_property: Optional[str] = None):
+        """
+        Used to get metadata of latest file in each directory.
+
+        Latest file is found by pointer stored for each directory, so only
+        its metadata is read. Files of directories without valid pointer
+        are found by listing files of directory instead.
+        """
+
+        results: list[Optional[dict]] = [None] * len(directory_ids)
+        unresolved = []
+
+        for idx, directory_id in enumerate(directory_ids):
+            file = self.__read_latest(directory_id, mime_types, required_property)
+
+            if file is None:
+                unresolved.append(idx)
+                continue
+
+            results[idx] = file
+
+        for idx in unresolved:
+            try:
+                files = self.__list_metadata(directory_ids[idx])
+
+            except OSError as error:
+                _logger.error("Error listing files: %s", error)
+                continue
+
+            results[idx] = max(
+                (
+                    file for file in files
+                    if self.__is_in_directory(file, directory_ids[idx], mime_types)
+                    and has_property(file, required_property)
+                ),
+                key=lambda file: file.get("createdTime"),
+                default={}
+            )
+
+        return results
+
+    def set_latest(self, directory_id: str, file_id: str):
+        """
+        Used to point directory to its latest file.
+        """
+
+        try:
+            pointer_path = self.__latest_path(directory_id)
+
+            os.makedirs(os.path.dirname(pointer_path), exist_ok=True)
+            save_file(pointer_path, file_id, atomic=True)
+
+        except OSError as error:
+            raise StorageError(f"Failed to point directory {directory_id} to file {file_id}: {error}") from error
+
+    def download_file(self, file_id: str, subscriber=None, sink=None):
+        """
+        Used to copy contents of file into sink or into memory.
+        """
+
+        file = sink if sink is not None else io.BytesIO()
+
+        try:
+            content_path = self.__content_path(file_id)
+            size = os.path.getsize(content_path)
+            copied = 0
+
+            with open(content_path, "rb") as source:
+                while data := source.read(self.ChunkSize):
+                    file.write(data)
+                    copied += len(data)
+
+                    if subscriber is not None:
+                        subscriber(copied / size)
+
+        except OSError as error:
+            _logger.error("Failed to download file from storage: %s", error, exc_info=True)
+            return None
+
+        if subscriber is not None and size == 0:
+            subscriber(1)
+
+        return file
+
+    def download_file_parallel(self, file_id: str, sink, size: Optional[int], concurrency: int, subscriber=None):
+        """
+        Local file is read sequentially, since disk doesn't benefit from concurrent reads.
+        """
+        return self.download_file(file_id, subscriber, sink)
+
+    def open_file(self, file_id: str, size: int):
+        """
+        Used to open file as seekable binary stream.
+        """
+
+        try:
+            return open(self.__content_path(file_id), "rb")
+
+        except OSError as error:
+            raise StorageError(f"Failed to open file {file_id}: {error}") from error
+
+    def upload_stream(self, stream, file_name: str, parent_directory_id: str, mime_type=ZIP_MIME_TYPE,
+                      properties: dict = None, subscriber=None, session: Optional[dict] = None,
+                      on_session_update: Optional[Callable[[dict], None]] = None):
+        """
+        Used to copy contents of stream into directory.
+
+        Stream is written into partial file, which is only published once
+        stream has ended. Upload could be continued from session, bytes
+        of the stream before session offset are verified and skipped.
+        """
+
+        session = session or {}
+        session_id = session.get(UploadSession.Uri) or uuid.uuid4().hex
+        part_path = os.path.join(self.__root, self.__UPLOADS_DIRECTORY, session_id + self.__UPLOAD_EXTENSION)
+        offset = session.get(UploadSession.Offset, 0)
+        digest = hashlib.new(SHA_256)
+
+        if session.get(UploadSession.Uri) is not None:
+            if os.path.basename(session_id) != session_id or not os.path.exists(part_path):
+                raise ValueError(f"Upload session {session_id} has expired.")
+
+            self.__skip_uploaded(stream, offset, session.get(UploadSession.Digest), digest)
+
+        try:
+            os.makedirs(os.path.dirname(part_path), exist_ok=True)
+
+            with open(part_path, "r+b" if offset > 0 else "wb") as part:
+                part.truncate(offset)
+                part.seek(offset)
+
+                while data := stream.read(self.ChunkSize):
+                    part.write(data)
+                    part.flush()
+
+                    offset += len(data)
+                    digest.update(data)
+
+                    if on_session_update is not None:
+                        on_session_update({
+                            UploadSession.Uri: session_id,
+                            UploadSession.Offset: offset,
+                            UploadSession.Digest: digest.hexdigest()
+                        })
+
+                    if subscriber is not None:
+                        subscriber(stream_progress(stream))
+
+            metadata = self.__new_metadata(file_name, parent_directory_id, mime_type, properties)
+            self.__publish(metadata, part_path)
+
+        except OSError as error:
+            _logger.error("Error uploading stream to storage: %s", error, exc_info=True)
+            raise StorageError(f"Failed to upload {file_name}: {error}") from error
+
+        if subscriber is not None:
+            subscriber(1)
+
+        return metadata.get("id")
+
+    def create_file(self, file_name: str, data: str | bytes, parent_directory_id: str, mime_type=JSON_MIME_TYPE,
+                    properties: dict = None):
+        """
+        Used to create small file from provided data.
+        """
+
+        metadata = self.__new_metadata(file_name, parent_directory_id, mime_type, properties)
+        self.__write(metadata, data)
+
+        return metadata.get("id")
+
+    def create_folder(self, folder_name: str, parent_directory_id: str):
+        """
+        Used to create folder, folder only has metadata.
+        """
+
+        metadata = self.__new_metadata(folder_name, parent_directory_id, FOLDER_MIME_TYPE, None)
+
+        try:
+            self.__publish(metadata, None)
+
+        except OSError as error:
+            raise StorageError(f"Failed to create folder {folder_name}: {error}") from error
+
+        return metadata.get("id")
+
+    def update_file(self, file_id: str, data: str, mime_type=JSON_MIME_TYPE, subscriber=None):
+        """
+        Used to replace contents of existing file.
+        """
+
+        metadata = self.__modified_metadata(file_id)
+        metadata["mimeType"] = mime_type
+        self.__write(metadata, data)
+
+        if subscriber is not None:
+            subscriber(1)
+
+    def update_properties(self, file_id: str, properties: dict):
+        """
+        Used to update app properties of existing file,
+        same as in Google Drive properties set to None are removed.
+        """
+
+        metadata = self.__modified_metadata(file_id)
+        app_properties = {**metadata.get("appProperties", {}), **properties}
+        metadata["appProperties"] = {key: value for key, value in app_properties.items() if value is not None}
+
+        try:
+            self.__publish(metadata, None)
+
+        except OSError as error:
+            raise StorageError(f"Failed to update properties of file {file_id}: {error}") from error
+
+    def delete_batch(self, file_ids: list[str]):
+        """
+        Used to remove files along with their metadata.
+        File is removed from index first, so it's never listed without metadata.
+        """
+
+        deleted_ids = []
+
+        for file_id in file_ids:
+            try:
+                index_paths = [
+                    os.path.join(self.__index_path(parent_id), file_id)
+                    for parent_id in self.__read_parents(file_id)
+                ]
+
+                for path in (*index_paths, self.__content_path(file_id), self.__metadata_path(file_id)):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+                self.__record_change({"removed": True, "fileId": file_id})
+                deleted_ids.append(file_id)
+
+            except OSError as error:
+                _logger.error("Error removing file %s: %s", file_id, error)
+
+        return deleted_ids
+
+    def get_changes(self, start_page_token: Optional[str]):
+        """
+        Used to read change log starting from token, which is offset
+        in the log since it was created. Invalid token or token of
+        removed changes is reset to the end of log.
+
+        Offset read by player is recorded, so changes read by all players are removed.
+        """
+
+        try:
+            os.makedirs(self.__root, exist_ok=True)
+
+            with locked_file(os.path.join(self.__root, self.__CHANGES_FILE)) as log:
+                base = self.__read_changes_base()
+                end = base + log.seek(0, io.SEEK_END)
+                offset = int(start_page_token) if start_page_token is not None else end
+
+                if not base <= offset <= end:
+                    raise ValueError(f"Offset {offset} is out of change log.")
+
+                log.seek(offset - base)
+                data = log.read(end - offset)
+
+                self.__record_consumer(end)
+                self.__compact_changes(log, base, end)
+
+        except ValueError as error:
+            _logger.warning("Start page token is no longer valid, resetting it: %s", error)
+            return {"changes": [], "newStartPageToken": self.get_start_page_token()}
+
+        except OSError as error:
+            raise StorageError(f"Failed to read change log: {error}") from error
+
+        return {
+            "changes": [json.loads(line) for line in data.decode(UTF_8).splitlines() if line],
+            "newStartPageToken": str(end)
+        }
+
+    def get_start_page_token(self):
+        """
+        Used to get offset of the end of change log.
+        """
+
+        try:
+            os.makedirs(self.__root, exist_ok=True)
+
+            with locked_file(os.path.join(self.__root, self.__CHANGES_FILE)) as log:
+                end = self.__read_changes_base() + log.seek(0, io.SEEK_END)
+                self.__record_consumer(end)
+
+                return str(end)
+
+        except OSError as error:
+            raise StorageError(f"Failed to read change log: {error}") from error
+
+    def __write(self, metadata: dict, data: str | bytes):
+        """
+        Used to write contents of the file and publish it.
+        """
+
+        data = data.encode(UTF_8) if isinstance(data, str) else data
+        temp_path = f"{self.__content_path(metadata.get('id'))}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(temp_path), exist_ok=True)
+            save_file(temp_path, data, binary=True)
+            self.__publish(metadata, temp_path)
+
+        except OSError as error:
+            raise StorageError(f"Failed to write file {metadata.get('name')}: {error}") from error
+
+    def __publish(self, metadata: dict, content_path: Optional[str]):
+        """
+        Used to move contents of file into place, store its metadata and
+        add it to index of its directories. Metadata is stored after contents
+        and file is indexed last, so file is never listed without contents.
+        """
+
+        file_id = metadata.get("id")
+        os.makedirs(os.path.join(self.__root, self.__FILES_DIRECTORY), exist_ok=True)
+
+        if content_path is not None:
+            os.replace(content_path, self.__content_path(file_id))
+            metadata["size"] = str(os.path.getsize(self.__content_path(file_id)))
+            metadata["md5Checksum"] = self.__md5(self.__content_path(file_id))
+
+        save_file(self.__metadata_path(file_id), metadata, as_json=True, atomic=True)
+
+        for parent_id in metadata.get("parents") or []:
+            self.__index_file(parent_id, file_id)
+
+        self.__record_change({"removed": False, "file": {"id": file_id, "parents": metadata.get("parents")}})
+
+    def __record_change(self, change: dict):
+        """
+        Used to append change to change log.
+        """
+
+        with locked_file(os.path.join(self.__root, self.__CHANGES_FILE)) as log:
+            log.seek(0, io.SEEK_END)
+            log.write((json.dumps(change, separators=(",", ":")) + "\n").encode(UTF_8))
+
+    def __read_changes_base(self):
+        """
+        Used to read offset of the first change in change log, changes
+        before it were removed. Should be called while change log is locked.
+        """
+
+        base_path = os.path.join(self.__root, self.__CHANGES_BASE_FILE)
+        return int(read_file(base_path)) if os.path.exists(base_path) else 0
+
+    def __record_consumer(self, offset: int):
+        """
+        Used to record offset of change log, which was read by the user.
+        """
+
+        user_id = hashlib.new(SHA_256, self.__user_name.encode(UTF_8)).hexdigest()
+        consumer_path = os.path.join(self.__root, self.__CONSUMERS_DIRECTORY, user_id)
+
+        os.makedirs(os.path.dirname(consumer_path), exist_ok=True)
+        save_file(consumer_path, str(offset), atomic=True)
+
+    def __compact_changes(self, log, base: int, end: int):
+        """
+        Used to remove changes, which were read by all users, once change log
+        exceeds its size. Users that haven't read changes for a long time
+        are not waited for, their token is reset once they read changes.
+        Should be called while change log is locked.
+        """
+
+        if end - base <= self.MaxChangesSize:
+            return
+
+        expiration_time = (datetime.now(timezone.utc) - self.ConsumerExpiration).timestamp()
+
+        try:
+            offset = min(
+                int(read_file(entry.path))
+                for entry in os.scandir(os.path.join(self.__root, self.__CONSUMERS_DIRECTORY))
+                if not entry.name.endswith(".tmp") and entry.stat().st_mtime >= expiration_time
+            )
+
+        except (OSError, RuntimeError, ValueError) as error:
+            _logger.warning("Failed to read offsets of change log read by users: %s", error)
+            return
+
+        if offset <= base:
+            return
+
+        log.seek(offset - base)
+        data = log.read()
+
+        log.seek(0)
+        log.write(data)
+        log.truncate(len(data))
+        log.flush()
+
+        save_file(os.path.join(self.__root, self.__CHANGES_BASE_FILE), str(offset), atomic=True)
+        _logger.info("Removed %d byte(s) of changes read by all users.", offset - base)
+
+    def __new_metadata(self, file_name: str, parent_directory_id: str, mime_type: str, properties: Optional[dict]):
+        """
+        Used to create metadata of new file.
+        """
+
+        now = self.__now()
+
+        return {
+            "id": uuid.uuid4().hex,
+            "name": file_name,
+            "mimeType": mime_type,
+            "parents": [parent_directory_id],
+            "createdTime": now,
+            "modifiedTime": now,
+            "version": "1",
+            "appProperties": {key: value for key, value in (properties or {}).items() if value is not None}
+        }
+
+    def __modified_metadata(self, file_id: str):
+        """
+        Used to get metadata of existing file with next version.
+        """
+
+        try:
+            metadata = self.__read_metadata(file_id)
+
+        except (OSError, RuntimeError, ValueError) as error:
+            raise StorageError(f"File {file_id} is not accessible: {error}") from error
+
+        metadata["modifiedTime"] = self.__now()
+        metadata["version"] = str(int(metadata.get("version", 0)) + 1)
+
+        return metadata
+
+    def __read_metadata(self, file_id: str) -> dict:
+        """
+        Used to read metadata of the file.
+        """
+        return read_file(self.__metadata_path(file_id), as_json=True)
+
+    def __read_parents(self, file_id: str) -> list[str]:
+        """
+        Used to read IDs of directories of the file,
+        file without metadata has no directories.
+        """
+
+        try:
+            return self.__read_metadata(file_id).get("parents") or []
+
+        except (RuntimeError, ValueError):
+            return []
+
+    def __list_metadata(self, directory_id: str):
+        """
+        Used to read metadata of files in directory, files which are removed
+        while being listed or have corrupted metadata are skipped.
+        """
+
+        self.__build_index()
+
+        try:
+            index_directory = self.__index_path(directory_id)
+
+        except FileNotFoundError:
+            return []
+
+        if not os.path.exists(index_directory):
+            return []
+
+        files = []
+
+        for entry in os.scandir(index_directory):
+            metadata_path = self.__metadata_path(entry.name)
+
+            # File could be removed after it was listed.
+            if not os.path.exists(metadata_path):
+                continue
+
+            try:
+                files.append(read_file(metadata_path, as_json=True))
+
+            except (OSError, RuntimeError, ValueError) as error:
+                _logger.warning("Skipping metadata %s: %s", entry.name, error)
+
+        return files
+
+    def __build_index(self):
+        """
+        Used to index files of storage, which was created before files
+        were indexed by directory. Storage is indexed only once.
+        """
+
+        indexed_path = os.path.join(self.__root, self.__DIRECTORIES_DIRECTORY, self.__INDEXED_FILE)
+        files_directory = os.path.join(self.__root, self.__FILES_DIRECTORY)
+
+        if os.path.exists(indexed_path):
+            return
+
+        if os.path.exists(files_directory):
+            _logger.info("Indexing files of storage by directory.")
+
+            for entry in os.scandir(files_directory):
+                if not entry.name.endswith(self.__METADATA_EXTENSION):
+                    continue
+
+                try:
+                    parent_ids = read_file(entry.path, as_json=True).get("parents") or []
+
+                except (OSError, RuntimeError, ValueError) as error:
+                    _logger.warning("Skipping metadata %s: %s", entry.name, error)
+                    continue
+
+                for parent_id in parent_ids:
+                    try:
+                        self.__index_file(parent_id, entry.name.removesuffix(self.__METADATA_EXTENSION))
+
+                    except FileNotFoundError:
+                        _logger.warning("Skipping invalid directory %s of %s.", parent_id, entry.name)
+
+        os.makedirs(os.path.dirname(indexed_path), exist_ok=True)
+        save_file(indexed_path, "")
+
+    def __index_file(self, directory_id: str, file_id: str):
+        """
+        Used to add file to index of directory.
+        """
+
+        index_path = os.path.join(self.__index_path(directory_id), file_id)
+
+        if not os.path.exists(index_path):
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            save_file(index_path, "")
+
+    def __read_latest(self, directory_id: str, mime_types: tuple[str, ...], required_property: Optional[str]):
+        """
+        Used to read metadata of file pointed as the latest one in directory.
+        None is returned when directory has no pointer or pointer is stale.
+        """
+
+        try:
+            pointer_path = self.__latest_path(directory_id)
+
+            if not os.path.exists(pointer_path):
+                return None
+
+            latest_id = read_file(pointer_path)
+
+        except (OSError, RuntimeError) as error:
+            _logger.warning("Failed to read latest file of directory %s: %s", directory_id, error)
+            return None
+
+        try:
+            file = self.__read_metadata(latest_id)
+
+        except (OSError, RuntimeError, ValueError):
+            file = None
+
+        # File could be removed manually, pointer is stale then.
+        if file is None or not self.__is_in_directory(file, directory_id, mime_types) \
+                or not has_property(file, required_property):
+            _logger.warning("Latest file %s of directory %s is missing.", latest_id, directory_id)
+            return None
+
+        return file
+
+    def __latest_path(self, directory_id: str):
+        """
+        Used to get path of the pointer to the latest file of directory.
+        ID is checked, so path never points outside of storage.
+        """
+
+        if not directory_id or os.path.basename(directory_id) != directory_id or directory_id.startswith("."):
+            raise FileNotFoundError(f"Directory {directory_id} doesn't exist.")
+
+        return os.path.join(self.__root, self.__LATEST_DIRECTORY, directory_id)
+
+    def __index_path(self, directory_id: str):
+        """
+        Used to get path of index of files in directory.
+        ID is checked, so path never points outside of storage.
+        """
+
+        if not directory_id or os.path.basename(directory_id) != directory_id or directory_id.startswith("."):
+            raise FileNotFoundError(f"Directory {directory_id} doesn't exist.")
+
+        return os.path.join(self.__root, self.__DIRECTORIES_DIRECTORY, directory_id)
+
+    def __content_path(self, file_id: str):
+        """
+        Used to get path of the contents of the file.
+        ID is checked, so path never points outside of storage.
+        """
+
+        if not file_id or os.path.basename(file_id) != file_id or file_id.startswith("."):
+            raise FileNotFoundError(f"File {file_id} doesn't exist.")
+
+        return os.path.join(self.__root, self.__FILES_DIRECTORY, file_id)
+
+    def __metadata_path(self, file_id: str):
+        """
+        Used to get path of the metadata of the file.
+        """
+        return self.__content_path(file_id) + self.__METADATA_EXTENSION
+
+    @staticmethod
+    def __is_in_directory(file: dict, directory_id: str, mime_types: Optional[tuple[str, ...]]):
+        """
+        Used to check whether file is in directory and is of one of provided types.
+        """
+        return directory_id in (file.get("parents") or []) and (not mime_types or file.get("mimeType") in mime_types)
+
+    def __skip_uploaded(self, stream, offset: int, expected_digest: Optional[str], digest):
+        """
+        Used to read bytes of the stream which were uploaded in previous
+        session and verify that stream has produced the same bytes.
+        """
+
+        remaining = offset
+
+        while remaining > 0:
+            data = stream.read(min(remaining, self.ChunkSize))
+
+            if len(data) == 0:
+                raise ValueError(f"Stream has ended before offset {offset}.")
+
+            digest.update(data)
+            remaining -= len(data)
+
+        if digest.hexdigest() != expected_digest:
+            raise ValueError(f"Stream doesn't match previous session at offset {offset}.")
+
+    @staticmethod
+    def __md5(file_path: str):
+        """
+        Used to calculate MD5 checksum of the file, same as Google Drive provides.
+        """
+
+        checksum = hashlib.md5()
+
+        with open(file_path, "rb") as file:
+            while data := file.read(LocalStorage.ChunkSize):
+                checksum.update(data)
+
+        return checksum.hexdigest()
+
+    @staticmethod
+    def __now():
+        """
+        Used to get current time in format of Google Drive.
+        """
+        return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
@@ -0,0 +1,139 @@
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, TypeVar, Final
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from savegem.common.util.logger import get_logger
+from savegem.common.util.metrics import metrics
+
+_logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Reasons of 403 responses which are sent when request rate is too high.
+RATE_LIMIT_REASONS: Final = ("userRateLimitExceeded", "rateLimitExceeded")
+# Responses of server which is temporarily unable to process request.
+SERVER_ERROR_CODES: Final = (500, 502, 503, 504)
+# Errors of connection which could succeed once sent again.
+TRANSIENT_ERRORS: Final = (TimeoutError, ConnectionError, httplib2.HttpLib2Error)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Represents how failed request to Google Drive is retried.
+
+    Delay before each retry grows exponentially and is randomized
+    (full jitter), so clients which failed together don't retry together.
+    Requests which aren't idempotent are only retried when server
+    has surely rejected them, i.e. when rate limit is exceeded.
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 1
+    max_delay: float = 32
+    is_idempotent: bool = True
+
+    def should_retry(self, error: Exception):
+        """
+        Used to check whether request should be sent again after error.
+        """
+
+        if is_rate_limited(error):
+            return True
+
+        if not self.is_idempotent:
+            return False
+
+        if isinstance(error, HttpError):
+            return error.status_code in SERVER_ERROR_CODES
+
+        return isinstance(error, TRANSIENT_ERRORS)
+
+    def delay(self, attempt: int, error: Exception):
+        """
+        Used to get delay in seconds before retry, attempt starts from 0.
+        Server could ask to wait longer with 'Retry-After' header.
+        """
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(delay, retry_after(error) or 0)
+
+
+def call_with_retry(function: Callable[[], T], endpoint: str, policy: RetryPolicy) -> T:
+    """
+    Used to call function retrying it according to policy.
+    Amount of retries and latency of the call are recorded in metrics.
+    Error of the last attempt is raised when all attempts failed.
+    """
+
+    start = time.monotonic()
+    attempt = 0
+
+    while True:
+        try:
+            result = function()
+
+        except Exception as error:
+            if attempt + 1 >= policy.max_attempts or not policy.should_retry(error):
+                metrics().record(endpoint, time.monotonic() - start, attempt, failed=True)
+                raise
+
+            delay = policy.delay(attempt, error)
+            _logger.warning("Request %s failed (%s), retrying in %.1f second(s).", endpoint, error, delay)
+
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        metrics().record(endpoint, time.monotonic() - start, attempt, failed=False)
+        return result
+
+
+def is_rate_limited(error: Exception):
+    """
+    Used to check whether request was rejected due to rate limit.
+    """
+
+    if not isinstance(error, HttpError):
+        return False
+
+    if error.status_code == 429:
+        return True
+
+    details = error.error_details if isinstance(error.error_details, list) else []
+    return error.status_code == 403 and any(
+        isinstance(detail, dict) and detail.get("reason") in RATE_LIMIT_REASONS for detail in details
+    )
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Used to get delay requested by 'Retry-After' header of the response,
+    which contains either amount of seconds or date.
+    """
+
+    if not isinstance(error, HttpError):
+        return None
+
+    value = error.resp.get("retry-after")
+
+    if not isinstance(value, str):
+        return None
+
+    try:
+        return max(float(value), 0)
+
+    except ValueError:
+        pass
+
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0)
+
+    except (TypeError, ValueError):
+        return None
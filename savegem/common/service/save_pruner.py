@@ -0,0 +1,155 @@
+import json
+from datetime import datetime, timezone, timedelta
+from typing import Iterable, Final, Optional
+
+from constants import CHUNKS_MIME_TYPE, UTF_8
+from savegem.common.core.context import app
+from savegem.common.core.game_config import Game
+from savegem.common.core.save_meta import DriveMetadata, SaveMetaProp
+from savegem.common.service.chunk_store import ChunkStore
+from savegem.common.service.storage import storage
+from savegem.common.util.logger import get_logger
+
+_logger = get_logger(__name__)
+
+
+class SavePruner:
+    """
+    Used to remove saves of games which exceed retention policy from Google Drive.
+    """
+
+    Fields: Final = "id, mimeType, createdTime, appProperties"
+    UnpublishedGracePeriod: Final = timedelta(days=1)
+
+    @classmethod
+    def prune(cls, games: Iterable[Game]):
+        """
+        Used to remove expired saves of provided games along with their
+        manifests and chunks, which are no longer referenced by any save.
+        Saves of all games are removed in batches, returns amount of removed files.
+        """
+
+        now = datetime.now(timezone.utc)
+        games = [game for game in games if game.retention.is_enabled]
+        file_ids = []
+
+        if len(games) == 0:
+            return 0
+
+        latest_files = storage().list_latest(
+            [game.drive_directory for game in games], "id", DriveMetadata.MimeTypes, SaveMetaProp.Checksum
+        )
+
+        for game, latest_file in zip(games, latest_files):
+            if latest_file is None:
+                _logger.warning("Failed to find latest save of %s, saves won't be pruned.", game.name)
+                continue
+
+            saves = storage().list_files(game.drive_directory, cls.Fields, DriveMetadata.MimeTypes)
+
+            if saves is None:
+                _logger.warning("Failed to list saves of %s, saves won't be pruned.", game.name)
+                continue
+
+            expired_ids = cls.__expired_files(game, saves, latest_file.get("id"), now)
+            file_ids.extend(expired_ids)
+
+            if any(save.get("mimeType") == CHUNKS_MIME_TYPE for save in saves):
+                file_ids.extend(cls.__unreferenced_chunks(game, saves, expired_ids, now))
+
+        if len(file_ids) == 0:
+            return 0
+
+        deleted_ids = storage().delete_batch(file_ids)
+        _logger.info("Removed %d of %d expired save file(s).", len(deleted_ids), len(file_ids))
+
+        return len(deleted_ids)
+
+    @classmethod
+    def __expired_files(cls, game: Game, saves: list[dict], latest_id: Optional[str], now: datetime):
+        """
+        Used to get IDs of saves of the game, which exceed retention
+        policy, and of their manifests. Latest save is never expired.
+
+        Saves are shared by all players, while only owner of the save
+        could remove it, so saves of other players are only counted.
+        """
+
+        file_ids = []
+        published_count = 0
+
+        for save in saves:
+            properties = save.get("appProperties") or {}
+            created_time = datetime.fromisoformat(save.get("createdTime").replace("Z", "+00:00"))
+
+            # Save is published once its checksum is set, unpublished save is either being
+            # uploaded or its upload has failed, so it's not counted as one of the last saves.
+            if properties.get(SaveMetaProp.Checksum) is None:
+                is_retained = now - created_time <= cls.UnpublishedGracePeriod
+
+            else:
+                is_retained = game.retention.is_retained(published_count, created_time, now)
+                published_count += 1
+
+            # Save pointed as the latest one and save currently known as the latest
+            # one are kept, even if newer save was uploaded in the meantime.
+            if is_retained or save.get("id") in (latest_id, game.meta.drive.id):
+                continue
+
+            if properties.get(SaveMetaProp.Owner) != app().user.name:
+                continue
+
+            file_ids.append(save.get("id"))
+            manifest_id = properties.get(SaveMetaProp.Manifest)
+
+            if manifest_id is not None:
+                file_ids.append(manifest_id)
+
+        _logger.debug("%d of %d save file(s) of %s are expired.", len(file_ids), len(saves), game.name)
+        return file_ids
+
+    @classmethod
+    def __unreferenced_chunks(cls, game: Game, saves: list[dict], expired_ids: list[str], now: datetime):
+        """
+        Used to get IDs of chunks of the game, which aren't referenced
+        by any of the remaining saves stored as chunks.
+
+        Chunks are only removed when all remaining saves are read,
+        otherwise chunks of unread save would be removed.
+        """
+
+        expired_ids = set(expired_ids)
+        referenced_ids = set()
+
+        for save in saves:
+            if save.get("mimeType") != CHUNKS_MIME_TYPE or save.get("id") in expired_ids:
+                continue
+
+            record = storage().download_file(save.get("id"))
+
+            if record is None:
+                _logger.warning("Failed to read save of %s, chunks won't be pruned.", game.name)
+                return []
+
+            try:
+                files = json.loads(record.getvalue().decode(UTF_8)).get(ChunkStore.Files, {})
+
+            except ValueError:
+                _logger.warning("Save of %s is corrupted, chunks won't be pruned.", game.name, exc_info=True)
+                return []
+
+            for entry in files.values():
+                referenced_ids.update(entry[ChunkStore.Chunks])
+
+        try:
+            # Chunks of save, which is being uploaded, are not referenced until save is created.
+            chunk_ids = ChunkStore(game.drive_directory, 1).find_unreferenced(
+                referenced_ids, now - cls.UnpublishedGracePeriod
+            )
+
+        except RuntimeError:
+            _logger.warning("Failed to list chunks of %s, chunks won't be pruned.", game.name, exc_info=True)
+            return []
+
+        _logger.debug("%d chunk(s) of %s are not referenced.", len(chunk_ids), game.name)
+        return chunk_ids
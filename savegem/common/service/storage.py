@@ -0,0 +1,56 @@
+import getpass
+import os
+from typing import Final, Optional
+
+from savegem.common.core.holders import prop
+from savegem.common.service.gdrive import GDrive
+from savegem.common.service.local_storage import LocalStorage
+from savegem.common.service.storage_backend import StorageBackend
+
+_storage: Optional[StorageBackend] = None
+
+
+class Backend:
+    """
+    Contains names of supported storage backends.
+    """
+
+    GDrive: Final = "gdrive"
+    Local: Final = "local"
+
+
+def storage() -> StorageBackend:
+    """
+    Used to get global storage backend instance,
+    backend is chosen in application configuration.
+    """
+
+    global _storage
+
+    if _storage is None:
+        _storage = _create_storage(prop("storage.backend") or Backend.GDrive)
+
+    return _storage
+
+
+def _create_storage(backend: str) -> StorageBackend:
+    """
+    Used to create storage backend by its name.
+    """
+
+    if backend == Backend.GDrive:
+        return GDrive()
+
+    if backend == Backend.Local:
+        root = prop("storage.localPath")
+
+        if not root:
+            raise ValueError("Path of local storage is not configured.")
+
+        return LocalStorage(
+            os.path.expandvars(root),
+            prop("storage.userName") or getpass.getuser(),
+            prop("storage.userEmail") or None
+        )
+
+    raise ValueError(f"Storage backend {backend} is not supported.")
@@ -0,0 +1,180 @@
+import abc
+from typing import Final, Optional, Callable
+
+from constants import ZIP_MIME_TYPE, JSON_MIME_TYPE
+
+# Upload is only complete once file is created, so progress of stream is reported below completion.
+_MAX_STREAM_PROGRESS: Final = 0.99
+
+
+class UploadSession:
+    """
+    Contains properties of resumable upload session.
+    Those are enough to continue upload of the
+    same stream after process was restarted.
+    """
+
+    Uri: Final = "uri"
+    Offset: Final = "offset"
+    Digest: Final = "digest"
+
+
+class StorageError(RuntimeError):
+    """
+    Raised when storage fails to complete operation.
+    """
+
+
+class StorageBackend(abc.ABC):
+    """
+    Storage of game saves and application files, which
+    are shared between players (e.g. Google Drive).
+
+    Files are identified by IDs assigned by storage and are placed
+    into directories, metadata of files is returned in the format
+    of Google Drive API, e.g. 'id', 'createdTime', 'appProperties'.
+    Storage could return more fields than requested, but never less.
+    """
+
+    @abc.abstractmethod
+    def is_authenticated(self) -> bool:
+        """
+        Used to check whether storage could be accessed without user interaction.
+        """
+
+    @abc.abstractmethod
+    def get_current_user(self) -> dict:
+        """
+        Used to get 'displayName' and 'emailAddress' of current user.
+        """
+
+    @abc.abstractmethod
+    def get_metadata(self, file_id: str, fields: str) -> Optional[dict]:
+        """
+        Used to get metadata of single file, None is returned when it's not accessible.
+        """
+
+    @abc.abstractmethod
+    def get_metadata_batch(self, file_ids: list[str], fields: str) -> list[Optional[dict]]:
+        """
+        Used to get metadata of multiple files in same order as IDs,
+        metadata of files that are not accessible is returned as None.
+        """
+
+    @abc.abstractmethod
+    def list_files(self, directory_id: str, fields: str,
+                   mime_types: Optional[tuple[str, ...]] = None) -> Optional[list[dict]]:
+        """
+        Used to list files of directory starting from the latest one,
+        files could be filtered by their types. None is returned when failed.
+        """
+
+    @abc.abstractmethod
+    def list_latest(self, directory_ids: list[str], fields: str, mime_types: tuple[str, ...],
+                    required_property: Optional[str] = None) -> list[Optional[dict]]:
+        """
+        Used to get latest file of provided types in each directory,
+        files without required app property (e.g. files which are
+        still being published) are skipped. Empty metadata is returned
+        for directory without such files and None for directory
+        which failed to be listed.
+        """
+
+    @abc.abstractmethod
+    def set_latest(self, directory_id: str, file_id: str):
+        """
+        Used to mark file as the latest one in directory, files are only
+        marked once they're complete, e.g. once their properties are set.
+        """
+
+    @abc.abstractmethod
+    def download_file(self, file_id: str, subscriber=None, sink=None):
+        """
+        Used to download file into sink (any writable file-like object)
+        or into memory when it's not provided.
+        Returns sink or None when download failed.
+        """
+
+    @abc.abstractmethod
+    def download_file_parallel(self, file_id: str, sink, size: Optional[int], concurrency: int, subscriber=None):
+        """
+        Used to download large file into sink, file is written into
+        sink strictly in order. Returns sink or None when download failed.
+        """
+
+    @abc.abstractmethod
+    def open_file(self, file_id: str, size: int):
+        """
+        Used to open file as seekable binary stream.
+        """
+
+    @abc.abstractmethod
+    def upload_stream(self, stream, file_name: str, parent_directory_id: str, mime_type=ZIP_MIME_TYPE,
+                      properties: dict = None, subscriber=None, session: Optional[dict] = None,
+                      on_session_update: Optional[Callable[[dict], None]] = None) -> str:
+        """
+        Used to upload contents of stream into directory, upload could be
+        continued from session provided to callback, stream is expected
+        to produce the same bytes as before. ValueError is raised when
+        session is no longer valid. Returns ID of created file.
+        """
+
+    @abc.abstractmethod
+    def create_file(self, file_name: str, data: str | bytes, parent_directory_id: str, mime_type=JSON_MIME_TYPE,
+                    properties: dict = None) -> str:
+        """
+        Used to create small file from provided data. Returns ID of created file.
+        """
+
+    @abc.abstractmethod
+    def create_folder(self, folder_name: str, parent_directory_id: str) -> str:
+        """
+        Used to create folder. Returns ID of created folder.
+        """
+
+    @abc.abstractmethod
+    def update_file(self, file_id: str, data: str, mime_type=JSON_MIME_TYPE, subscriber=None):
+        """
+        Used to replace contents of existing file.
+        """
+
+    @abc.abstractmethod
+    def update_properties(self, file_id: str, properties: dict):
+        """
+        Used to update app properties of existing file.
+        """
+
+    @abc.abstractmethod
+    def delete_batch(self, file_ids: list[str]) -> list[str]:
+        """
+        Used to permanently remove multiple files. Returns IDs of removed files.
+        """
+
+    @abc.abstractmethod
+    def get_changes(self, start_page_token: Optional[str]) -> dict:
+        """
+        Used to get 'changes' made since token and 'newStartPageToken',
+        which points to the end of change feed.
+        """
+
+    @abc.abstractmethod
+    def get_start_page_token(self) -> str:
+        """
+        Used to get token that points to the current end of change feed.
+        """
+
+
+def has_property(file: dict, name: Optional[str]):
+    """
+    Used to check whether file has app property,
+    any file matches when property is not provided.
+    """
+    return name is None or (file.get("appProperties") or {}).get(name) is not None
+
+
+def stream_progress(stream):
+    """
+    Used to get progress of stream which is being uploaded,
+    stream could be read completely before upload is complete.
+    """
+    return min(getattr(stream, "progress", 0), _MAX_STREAM_PROGRESS)
@@ -14,6 +14,12 @@ class EventKind:
     DriveMetadataMissing = auto()
     SavesDirectoryMissing = auto()
     ErrorUploadingToDrive = auto()
+    ErrorDownloadingFromDrive = auto()
+
+    """
+    Done Kinds
+    """
+    AlreadyUpToDate = auto()
 
 
 class EventType(Enum):
@@ -92,7 +98,7 @@ class DoneEvent(Event):
         Used to check if service finished
         work without errors.
         """
-        return self._event_kind is None
+        return self._event_kind is None or self._event_kind == EventKind.AlreadyUpToDate
 
 
 class SubscriptableService:
@@ -1,17 +1,23 @@
+import hashlib
+import json
 import os
 from datetime import datetime
-import shutil
+from typing import Optional, Final
 
 from googleapiclient.errors import HttpError
 
 from savegem.common.core.context import app
 
-from constants import ZIP_EXTENSION
+from constants import ZIP_EXTENSION, SHA_256, JSON_EXTENSION, CHUNKS_MIME_TYPE
 from savegem.common.core.game_config import Game
-from savegem.common.core.save_meta import SaveMetaProp
-from savegem.common.service.gdrive import GDrive
+from savegem.common.core.holders import prop
+from savegem.common.core.save_meta import SaveMetaProp, manifest_checksum
+from savegem.common.core.upload_journal import UploadJournal, upload_journal
+from savegem.common.service.chunk_store import ChunkStore
+from savegem.common.service.storage import storage
+from savegem.common.service.storage_backend import UploadSession, StorageError
 from savegem.common.service.subscriptable import SubscriptableService, DoneEvent, ErrorEvent, EventKind
-from savegem.common.util.file import resolve_temp_file
+from savegem.common.util.archive import ZipStream
 from savegem.common.util.logger import get_logger
 
 _logger = get_logger(__name__)
@@ -22,70 +28,235 @@ class Uploader(SubscriptableService):
     Used to upload current save files of selected game to Google Drive.
     """
 
+    ManifestSuffix: Final = ".manifest.json"
+    DefaultConcurrency: Final = 4
+    DefaultArchiveConcurrency: Final = 4
+
     def upload(self, game: Game):
         """
         Used to upload current save files of selected game to Google Drive.
-        Save files are being archived before being uploaded.
+        Save files are being archived while being uploaded, each file
+        is read only once to calculate checksum and compress it.
         """
 
-        # 1 - Create archive target directory to store files for upload
-        # 3 - Copy save files to archive target directory
-        # 2 - Update metadata and copy to archive target directory
-        # 4 - Make archive
-        # 5 - Upload archive
-        self._set_stages(5)
+        # 1 - Collect save files that need to be archived
+        # 2 - Archive and upload save files
+        # 3 - Publish save metadata
+        self._set_stages(3)
 
         saves_root_dir = game.local_path
-        now = datetime.now()
-        current_date = now.strftime("%Y-%m-%d-%H-%M-%S")
-        target_archive_path = resolve_temp_file(f"{game.name}-{current_date}")
 
         if not os.path.exists(saves_root_dir):
             _logger.error("Directory with saves is missing %s", saves_root_dir)
             self._send_event(ErrorEvent(EventKind.SavesDirectoryMissing))
             return
 
-        # Make directory to place all files that needs to be uploaded.
-        os.makedirs(target_archive_path)
-        self._complete_stage()
+        checksum = game.meta.local.calculate_checksum()
+
+        # Checksum is compared with cached metadata, so
+        # nothing is sent to Google Drive when save is the same.
+        if game.meta.drive.is_present and checksum == game.meta.drive.checksum:
+            _logger.info("Save of %s is already up to date (%s), skipping upload.", game.name, checksum)
+            game.meta.local.checksum = checksum
+            self._send_event(DoneEvent(EventKind.AlreadyUpToDate))
+            return
 
-        # Copy game files to archive directory.
-        for file_path in game.file_list:
-            shutil.copy(file_path, target_archive_path)
+        # Metadata is not part of the checksum, it's always archived separately.
+        save_files = [file_path for file_path in game.file_list if file_path != game.metadata_file_path]
         self._complete_stage()
 
-        # Set checksum then copy metadata file to target directory.
-        game.meta.local.checksum = game.meta.local.calculate_checksum()
+        manifest = {}
+        file_id = None
+        manifest_id = None
+
+        is_chunked = prop("chunkedStorage.enabled")
+
+        try:
+            if is_chunked:
+                file_id = self.__upload_chunks(game, save_files, manifest)
+
+            else:
+                file_id = self.__upload_resumable_archive(game, save_files, manifest)
+
+            archive_props = {
+                SaveMetaProp.Checksum: game.meta.local.checksum
+                # No need to upload createdTime it would be populated by
+                # Google Drive API. We only add it to local metadata for
+                # clarity.
+            }
+
+            manifest_id = self.__upload_manifest(game, file_id, manifest)
+
+            if manifest_id is not None:
+                archive_props[SaveMetaProp.Manifest] = manifest_id
+
+            # Checksum is calculated while archive is being streamed, so it could
+            # only be published once upload is done. Save without checksum is
+            # never picked as the latest one.
+            storage().update_properties(file_id, archive_props)
+
+            # Save becomes the latest one only once it's complete.
+            storage().set_latest(game.drive_directory, file_id)
+            self._complete_stage()
+
+        except (HttpError, RuntimeError) as error:
+            _logger.error("Failed to upload save: %s", error)
+            self.__remove_unpublished([file_id, manifest_id])
+            self._send_event(ErrorEvent(EventKind.ErrorUploadingToDrive))
+            return
+
+        self._send_event(DoneEvent(None))
+
+    def __upload_resumable_archive(self, game: Game, save_files: list[str], manifest: dict):
+        """
+        Used to upload archive of save files, upload of the
+        same save files is continued if it was interrupted.
+        """
+
+        fingerprint = UploadJournal.fingerprint(save_files)
+        session = upload_journal().get(game.name, fingerprint)
+
+        try:
+            file_id = self.__upload_archive(game, save_files, fingerprint, session, manifest)
+
+        except (HttpError, ValueError) as error:
+            if session is None or isinstance(error, HttpError) and error.status_code not in (404, 410):
+                raise
+
+            # Session has expired or archive is no longer the same,
+            # so it's uploaded from scratch.
+            _logger.warning("Failed to resume upload, starting new one: %s", error)
+            upload_journal().remove(game.name)
+            file_id = self.__upload_archive(game, save_files, fingerprint, None, manifest)
+
+        upload_journal().remove(game.name)
+        return file_id
+
+    def __upload_chunks(self, game: Game, save_files: list[str], manifest: dict):
+        """
+        Used to upload save files into chunk store of the game.
+        Only chunks missing in the store are uploaded, so
+        interrupted upload is continued naturally.
+        Version of the save is recorded as list of chunks of each file.
+        """
+
+        now = datetime.now()
+        store = ChunkStore(game.drive_directory, prop("chunkedStorage.concurrency") or self.DefaultConcurrency)
+
+        _logger.info("Uploading chunks of save files to cloud.")
+        files = store.upload_files(save_files, subscriber=lambda completion: self._complete_stage(completion))
+
+        for file_name, entry in files.items():
+            manifest[file_name] = [entry[ChunkStore.Size], entry[ChunkStore.Digest]]
+
+        game.meta.local.checksum = manifest_checksum(manifest)
         game.meta.local.owner = app().user.name
         game.meta.local.created_time = now.isoformat()
 
-        shutil.copy(game.metadata_file_path, target_archive_path)
-        self._complete_stage()
+        files.update(store.upload_files([game.metadata_file_path]))
 
-        # Archive save contents to mitigate impact on drive storage.
-        _logger.info("Archiving save files that need to be uploaded.")
-        shutil.make_archive(target_archive_path, ZIP_EXTENSION, target_archive_path)
-        self._complete_stage()
+        return storage().create_file(
+            f"{game.name}-{now.strftime('%Y-%m-%d-%H-%M-%S')}{JSON_EXTENSION}",
+            json.dumps({ChunkStore.Files: files}, separators=(",", ":")),
+            game.drive_directory,
+            CHUNKS_MIME_TYPE,
+            properties={SaveMetaProp.Owner: app().user.name}
+        )
 
-        archive_props = {
-            SaveMetaProp.Owner: app().user.name,
-            SaveMetaProp.Checksum: game.meta.local.checksum
-            # No need to upload createdTime it would be populated by
-            # Google Drive API. We only add it to local metadata for
-            # clarity.
-        }
+    @staticmethod
+    def __remove_unpublished(file_ids: list[Optional[str]]):
+        """
+        Used to remove save and its manifest, which failed to be published.
+        """
+
+        file_ids = [file_id for file_id in file_ids if file_id is not None]
+
+        if len(file_ids) > 0 and len(storage().delete_batch(file_ids)) < len(file_ids):
+            _logger.warning("Failed to remove unpublished save, it would be removed by pruning.")
+
+    @staticmethod
+    def __upload_manifest(game: Game, file_id: str, manifest: dict):
+        """
+        Used to upload manifest of the save next to its archive.
+        Manifest is optional, so save is still published when it fails.
+        """
 
         try:
-            _logger.info("Uploading archive to cloud.")
-            GDrive.upload_file(
-                f"{target_archive_path}.{ZIP_EXTENSION}",
-                game.drive_directory,
-                properties=archive_props,
-                subscriber=lambda completion: self._complete_stage(completion)
+            return storage().create_file(
+                f"{file_id}{Uploader.ManifestSuffix}",
+                json.dumps(manifest, separators=(",", ":")),
+                game.drive_directory
             )
 
-        except HttpError:
-            self._send_event(ErrorEvent(EventKind.ErrorUploadingToDrive))
-            return
+        except (HttpError, StorageError):
+            _logger.warning("Failed to upload manifest of the save, save will be published without it.")
+            return None
 
-        self._send_event(DoneEvent(None))
+    def __upload_archive(self, game: Game, save_files: list[str], fingerprint: str, session: Optional[dict],
+                         manifest: dict):
+        """
+        Used to archive save files and stream archive to Google Drive.
+        When session of interrupted upload is provided upload is continued,
+        progress of upload is recorded in journal after each chunk.
+        Size and digest of each save file are collected into manifest.
+        """
+
+        if session is not None:
+            _logger.info("Resuming interrupted upload from byte %d.", session.get(UploadSession.Offset))
+            archive_name = session.get(UploadJournal.FileName)
+            created_time = session.get(UploadJournal.CreatedTime)
+
+        else:
+            now = datetime.now()
+            archive_name = f"{game.name}-{now.strftime('%Y-%m-%d-%H-%M-%S')}.{ZIP_EXTENSION}"
+            created_time = now.isoformat()
+
+        checksum = hashlib.new(SHA_256)
+
+        def on_file_archived(file_path: str, digest: str):
+            checksum.update(digest.encode())
+            manifest[os.path.basename(file_path)] = [os.path.getsize(file_path), digest]
+
+            # Progress is reported per member, since many small members
+            # fit into single uploaded chunk. Stage is completed by upload.
+            if stream.progress < 1:
+                self._complete_stage(stream.progress)
+
+        def on_session_update(upload_session: dict):
+            upload_journal().save(game.name, {
+                **upload_session,
+                UploadJournal.Fingerprint: fingerprint,
+                UploadJournal.FileName: archive_name,
+                UploadJournal.CreatedTime: created_time
+            })
+
+        # Archive is reproducible, so members are sorted
+        # and metadata, which differs on each upload, is not archived.
+        stream = ZipStream(
+            sorted(save_files, key=os.path.basename),
+            total_size=sum(os.path.getsize(file_path) for file_path in save_files),
+            on_file_archived=on_file_archived,
+            compression=game.compression,
+            concurrency=prop("archiveConcurrency") or self.DefaultArchiveConcurrency
+        )
+
+        _logger.info("Archiving save files and uploading archive to cloud.")
+        file_id = storage().upload_stream(
+            stream,
+            archive_name,
+            game.drive_directory,
+            # Properties known upfront are set on creation. Downloader
+            # checks that it's able to extract archive.
+            properties={SaveMetaProp.Owner: app().user.name, SaveMetaProp.Compression: str(game.compression)},
+            subscriber=lambda completion: self._complete_stage(completion),
+            session=session,
+            on_session_update=on_session_update
+        )
+
+        # Owner and time of the save are kept in Google Drive,
+        # local metadata is only updated once save is uploaded.
+        game.meta.local.checksum = checksum.hexdigest()
+        game.meta.local.owner = app().user.name
+        game.meta.local.created_time = created_time
+
+        return file_id
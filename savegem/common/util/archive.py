@@ -0,0 +1,936 @@
+import hashlib
+import lzma
+import os.path
+import stat
+import struct
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass
+from typing import Iterable, Callable, Optional, Final
+
+from constants import SHA_256
+
+try:
+    from compression import zstd
+except ImportError:
+    # Zstandard is only available since Python 3.14.
+    zstd = None
+
+# Method ID from zip specification, zipfile only defines it since Python 3.14.
+_ZIP_ZSTANDARD: Final = getattr(zipfile, "ZIP_ZSTANDARD", 93)
+
+_DATA_DESCRIPTOR_FLAG: Final = 0x08
+_LZMA_EOS_FLAG: Final = 0x02
+_UTF_8_FLAG: Final = 0x800
+_DATA_DESCRIPTOR_SIGNATURE: Final = b"PK\x07\x08"
+_ZIP64_EXTRA_ID: Final = 0x0001
+_ZIP64_MARKER: Final = 0xFFFFFFFF
+
+
+class Codec:
+    """
+    Represents collection of compression codecs of archive members.
+    """
+
+    Store: Final = "store"
+    Deflate: Final = "deflate"
+    Lzma: Final = "lzma"
+    Zstd: Final = "zstd"
+
+
+@dataclass(frozen=True)
+class Compression:
+    """
+    Represents compression codec and level of archive members.
+    Written as codec name optionally followed by level, e.g. 'deflate:9'.
+    """
+
+    codec: str = Codec.Deflate
+    level: Optional[int] = None
+
+    __LEVELS = {Codec.Deflate: range(0, 10), Codec.Zstd: range(-7, 23)}
+
+    @classmethod
+    def parse(cls, value: Optional[str]):
+        """
+        Used to parse compression from its string representation,
+        default compression is used when value is empty.
+        """
+
+        if not value:
+            return cls()
+
+        codec, _, level = value.strip().lower().partition(":")
+
+        if codec not in (Codec.Store, Codec.Deflate, Codec.Lzma, Codec.Zstd):
+            raise ValueError(f"Unknown compression codec '{codec}'.")
+
+        if not level:
+            return cls(codec)
+
+        if codec not in cls.__LEVELS or int(level) not in cls.__LEVELS[codec]:
+            raise ValueError(f"Compression level {level} is not supported by {codec}.")
+
+        return cls(codec, int(level))
+
+    @property
+    def is_supported(self):
+        """
+        Used to check whether archives could be
+        compressed and extracted with this codec.
+        """
+        return self.codec != Codec.Zstd or zstd is not None and hasattr(zipfile, "ZIP_ZSTANDARD")
+
+    @property
+    def compress_type(self):
+        """
+        Used to get zip compression method of the codec.
+        """
+
+        return {
+            # Stored members require size and CRC before data, which is not
+            # possible for streamed archive, so deflate stored blocks are used.
+            Codec.Store: zipfile.ZIP_DEFLATED,
+            Codec.Deflate: zipfile.ZIP_DEFLATED,
+            Codec.Lzma: zipfile.ZIP_LZMA,
+            Codec.Zstd: _ZIP_ZSTANDARD
+        }[self.codec]
+
+    @property
+    def compress_level(self):
+        """
+        Used to get compression level, None stands for default level of codec.
+        """
+        return 0 if self.codec == Codec.Store else self.level
+
+    def compressor(self):
+        """
+        Used to create compressor of member data.
+        """
+
+        if self.compress_type == zipfile.ZIP_LZMA:
+            return _LzmaCompressor()
+
+        if self.compress_type == _ZIP_ZSTANDARD:
+            return zstd.ZstdCompressor(self.level)
+
+        level = self.compress_level if self.compress_level is not None else zlib.Z_DEFAULT_COMPRESSION
+        return zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    def __str__(self):
+        return self.codec if self.level is None else f"{self.codec}:{self.level}"
+
+
+class _ArchiveBuffer:
+    """
+    Write-only, non-seekable file object
+    used as output of zip archive, so archive
+    could be produced strictly sequentially.
+    """
+
+    def __init__(self):
+        self.__data = bytearray()
+
+    def write(self, data):
+        self.__data += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self, size: int):
+        """
+        Used to remove and return at most
+        provided amount of bytes from the buffer.
+        """
+
+        data = bytes(self.__data[:size])
+        del self.__data[:size]
+
+        return data
+
+    def __len__(self):
+        return len(self.__data)
+
+
+class ZipStream:
+    """
+    Zip archive which is being built lazily while it's being read.
+
+    Files are compressed in parallel by worker threads, compressed
+    members are written into archive in the same order files were
+    provided. Every file is read exactly once, its digest is calculated
+    in the same pass it's being compressed, and only compressed
+    bytes that were not consumed yet are kept in memory.
+
+    Archive is reproducible, timestamps and permissions of members
+    are normalized, so the same files in the same order with the same
+    compression always produce the same archive bytes.
+
+    Files larger than InlineSize are not compressed ahead, they
+    are compressed while archive is being read, so memory usage
+    doesn't depend on size of save files.
+    """
+
+    BlockSize = 1024 * 1024
+    InlineSize = 8 * 1024 * 1024
+
+    # Earliest time zip format could represent.
+    MemberTime: Final = (1980, 1, 1, 0, 0, 0)
+    MemberMode: Final = stat.S_IFREG | 0o644
+
+    __UNIX_SYSTEM = 3
+
+    def __init__(self, file_paths: Iterable[str], total_size: int = 0,
+                 on_file_archived: Optional[Callable[[str, str], None]] = None,
+                 compression: Compression = Compression(), concurrency: int = 1):
+        """
+        File paths could be any iterable, it's consumed lazily, at
+        most one file per worker ahead of archived files.
+
+        When total size of files is provided it's used to calculate progress.
+        Callback is executed with file path and its digest once file is archived,
+        callbacks are executed in order of files.
+        """
+
+        if not compression.is_supported:
+            raise ValueError(f"Compression {compression} is not supported.")
+
+        self.__file_paths = file_paths
+        self.__total_size = total_size
+        self.__on_file_archived = on_file_archived
+        self.__compression = compression
+        self.__concurrency = max(concurrency, 1)
+
+        self.__buffer = _ArchiveBuffer()
+        self.__container = _ZipContainer(self.__buffer)
+        self.__bytes_read = 0
+        self.__finished = False
+        self.__writer = self.__write_archive()
+
+    @property
+    def progress(self):
+        """
+        Used to get fraction of source bytes
+        that were already archived (0 to 1).
+        """
+
+        if self.__finished:
+            return 1
+
+        if self.__total_size == 0:
+            return 0
+
+        return min(self.__bytes_read / self.__total_size, 1)
+
+    def read(self, size: int = -1):
+        """
+        Used to read next portion of archive.
+        Returns fewer bytes than requested only
+        when archive has been fully read.
+        """
+
+        while (size < 0 or len(self.__buffer) < size) and not self.__finished:
+            next(self.__writer, None)
+
+        return self.__buffer.take(len(self.__buffer) if size < 0 else size)
+
+    def __write_archive(self):
+        """
+        Generator that writes single block of
+        archive on each iteration.
+        """
+
+        executor = ThreadPoolExecutor(self.__concurrency)
+
+        try:
+            yield from self.__write_members(executor, self.__file_paths)
+
+        finally:
+            # Abandoned stream is closed by garbage collector, which could run in
+            # any thread, even in worker being started, so workers are never awaited.
+            # Archive is only complete once all members are written, so no work is lost.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Central directory is written once all members are written.
+        self.__container.close()
+        self.__finished = True
+
+    def __write_members(self, executor: ThreadPoolExecutor, file_paths: Iterable[str]):
+        """
+        Used to compress files ahead in workers and
+        write compressed members in order of files.
+        """
+
+        pending = deque()
+
+        try:
+            for file_path in file_paths:
+                member = self.__member(file_path)
+                future = None
+
+                if member.file_size <= self.InlineSize:
+                    future = executor.submit(self.__compress, file_path, member)
+
+                pending.append((file_path, member, future))
+
+                if len(pending) == self.__concurrency:
+                    yield from self.__write_member(*pending.popleft())
+
+            while pending:
+                yield from self.__write_member(*pending.popleft())
+
+        finally:
+            for _, _, future in pending:
+                if future is not None:
+                    future.cancel()
+
+    def __member(self, file_path: str):
+        """
+        Used to create archive member of the file. Member only
+        depends on name of the file, its size and compression.
+        """
+
+        member = zipfile.ZipInfo(os.path.basename(file_path), self.MemberTime)
+        member.create_system = self.__UNIX_SYSTEM
+        member.external_attr = self.MemberMode << 16
+        member.file_size = os.path.getsize(file_path)
+        member.compress_type = self.__compression.compress_type
+
+        if member.compress_type == zipfile.ZIP_LZMA:
+            # LZMA stream is terminated by end marker.
+            member.flag_bits |= _LZMA_EOS_FLAG
+
+        return member
+
+    def __write_member(self, file_path: str, member: zipfile.ZipInfo, future: Optional[Future]):
+        """
+        Used to write member into archive, member is compressed
+        inline when it wasn't compressed ahead by worker.
+        """
+
+        if future is not None:
+            data, digest = future.result()
+            self.__container.write_header(member)
+
+            for offset in range(0, len(data), self.BlockSize):
+                self.__container.write(data[offset:offset + self.BlockSize])
+
+            self.__bytes_read += member.file_size
+
+        else:
+            digest = yield from self.__write_inline_member(file_path, member)
+
+        if self.__on_file_archived is not None:
+            self.__on_file_archived(file_path, digest)
+
+        yield
+
+    def __write_inline_member(self, file_path: str, member: zipfile.ZipInfo):
+        """
+        Used to compress member while it's being written, sizes
+        and CRC are written after data in data descriptor.
+        """
+
+        compressor = self.__compression.compressor()
+        file_hash = hashlib.new(SHA_256)
+        crc = 0
+        file_size = 0
+        compress_size = 0
+
+        member.flag_bits |= _DATA_DESCRIPTOR_FLAG
+        zip64 = member.file_size * 1.05 > zipfile.ZIP64_LIMIT
+        self.__container.write_header(member, zip64)
+
+        with open(file_path, "rb") as source:
+            for block in iter(lambda: source.read(self.BlockSize), b""):
+                file_hash.update(block)
+                crc = zlib.crc32(block, crc)
+                file_size += len(block)
+
+                data = compressor.compress(block)
+                compress_size += len(data)
+                self.__container.write(data)
+
+                self.__bytes_read += len(block)
+                yield
+
+        data = compressor.flush()
+        compress_size += len(data)
+        self.__container.write(data)
+
+        member.CRC, member.file_size, member.compress_size = crc, file_size, compress_size
+        self.__container.write_data_descriptor(member, zip64)
+
+        return file_hash.hexdigest()
+
+    def __compress(self, file_path: str, member: zipfile.ZipInfo):
+        """
+        Used to compress whole file in worker.
+        Returns compressed data and digest of the file.
+        """
+
+        compressor = self.__compression.compressor()
+        file_hash = hashlib.new(SHA_256)
+        crc = 0
+        file_size = 0
+        blocks = []
+
+        with open(file_path, "rb") as source:
+            for block in iter(lambda: source.read(self.BlockSize), b""):
+                file_hash.update(block)
+                crc = zlib.crc32(block, crc)
+                file_size += len(block)
+                blocks.append(compressor.compress(block))
+
+        blocks.append(compressor.flush())
+        data = b"".join(blocks)
+
+        # File could change since it was listed, so actual size is used.
+        member.CRC, member.file_size, member.compress_size = crc, file_size, len(data)
+
+        return data, file_hash.hexdigest()
+
+
+class _ZipContainer:
+    """
+    Writes zip container around members compressed beforehand,
+    so members could be compressed independently of each other.
+    """
+
+    def __init__(self, output):
+        self.__output = output
+        self.__offset = 0
+        self.__members: list[zipfile.ZipInfo] = []
+
+    def write_header(self, member: zipfile.ZipInfo, zip64: Optional[bool] = None):
+        """
+        Used to start new member by writing its local file header.
+        """
+
+        member.header_offset = self.__offset
+        self.__members.append(member)
+        self.write(member.FileHeader(zip64))
+
+    def write(self, data: bytes):
+        self.__output.write(data)
+        self.__offset += len(data)
+
+    def write_data_descriptor(self, member: zipfile.ZipInfo, zip64: bool):
+        """
+        Used to write sizes and CRC after data of the member.
+        """
+
+        size_format = "<LQQ" if zip64 else "<LLL"
+        self.write(_DATA_DESCRIPTOR_SIGNATURE + struct.pack(size_format, member.CRC, member.compress_size,
+                                                            member.file_size))
+
+    def close(self):
+        """
+        Used to write central directory and end of archive record.
+        """
+
+        directory_offset = self.__offset
+
+        for member in self.__members:
+            self.__write_directory_record(member)
+
+        directory_size = self.__offset - directory_offset
+        member_count = len(self.__members)
+
+        if (member_count > zipfile.ZIP_FILECOUNT_LIMIT or directory_offset > zipfile.ZIP64_LIMIT
+                or directory_size > zipfile.ZIP64_LIMIT):
+            end_offset = self.__offset
+
+            self.write(struct.pack(
+                zipfile.structEndArchive64, zipfile.stringEndArchive64, 44, zipfile.ZIP64_VERSION,
+                zipfile.ZIP64_VERSION, 0, 0, member_count, member_count, directory_size, directory_offset
+            ))
+            self.write(struct.pack(zipfile.structEndArchive64Locator, zipfile.stringEndArchive64Locator, 0,
+                                   end_offset, 1))
+
+            member_count = min(member_count, zipfile.ZIP_FILECOUNT_LIMIT)
+            directory_size = min(directory_size, _ZIP64_MARKER)
+            directory_offset = min(directory_offset, _ZIP64_MARKER)
+
+        self.write(struct.pack(zipfile.structEndArchive, zipfile.stringEndArchive, 0, 0, member_count,
+                               member_count, directory_size, directory_offset, 0))
+
+    def __write_directory_record(self, member: zipfile.ZipInfo):
+        """
+        Used to write central directory record of the member.
+        """
+
+        file_size, compress_size, header_offset = member.file_size, member.compress_size, member.header_offset
+        zip64_values = []
+
+        if file_size > zipfile.ZIP64_LIMIT or compress_size > zipfile.ZIP64_LIMIT:
+            zip64_values += [file_size, compress_size]
+            file_size = compress_size = _ZIP64_MARKER
+
+        if header_offset > zipfile.ZIP64_LIMIT:
+            zip64_values.append(header_offset)
+            header_offset = _ZIP64_MARKER
+
+        extra = b""
+        extract_version = member.extract_version
+
+        if zip64_values:
+            extra = struct.pack(f"<HH{len(zip64_values)}Q", _ZIP64_EXTRA_ID, 8 * len(zip64_values), *zip64_values)
+            extract_version = max(extract_version, zipfile.ZIP64_VERSION)
+
+        try:
+            name, flag_bits = member.filename.encode("ascii"), member.flag_bits
+
+        except UnicodeEncodeError:
+            name, flag_bits = member.filename.encode("utf-8"), member.flag_bits | _UTF_8_FLAG
+
+        year, month, day, hour, minute, second = member.date_time
+
+        self.write(struct.pack(
+            zipfile.structCentralDir, zipfile.stringCentralDir, max(member.create_version, extract_version),
+            member.create_system, extract_version, member.reserved, flag_bits, member.compress_type,
+            hour << 11 | minute << 5 | second // 2, (year - 1980) << 9 | month << 5 | day,
+            member.CRC, compress_size, file_size, len(name), len(extra), 0, 0,
+            member.internal_attr, member.external_attr, header_offset
+        ))
+        self.write(name + extra)
+
+
+class ZipExtractor:
+    """
+    Writable sink which extracts zip archive into directory
+    while archive is being written into it.
+
+    Archive is parsed sequentially using local file headers,
+    so it's never stored anywhere. Digest of each member is
+    calculated while member is being written.
+    """
+
+    BlockSize = 1024 * 1024
+
+    def __init__(self, target_directory: str, on_file_extracted: Optional[Callable[[str, str], None]] = None):
+        """
+        Callback is executed with path of extracted
+        file and its digest once file is extracted.
+        """
+
+        self.__target_directory = target_directory
+        self.__on_file_extracted = on_file_extracted
+
+        self.__buffer = bytearray()
+        self.__member = None
+        self.__finished = False
+
+    @property
+    def finished(self):
+        """
+        Used to check whether whole archive has been extracted.
+        """
+        return self.__finished
+
+    def write(self, data):
+        self.__buffer += data
+
+        while not self.__finished and self.__process():
+            pass
+
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """
+        Used to make sure that archive was complete.
+        """
+
+        self.__release()
+
+        if not self.__finished:
+            raise zipfile.BadZipFile("Archive has ended unexpectedly.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        File of member which is being extracted is closed even
+        when archive was not complete, so it could be removed.
+        """
+        self.__release()
+
+    def __release(self):
+        """
+        Used to close file of member which is being extracted.
+        """
+
+        if self.__member is not None:
+            self.__member.close()
+
+    def __process(self):
+        """
+        Used to process buffered data.
+        Returns whether there was enough data to make progress.
+        """
+
+        if self.__member is None:
+            return self.__read_header()
+
+        if self.__member.is_written:
+            return self.__read_data_descriptor()
+
+        return self.__read_data()
+
+    def __read_header(self):
+        """
+        Used to read header of the next archive record.
+        """
+
+        if len(self.__buffer) < 4:
+            return False
+
+        signature = bytes(self.__buffer[:4])
+
+        # Central directory follows last member, it
+        # only duplicates information of local headers.
+        if signature in (zipfile.stringCentralDir, zipfile.stringEndArchive, zipfile.stringEndArchive64):
+            self.__finished = True
+            self.__buffer.clear()
+            return False
+
+        if signature != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"Unexpected record signature {signature!r}.")
+
+        if len(self.__buffer) < zipfile.sizeFileHeader:
+            return False
+
+        header = struct.unpack(zipfile.structFileHeader, self.__buffer[:zipfile.sizeFileHeader])
+        _, _, _, flag_bits, compress_type, _, _, crc, compress_size, file_size, name_length, extra_length = header
+        header_size = zipfile.sizeFileHeader + name_length + extra_length
+
+        if len(self.__buffer) < header_size:
+            return False
+
+        name = bytes(self.__buffer[zipfile.sizeFileHeader:zipfile.sizeFileHeader + name_length])
+        name = name.decode("utf-8" if flag_bits & _UTF_8_FLAG else "cp437")
+        extra = bytes(self.__buffer[zipfile.sizeFileHeader + name_length:header_size])
+        del self.__buffer[:header_size]
+
+        has_data_descriptor = bool(flag_bits & _DATA_DESCRIPTOR_FLAG)
+        zip64_sizes = self.__read_zip64_sizes(extra, file_size, compress_size)
+
+        if zip64_sizes is not None:
+            file_size, compress_size = zip64_sizes
+
+        self.__member = _ExtractedMember(
+            self.__resolve_path(name),
+            compress_type,
+            None if has_data_descriptor else compress_size,
+            None if has_data_descriptor else file_size,
+            None if has_data_descriptor else crc,
+            zip64_sizes is not None
+        )
+
+        # Empty members have no data at all.
+        if self.__member.is_written and self.__member.crc is not None:
+            self.__complete_member()
+
+        return True
+
+    def __read_data(self):
+        """
+        Used to read compressed data of current member.
+        """
+
+        if len(self.__buffer) == 0:
+            return False
+
+        consumed = self.__member.write(self.__buffer, self.BlockSize)
+        del self.__buffer[:consumed]
+
+        if self.__member.is_written and self.__member.crc is not None:
+            self.__complete_member()
+
+        return True
+
+    def __read_data_descriptor(self):
+        """
+        Used to read sizes and CRC of current member
+        which are written after member data.
+        """
+
+        size_format = "<LQQ" if self.__member.is_zip64 else "<LLL"
+        size = struct.calcsize(size_format)
+        has_signature = self.__buffer[:4] == _DATA_DESCRIPTOR_SIGNATURE
+
+        if len(self.__buffer) < size + (4 if has_signature else 0):
+            return False
+
+        if has_signature:
+            del self.__buffer[:4]
+
+        self.__member.crc, self.__member.compress_size, self.__member.file_size = \
+            struct.unpack(size_format, self.__buffer[:size])
+        del self.__buffer[:size]
+
+        self.__complete_member()
+        return True
+
+    def __complete_member(self):
+        """
+        Used to verify and close current member.
+        """
+
+        member = self.__member
+        self.__member = None
+
+        member.close()
+        member.verify()
+
+        if self.__on_file_extracted is not None:
+            self.__on_file_extracted(member.path, member.digest)
+
+    def __read_zip64_sizes(self, extra: bytes, file_size: int, compress_size: int):
+        """
+        Used to get sizes from Zip64 extra field if it's present.
+        """
+
+        while len(extra) >= 4:
+            header_id, data_size = struct.unpack("<HH", extra[:4])
+            data = extra[4:4 + data_size]
+            extra = extra[4 + data_size:]
+
+            if header_id != _ZIP64_EXTRA_ID:
+                continue
+
+            # Only sizes that didn't fit into header are present.
+            if file_size == _ZIP64_MARKER:
+                file_size, = struct.unpack("<Q", data[:8])
+                data = data[8:]
+
+            if compress_size == _ZIP64_MARKER:
+                compress_size, = struct.unpack("<Q", data[:8])
+
+            return file_size, compress_size
+
+        return None
+
+    def __resolve_path(self, name: str):
+        """
+        Used to get path of member inside of target directory.
+        Members that point outside of target directory are rejected.
+        """
+
+        parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".")]
+
+        if name.startswith(("/", "\\")) or ".." in parts or any(":" in part for part in parts):
+            raise zipfile.BadZipFile(f"Archive member has unsafe path '{name}'.")
+
+        path = os.path.join(self.__target_directory, *parts)
+
+        if name.endswith("/"):
+            os.makedirs(path, exist_ok=True)
+            return None
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+
+class _ExtractedMember:
+    """
+    Archive member that is being extracted.
+    """
+
+    def __init__(self, path: Optional[str], compress_type: int, compress_size: Optional[int],
+                 file_size: Optional[int], crc: Optional[int], is_zip64: bool):
+        """
+        Sizes and CRC are not known upfront when
+        member is followed by data descriptor.
+        """
+
+        if compress_type == zipfile.ZIP_DEFLATED:
+            self.__decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+        elif compress_type == zipfile.ZIP_LZMA:
+            self.__decompressor = _LzmaDecompressor()
+
+        elif compress_type == _ZIP_ZSTANDARD and zstd is not None:
+            self.__decompressor = zstd.ZstdDecompressor()
+
+        elif compress_type == zipfile.ZIP_STORED and compress_size is not None:
+            self.__decompressor = None
+
+        else:
+            raise zipfile.BadZipFile(f"Compression method {compress_type} is not supported.")
+
+        self.path = path
+        self.compress_size = compress_size
+        self.file_size = file_size
+        self.crc = crc
+        self.is_zip64 = is_zip64
+
+        self.__file = open(path, "wb") if path is not None else None
+        self.__hash = hashlib.new(SHA_256)
+        self.__crc = 0
+        self.__bytes_read = 0
+        self.__bytes_written = 0
+        self.__is_written = compress_size == 0
+
+    @property
+    def is_written(self):
+        """
+        Used to check whether all member data was read.
+        """
+        return self.__is_written
+
+    @property
+    def digest(self):
+        return self.__hash.hexdigest()
+
+    def write(self, data: bytearray, block_size: int):
+        """
+        Used to write compressed data of the member.
+        Returns amount of bytes that belong to the member.
+        """
+
+        if self.compress_size is not None:
+            data = data[:self.compress_size - self.__bytes_read]
+
+        if self.__decompressor is None:
+            consumed = len(data)
+            self.__write(bytes(data))
+
+        elif hasattr(self.__decompressor, "unconsumed_tail"):
+            # Output is limited, so highly compressed
+            # data is never fully decompressed into memory.
+            self.__write(self.__decompressor.decompress(bytes(data), block_size))
+
+            while self.__decompressor.unconsumed_tail and not self.__decompressor.eof:
+                self.__write(self.__decompressor.decompress(self.__decompressor.unconsumed_tail, block_size))
+
+            consumed = len(data) - len(self.__decompressor.unused_data)
+
+        else:
+            self.__write(self.__decompressor.decompress(bytes(data)))
+            consumed = len(data) - len(self.__decompressor.unused_data)
+
+        self.__bytes_read += consumed
+
+        if self.__decompressor is not None and self.__decompressor.eof or self.__bytes_read == self.compress_size:
+            self.__is_written = True
+
+        return consumed
+
+    def verify(self):
+        """
+        Used to check that extracted data
+        matches CRC and size of the member.
+        """
+
+        if self.__crc != self.crc or self.__bytes_written != self.file_size:
+            raise zipfile.BadZipFile(f"Archive member '{self.path}' is corrupted.")
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+
+    def __write(self, data: bytes):
+        self.__hash.update(data)
+        self.__crc = zlib.crc32(data, self.__crc)
+        self.__bytes_written += len(data)
+
+        if self.__file is not None:
+            self.__file.write(data)
+
+
+class _LzmaCompressor:
+    """
+    Compressor of LZMA archive members.
+
+    Raw stream is prefixed with version and properties of LZMA
+    stream, the same properties as zipfile uses are written.
+    """
+
+    __VERSION = (9, 4)
+    __LITERAL_CONTEXT_BITS = 3
+    __LITERAL_POSITION_BITS = 0
+    __POSITION_BITS = 2
+    __DICT_SIZE = 8 * 1024 * 1024
+
+    def __init__(self):
+        self.__compressor = lzma.LZMACompressor(lzma.FORMAT_RAW, filters=[{
+            "id": lzma.FILTER_LZMA1,
+            "lc": self.__LITERAL_CONTEXT_BITS,
+            "lp": self.__LITERAL_POSITION_BITS,
+            "pb": self.__POSITION_BITS,
+            "dict_size": self.__DICT_SIZE
+        }])
+
+        bits = (self.__POSITION_BITS * 5 + self.__LITERAL_POSITION_BITS) * 9 + self.__LITERAL_CONTEXT_BITS
+        self.__header = struct.pack("<BBHBL", *self.__VERSION, 5, bits, self.__DICT_SIZE)
+
+    def compress(self, data: bytes):
+        header, self.__header = self.__header, b""
+        return header + self.__compressor.compress(data)
+
+    def flush(self):
+        header, self.__header = self.__header, b""
+        return header + self.__compressor.flush()
+
+
+class _LzmaDecompressor:
+    """
+    Decompressor of LZMA archive members.
+
+    Member data starts with version and properties
+    of LZMA stream, which are followed by raw stream.
+    """
+
+    def __init__(self):
+        self.__header = b""
+        self.__decompressor: Optional[lzma.LZMADecompressor] = None
+
+    @property
+    def eof(self):
+        return self.__decompressor is not None and self.__decompressor.eof
+
+    @property
+    def unused_data(self):
+        return self.__decompressor.unused_data if self.__decompressor is not None else b""
+
+    def decompress(self, data: bytes):
+        if self.__decompressor is not None:
+            return self.__decompressor.decompress(data)
+
+        self.__header += data
+
+        if len(self.__header) < 4:
+            return b""
+
+        properties_size, = struct.unpack("<H", self.__header[2:4])
+
+        if len(self.__header) < 4 + properties_size:
+            return b""
+
+        properties = self.__header[4:4 + properties_size]
+        data = self.__header[4 + properties_size:]
+
+        if properties_size != 5:
+            raise zipfile.BadZipFile("LZMA properties are corrupted.")
+
+        # First byte packs literal context, literal position
+        # and position bits, then dictionary size follows.
+        bits, dict_size = struct.unpack("<BL", properties)
+        lzma_filter = {
+            "id": lzma.FILTER_LZMA1,
+            "lc": bits % 9,
+            "lp": bits // 9 % 5,
+            "pb": bits // 45,
+            "dict_size": dict_size
+        }
+
+        self.__decompressor = lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=[lzma_filter])
+        return self.__decompressor.decompress(data)
@@ -0,0 +1,56 @@
+import hashlib
+from typing import Final, Iterator, BinaryIO
+
+from constants import SHA_256
+
+MIN_CHUNK_SIZE: Final = 256 * 1024
+MAX_CHUNK_SIZE: Final = 4 * 1024 * 1024
+
+# Each byte is mapped into one of four classes, chunk boundary is placed
+# after specific sequence of ten classes. Boundary only depends on last
+# ten bytes, so inserting or removing data only changes chunks around
+# modified region. Sequence occurs once in 4^10 bytes (1 MiB) of random
+# data. Mapping must never change, since it defines chunks stored in cloud.
+_CLASSES: Final = bytes(hashlib.sha256(bytes([value])).digest()[0] % 4 for value in range(256))
+_BOUNDARY: Final = bytes([0, 1, 2, 3, 1, 0, 3, 2, 2, 1])
+_READ_SIZE: Final = 8 * 1024 * 1024
+
+
+def split_chunks(stream: BinaryIO, min_size: int = MIN_CHUNK_SIZE, max_size: int = MAX_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Used to split contents of binary stream into content-defined
+    chunks, the same data always produces the same chunks.
+
+    Boundaries are searched in translated copy of data, so
+    scanning is done by C code of bytes.find instead of
+    Python loop over each byte.
+    """
+
+    data = bytearray()
+    classes = bytearray()
+    is_read = False
+
+    while not is_read or data:
+        if not is_read and len(data) < max_size:
+            block = stream.read(_READ_SIZE)
+            is_read = len(block) == 0
+
+            data += block
+            classes += block.translate(_CLASSES)
+            continue
+
+        boundary = classes.find(_BOUNDARY, max(min_size - len(_BOUNDARY), 0), max_size)
+        size = boundary + len(_BOUNDARY) if boundary != -1 else min(max_size, len(data))
+
+        yield bytes(data[:size])
+
+        del data[:size]
+        del classes[:size]
+
+
+def chunk_digest(chunk: bytes):
+    """
+    Used to get digest of the chunk,
+    which also serves as its name.
+    """
+    return hashlib.new(SHA_256, chunk).hexdigest()
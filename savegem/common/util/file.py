@@ -2,8 +2,33 @@ import hashlib
 import json
 import os.path
 import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Final
+
 from constants import Directory, UTF_8, SHA_256
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Not available on Windows.
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover
+    # Only available on Windows.
+    msvcrt = None
+
+# Linux ioctl which makes file share data blocks of another file.
+_FICLONE: Final = 0x40049409
+
+# File opened by other process can't be replaced on Windows, it's retried with growing delay (seconds).
+_REPLACE_ATTEMPTS: Final = 5
+_REPLACE_DELAY: Final = 0.05
+
 
 def resolve_config(config_name: str):
     """
@@ -96,9 +121,40 @@ def read_file(file_path: str, as_json: bool = False):
         return json.load(file) if as_json else file.read()
 
 
-def save_file(file_path: str, data: any, as_json: bool = False, binary: bool = False):
+def save_file(file_path: str, data: any, as_json: bool = False, binary: bool = False, atomic: bool = False):
     """
     Used to save contents of the file.
+
+    When atomic flag is set contents are written into
+    temporary file first which then replaces target file,
+    so other processes never observe partially written file.
+
+    On Windows file can't be replaced while other process has it
+    open, replacing is retried then and file is written in place
+    as the last resort, same as without atomic flag.
+    """
+
+    if not atomic:
+        _write_file(file_path, data, as_json, binary)
+        return
+
+    # Name is unique, since file could be saved by multiple threads at once.
+    temp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        _write_file(temp_path, data, as_json, binary)
+
+        if not _replace_file(temp_path, file_path):
+            _write_file(file_path, data, as_json, binary)
+
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _write_file(file_path: str, data: any, as_json: bool, binary: bool):
+    """
+    Used to write contents of the file.
     """
 
     mode = "wb" if binary else "w"
@@ -108,6 +164,48 @@ def save_file(file_path: str, data: any, as_json: bool = False, binary: bool = F
         json.dump(data, file, indent=2) if as_json else file.write(data)
 
 
+def _replace_file(source_path: str, target_path: str):
+    """
+    Used to replace target file with source file,
+    returns whether file has been replaced.
+    """
+
+    for attempt in range(_REPLACE_ATTEMPTS):
+        try:
+            os.replace(source_path, target_path)
+            return True
+
+        except PermissionError:
+            time.sleep(_REPLACE_DELAY * (attempt + 1))
+
+    return False
+
+
+@contextmanager
+def locked_file(file_path: str):
+    """
+    Used to open binary file for reading and writing, file is locked
+    exclusively, so other processes wait until it's closed.
+    File is created when it doesn't exist.
+    """
+
+    with os.fdopen(os.open(file_path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)), "r+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+        elif msvcrt is not None:
+            # Region past the end of file could be locked as well.
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+        try:
+            yield file
+
+        finally:
+            if fcntl is None and msvcrt is not None:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
 def delete_file(file_path: str):
     """
     Used to remove file.
@@ -117,20 +215,92 @@ def delete_file(file_path: str):
         os.remove(file_path)
 
 
-def file_checksum(file_path: str, algorithm: str = SHA_256, block_size: int = 8192):
+def file_checksum(file_path: str, algorithm: str = SHA_256, block_size: int = 1024 * 1024):
     """
     Used to get checksum of file.
     """
 
-    file_hash = hashlib.new(algorithm)
-
     with open(file_path, "rb") as file:
+        # Reads file into reusable buffer without extra copies (Python 3.11+).
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(file, algorithm).hexdigest()
+
+        file_hash = hashlib.new(algorithm)
+
         for chunk in iter(lambda: file.read(block_size), b""):
             file_hash.update(chunk)
 
     return file_hash.hexdigest()
 
 
+def file_checksums(file_paths: list[str], algorithm: str = SHA_256, workers: int = None):
+    """
+    Used to get checksums of multiple files.
+    Files are hashed in parallel, since hashlib releases GIL
+    while hashing. Checksums are returned in the same order as files.
+    """
+
+    workers = workers or min(len(file_paths), os.cpu_count() or 1)
+
+    if workers <= 1:
+        return [file_checksum(file_path, algorithm) for file_path in file_paths]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda file_path: file_checksum(file_path, algorithm), file_paths))
+
+
+def clone_file(source_path: str, target_path: str):
+    """
+    Used to copy file along with its metadata.
+    On copy-on-write file systems (btrfs, XFS) data
+    blocks of the file are shared instead of being copied.
+    """
+
+    with open(source_path, "rb") as source, open(target_path, "wb") as target:
+        if not _reflink(source, target):
+            _copy_file_range(source, target)
+
+    shutil.copystat(source_path, target_path)
+
+
+def _reflink(source, target):
+    """
+    Used to clone file using FICLONE ioctl.
+    Returns whether file has been cloned.
+    """
+
+    if fcntl is None:
+        return False
+
+    try:
+        fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+        return True
+
+    except OSError:
+        return False
+
+
+def _copy_file_range(source, target):
+    """
+    Used to copy file contents within kernel, which also shares
+    data blocks on some file systems, falls back to regular copy.
+    """
+
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(source.fileno(), target.fileno(), 1024 * 1024 * 1024) > 0:
+                pass
+
+            return
+
+        except OSError:
+            source.seek(0)
+            target.seek(0)
+            target.truncate()
+
+    shutil.copyfileobj(source, target)
+
+
 def file_name_from_path(file_path: str):
     """
     Used to extract file name from file path.
@@ -0,0 +1,75 @@
+import threading
+from typing import Final, Optional
+
+_metrics: Optional["Metrics"] = None
+
+
+class Metrics:
+    """
+    In-memory metrics of remote calls of current process,
+    such as amount of calls, retries and their latency.
+    """
+
+    Calls: Final = "calls"
+    Retries: Final = "retries"
+    Failures: Final = "failures"
+    TotalLatency: Final = "totalLatency"
+    MaxLatency: Final = "maxLatency"
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__endpoints: dict[str, dict] = {}
+
+    def record(self, endpoint: str, latency: float, retries: int, failed: bool):
+        """
+        Used to record single call of endpoint, latency
+        includes time spent on retries and waiting between them.
+        """
+
+        with self.__lock:
+            entry = self.__endpoints.setdefault(endpoint, {
+                self.Calls: 0,
+                self.Retries: 0,
+                self.Failures: 0,
+                self.TotalLatency: 0.0,
+                self.MaxLatency: 0.0
+            })
+
+            entry[self.Calls] += 1
+            entry[self.Retries] += retries
+            entry[self.Failures] += int(failed)
+            entry[self.TotalLatency] += latency
+            entry[self.MaxLatency] = max(entry[self.MaxLatency], latency)
+
+    def snapshot(self):
+        """
+        Used to get copy of metrics of each endpoint.
+        """
+
+        with self.__lock:
+            return {endpoint: dict(entry) for endpoint, entry in self.__endpoints.items()}
+
+    def summary(self):
+        """
+        Used to get human-readable summary of metrics, one line per endpoint.
+        """
+
+        return "\n".join(
+            f"{endpoint}: {entry[self.Calls]} call(s), {entry[self.Retries]} retry(ies), "
+            f"{entry[self.Failures]} failure(s), avg {entry[self.TotalLatency] / entry[self.Calls]:.3f}s, "
+            f"max {entry[self.MaxLatency]:.3f}s"
+            for endpoint, entry in sorted(self.snapshot().items())
+        )
+
+
+def metrics():
+    """
+    Used to get global metrics instance.
+    """
+
+    global _metrics
+
+    if _metrics is None:
+        _metrics = Metrics()
+
+    return _metrics
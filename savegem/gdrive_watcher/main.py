@@ -4,19 +4,54 @@ from savegem.common.core.context import app
 from constants import File
 import threading
 import os.path
+from datetime import datetime, timezone, timedelta
+from typing import Final
 
+from googleapiclient.errors import HttpError
+
+from savegem.common.core.editable_json_config_holder import EditableJsonConfigHolder
+from savegem.common.core.json_config_holder import JsonConfigHolder
 from savegem.common.service.daemon import Daemon
-from savegem.common.service.gdrive import GDrive
-from savegem.common.util.file import resolve_temp_file
+from savegem.common.service.storage import storage
+from savegem.common.service.save_pruner import SavePruner
+from savegem.common.util.file import resolve_temp_file, resolve_app_data
 from savegem.gdrive_watcher.ipc_socket import google_drive_watcher_socket
 
 
 class GDriveWatcher(Daemon):
 
+    StartPageToken = "startPageToken"
+    LastPruneTime = "lastPruneTime"
+    DefaultPruneIntervalHours: Final = 24
+
     def __init__(self):
-        self.__start_page_token = None
+        self.__state = EditableJsonConfigHolder(resolve_app_data(File.GDriveWatcherState))
+        self.__prune_interval = timedelta(hours=self.DefaultPruneIntervalHours)
         Daemon.__init__(self, "gdrive_watcher", True)
 
+    def _initialize(self, config: JsonConfigHolder):
+        self.__prune_interval = timedelta(
+            hours=config.get_value("pruneIntervalHours", self.DefaultPruneIntervalHours)
+        )
+
+    @property
+    def start_page_token(self):
+        """
+        Used to get change feed cursor.
+        Cursor is persisted so changes that happened
+        while watcher wasn't running are not lost.
+        """
+        return self.__state.get_value(self.StartPageToken)
+
+    @start_page_token.setter
+    def start_page_token(self, start_page_token: str):
+        """
+        Used to store change feed cursor.
+        """
+
+        if start_page_token != self.start_page_token:
+            self.__state.set_value(self.StartPageToken, start_page_token)
+
     def _work(self):
         """
         Used to poll from Google Drive Changes API
@@ -29,14 +64,22 @@ class GDriveWatcher(Daemon):
         if not os.path.exists(resolve_temp_file(File.GUIInitializedFlag)):
             return
 
-        app().user.initialize(GDrive.get_current_user)
-        app().games.download()
+        app().user.initialize(storage().get_current_user)
+
+        # Change feed already tells whether game configuration has
+        # changed, so it's only downloaded on startup or when needed.
+        if app().games.empty:
+            app().games.download()
 
         files, directories = self.__get_changes()
-        save_files_modified = app().games.current.drive_directory in directories
         games_config_modified = app().config.games_config_file_id in files
         activity_log_modified = app().config.activity_log_file_id in files
 
+        if games_config_modified:
+            app().games.download()
+
+        save_files_modified = app().games.current.drive_directory in directories
+
         self._logger.debug("Current game files modified: %s", save_files_modified)
         self._logger.debug("Games config modified: %s", games_config_modified)
         self._logger.debug("Activity log modified: %s", activity_log_modified)
@@ -50,20 +93,49 @@ class GDriveWatcher(Daemon):
         if activity_log_modified:
             ui_socket.send_ui_refresh_command(UIRefreshEvent.ActivityLogUpdate)
 
+        self.__prune_saves()
+
+    def __prune_saves(self):
+        """
+        Used to remove saves exceeding retention policy of the games.
+        Pruning isn't urgent, so it's done once per interval.
+        """
+
+        now = datetime.now(timezone.utc)
+        last_prune_time = self.__state.get_value(self.LastPruneTime)
+
+        if last_prune_time is not None and now - datetime.fromisoformat(last_prune_time) < self.__prune_interval:
+            return
+
+        # Time is stored beforehand, so failing pruning isn't retried on each iteration.
+        self.__state.set_value(self.LastPruneTime, now.isoformat())
+        SavePruner.prune(app().games.list)
+
     def __get_changes(self):
         """
         Used to get formatted changes from Google Drive Changes API.
         """
 
-        response = GDrive.get_changes(self.__start_page_token)
-        self.__start_page_token = response.get("newStartPageToken")
-
         modified_files = []
         affected_directories = []
 
+        try:
+            response = storage().get_changes(self.start_page_token)
+
+        except HttpError as error:
+            # Persisted cursor could become invalid (e.g. it has expired),
+            # in that case feed is restarted from its current end.
+            if error.status_code in (400, 404):
+                self._logger.warning("Start page token is no longer valid, resetting it.")
+                self.start_page_token = None
+
+            raise
+
+        self.start_page_token = response.get("newStartPageToken")
+
         changes = response.get("changes", [])
         self._logger.debug("changes=%s", changes)
-        self._logger.debug("startPageToken=%s", self.__start_page_token)
+        self._logger.debug("startPageToken=%s", self.start_page_token)
 
         for change in changes:
             file = change.get("file")
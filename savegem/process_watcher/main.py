@@ -7,7 +7,7 @@ from savegem.common.service.daemon import Daemon
 from savegem.common.service.downloader import Downloader
 from savegem.common.service.uploader import Uploader
 from savegem.common.core.context import app
-from savegem.common.service.gdrive import GDrive
+from savegem.common.service.storage import storage
 from savegem.process_watcher.game_process import get_running_game_processes, GameProcess
 from savegem.process_watcher.ipc_socket import process_watcher_socket
 import threading
@@ -27,7 +27,7 @@ class ProcessWatcher(Daemon):
         self.__uploader = Uploader()
 
     def _work(self):
-        app().user.initialize(GDrive.get_current_user)
+        app().user.initialize(storage().get_current_user)
         app().games.download()
 
         active_processes = get_running_game_processes()
@@ -50,6 +50,8 @@ class ProcessWatcher(Daemon):
         Only works if auto mode is enabled.
         """
 
+        actionable_processes = []
+
         for process in processes:
             # No need to perform extra actions such as metadata download
             # if process is in running state and no action is required.
@@ -62,7 +64,12 @@ class ProcessWatcher(Daemon):
                 self._logger.info("Auto mode is disabled for %s", process.game.name)
                 continue
 
-            process.game.meta.drive.refresh()
+            actionable_processes.append(process)
+
+        # Metadata of all affected games is downloaded in single batch.
+        app().games.refresh_drive_metadata([process.game for process in actionable_processes])
+
+        for process in actionable_processes:
             sync_status = process.game.meta.sync_status
 
             if sync_status == SyncStatus.UpToDate:
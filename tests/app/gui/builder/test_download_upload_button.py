@@ -233,6 +233,23 @@ def test_done_subscriber_notifies_on_success_only(notification_mock, success, ex
         notification_mock.assert_not_called()
 
 
+def test_done_subscriber_notifies_when_save_is_up_to_date(notification_mock, tr_mock):
+    """
+    Test __done_subscriber shows distinct notification when upload was skipped.
+    """
+
+    from savegem.common.service.subscriptable import DoneEvent, EventKind
+    from savegem.app.gui.builder.download_upload_button import DownloadUploadButtonBuilder
+
+    callback = DownloadUploadButtonBuilder._DownloadUploadButtonBuilder__done_subscriber("test_message")  # noqa
+
+    # Act
+    callback(DoneEvent(EventKind.AlreadyUpToDate))
+
+    # Assert
+    notification_mock.assert_called_once_with("Translated(notification_SaveIsAlreadyUpToDate)")
+
+
 def test_progress_subscriber_sets_progress_on_widget(mocker: MockerFixture):
     """
     Test __progress_subscriber returns a callback that updates the widget's progress.
@@ -259,6 +276,7 @@ def test_progress_subscriber_sets_progress_on_widget(mocker: MockerFixture):
     ("SavesDirectoryMissing", "notification_ErrorSaveDirectoryMissing"),
     ("DriveMetadataMissing", "label_StorageIsEmpty"),
     ("ErrorUploadingToDrive", "notification_ErrorUploadingToDrive"),
+    ("ErrorDownloadingFromDrive", "notification_ErrorDownloadingFromDrive"),
     ("UnknownEvent", None),
 ])
 def test_error_subscriber_notifies_on_specific_errors(notification_mock, tr_mock, games_config, event_kind,
@@ -281,6 +299,9 @@ def test_error_subscriber_notifies_on_specific_errors(notification_mock, tr_mock
     if event_kind == "ErrorUploadingToDrive":
         kind = EventKind.ErrorUploadingToDrive
 
+    if event_kind == "ErrorDownloadingFromDrive":
+        kind = EventKind.ErrorDownloadingFromDrive
+
     # Arrange
     error_event = ErrorEvent(kind)
 
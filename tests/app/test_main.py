@@ -12,7 +12,7 @@ def _setup(module_patch, sys_mock):
     sys_mock.argv = ['app.py']
 
 
-def test_main_application_startup(module_patch, app_context, gdrive_mock, logger_mock, qt_app_mock, gui_mock,
+def test_main_application_startup(module_patch, app_context, storage_mock, logger_mock, qt_app_mock, gui_mock,
                                   ui_socket_mock, sys_mock, prop_mock):
     """
     Test the entire application startup sequence, ensuring all services are initialized
@@ -23,6 +23,7 @@ def test_main_application_startup(module_patch, app_context, gdrive_mock, logger
     from savegem.common.core.ipc_socket import IPCCommand
 
     module_patch("load_stylesheet")
+    staging_area_mock = module_patch("staging_area")
     qt_app_mock.return_value.exec.return_value = 0
     prop_mock.return_value = "1.0.0"
 
@@ -34,9 +35,10 @@ def test_main_application_startup(module_patch, app_context, gdrive_mock, logger
     ], any_order=False)
 
     # 1a. Core Service Calls
-    app_context.user.initialize.assert_called_once_with(gdrive_mock.get_current_user)
+    staging_area_mock.return_value.sweep.assert_called_once()
+    app_context.user.initialize.assert_called_once_with(storage_mock.get_current_user)
     app_context.games.download.assert_called_once()
-    app_context.games.current.meta.drive.refresh.assert_called_once()
+    app_context.games.refresh_drive_metadata.assert_called_once_with()
     app_context.activity.refresh.assert_called_once()
 
     # 1b. UI Setup
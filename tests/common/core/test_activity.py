@@ -1,5 +1,9 @@
+import itertools
 import json
+from pathlib import Path
+
 import pytest
+from pytest_mock import MockerFixture
 
 from tests.test_data import GameTestData, PlayerTestData, ConfigTestData
 from tests.util import json_to_bytes_io
@@ -53,9 +57,28 @@ def _activity(app_config, app_context, user_config_mock, games_config):
     return activity
 
 
+@pytest.fixture(autouse=True)
+def _drive_file_cache(mocker: MockerFixture, module_patch, storage_mock, tmp_path: Path):
+    """
+    Activity log is fetched through cache, which is kept inside of test directory.
+    Each version of activity log is different unless overridden.
+    """
+
+    from savegem.common.core.drive_file_cache import DriveFileCache
+
+    versions = itertools.count()
+    storage_mock.get_metadata.side_effect = lambda file_id, fields: {"version": str(next(versions))}
+    mocker.patch("savegem.common.core.drive_file_cache.storage", return_value=storage_mock)
+
+    cache = DriveFileCache(str(tmp_path / "drive_cache.json"))
+    module_patch("drive_file_cache", return_value=cache)
+
+    return cache
+
+
 @pytest.fixture
-def _mock_download_file(gdrive_mock):
-    return lambda data: gdrive_mock.download_file.configure_mock(
+def _mock_download_file(storage_mock):
+    return lambda data: storage_mock.download_file.configure_mock(
         side_effect=lambda file_id: json_to_bytes_io(data)
     )
 
@@ -64,21 +87,21 @@ def test_should_not_have_players_without_refresh(_activity):
     assert len(_activity.players) == 0
 
 
-def test_should_use_config_file_id_when_downloading(_activity, _mock_download_file, gdrive_mock):
+def test_should_use_config_file_id_when_downloading(_activity, _mock_download_file, storage_mock):
     _mock_download_file(NoActivity)
     _activity.refresh()
 
-    gdrive_mock.download_file.assert_called_with(ConfigTestData.ActivityLogFileId)
+    storage_mock.download_file.assert_called_with(ConfigTestData.ActivityLogFileId)
 
 
-def test_refresh_when_no_active_players(_activity, _mock_download_file, gdrive_mock):
+def test_refresh_when_no_active_players(_activity, _mock_download_file, storage_mock):
     _mock_download_file(NoActivity)
     _activity.refresh()
 
     assert len(_activity.players) == 0
 
 
-def test_refresh_when_only_current_player(_activity, user_config_mock, _mock_download_file, gdrive_mock,
+def test_refresh_when_only_current_player(_activity, user_config_mock, _mock_download_file, storage_mock,
                                           _first_player_activity):
     _mock_download_file(_first_player_activity)
     _activity.refresh()
@@ -87,7 +110,7 @@ def test_refresh_when_only_current_player(_activity, user_config_mock, _mock_dow
     assert len(_activity.players) == 0
 
 
-def test_refresh_when_active_players(_activity, _mock_download_file, gdrive_mock, _second_player_activity):
+def test_refresh_when_active_players(_activity, _mock_download_file, storage_mock, _second_player_activity):
     _mock_download_file(_second_player_activity)
     _activity.refresh()
 
@@ -95,7 +118,7 @@ def test_refresh_when_active_players(_activity, _mock_download_file, gdrive_mock
     assert len(_activity.players) == 1
 
 
-def test_refresh_when_activity_contains_not_selected_game(_activity, _mock_download_file, gdrive_mock, games_config,
+def test_refresh_when_activity_contains_not_selected_game(_activity, _mock_download_file, storage_mock, games_config,
                                                           _second_player_activity):
     _mock_download_file(_second_player_activity)
     games_config.current.name = GameTestData.SecondGame
@@ -105,7 +128,7 @@ def test_refresh_when_activity_contains_not_selected_game(_activity, _mock_downl
     assert len(_activity.players) == 0
 
 
-def test_update_when_has_active_games(_activity, _mock_download_file, gdrive_mock, _second_player_activity):
+def test_update_when_has_active_games(_activity, _mock_download_file, storage_mock, _second_player_activity):
 
     from savegem.common.core.activity import Activity
 
@@ -114,7 +137,7 @@ def test_update_when_has_active_games(_activity, _mock_download_file, gdrive_moc
     _mock_download_file(_second_player_activity)
     _activity.update(games)
 
-    update_args = gdrive_mock.update_file.call_args[0]
+    update_args = storage_mock.update_file.call_args[0]
     file_id = update_args[0]
     data: dict = json.loads(update_args[1])
 
@@ -130,14 +153,36 @@ def test_update_when_has_active_games(_activity, _mock_download_file, gdrive_moc
     assert data.get(first_machine_id, {}).get(Activity.GAMES_PROP) == games
 
 
-def test_update_when_no_games(_activity, _mock_download_file, gdrive_mock, _first_player_activity):
+def test_update_when_no_games(_activity, _mock_download_file, storage_mock, _first_player_activity):
     _mock_download_file(_first_player_activity)
     _activity.update([])
 
-    update_args = gdrive_mock.update_file.call_args[0]
+    update_args = storage_mock.update_file.call_args[0]
     file_id = update_args[0]
     data: dict = json.loads(update_args[1])
 
     assert file_id == ConfigTestData.ActivityLogFileId
     # Previous user activity data was removed.
     assert len(data.keys()) == 0
+
+
+def test_refresh_reuses_unchanged_activity_log(_activity, _mock_download_file, storage_mock, _drive_file_cache,
+                                               _second_player_activity):
+    storage_mock.get_metadata.side_effect = lambda file_id, fields: {"version": "1"}
+    _mock_download_file(_second_player_activity)
+
+    _activity.refresh()
+    _activity.refresh()
+
+    storage_mock.download_file.assert_called_once()
+    assert len(_activity.players) == 1
+    assert (_drive_file_cache.hits, _drive_file_cache.misses) == (1, 1)
+
+
+def test_refresh_fails_when_activity_log_not_accessible(_activity, storage_mock):
+    storage_mock.get_metadata.side_effect = lambda file_id, fields: None
+
+    with pytest.raises(RuntimeError):
+        _activity.refresh()
+
+    storage_mock.download_file.assert_not_called()
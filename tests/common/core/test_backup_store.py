@@ -0,0 +1,187 @@
+import os
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def _backup_props(module_patch):
+    """
+    Fixture for backup store configuration, defaults are used unless overridden.
+    """
+
+    props = {}
+    module_patch("prop", side_effect=lambda name: props.get(name, {}))
+
+    return props
+
+
+@pytest.fixture
+def _store(module_patch, tmp_path: Path, _backup_props):
+    from savegem.common.core.backup_store import BackupStore
+    from savegem.common.core.checksum_cache import ChecksumCache
+
+    module_patch("checksum_cache", return_value=ChecksumCache(str(tmp_path / "checksums.json")))
+
+    return BackupStore(str(tmp_path / "backups"))
+
+
+@pytest.fixture
+def _saves_directory(tmp_path: Path):
+    saves_directory = tmp_path / "saves"
+    (saves_directory / "nested").mkdir(parents=True)
+    (saves_directory / "save.sav").write_bytes(b"save data")
+    (saves_directory / "nested" / "settings.ini").write_bytes(b"settings")
+
+    return saves_directory
+
+
+def _inode(snapshot, file_name: str):
+    return os.stat(os.path.join(snapshot.path, "data", file_name)).st_ino
+
+
+def test_should_list_stored_snapshots(_store, _saves_directory):
+
+    first = _store.snapshot("Game", str(_saves_directory))
+    second = _store.snapshot("Game", str(_saves_directory))
+
+    assert [snapshot.id for snapshot in _store.list("Game")] == [second.id, first.id]
+    assert _store.list("Other Game") == []
+
+
+def test_should_share_unchanged_files_between_snapshots(_store, _saves_directory):
+
+    first = _store.snapshot("Game", str(_saves_directory))
+    (_saves_directory / "save.sav").write_bytes(b"new save data")
+    second = _store.snapshot("Game", str(_saves_directory))
+
+    assert _inode(first, "nested/settings.ini") == _inode(second, "nested/settings.ini")
+    assert _inode(first, "save.sav") != _inode(second, "save.sav")
+
+
+def test_should_not_share_files_with_saves_directory(_store, _saves_directory):
+
+    snapshot = _store.snapshot("Game", str(_saves_directory))
+
+    assert _inode(snapshot, "save.sav") != os.stat(_saves_directory / "save.sav").st_ino
+
+
+def test_should_restore_snapshot(_store, _saves_directory):
+
+    snapshot = _store.snapshot("Game", str(_saves_directory))
+
+    (_saves_directory / "save.sav").write_bytes(b"new save data")
+    (_saves_directory / "new.sav").write_bytes(b"new file")
+
+    _store.restore("Game", snapshot.id, str(_saves_directory))
+
+    assert (_saves_directory / "save.sav").read_bytes() == b"save data"
+    assert (_saves_directory / "nested" / "settings.ini").read_bytes() == b"settings"
+    assert not (_saves_directory / "new.sav").exists()
+
+    # Replaced contents are stored as well.
+    assert len(_store.list("Game")) == 2
+
+    # Restored files are not shared with snapshot.
+    (_saves_directory / "save.sav").write_bytes(b"modified")
+    assert Path(snapshot.path, "data", "save.sav").read_bytes() == b"save data"
+
+
+def test_should_fail_to_restore_missing_snapshot(_store, _saves_directory):
+
+    with pytest.raises(ValueError):
+        _store.restore("Game", "missing", str(_saves_directory))
+
+
+def test_should_evict_snapshots_exceeding_amount(_store, _backup_props, _saves_directory):
+
+    _backup_props["backups.maxSnapshots"] = 2
+
+    for _ in range(4):
+        _store.snapshot("Game", str(_saves_directory))
+
+    assert len(_store.list("Game")) == 2
+
+
+def test_should_evict_snapshots_exceeding_size(_store, _backup_props, _saves_directory):
+
+    _backup_props["backups.maxSizeMb"] = 1
+
+    _store.snapshot("Game", str(_saves_directory))
+    shared = _store.snapshot("Game", str(_saves_directory))
+
+    # Shared files are counted once, so snapshots fit into limit.
+    assert len(_store.list("Game")) == 2
+
+    (_saves_directory / "save.sav").write_bytes(os.urandom(1024 * 1024))
+    latest = _store.snapshot("Game", str(_saves_directory))
+
+    assert [snapshot.id for snapshot in _store.list("Game")] == [latest.id]
+    assert not os.path.exists(shared.path)
+
+
+def test_should_evict_expired_snapshots(mocker, _store, _saves_directory):
+
+    from savegem.common.core.backup_store import Snapshot
+
+    expired = _store.snapshot("Game", str(_saves_directory))
+    latest = _store.snapshot("Game", str(_saves_directory))
+
+    expired_time = datetime.now(timezone.utc) - timedelta(days=31)
+    snapshots = [latest, Snapshot(expired.id, expired_time, expired.path)]
+    mocker.patch.object(_store, "list", return_value=snapshots)
+
+    _store.evict("Game")
+
+    assert not os.path.exists(expired.path)
+    assert os.path.exists(latest.path)
+
+
+def test_should_ignore_unfinished_snapshots(_store, _saves_directory, tmp_path: Path):
+
+    snapshot = _store.snapshot("Game", str(_saves_directory))
+    Path(snapshot.path + ".tmp").mkdir()
+
+    assert [snapshot.id for snapshot in _store.list("Game")] == [snapshot.id]
+
+
+def test_should_store_games_with_unsafe_names(_store, _saves_directory):
+
+    _store.snapshot("Game: Remastered", str(_saves_directory))
+
+    assert len(_store.list("Game: Remastered")) == 1
+
+
+def test_should_copy_files_when_previous_manifest_is_corrupted(_store, _saves_directory, logger_mock):
+
+    first = _store.snapshot("Game", str(_saves_directory))
+    Path(first.path, "manifest.json").write_text("{corrupted")
+    second = _store.snapshot("Game", str(_saves_directory))
+
+    assert _inode(first, "save.sav") != _inode(second, "save.sav")
+    logger_mock.warning.assert_called_once()
+
+
+def test_should_copy_files_when_link_is_not_supported(module_patch, _store, _saves_directory):
+
+    first = _store.snapshot("Game", str(_saves_directory))
+    module_patch("os.link", side_effect=OSError("Links are not supported."))
+    second = _store.snapshot("Game", str(_saves_directory))
+
+    assert _inode(first, "save.sav") != _inode(second, "save.sav")
+    assert Path(second.path, "data", "save.sav").read_bytes() == b"save data"
+
+
+def test_backup_store_is_stored_in_app_data(module_patch):
+
+    from constants import File
+    from savegem.common.core import backup_store as module
+
+    module_patch("_backup_store", new=None)
+    resolve_app_data_mock = module_patch("resolve_app_data", return_value="/app/data/backups")
+
+    store = module.backup_store()
+
+    assert store is module.backup_store()
+    resolve_app_data_mock.assert_called_once_with(File.BackupStore)
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def _cache_path(tmp_path: Path):
+    return str(tmp_path / "checksums.json")
+
+
+@pytest.fixture
+def _save_file(tmp_path: Path):
+    """
+    Creates save file which is old enough to be cached.
+    """
+
+    file_path = tmp_path / "save.sav"
+    file_path.write_bytes(b"save data")
+
+    _age_file(file_path)
+
+    return str(file_path)
+
+
+@pytest.fixture
+def _file_checksums_mock(module_patch):
+    from savegem.common.util.file import file_checksums
+    return module_patch("file_checksums", side_effect=file_checksums)
+
+
+def _hashed_files(file_checksums_mock):
+    return [file_path for c in file_checksums_mock.call_args_list for file_path in c.args[0]]
+
+
+def _age_file(file_path):
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 60 * 10 ** 9))
+
+
+def test_should_calculate_digests(_cache_path, _save_file):
+
+    from savegem.common.core.checksum_cache import ChecksumCache
+
+    digests = ChecksumCache(_cache_path).digests([_save_file])
+
+    assert digests == [hashlib.sha256(b"save data").hexdigest()]
+
+
+def test_should_reuse_digest_of_unchanged_file(_cache_path, _save_file, _file_checksums_mock):
+
+    from savegem.common.core.checksum_cache import ChecksumCache
+
+    ChecksumCache(_cache_path).digests([_save_file])
+    # Different instance, to make sure cache is persisted.
+    digests = ChecksumCache(_cache_path).digests([_save_file])
+
+    assert digests == [hashlib.sha256(b"save data").hexdigest()]
+    assert _hashed_files(_file_checksums_mock) == [_save_file]
+
+
+def test_should_recalculate_digest_of_modified_file(_cache_path, _save_file, _file_checksums_mock):
+
+    from savegem.common.core.checksum_cache import ChecksumCache
+
+    cache = ChecksumCache(_cache_path)
+    cache.digests([_save_file])
+
+    with open(_save_file, "wb") as file:
+        file.write(b"modified save data")
+
+    _age_file(_save_file)
+    digests = cache.digests([_save_file])
+
+    assert digests == [hashlib.sha256(b"modified save data").hexdigest()]
+    assert _hashed_files(_file_checksums_mock) == [_save_file, _save_file]
+
+
+def test_should_not_cache_recently_modified_file(_cache_path, _save_file, _file_checksums_mock):
+
+    from savegem.common.core.checksum_cache import ChecksumCache
+
+    # File modification time is now.
+    os.utime(_save_file)
+
+    cache = ChecksumCache(_cache_path)
+    cache.digests([_save_file])
+    cache.digests([_save_file])
+
+    assert _hashed_files(_file_checksums_mock) == [_save_file, _save_file]
+    assert not os.path.exists(_cache_path)
+
+
+def test_should_drop_entries_of_removed_files(_cache_path, _save_file, tmp_path: Path):
+
+    from savegem.common.core.checksum_cache import ChecksumCache
+
+    other_file = tmp_path / "other.sav"
+    other_file.write_bytes(b"other")
+    _age_file(other_file)
+
+    cache = ChecksumCache(_cache_path)
+    cache.digests([str(other_file)])
+
+    os.remove(other_file)
+    cache.digests([_save_file])
+
+    with open(_cache_path) as file:
+        assert list(json.load(file).keys()) == [_save_file]
+
+
+def test_should_only_hash_modified_files(_cache_path, _save_file, _file_checksums_mock, tmp_path: Path):
+
+    from savegem.common.core.checksum_cache import ChecksumCache
+
+    other_file = tmp_path / "other.sav"
+    other_file.write_bytes(b"other")
+    _age_file(other_file)
+
+    cache = ChecksumCache(_cache_path)
+    cache.digests([_save_file])
+    digests = cache.digests([str(other_file), _save_file])
+
+    assert digests == [hashlib.sha256(b"other").hexdigest(), hashlib.sha256(b"save data").hexdigest()]
+    assert _hashed_files(_file_checksums_mock) == [_save_file, str(other_file)]
+
+
+def test_should_rebuild_corrupted_cache(_cache_path, _save_file, logger_mock):
+
+    from savegem.common.core.checksum_cache import ChecksumCache
+
+    with open(_cache_path, "w") as file:
+        file.write("{not json")
+
+    digests = ChecksumCache(_cache_path).digests([_save_file])
+
+    assert digests == [hashlib.sha256(b"save data").hexdigest()]
+    logger_mock.warning.assert_called_once()
+
+
+def test_should_ignore_error_when_storing_cache(module_patch, _cache_path, _save_file, logger_mock):
+
+    from savegem.common.core.checksum_cache import ChecksumCache
+
+    module_patch("save_file", side_effect=OSError("Disk is full"))
+
+    digests = ChecksumCache(_cache_path).digests([_save_file])
+
+    assert digests == [hashlib.sha256(b"save data").hexdigest()]
+    logger_mock.warning.assert_called_once()
+
+
+def test_checksum_cache_is_stored_in_app_data(module_patch):
+
+    from constants import File
+    from savegem.common.core import checksum_cache as module
+
+    module_patch("_checksum_cache", new=None)
+    resolve_app_data_mock = module_patch("resolve_app_data", return_value="/app/data/checksums.json")
+
+    cache = module.checksum_cache()
+
+    assert cache is module.checksum_cache()
+    resolve_app_data_mock.assert_called_once_with(File.ChecksumCache)
@@ -0,0 +1,126 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from tests.util import json_to_bytes_io
+
+
+@pytest.fixture
+def _version(storage_mock):
+    """
+    Mocks version of drive file.
+    """
+
+    version = {"md5Checksum": "checksum_1", "modifiedTime": "2025-01-01T00:00:00.000Z", "version": "1"}
+    storage_mock.get_metadata.side_effect = lambda file_id, fields: dict(version)
+
+    return version
+
+
+@pytest.fixture
+def _cache_path(tmp_path: Path):
+    return tmp_path / "drive_cache.json"
+
+
+@pytest.fixture
+def _cache(_cache_path):
+    from savegem.common.core.drive_file_cache import DriveFileCache
+    return DriveFileCache(str(_cache_path))
+
+
+def test_fetch_downloads_file_once(storage_mock, _version, _cache):
+
+    from savegem.common.core.drive_file_cache import DriveFileCache
+
+    storage_mock.download_file.side_effect = lambda file_id: json_to_bytes_io({"id": file_id})
+
+    first = _cache.fetch("file_id")
+    second = _cache.fetch("file_id")
+
+    storage_mock.download_file.assert_called_once_with("file_id")
+    storage_mock.get_metadata.assert_called_with("file_id", DriveFileCache.VersionFields)
+    assert json.load(first.open()) == json.load(second.open()) == {"id": "file_id"}
+    assert second.version == _version
+    assert (_cache.hits, _cache.misses) == (1, 1)
+
+
+def test_fetch_downloads_changed_file(storage_mock, _version, _cache):
+
+    storage_mock.download_file.side_effect = [json_to_bytes_io({"value": 1}), json_to_bytes_io({"value": 2})]
+
+    _cache.fetch("file_id")
+    _version["version"] = "2"
+
+    assert json.loads(_cache.fetch("file_id").content) == {"value": 2}
+    assert storage_mock.download_file.call_count == 2
+    assert (_cache.hits, _cache.misses) == (0, 2)
+
+
+def test_fetch_keeps_files_separately(storage_mock, _version, _cache):
+
+    storage_mock.download_file.side_effect = lambda file_id: json_to_bytes_io({"id": file_id})
+
+    _cache.fetch("first_id")
+    _cache.fetch("second_id")
+
+    assert json.loads(_cache.fetch("first_id").content) == {"id": "first_id"}
+    assert json.loads(_cache.fetch("second_id").content) == {"id": "second_id"}
+    assert storage_mock.download_file.call_count == 2
+
+
+def test_fetch_shares_cache_between_instances(storage_mock, _version, _cache, _cache_path):
+
+    from savegem.common.core.drive_file_cache import DriveFileCache
+
+    storage_mock.download_file.return_value = json_to_bytes_io({})
+
+    _cache.fetch("file_id")
+    DriveFileCache(str(_cache_path)).fetch("file_id")
+
+    storage_mock.download_file.assert_called_once()
+
+
+@pytest.mark.parametrize("content", ["{corrupted", json.dumps({"file_id": {"version": {}, "content": "!"}})])
+def test_fetch_downloads_file_when_cache_is_corrupted(storage_mock, _version, _cache, _cache_path, content):
+
+    _cache_path.write_text(content)
+    storage_mock.download_file.return_value = json_to_bytes_io({"value": 1})
+
+    assert json.loads(_cache.fetch("file_id").content) == {"value": 1}
+    storage_mock.download_file.assert_called_once()
+
+
+def test_fetch_downloads_file_when_cached_content_is_corrupted(storage_mock, _version, _cache, _cache_path,
+                                                               logger_mock):
+
+    _cache_path.write_text(json.dumps({"file_id": {"version": _version, "content": "!"}}))
+    storage_mock.download_file.return_value = json_to_bytes_io({"value": 1})
+
+    assert json.loads(_cache.fetch("file_id").content) == {"value": 1}
+    logger_mock.warning.assert_called_once()
+
+
+def test_fetch_returns_file_when_cache_is_not_writable(storage_mock, _version, _cache, module_patch, logger_mock):
+
+    module_patch("save_file", side_effect=OSError("Access denied."))
+    storage_mock.download_file.return_value = json_to_bytes_io({"value": 1})
+
+    assert json.loads(_cache.fetch("file_id").content) == {"value": 1}
+    logger_mock.warning.assert_called_once()
+
+
+def test_fetch_returns_none_when_file_is_not_accessible(storage_mock, _cache):
+
+    storage_mock.get_metadata.return_value = None
+
+    assert _cache.fetch("file_id") is None
+    storage_mock.download_file.assert_not_called()
+
+
+def test_fetch_returns_none_when_download_failed(storage_mock, _version, _cache, _cache_path):
+
+    storage_mock.download_file.return_value = None
+
+    assert _cache.fetch("file_id") is None
+    assert not _cache_path.exists()
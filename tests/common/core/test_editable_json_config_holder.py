@@ -55,7 +55,7 @@ def test_set_value_updates_data_and_saves(save_file_mock, _test_config_path):
 
     # 4. Assert save_file was called with the correct path, data, and as_json=True
     expected_data = {"old_key": 100, "new_key": "test_value"}
-    save_file_mock.assert_called_with(_test_config_path, expected_data, as_json=True)
+    save_file_mock.assert_called_with(_test_config_path, expected_data, as_json=True, atomic=True)
 
 
 def test_set_fully_replaces_data_and_saves(save_file_mock, _test_config_path):
@@ -85,7 +85,7 @@ def test_set_fully_replaces_data_and_saves(save_file_mock, _test_config_path):
     save_file_mock.assert_called_once()
 
     # 4. Assert save_file was called with the new data
-    save_file_mock.assert_called_with(_test_config_path, new_config, as_json=True)
+    save_file_mock.assert_called_with(_test_config_path, new_config, as_json=True, atomic=True)
 
 
 def test_before_file_open_creates_directories_and_default_file(mocker: MockerFixture, _test_config_path, save_file_mock,
@@ -113,7 +113,7 @@ def test_before_file_open_creates_directories_and_default_file(mocker: MockerFix
 
     # 5. Assert save_file was called to create the empty default file
     # This happens because os.path.exists returned False
-    save_file_mock.assert_called_once_with(_test_config_path, {}, as_json=True)
+    save_file_mock.assert_called_once_with(_test_config_path, {}, as_json=True, atomic=True)
 
     # 6. Sanity check: Assert mock_exists was called
     path_exists_mock.assert_called()
@@ -7,14 +7,14 @@ from tests.test_data import GameTestData, PlayerTestData, ConfigTestData
 
 
 @pytest.fixture
-def _download_file_mock(gdrive_mock, tmp_path: Path):
+def _download_file_mock(storage_mock, tmp_path: Path):
     """
-    Mocks GDrive.download_file to return the successful file data.
+    Mocks download_file of storage to return the successful file data.
     """
 
     from tests.util import json_to_bytes_io
 
-    gdrive_mock.download_file.return_value = json_to_bytes_io(
+    storage_mock.download_file.return_value = json_to_bytes_io(
         [
             {
                 "name": GameTestData.FirstGame,
@@ -23,6 +23,8 @@ def _download_file_mock(gdrive_mock, tmp_path: Path):
                 "process": "GameA.exe",
                 "allowAutoMode": True,
                 "filesFilter": [".*\\.sav"],
+                "compression": "lzma",
+                "retention": {"keepLast": 10, "maxAgeDays": 30},
                 "players": [PlayerTestData.FirstPlayerEmail, PlayerTestData.SecondPlayerEmail]
             },
             {
@@ -45,13 +47,58 @@ def _download_file_mock(gdrive_mock, tmp_path: Path):
                 "localPath": str(tmp_path / "GameD"),
                 "gdriveParentDirectoryId": "drive_D_id",
                 "process": "GameD.exe",
+                "compression": "brotli",
+                "retention": {"keepLast": 0}
             }
         ]
     )
 
 
+@pytest.fixture(autouse=True)
+def resolve_app_data_mock(module_patch, tmp_path: Path):
+    """
+    Keeps files of application data inside of test directory.
+    """
+    return module_patch("resolve_app_data", side_effect=lambda file_name: str(tmp_path / file_name))
+
+
 @pytest.fixture
-def _games_config(app_context, app_config, user_config_mock, app_state_mock, _download_file_mock):
+def storage_mock(mocker: MockerFixture):
+    """
+    Mocks storage backend, which is accessed through drive file cache.
+    """
+    return mocker.patch("savegem.common.core.drive_file_cache.storage").return_value
+
+
+@pytest.fixture(autouse=True)
+def _drive_file_cache(module_patch, tmp_path: Path):
+    """
+    Keeps drive file cache inside of test directory.
+    """
+
+    from constants import File
+    from savegem.common.core.drive_file_cache import DriveFileCache
+
+    cache = DriveFileCache(str(tmp_path / File.DriveFileCache))
+    module_patch("drive_file_cache", return_value=cache)
+
+    return cache
+
+
+@pytest.fixture
+def _config_version(storage_mock):
+    """
+    Mocks metadata of game configuration file.
+    """
+
+    version = {"md5Checksum": "checksum_1", "modifiedTime": "2025-01-01T00:00:00.000Z"}
+    storage_mock.get_metadata.side_effect = lambda file_id, fields: dict(version)
+
+    return version
+
+
+@pytest.fixture
+def _games_config(_config_version, app_context, app_config, user_config_mock, app_state_mock, _download_file_mock):
 
     from savegem.common.core.game_config import GameConfig
 
@@ -87,13 +134,13 @@ def _game(_game_path):
     )
 
 
-def test_download_success_and_filtering(gdrive_mock, _games_config):
+def test_download_success_and_filtering(storage_mock, _games_config):
     """
     Tests successful download and verifies filtering logic for players and hidden games.
     """
 
     _games_config.download()
-    gdrive_mock.download_file.assert_called_once_with(ConfigTestData.GameConfigFileId)
+    storage_mock.download_file.assert_called_once_with(ConfigTestData.GameConfigFileId)
 
     # Assert properties
     assert _games_config.empty is False
@@ -113,7 +160,7 @@ def test_download_success_and_filtering(gdrive_mock, _games_config):
     assert _games_config.by_name("Game D (No Filter)").name == "Game D (No Filter)"
 
 
-def test_download_failure_raises_runtime_error_and_cleans_token(_games_config, gdrive_mock, resolve_app_data_mock,
+def test_download_failure_raises_runtime_error_and_cleans_token(_games_config, storage_mock, resolve_app_data_mock,
                                                                 delete_file_mock):
     """
     Tests the failure path when GDrive download fails.
@@ -121,16 +168,98 @@ def test_download_failure_raises_runtime_error_and_cleans_token(_games_config, g
 
     from constants import File
 
-    gdrive_mock.download_file.return_value = None
+    storage_mock.download_file.return_value = None
 
     with pytest.raises(RuntimeError) as error:
         _games_config.download()
 
     assert "Configuration file ID is invalid" in str(error.value)
-    resolve_app_data_mock.assert_called_once_with(File.GDriveToken)
+    resolve_app_data_mock.assert_called_with(File.GDriveToken)
+    delete_file_mock.assert_called_once()
+
+
+def test_download_failure_when_metadata_not_accessible(_games_config, storage_mock, delete_file_mock):
+    """
+    Tests that inaccessible configuration file is handled same way as failed download.
+    """
+
+    storage_mock.get_metadata.side_effect = None
+    storage_mock.get_metadata.return_value = None
+
+    with pytest.raises(RuntimeError):
+        _games_config.download()
+
+    storage_mock.download_file.assert_not_called()
     delete_file_mock.assert_called_once()
 
 
+def test_download_skipped_when_config_not_changed(mocker: MockerFixture, storage_mock, _games_config):
+    """
+    Tests that configuration is neither downloaded nor rebuilt when its version hasn't changed.
+    """
+
+    _games_config.download()
+    games = _games_config.list
+
+    _games_config.download()
+
+    storage_mock.download_file.assert_called_once()
+    assert storage_mock.get_metadata.call_args_list == [
+        mocker.call(ConfigTestData.GameConfigFileId, "md5Checksum, modifiedTime, version")
+    ] * 2
+    assert all(game is same_game for game, same_game in zip(games, _games_config.list))
+
+
+def test_download_uses_local_cache(app_context, storage_mock, _games_config, _drive_file_cache):
+    """
+    Tests that other instances reuse configuration cached in AppData.
+    """
+
+    from savegem.common.core.game_config import GameConfig
+
+    _games_config.download()
+
+    other_config = GameConfig()
+    other_config.link(app_context)
+    other_config.download()
+
+    storage_mock.download_file.assert_called_once()
+    assert other_config.names == _games_config.names
+    assert (_drive_file_cache.hits, _drive_file_cache.misses) == (1, 1)
+
+
+def test_download_when_config_changed(storage_mock, _games_config, _config_version, tmp_path: Path):
+    """
+    Tests that configuration is downloaded again once its checksum has changed.
+    """
+
+    from tests.util import json_to_bytes_io
+
+    _games_config.download()
+
+    _config_version["md5Checksum"] = "checksum_2"
+    storage_mock.download_file.return_value = json_to_bytes_io([{"name": "New Game", "localPath": str(tmp_path)}])
+    _games_config.download()
+
+    assert storage_mock.download_file.call_count == 2
+    assert _games_config.names == ["New Game"]
+
+
+def test_download_ignores_corrupted_cache(storage_mock, _games_config, tmp_path: Path):
+    """
+    Tests that corrupted cache is replaced with downloaded configuration.
+    """
+
+    from constants import File
+
+    (tmp_path / File.DriveFileCache).write_text("{corrupted")
+
+    _games_config.download()
+
+    storage_mock.download_file.assert_called_once()
+    assert len(_games_config.names) == 2
+
+
 def test_game_config_properties(_games_config):
     """
     Tests basic properties: list, names, empty, by_name, current.
@@ -153,6 +282,80 @@ def test_game_config_properties(_games_config):
     assert _games_config.empty is False
 
 
+def test_game_config_compression(_games_config):
+    """
+    Verifies compression of each game, invalid compression is replaced with default one.
+    """
+
+    from savegem.common.util.archive import Compression
+
+    _games_config.download()
+
+    assert _games_config.by_name(GameTestData.FirstGame).compression == Compression("lzma")
+    assert _games_config.by_name("Game D (No Filter)").compression == Compression()
+
+
+def test_game_config_compression_not_available(mocker: MockerFixture, _games_config):
+    """
+    Verifies compression with codec missing in this runtime is replaced with default one.
+    """
+
+    from savegem.common.util.archive import Compression
+
+    mocker.patch.object(Compression, "is_supported", new_callable=mocker.PropertyMock, return_value=False)
+
+    _games_config.download()
+
+    assert _games_config.by_name(GameTestData.FirstGame).compression == Compression()
+
+
+def test_game_config_retention(_games_config):
+    """
+    Verifies retention of each game, all saves are kept when retention is invalid.
+    """
+
+    from savegem.common.core.game_config import Retention
+
+    _games_config.download()
+
+    assert _games_config.by_name(GameTestData.FirstGame).retention == Retention(10, 30)
+    assert _games_config.by_name("Game D (No Filter)").retention == Retention()
+    assert _games_config.by_name("Game D (No Filter)").retention.is_enabled is False
+
+
+@pytest.mark.parametrize("retention, index, age_days, is_retained", [
+    ({"keepLast": 3}, 0, 100, True),
+    ({"keepLast": 3}, 2, 100, True),
+    ({"keepLast": 3}, 3, 0, False),
+    ({"maxAgeDays": 7}, 5, 7, True),
+    ({"maxAgeDays": 7}, 1, 8, False),
+    ({"keepLast": 2, "maxAgeDays": 7}, 5, 1, True),
+    ({"keepLast": 2, "maxAgeDays": 7}, 1, 30, True),
+    ({"keepLast": 2, "maxAgeDays": 7}, 2, 8, False),
+    ({}, 100, 1000, True)
+])
+def test_retention_is_retained(retention, index, age_days, is_retained):
+    """
+    Verifies that save is kept while it's one of the last saves or it's not too old.
+    """
+
+    from datetime import datetime, timezone, timedelta
+    from savegem.common.core.game_config import Retention
+
+    now = datetime.now(timezone.utc)
+
+    assert Retention.parse(retention).is_retained(index, now - timedelta(days=age_days), now) is is_retained
+
+
+@pytest.mark.parametrize("retention", [[], {"keepLast": -1}, {"maxAgeDays": "30"}, {"keepLast": True}])
+def test_retention_parse_invalid(retention):
+
+    from savegem.common.core.game_config import Retention
+
+    with pytest.raises(ValueError):
+        Retention.parse(retention)
+
+
 def test_game_config_refresh_calls_game_meta_refresh(mocker: MockerFixture, _games_config):
     """
     Verifies that refresh() calls refresh on LocalMetadata for each game.
@@ -170,6 +373,36 @@ def test_game_config_refresh_calls_game_meta_refresh(mocker: MockerFixture, _gam
     assert mock_local_refresh.call_count == 2
 
 
+def test_refresh_drive_metadata_in_single_batch(mocker: MockerFixture, _games_config):
+    """
+    Verifies that drive metadata of all games is refreshed together.
+    """
+
+    from savegem.common.core.save_meta import DriveMetadata
+
+    _games_config.download()
+    refresh_all = mocker.patch.object(DriveMetadata, "refresh_all")
+
+    _games_config.refresh_drive_metadata()
+
+    game_a, game_d = _games_config.list
+    refresh_all.assert_called_once_with([game_a.meta.drive, game_d.meta.drive])
+
+
+def test_refresh_drive_metadata_of_no_games(mocker: MockerFixture, _games_config):
+    """
+    Verifies that no request is sent when there are no games to refresh.
+    """
+
+    from savegem.common.core.save_meta import DriveMetadata
+
+    refresh_all = mocker.patch.object(DriveMetadata, "refresh_all")
+
+    _games_config.refresh_drive_metadata([])
+
+    refresh_all.assert_not_called()
+
+
 def test_game_properties(_game):
     """
     Tests basic Game properties.
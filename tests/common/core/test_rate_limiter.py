@@ -0,0 +1,179 @@
+import json
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def _rate_limit_props(module_patch):
+    """
+    Fixture for rate limit configuration.
+    """
+
+    props = {
+        "rateLimit.requestsPerSecond": 10,
+        "rateLimit.burst": 20,
+        "rateLimit.interactiveReserve": 5
+    }
+    module_patch("prop", side_effect=lambda name: props.get(name, {}))
+
+    return props
+
+
+@pytest.fixture
+def _clock(module_patch):
+    """
+    Fixture for fake clock, sleeping moves it forward.
+    """
+
+    clock = {"now": 1000.0}
+
+    def sleep(seconds: float):
+        clock["now"] += seconds
+
+    module_patch("time.time", side_effect=lambda: clock["now"])
+    clock["sleep"] = module_patch("time.sleep", side_effect=sleep)
+
+    return clock
+
+
+@pytest.fixture
+def _state_path(tmp_path: Path):
+    return str(tmp_path / "rate_limit.json")
+
+
+def _limiter(state_path: str, priority=None):
+    from savegem.common.core.rate_limiter import RateLimiter, Priority
+    return RateLimiter(state_path, priority or Priority.Interactive)
+
+
+def _tokens(state_path: str):
+    with open(state_path, "rb") as file:
+        return json.loads(file.read())["tokens"]
+
+
+def test_should_allow_burst_without_waiting(_rate_limit_props, _clock, _state_path):
+
+    limiter = _limiter(_state_path)
+
+    for _ in range(20):
+        limiter.acquire()
+
+    _clock["sleep"].assert_not_called()
+    assert _tokens(_state_path) == 0
+
+
+def test_should_wait_when_bucket_is_empty(_rate_limit_props, _clock, _state_path):
+
+    limiter = _limiter(_state_path)
+    limiter.acquire(20)
+
+    limiter.acquire(2)
+
+    _clock["sleep"].assert_called_once_with(pytest.approx(0.2))
+    assert _tokens(_state_path) == pytest.approx(0)
+
+
+def test_should_refill_bucket_over_time(_rate_limit_props, _clock, _state_path):
+
+    limiter = _limiter(_state_path)
+    limiter.acquire(20)
+
+    _clock["now"] += 100
+    limiter.acquire()
+
+    _clock["sleep"].assert_not_called()
+    # Bucket never holds more than burst.
+    assert _tokens(_state_path) == 19
+
+
+def test_should_share_bucket_between_instances(_rate_limit_props, _clock, _state_path):
+
+    _limiter(_state_path).acquire(20)
+    _limiter(_state_path).acquire()
+
+    _clock["sleep"].assert_called_once()
+
+
+def test_background_request_should_not_take_reserved_tokens(_rate_limit_props, _clock, _state_path):
+
+    from savegem.common.core.rate_limiter import Priority
+
+    _limiter(_state_path).acquire(15)
+
+    # Remaining tokens are reserved for interactive requests.
+    _limiter(_state_path, Priority.Background).acquire()
+    _clock["sleep"].assert_called_once_with(pytest.approx(0.1))
+
+    _clock["sleep"].reset_mock()
+    _limiter(_state_path, Priority.Interactive).acquire(5)
+    _clock["sleep"].assert_not_called()
+
+
+@pytest.mark.parametrize("reserve, expected_delay", [
+    (0, None),
+    (None, 0.6),
+    ({}, 0.6)
+])
+def test_background_request_with_configured_reserve(_rate_limit_props, _clock, _state_path, reserve, expected_delay):
+
+    from savegem.common.core.rate_limiter import Priority
+
+    _rate_limit_props["rateLimit.interactiveReserve"] = reserve
+    _limiter(_state_path).acquire(15)
+
+    _limiter(_state_path, Priority.Background).acquire()
+
+    if expected_delay is None:
+        _clock["sleep"].assert_not_called()
+
+    else:
+        # Default reserve takes the rest of bucket.
+        _clock["sleep"].assert_called_once_with(pytest.approx(expected_delay))
+
+
+def test_should_take_bucket_into_debt_for_large_request(_rate_limit_props, _clock, _state_path):
+
+    limiter = _limiter(_state_path)
+
+    limiter.acquire(30)
+    _clock["sleep"].assert_not_called()
+    assert _tokens(_state_path) == -10
+
+    limiter.acquire()
+    _clock["sleep"].assert_called_once_with(pytest.approx(1.1))
+
+
+def test_should_reset_corrupted_state(_rate_limit_props, _clock, _state_path):
+
+    with open(_state_path, "w") as file:
+        file.write("{invalid")
+
+    _limiter(_state_path).acquire()
+
+    _clock["sleep"].assert_not_called()
+    assert _tokens(_state_path) == 19
+
+
+def test_should_not_limit_requests_when_state_is_inaccessible(_rate_limit_props, _clock, tmp_path: Path):
+
+    limiter = _limiter(str(tmp_path / "missing" / "rate_limit.json"))
+
+    for _ in range(30):
+        limiter.acquire()
+
+    _clock["sleep"].assert_not_called()
+
+
+def test_rate_limiter_is_stored_in_app_data(module_patch):
+
+    from constants import File
+    from savegem.common.core import rate_limiter as module
+
+    module_patch("_rate_limiter", new=None)
+    resolve_app_data_mock = module_patch("resolve_app_data", return_value="/app/data/rate_limiter.json")
+
+    limiter = module.rate_limiter()
+
+    assert limiter is module.rate_limiter()
+    resolve_app_data_mock.assert_called_once_with(File.RateLimiter)
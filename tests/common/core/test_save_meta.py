@@ -1,3 +1,4 @@
+import io
 from datetime import datetime
 from unittest.mock import MagicMock, call, PropertyMock
 
@@ -27,8 +28,8 @@ def _config_holder(module_patch):
 
 
 @pytest.fixture
-def _gdrive(module_patch):
-    return module_patch("GDrive", autospec=True)
+def _storage(module_patch):
+    return module_patch("storage").return_value
 
 
 @pytest.fixture
@@ -39,7 +40,7 @@ def mock_checksum_utils(module_patch):
     return {
         "new": module_patch("hashlib.new", return_value=mock_hash_instance),
         "hash_instance": mock_hash_instance,
-        "file_checksum": module_patch("file_checksum", return_value="FILE_HASH_PART")
+        "checksum_cache": module_patch("checksum_cache")
     }
 
 
@@ -155,6 +156,7 @@ def test_local_metadata_calculate_checksum(mock_game, _config_holder, mock_check
     from savegem.common.core.save_meta import LocalMetadata
 
     local_meta = LocalMetadata(mock_game)
+    mock_checksum_utils["checksum_cache"].return_value.digests.return_value = ["FILE_HASH_PART", "FILE_HASH_PART"]
 
     # Act
     checksum = local_meta.calculate_checksum()
@@ -162,12 +164,11 @@ def test_local_metadata_calculate_checksum(mock_game, _config_holder, mock_check
     # Assert the final result
     assert checksum == "FINAL_CALCULATED_HASH"
 
-    # Verify file_checksum was called for all save files (excluding metadata)
-    mock_checksum_utils["file_checksum"].assert_has_calls([
-        call(MOCK_SAVE_FILE_A),
-        call(MOCK_SAVE_FILE_B)
-    ], any_order=False)
-    assert mock_checksum_utils["file_checksum"].call_count == 2
+    # Verify digests were requested for all save files (excluding metadata)
+    mock_checksum_utils["checksum_cache"].return_value.digests.assert_called_once_with([
+        MOCK_SAVE_FILE_A,
+        MOCK_SAVE_FILE_B
+    ])
 
     # Verify hashlib was initialized with SHA_256
     mock_checksum_utils["new"].assert_called_once_with("sha256")
@@ -194,22 +195,21 @@ def test_local_metadata_refresh(mock_game, _config_holder):
 
 # --- DriveMetadata Tests ---
 
-def test_drive_metadata_refresh_success(mock_game, _gdrive):
+def test_drive_metadata_refresh_success(mock_game, _storage):
 
     from savegem.common.core.save_meta import SaveMetaProp, DriveMetadata
 
     drive_meta = DriveMetadata(mock_game)
 
-    _gdrive.query_single.return_value = {
-        "files": [{
-            "id": "file_id_1",
-            "createdTime": "2024-03-15T10:00:00Z",
-            "appProperties": {
-                SaveMetaProp.Owner: "GDriveUser",
-                SaveMetaProp.Checksum: "drive_hash_123"
-            }
-        }]
-    }
+    _storage.list_latest.return_value = [{
+        "id": "file_id_1",
+        "createdTime": "2024-03-15T10:00:00Z",
+        "size": "2048",
+        "appProperties": {
+            SaveMetaProp.Owner: "GDriveUser",
+            SaveMetaProp.Checksum: "drive_hash_123"
+        }
+    }]
 
     drive_meta.refresh()
 
@@ -218,16 +218,79 @@ def test_drive_metadata_refresh_success(mock_game, _gdrive):
     assert drive_meta.owner == "GDriveUser"
     assert drive_meta.created_time == "2024-03-15T10:00:00Z"
     assert drive_meta.checksum == "drive_hash_123"
+    assert drive_meta.size == 2048
+
+    _storage.list_latest.assert_called_once_with([mock_game.drive_directory], DriveMetadata.Fields,
+                                                 DriveMetadata.MimeTypes, SaveMetaProp.Checksum)
+
+
+def test_drive_metadata_refresh_all_at_once(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.save_meta import DriveMetadata, SaveMetaProp
+
+    games = [mocker.Mock(drive_directory=f"drive_{name}") for name in ("a", "b", "c")]
+    metadata = [DriveMetadata(game) for game in games]
+
+    _storage.list_latest.return_value = [{"id": "save_a", "appProperties": {}}, {"id": "save_b"}, {}]
+
+    DriveMetadata.refresh_all(metadata)
+
+    assert [meta.id for meta in metadata] == ["save_a", "save_b", None]
+    assert [meta.is_present for meta in metadata] == [True, True, False]
+    _storage.list_latest.assert_called_once_with(["drive_a", "drive_b", "drive_c"], DriveMetadata.Fields,
+                                                 DriveMetadata.MimeTypes, SaveMetaProp.Checksum)
+
 
-    _gdrive.query_single.assert_called_once()
+def test_drive_metadata_refresh_all_continues_after_failed_game(mocker: MockerFixture, _storage, logger_mock):
 
+    from savegem.common.core.save_meta import DriveMetadata
+
+    games = [mocker.Mock(drive_directory=f"drive_{name}") for name in ("a", "b")]
+    metadata = [DriveMetadata(game) for game in games]
+
+    _storage.list_latest.return_value = [None, {"id": "save_b", "appProperties": {}}]
 
-def test_drive_metadata_refresh_no_saves(mock_game, _gdrive, _logger):
+    DriveMetadata.refresh_all(metadata)
+
+    assert [meta.id for meta in metadata] == [None, "save_b"]
+    assert [meta.is_present for meta in metadata] == [False, True]
+    logger_mock.error.assert_called_once()
+
+
+@pytest.mark.parametrize("mime_type, is_chunked", [
+    ("application/zip", False),
+    ("application/vnd.savegem.chunks+json", True)
+])
+def test_drive_metadata_is_chunked(mock_game, _storage, mime_type, is_chunked):
 
     from savegem.common.core.save_meta import DriveMetadata
 
     drive_meta = DriveMetadata(mock_game)
-    _gdrive.query_single.return_value = {"files": []}
+    drive_meta.apply({"id": "file_id_1", "mimeType": mime_type, "appProperties": {}})
+
+    assert drive_meta.is_chunked is is_chunked
+
+
+def test_drive_metadata_compression(mock_game, _storage):
+
+    from savegem.common.core.save_meta import SaveMetaProp, DriveMetadata
+
+    drive_meta = DriveMetadata(mock_game)
+    drive_meta.apply({"id": "file_id_1", "appProperties": {SaveMetaProp.Compression: "lzma"}})
+
+    assert drive_meta.compression == "lzma"
+
+    drive_meta.apply({"id": "file_id_2", "appProperties": {}})
+
+    assert drive_meta.compression is None
+
+
+def test_drive_metadata_refresh_no_saves(mock_game, _storage, _logger):
+
+    from savegem.common.core.save_meta import DriveMetadata
+
+    drive_meta = DriveMetadata(mock_game)
+    _storage.list_latest.return_value = [{}]
 
     drive_meta.refresh()
 
@@ -237,17 +300,17 @@ def test_drive_metadata_refresh_no_saves(mock_game, _gdrive, _logger):
     _logger.warning.assert_called_once_with("There are no saves on Google Drive for %s.", "Test Game")
 
 
-def test_drive_metadata_refresh_runtime_error(mock_game, _gdrive, _logger):
+def test_drive_metadata_refresh_runtime_error(mock_game, _storage, _logger):
     """
-    Tests refresh when GDrive query returns None (indicating a structural error).
+    Tests refresh when latest save couldn't be listed (indicating a structural error).
     """
 
     from savegem.common.core.save_meta import DriveMetadata
 
     drive_meta = DriveMetadata(mock_game)
 
-    # Arrange: Mock the GDrive query result to be None
-    _gdrive.query_single.return_value = None
+    # Arrange: Mock the listing result to be None
+    _storage.list_latest.return_value = [None]
 
     # Act & Assert
     with pytest.raises(RuntimeError, match="Error downloading metadata"):
@@ -258,6 +321,102 @@ def test_drive_metadata_refresh_runtime_error(mock_game, _gdrive, _logger):
     assert "Error downloading metadata" in _logger.error.call_args[0][0]
 
 
+def test_drive_metadata_downloads_manifest_once(mock_game, _storage):
+
+    from savegem.common.core.save_meta import SaveMetaProp, DriveMetadata
+
+    drive_meta = DriveMetadata(mock_game)
+    metadata = {"id": "file_id_1", "appProperties": {SaveMetaProp.Manifest: "manifest_id"}}
+    _storage.download_file.return_value = io.BytesIO(b'{"save_a.dat": [10, "digest"]}')
+
+    drive_meta.apply(metadata)
+
+    assert drive_meta.manifest == {"save_a.dat": [10, "digest"]}
+    assert drive_meta.manifest == {"save_a.dat": [10, "digest"]}
+    _storage.download_file.assert_called_once_with("manifest_id")
+
+    # Same save, manifest is not downloaded again.
+    drive_meta.apply(metadata)
+    assert drive_meta.manifest is not None
+    _storage.download_file.assert_called_once()
+
+
+def test_drive_metadata_without_manifest(mock_game, _storage):
+
+    from savegem.common.core.save_meta import DriveMetadata
+
+    drive_meta = DriveMetadata(mock_game)
+    drive_meta.apply({"id": "file_id_1", "appProperties": {}})
+
+    assert drive_meta.manifest is None
+    _storage.download_file.assert_not_called()
+
+
+@pytest.mark.parametrize("data", [None, io.BytesIO(b"{corrupted")])
+def test_drive_metadata_manifest_unavailable(mock_game, _storage, _logger, data):
+
+    from savegem.common.core.save_meta import SaveMetaProp, DriveMetadata
+
+    drive_meta = DriveMetadata(mock_game)
+    drive_meta.apply({"id": "file_id_1", "appProperties": {SaveMetaProp.Manifest: "manifest_id"}})
+    _storage.download_file.return_value = data
+
+    assert drive_meta.manifest is None
+
+
+def test_local_metadata_calculate_manifest(mock_game, _config_holder, module_patch):
+
+    from savegem.common.core.save_meta import LocalMetadata
+
+    module_patch("checksum_cache").return_value.digests.return_value = ["digest_a", "digest_b"]
+    module_patch("os.path.getsize", side_effect=[10, 20])
+
+    manifest = LocalMetadata(mock_game).calculate_manifest()
+
+    assert manifest == {"save_a.dat": [10, "digest_a"], "save_b.dat": [20, "digest_b"]}
+
+
+def test_manifest_checksum_matches_save_checksum(mock_game, _config_holder, module_patch):
+
+    from savegem.common.core.save_meta import LocalMetadata, manifest_checksum
+
+    module_patch("checksum_cache").return_value.digests.return_value = ["digest_a", "digest_b"]
+
+    checksum = LocalMetadata(mock_game).calculate_checksum()
+
+    assert manifest_checksum({"save_b.dat": [20, "digest_b"], "save_a.dat": [10, "digest_a"]}) == checksum
+
+
+def test_metadata_wrapper_diverging_files(_local_meta, _drive_meta):
+
+    from savegem.common.core.save_meta import MetadataWrapper
+
+    _local_meta.calculate_manifest.return_value = {
+        "same.sav": [1, "digest"],
+        "changed.sav": [1, "old_digest"],
+        "local_only.sav": [1, "digest"]
+    }
+    type(_drive_meta).manifest = PropertyMock(return_value={
+        "same.sav": [1, "digest"],
+        "changed.sav": [1, "new_digest"],
+        "drive_only.sav": [1, "digest"]
+    })
+
+    wrapper = MetadataWrapper(_local_meta, _drive_meta)
+
+    assert wrapper.diverging_files == ["changed.sav", "drive_only.sav", "local_only.sav"]
+
+
+def test_metadata_wrapper_diverging_files_without_manifest(_local_meta, _drive_meta):
+
+    from savegem.common.core.save_meta import MetadataWrapper
+
+    type(_drive_meta).manifest = PropertyMock(return_value=None)
+
+    assert MetadataWrapper(_local_meta, _drive_meta).diverging_files is None
+    _local_meta.calculate_manifest.assert_not_called()
+
+
 # Parameterized test for all sync_status scenarios
 @pytest.mark.parametrize(
     "drive_present, local_stored_checksum, local_calculated_checksum, drive_stored_checksum, expected_status",
@@ -0,0 +1,188 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def _staging_props(module_patch):
+    """
+    Fixture for staging area configuration, defaults are used unless overridden.
+    """
+
+    props = {}
+    module_patch("prop", side_effect=lambda name: props.get(name, {}))
+
+    return props
+
+
+@pytest.fixture
+def _area(tmp_path: Path, _staging_props):
+    from savegem.common.core.staging_area import StagingArea
+    return StagingArea(str(tmp_path / "staging.json"))
+
+
+@pytest.fixture
+def _directory(tmp_path: Path):
+    directory = tmp_path / "saves"
+    directory.mkdir()
+
+    return str(directory)
+
+
+def _registry(tmp_path: Path):
+    return json.loads((tmp_path / "staging.json").read_text())
+
+
+def test_should_create_unique_workspaces(_area, _directory, tmp_path: Path):
+
+    with _area.workspace(_directory) as first, _area.workspace(_directory) as second:
+        assert first != second
+        assert os.path.isdir(first)
+        assert os.path.isdir(second)
+        assert os.path.dirname(first) == os.path.dirname(_directory)
+        assert set(_registry(tmp_path)) == {first, second}
+
+    assert not os.path.exists(first)
+    assert not os.path.exists(second)
+    assert _registry(tmp_path) == {}
+
+
+def test_should_remove_workspace_on_failure(_area, _directory, tmp_path: Path):
+
+    with pytest.raises(ValueError):
+        with _area.workspace(_directory) as workspace:
+            Path(workspace, "save.sav").write_bytes(b"partial save")
+            raise ValueError("Download failed")
+
+    assert not os.path.exists(workspace)
+    assert _registry(tmp_path) == {}
+
+
+def test_should_allow_workspace_to_be_moved(_area, _directory, tmp_path: Path):
+
+    target_directory = str(tmp_path / "target")
+
+    with _area.workspace(_directory) as workspace:
+        os.rename(workspace, target_directory)
+
+    assert os.path.isdir(target_directory)
+    assert _registry(tmp_path) == {}
+
+
+def test_should_fail_when_quota_is_exceeded(_area, _staging_props, _directory, tmp_path: Path):
+
+    _staging_props["staging.maxSizeMb"] = 1
+
+    with _area.workspace(_directory, 512 * 1024):
+        with pytest.raises(RuntimeError):
+            with _area.workspace(_directory, 768 * 1024):
+                pass
+
+    # Reserved size is released with workspace.
+    with _area.workspace(_directory, 768 * 1024):
+        pass
+
+    assert _registry(tmp_path) == {}
+
+
+def test_should_sweep_workspaces_of_stopped_processes(_area, _directory, tmp_path: Path):
+
+    from savegem.common.core.staging_area import StagingArea
+
+    orphan = tmp_path / "saves.staging-1-orphan"
+    reused = tmp_path / "saves.staging-2-reused"
+
+    for workspace in (orphan, reused):
+        workspace.mkdir()
+        (workspace / "save.sav").write_bytes(b"partial save")
+
+    with _area.workspace(_directory) as workspace:
+        registry = _registry(tmp_path)
+        registry[str(orphan)] = {StagingArea.Pid: 2 ** 22 + 1, StagingArea.CreateTime: 0, StagingArea.Size: 0}
+        # Process ID has been reused by another process.
+        registry[str(reused)] = {StagingArea.Pid: os.getpid(), StagingArea.CreateTime: 0, StagingArea.Size: 0}
+        (tmp_path / "staging.json").write_text(json.dumps(registry))
+
+        _area.sweep()
+
+        assert not orphan.exists()
+        assert not reused.exists()
+        assert os.path.isdir(workspace)
+        assert set(_registry(tmp_path)) == {workspace}
+
+
+def test_should_reset_corrupted_registry(_area, _directory, tmp_path: Path):
+
+    (tmp_path / "staging.json").write_text("{")
+
+    with _area.workspace(_directory) as workspace:
+        assert set(_registry(tmp_path)) == {workspace}
+
+
+@pytest.mark.parametrize("content", ["{", "[]"])
+def test_should_reset_invalid_registry(_area, _directory, tmp_path: Path, content):
+
+    (tmp_path / "staging.json").write_text(content)
+
+    with _area.workspace(_directory) as workspace:
+        assert set(_registry(tmp_path)) == {workspace}
+
+
+def test_should_share_registry_between_processes(module_patch, _area, _directory, tmp_path: Path):
+
+    from savegem.common.core.staging_area import StagingArea
+    from savegem.common.util.file import locked_file as real_locked_file
+
+    locked_file = module_patch("locked_file", side_effect=real_locked_file)
+    other_area = StagingArea(str(tmp_path / "staging.json"))
+
+    with _area.workspace(_directory) as first, other_area.workspace(_directory) as second:
+        assert set(_registry(tmp_path)) == {first, second}
+
+    assert _registry(tmp_path) == {}
+    assert all(call.args == (str(tmp_path / "staging.json"),) for call in locked_file.call_args_list)
+
+
+def test_should_work_when_registry_is_not_accessible(module_patch, _area, _staging_props, _directory):
+
+    module_patch("locked_file", side_effect=PermissionError("Access is denied"))
+    _staging_props["staging.maxSizeMb"] = 1
+
+    with _area.workspace(_directory) as workspace:
+        assert os.path.isdir(workspace)
+
+    assert not os.path.exists(workspace)
+
+    with pytest.raises(RuntimeError):
+        with _area.workspace(_directory, 2 * 1024 * 1024):
+            pass
+
+
+def test_should_keep_modification_when_registry_failed_to_be_stored(mocker, module_patch, _area, _directory):
+
+    file = mocker.MagicMock()
+    file.read.return_value = b""
+    file.write.side_effect = OSError("Disk is full")
+    module_patch("locked_file").return_value.__enter__.return_value = file
+
+    remove_orphans = mocker.spy(_area, "_StagingArea__remove_orphans")
+
+    _area.sweep()
+
+    remove_orphans.assert_called_once_with({})
+
+
+def test_staging_area_is_stored_in_app_data(module_patch):
+
+    from constants import File
+    from savegem.common.core import staging_area as module
+
+    module_patch("_staging_area", new=None)
+    resolve_app_data_mock = module_patch("resolve_app_data", return_value="/app/data/staging.json")
+
+    area = module.staging_area()
+
+    assert area is module.staging_area()
+    resolve_app_data_mock.assert_called_once_with(File.StagingArea)
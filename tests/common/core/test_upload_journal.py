@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def _journal(tmp_path: Path):
+    from savegem.common.core.upload_journal import UploadJournal
+    return UploadJournal(str(tmp_path / "uploads.json"))
+
+
+@pytest.fixture
+def _save_file(tmp_path: Path):
+    file_path = tmp_path / "save.sav"
+    file_path.write_bytes(b"save data")
+
+    return str(file_path)
+
+
+def test_should_return_saved_entry(_journal):
+
+    _journal.save("Game", {"uri": "session_uri", "fingerprint": "fingerprint"})
+
+    assert _journal.get("Game", "fingerprint") == {"uri": "session_uri", "fingerprint": "fingerprint"}
+    assert _journal.get("Other Game", "fingerprint") is None
+
+
+def test_should_drop_entry_with_different_fingerprint(_journal):
+
+    _journal.save("Game", {"fingerprint": "old_fingerprint"})
+
+    assert _journal.get("Game", "new_fingerprint") is None
+    assert _journal.get("Game", "old_fingerprint") is None
+
+
+def test_should_remove_entry(_journal):
+
+    _journal.save("Game", {"fingerprint": "fingerprint"})
+    _journal.save("Other Game", {"fingerprint": "fingerprint"})
+
+    _journal.remove("Game")
+
+    assert _journal.get("Game", "fingerprint") is None
+    assert _journal.get("Other Game", "fingerprint") is not None
+
+
+def test_should_be_shared_between_instances(tmp_path: Path, _journal):
+
+    from savegem.common.core.upload_journal import UploadJournal
+
+    _journal.save("Game", {"fingerprint": "fingerprint"})
+
+    assert UploadJournal(str(tmp_path / "uploads.json")).get("Game", "fingerprint") is not None
+
+
+def test_should_reset_corrupted_journal(tmp_path: Path, _journal, logger_mock):
+
+    (tmp_path / "uploads.json").write_text("{corrupted")
+
+    assert _journal.get("Game", "fingerprint") is None
+    logger_mock.warning.assert_called_once()
+
+
+def test_should_not_fail_when_journal_could_not_be_stored(module_patch, _journal, logger_mock):
+
+    module_patch("save_file", side_effect=OSError("Disk is full"))
+
+    _journal.save("Game", {"fingerprint": "fingerprint"})
+
+    logger_mock.warning.assert_called_once()
+
+
+def test_fingerprint_changes_when_file_is_modified(_save_file):
+
+    from savegem.common.core.upload_journal import UploadJournal
+
+    fingerprint = UploadJournal.fingerprint([_save_file])
+    assert UploadJournal.fingerprint([_save_file]) == fingerprint
+
+    stat = os.stat(_save_file)
+    os.utime(_save_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert UploadJournal.fingerprint([_save_file]) != fingerprint
+
+
+def test_upload_journal_is_stored_in_app_data(module_patch):
+
+    from constants import File
+    from savegem.common.core import upload_journal as module
+
+    module_patch("_upload_journal", new=None)
+    resolve_app_data_mock = module_patch("resolve_app_data", return_value="/app/data/uploads.json")
+
+    journal = module.upload_journal()
+
+    assert journal is module.upload_journal()
+    resolve_app_data_mock.assert_called_once_with(File.UploadJournal)
@@ -0,0 +1,319 @@
+import io
+import os
+import zlib
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+import pytest
+
+from tests.test_data import PlayerTestData
+
+
+class _FakeDrive:
+    """
+    In-memory storage with single chunks folder.
+    """
+
+    def __init__(self):
+        self.folder_id = None
+        self.files = {}
+        self.properties = {}
+        self.created_times = {}
+        self.downloaded = []
+
+    def list_files(self, directory_id, fields, mime_types=None):
+        if directory_id == self.folder_id:
+            return [
+                {
+                    "id": file_id,
+                    "name": name,
+                    "createdTime": self.created_times[file_id].isoformat().replace("+00:00", "Z"),
+                    "appProperties": self.properties[file_id]
+                }
+                for file_id, (name, _) in self.files.items()
+            ]
+
+        return [] if self.folder_id is None else [{"id": self.folder_id, "name": "chunks"}]
+
+    def create_folder(self, folder_name, parent_directory_id):
+        self.folder_id = "chunks_folder_id"
+        return self.folder_id
+
+    def create_file(self, file_name, data, parent_directory_id, mime_type, properties=None):
+        file_id = f"file_{len(self.files)}"
+        self.files[file_id] = (file_name, data)
+        self.properties[file_id] = properties
+        self.created_times[file_id] = datetime.now(timezone.utc)
+        return file_id
+
+    def download_file(self, file_id):
+        self.downloaded.append(file_id)
+        return io.BytesIO(self.files[file_id][1])
+
+
+@pytest.fixture(autouse=True)
+def _setup(user_config_mock):
+    pass
+
+
+@pytest.fixture
+def _drive(module_patch):
+    drive = _FakeDrive()
+    storage_mock = module_patch("storage").return_value
+
+    for method in ["list_files", "create_folder", "create_file", "download_file"]:
+        getattr(storage_mock, method).side_effect = getattr(drive, method)
+
+    return drive
+
+
+@pytest.fixture
+def _save_files(tmp_path: Path):
+    saves_directory = tmp_path / "saves"
+    saves_directory.mkdir()
+
+    (saves_directory / "large.sav").write_bytes(os.urandom(6 * 1024 * 1024))
+    (saves_directory / "small.sav").write_bytes(b"small save")
+
+    return saves_directory
+
+
+def _store():
+    from savegem.common.service.chunk_store import ChunkStore
+    return ChunkStore("drive_directory", 2)
+
+
+def _file_paths(directory: Path):
+    return [str(directory / name) for name in sorted(os.listdir(directory))]
+
+
+def test_upload_files(_drive, _save_files):
+
+    import hashlib
+    from savegem.common.service.chunk_store import ChunkStore
+
+    subscriber = []
+    files = _store().upload_files(_file_paths(_save_files), subscriber=subscriber.append)
+
+    large = (_save_files / "large.sav").read_bytes()
+    entry = files["large.sav"]
+
+    assert entry[ChunkStore.Size] == len(large)
+    assert entry[ChunkStore.Digest] == hashlib.sha256(large).hexdigest()
+    assert len(entry[ChunkStore.Chunks]) > 1
+
+    # Chunks are compressed and named after their digest.
+    stored = {name: zlib.decompress(data) for name, data in _drive.files.values()}
+    assert b"".join(stored[chunk_id] for chunk_id in entry[ChunkStore.Chunks]) == large
+    assert _drive.folder_id is not None
+    assert subscriber[-1] == 1
+
+
+def test_upload_files_skips_stored_chunks(_drive, _save_files):
+
+    _store().upload_files(_file_paths(_save_files))
+    uploaded_count = len(_drive.files)
+
+    # Same data, nothing is uploaded.
+    _store().upload_files(_file_paths(_save_files))
+    assert len(_drive.files) == uploaded_count
+
+    # Only chunk around modified data is uploaded.
+    large = bytearray((_save_files / "large.sav").read_bytes())
+    large[100:110] = b"modified!!"
+    (_save_files / "large.sav").write_bytes(large)
+
+    _store().upload_files(_file_paths(_save_files))
+    assert len(_drive.files) == uploaded_count + 1
+
+
+def test_upload_files_with_repeated_chunks(_drive, tmp_path: Path):
+
+    data = os.urandom(1024 * 1024)
+    (tmp_path / "first.sav").write_bytes(data)
+    (tmp_path / "second.sav").write_bytes(data)
+
+    files = _store().upload_files(_file_paths(tmp_path))
+
+    assert len(_drive.files) == len(files["first.sav"]["chunks"])
+
+
+def test_download_files_reuses_local_chunks(_drive, _save_files, tmp_path: Path):
+
+    original = (_save_files / "large.sav").read_bytes()
+    files = _store().upload_files(_file_paths(_save_files))
+
+    # Local save has diverged in the middle.
+    modified = bytearray(original)
+    modified[3 * 1024 * 1024:3 * 1024 * 1024 + 10] = b"modified!!"
+    (_save_files / "large.sav").write_bytes(modified)
+
+    target_directory = tmp_path / "target"
+    target_directory.mkdir()
+
+    _store().download_files(files, str(target_directory), _file_paths(_save_files))
+
+    assert (target_directory / "large.sav").read_bytes() == original
+    assert (target_directory / "small.sav").read_bytes() == b"small save"
+    assert len(_drive.downloaded) == 1
+
+
+def test_download_files_without_local_files(_drive, _save_files, tmp_path: Path):
+
+    files = _store().upload_files(_file_paths(_save_files))
+
+    _store().download_files(files, str(tmp_path), [])
+
+    assert (tmp_path / "large.sav").read_bytes() == (_save_files / "large.sav").read_bytes()
+    assert len(_drive.downloaded) == len(_drive.files)
+
+
+def test_download_files_detects_corrupted_chunk(_drive, _save_files, tmp_path: Path):
+
+    files = _store().upload_files(_file_paths(_save_files))
+
+    for file_id, (name, _) in _drive.files.items():
+        _drive.files[file_id] = (name, zlib.compress(b"corrupted"))
+
+    with pytest.raises(ValueError):
+        _store().download_files(files, str(tmp_path), [])
+
+
+def test_download_files_rejects_unsafe_names(_drive, _save_files, tmp_path: Path):
+
+    files = _store().upload_files(_file_paths(_save_files))
+
+    with pytest.raises(ValueError):
+        _store().download_files({"../evil.sav": files["small.sav"]}, str(tmp_path / "target"), [])
+
+
+def test_download_files_fails_when_chunks_folder_is_missing(_drive, tmp_path: Path):
+
+    with pytest.raises(RuntimeError):
+        _store().download_files({}, str(tmp_path), [])
+
+
+def test_download_files_with_same_store(_drive, _save_files, tmp_path: Path):
+
+    store = _store()
+    subscriber = []
+    files = store.upload_files(_file_paths(_save_files))
+
+    store.download_files(files, str(tmp_path), _file_paths(_save_files), subscriber=subscriber.append)
+
+    assert (tmp_path / "small.sav").read_bytes() == b"small save"
+    assert subscriber[-1] == 1
+    assert _drive.downloaded == []
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda drive, file_id: drive.files.pop(file_id),
+    lambda drive, file_id: drive.files.update({file_id: (drive.files[file_id][0], b"not compressed")})
+])
+def test_download_files_fails_when_chunk_is_not_available(_drive, tmp_path: Path, corrupt):
+
+    (tmp_path / "save.sav").write_bytes(b"save")
+    files = _store().upload_files([str(tmp_path / "save.sav")])
+    corrupt(_drive, next(iter(_drive.files)))
+
+    with pytest.raises(ValueError):
+        _store().download_files(files, str(tmp_path), [])
+
+
+def test_download_files_fails_when_chunk_download_failed(_drive, tmp_path: Path):
+
+    from savegem.common.service.chunk_store import storage
+
+    (tmp_path / "save.sav").write_bytes(b"save")
+    files = _store().upload_files([str(tmp_path / "save.sav")])
+    storage().download_file.side_effect = lambda file_id: None
+
+    with pytest.raises(ValueError, match="Failed to download"):
+        _store().download_files(files, str(tmp_path), [])
+
+
+def test_download_files_detects_modified_file(_drive, _save_files, tmp_path: Path):
+
+    from savegem.common.service.chunk_store import ChunkStore
+
+    files = _store().upload_files(_file_paths(_save_files))
+    files["small.sav"][ChunkStore.Digest] = "digest"
+
+    with pytest.raises(ValueError, match="doesn't match"):
+        _store().download_files(files, str(tmp_path), [])
+
+
+def test_upload_files_fails_when_chunk_upload_failed(module_patch, _drive, _save_files):
+
+    module_patch("storage").return_value.create_file.side_effect = RuntimeError("Upload failed.")
+
+    with pytest.raises(RuntimeError, match="Upload failed"):
+        _store().upload_files(_file_paths(_save_files))
+
+
+@pytest.mark.parametrize("folders, message", [
+    ([None], "Failed to find chunks folder"),
+    ([[{"id": "chunks_folder_id", "name": "chunks"}], None], "Failed to list chunks")
+])
+def test_upload_files_fails_when_chunks_are_not_listed(module_patch, _drive, _save_files, folders, message):
+
+    module_patch("storage").return_value.list_files.side_effect = folders
+
+    with pytest.raises(RuntimeError, match=message):
+        _store().upload_files(_file_paths(_save_files))
+
+
+def test_upload_files_sets_owner_of_chunks(_drive, _save_files):
+
+    _store().upload_files(_file_paths(_save_files))
+
+    assert all(properties == {"owner": PlayerTestData.FirstPlayerName} for properties in _drive.properties.values())
+
+
+def test_find_unreferenced_chunks(_drive, _save_files):
+
+    files = _store().upload_files(_file_paths(_save_files))
+    referenced_ids = files["large.sav"]["chunks"]
+    unreferenced_ids = [file_id for file_id, (name, _) in _drive.files.items() if name not in referenced_ids]
+
+    for file_id in _drive.files:
+        _drive.created_times[file_id] -= timedelta(days=2)
+
+    result = _store().find_unreferenced(referenced_ids, datetime.now(timezone.utc) - timedelta(days=1))
+
+    assert len(unreferenced_ids) > 0
+    assert result == unreferenced_ids
+
+
+def test_find_unreferenced_chunks_keeps_recent_chunks(_drive, _save_files):
+
+    _store().upload_files(_file_paths(_save_files))
+
+    assert _store().find_unreferenced([], datetime.now(timezone.utc) - timedelta(days=1)) == []
+
+
+def test_find_unreferenced_chunks_keeps_chunks_of_other_players(_drive, _save_files):
+
+    _store().upload_files(_file_paths(_save_files))
+
+    for file_id in _drive.files:
+        _drive.properties[file_id] = {"owner": PlayerTestData.SecondPlayerName}
+
+    assert _store().find_unreferenced([], datetime.now(timezone.utc) + timedelta(days=1)) == []
+
+
+def test_find_unreferenced_chunks_without_folder(_drive):
+
+    assert _store().find_unreferenced([], datetime.now(timezone.utc)) == []
+
+
+def test_find_unreferenced_chunks_when_listing_failed(_drive, _save_files):
+
+    from savegem.common.service.chunk_store import storage
+
+    _store().upload_files(_file_paths(_save_files))
+    storage().list_files.side_effect = lambda directory_id, *args: \
+        None if directory_id == _drive.folder_id else _drive.list_files(directory_id, *args)
+
+    with pytest.raises(RuntimeError):
+        _store().find_unreferenced([], datetime.now(timezone.utc))
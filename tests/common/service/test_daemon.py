@@ -37,7 +37,7 @@ def _mock_daemon():
 
 
 @pytest.fixture(autouse=True)
-def _setup(mocker: MockerFixture, json_config_holder_mock):
+def _setup(mocker: MockerFixture, module_patch, json_config_holder_mock):
 
     from tests.tools.mocks.mock_json_config_holder import MockJsonConfigHolder
 
@@ -49,6 +49,9 @@ def _setup(mocker: MockerFixture, json_config_holder_mock):
     mocker.spy(mock_holder, "get_value")
     json_config_holder_mock.return_value = mock_holder
 
+    module_patch("staging_area")
+    module_patch("rate_limiter")
+
 
 @pytest.fixture
 def mock_sys_exit(mocker: MockerFixture):
@@ -130,16 +133,16 @@ def test_daemon_start_work_loop_no_auth(mocker: MockerFixture, path_exists_mock,
     assert time_sleep_mock.call_count == 1
 
 
-def test_daemon_start_auth_required_delayed(mocker: MockerFixture, resolve_app_data_mock, path_exists_mock,
-                                            module_patch, time_sleep_mock, logger_mock, _mock_daemon):
+def test_daemon_start_auth_required_delayed(mocker: MockerFixture, path_exists_mock, storage_mock,
+                                            time_sleep_mock, logger_mock, _mock_daemon):
     """
     Test the loop when authentication is required and delayed.
     """
 
     from savegem.common.service.daemon import ExitTestLoop
 
-    resolve_app_data_mock.return_value = "/mock/appdata/gdrive_token.txt"
-    path_exists_mock.side_effect = [False, False, True, ExitTestLoop]
+    path_exists_mock.return_value = False
+    storage_mock.is_authenticated.side_effect = [False, True, ExitTestLoop]
 
     daemon = _mock_daemon("AuthService", requires_auth=True)
 
@@ -149,11 +152,10 @@ def test_daemon_start_auth_required_delayed(mocker: MockerFixture, resolve_app_d
     with pytest.raises(ExitTestLoop):
         daemon.start()
 
-    # The side_effect of os.path.exists determines the flow:
-    # 1. Loop 1: os.path.exists -> False (Auth not done, calls time.sleep)
-    # 2. Loop 2: os.path.exists -> False (Auth not done, calls time.sleep)
-    # 3. Loop 3: os.path.exists -> True (Auth done, calls _work)
-    # 4. Loop 4: os.path.exists -> ExitTestLoop (Breaks the loop)
+    # The side_effect of is_authenticated determines the flow:
+    # 1. Loop 1: is_authenticated -> False (Auth not done, calls time.sleep)
+    # 2. Loop 2: is_authenticated -> True (Auth done, calls _work and time.sleep)
+    # 3. Loop 3: is_authenticated -> ExitTestLoop (Breaks the loop)
 
     assert logger_mock.debug.call_count == 1
     logger_mock.debug.assert_any_call(
@@ -164,15 +166,14 @@ def test_daemon_start_auth_required_delayed(mocker: MockerFixture, resolve_app_d
     assert time_sleep_mock.call_count == 2
 
 
-def test_daemon_start_work_exception_handling(mocker: MockerFixture, resolve_app_data_mock, path_exists_mock,
-                                              time_sleep_mock, logger_mock, _mock_daemon):
+def test_daemon_start_work_exception_handling(mocker: MockerFixture, path_exists_mock, time_sleep_mock,
+                                              logger_mock, _mock_daemon):
     """
     Test that exceptions in _work are logged and the loop continues.
     """
 
     from savegem.common.service.daemon import ExitTestLoop
 
-    resolve_app_data_mock.return_value = "/mock/appdata/gdrive_token.txt"
     path_exists_mock.return_value = False
 
     daemon = _mock_daemon("ErrorService", requires_auth=False)
@@ -193,3 +194,46 @@ def test_daemon_start_work_exception_handling(mocker: MockerFixture, resolve_app
 
     # time.sleep should be called after the exception is handled
     assert time_sleep_mock.call_count == 1
+
+
+def test_daemon_logs_metrics_periodically_and_on_exit(mocker: MockerFixture, module_patch, path_exists_mock,
+                                                      time_sleep_mock, logger_mock, _mock_daemon):
+    """
+    Test that metrics are logged every configured amount of polls and once daemon stops.
+    """
+
+    from savegem.common.service.daemon import ExitTestLoop
+
+    path_exists_mock.return_value = False
+    module_patch("metrics").return_value.summary.return_value = "list_files: 1 call(s)"
+    mocker.patch("savegem.common.service.daemon.Daemon.MetricsLogPolls", 2)
+
+    daemon = _mock_daemon("MetricsService", requires_auth=False)
+    daemon._work = mocker.Mock(side_effect=[None, None, None, ExitTestLoop])
+
+    with pytest.raises(ExitTestLoop):
+        daemon.start()
+
+    assert logger_mock.info.call_args_list.count(mocker.call(
+        "Google Drive requests of '%s' service:\n%s", "MetricsService", "list_files: 1 call(s)"
+    )) == 2
+
+
+def test_daemon_skips_empty_metrics(mocker: MockerFixture, module_patch, path_exists_mock,
+                                    time_sleep_mock, logger_mock, _mock_daemon):
+    """
+    Test that metrics are not logged when daemon made no remote calls.
+    """
+
+    from savegem.common.service.daemon import ExitTestLoop
+
+    path_exists_mock.return_value = False
+    module_patch("metrics").return_value.summary.return_value = ""
+
+    daemon = _mock_daemon("MetricsService", requires_auth=False)
+    daemon._work = mocker.Mock(side_effect=ExitTestLoop)
+
+    with pytest.raises(ExitTestLoop):
+        daemon.start()
+
+    assert all("Google Drive requests" not in call.args[0] for call in logger_mock.info.call_args_list)
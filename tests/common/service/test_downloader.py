@@ -1,7 +1,32 @@
+import hashlib
+import io
+import os
+import zipfile
+from pathlib import Path
+
 import pytest
 
 from pytest_mock import MockerFixture
 
+_DRIVE_FILES = {"save_1.sav": b"new save 1", "save_2.sav": b"new save 2", ".metadata": b"metadata"}
+
+
+def _archive_bytes():
+    archive = io.BytesIO()
+
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, content in _DRIVE_FILES.items():
+            zip_file.writestr(name, content)
+
+    return archive.getvalue()
+
+
+def _drive_manifest():
+    return {
+        name: [len(content), hashlib.sha256(content).hexdigest()]
+        for name, content in _DRIVE_FILES.items() if name != ".metadata"
+    }
+
 
 @pytest.fixture
 def mock_game(mocker: MockerFixture):
@@ -13,6 +38,10 @@ def mock_game(mocker: MockerFixture):
     mock_game.local_path = "/path/to/local/saves"
     mock_game.meta.drive.is_present = True
     mock_game.meta.drive.id = "drive_file_id"
+    mock_game.meta.drive.size = 1024
+    mock_game.meta.drive.manifest = None
+    mock_game.meta.drive.is_chunked = False
+    mock_game.meta.drive.compression = None
     mock_game.meta.local.checksum = "local_checksum_old"
     mock_game.meta.drive.checksum = "drive_checksum_new"
 
@@ -22,6 +51,79 @@ def mock_game(mocker: MockerFixture):
     return mock_game
 
 
+@pytest.fixture(autouse=True)
+def _backup_store_mock(module_patch):
+    """
+    Fixture for backup store, so snapshots are not stored in AppData.
+    """
+    return module_patch("backup_store").return_value
+
+
+@pytest.fixture(autouse=True)
+def _staging_area(module_patch, tmp_path: Path):
+    """
+    Fixture for staging area, so workspaces are not registered in AppData.
+    """
+
+    from savegem.common.core.staging_area import StagingArea
+
+    staging_area = StagingArea(str(tmp_path / "staging.json"))
+    module_patch("staging_area", return_value=staging_area)
+
+    return staging_area
+
+
+def _staging_workspaces(mock_game):
+    """
+    Used to get workspaces left next to saves directory.
+    """
+
+    parent_directory = os.path.dirname(mock_game.local_path)
+    saves_name = os.path.basename(mock_game.local_path)
+
+    return [name for name in os.listdir(parent_directory) if name.startswith(saves_name + ".staging")]
+
+
+@pytest.fixture
+def _saves_directory(tmp_path: Path, mock_game):
+    """
+    Fixture for directory with existing save files of the game.
+    """
+
+    saves_directory = tmp_path / "saves"
+    saves_directory.mkdir()
+    (saves_directory / "save_1.sav").write_bytes(b"old save 1")
+    (saves_directory / "other.sav").write_bytes(b"other")
+
+    mock_game.local_path = str(saves_directory)
+    mock_game.metadata_file_path = str(saves_directory / ".metadata")
+
+    return saves_directory
+
+
+@pytest.fixture
+def _drive_archive(mock_game):
+    """
+    Fixture for side effect of the download which writes
+    save archive into provided sink, checksum of the save
+    on drive is updated to match archived files.
+    """
+
+    checksum = hashlib.sha256()
+
+    for name in sorted(_DRIVE_FILES):
+        if name != ".metadata":
+            checksum.update(hashlib.sha256(_DRIVE_FILES[name]).hexdigest().encode())
+
+    mock_game.meta.drive.checksum = checksum.hexdigest()
+
+    def download(file_id, sink, *args, **kwargs):
+        sink.write(_archive_bytes())
+        return sink
+
+    return download
+
+
 @pytest.fixture
 def mock_subscriber(mocker: MockerFixture):
     """
@@ -44,8 +146,8 @@ def _downloader(mock_subscriber):
     return downloader
 
 
-def test_download_success(path_exists_mock, module_patch, copytree_mock,
-                          _downloader, cleanup_directory_mock, mock_game, mock_subscriber):
+def test_download_success(module_patch, _downloader, _saves_directory, _drive_archive,
+                          mock_game, mock_subscriber):
     """
     Test a successful full download process.
     """
@@ -53,75 +155,44 @@ def test_download_success(path_exists_mock, module_patch, copytree_mock,
     from savegem.common.service.downloader import Downloader
     from savegem.common.service.subscriptable import DoneEvent
 
-    mock_unpack_archive = module_patch("shutil.unpack_archive")
-    mock_save_file = module_patch("save_file")
-    mock_gdrive = module_patch("GDrive")
-    module_patch("resolve_temp_file", return_value="/tmp/save.zip")
-    module_patch("os.removedirs")
-    path_exists_mock.return_value = True  # Directory exists
+    mock_storage = module_patch("storage").return_value
+    module_patch("prop", return_value=8)
 
-    # Setup GDrive mock to return a BytesIO object (simulating file content)
-    mock_file_content = b"save_data"
-    mock_gdrive.download_file.return_value.getvalue.return_value = mock_file_content
+    mock_storage.download_file_parallel.side_effect = _drive_archive
 
     # ACT
     _downloader.download(mock_game)
 
-    # ASSERT - Execution Flow (6 stages + DoneEvent)
+    # ASSERT
+    mock_game.meta.drive.refresh.assert_called_once()
 
-    # 1. Check game directory check (mocked as True)
-    path_exists_mock.assert_any_call(mock_game.local_path)
+    # Archive is streamed into extractor with configured concurrency.
+    mock_storage.download_file_parallel.assert_called_once()
+    assert 'subscriber' in mock_storage.download_file_parallel.call_args[1]
 
-    # 2. Check stages set and initial 0% progress sent
-    # (The Downloader is a SubscriptableService, which sends 0% progress on _set_stages)
-    assert mock_subscriber.call_count > 0
+    file_id, sink, size, concurrency = mock_storage.download_file_parallel.call_args[0]
+    assert (file_id, size, concurrency) == ("drive_file_id", 1024, 8)
+    assert sink.finished is True
 
-    # 3. Check metadata refresh
-    mock_game.meta.drive.refresh.assert_called_once()
+    # Previous saves directory becomes the backup.
+    backup_directory = Path(mock_game.local_path + Downloader.BackupSuffix)
+    assert (backup_directory / "save_1.sav").read_bytes() == b"old save 1"
+    assert not (backup_directory / "save_2.sav").exists()
+
+    # Extracted files replace existing ones, staging directory is removed.
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"new save 1"
+    assert (_saves_directory / "save_2.sav").read_bytes() == b"new save 2"
+    assert (_saves_directory / ".metadata").read_bytes() == b"metadata"
+    assert (_saves_directory / "other.sav").read_bytes() == b"other"
+    assert _staging_workspaces(mock_game) == []
+
+    # Carried over files don't share inode with the backup.
+    assert not os.path.samefile(_saves_directory / "other.sav", backup_directory / "other.sav")
 
-    # 4. Check GDrive download and subscriber setup
-    mock_gdrive.download_file.assert_called_once()
-    # Check that a subscriber lambda was passed to GDrive for progress updates
-    assert 'subscriber' in mock_gdrive.download_file.call_args[1]
-
-    # 5. Check saving the file locally
-    mock_save_file.assert_called_once_with(
-        "/tmp/save.zip",
-        mock_file_content,
-        binary=True
-    )
-
-    # 6. Check backup directory is created
-    copytree_mock.assert_called_once_with(
-        mock_game.local_path,
-        mock_game.local_path + Downloader.BackupSuffix
-    )
-
-    # 7. Check archive extraction
-    mock_unpack_archive.assert_called_once_with(
-        "/tmp/save.zip",
-        mock_game.local_path,
-        "zip"
-    )
-
-    # 8. Check metadata update (checksum)
     assert mock_game.meta.local.checksum == mock_game.meta.drive.checksum
-    assert mock_game.meta.local.checksum == "drive_checksum_new"
-
-    # 9. Check events sent: 6 ProgressEvents (including 0%) + 5 full stage ProgressEvents + 1 DoneEvent
-    # 1st call: ProgressEvent (0%) from _set_stages
-    # 2nd-6th calls: ProgressEvents from _complete_stage
-    # 7th call: DoneEvent
-
-    # In a successful run, we have 6 stages.
-    # Stage 0: _set_stages sends 0% progress. (1 call)
-    # Stage 1-5: _complete_stage sends progress. (5 calls)
-    # Stage 6: _complete_stage is implicitly called by the GDrive subscriber's lambda.
-    # (This is complex to assert perfectly without running the lambda, but the next 4 stages are completed)
-    # Done: DoneEvent (1 call)
-    # Total: at least 7 explicit calls to the subscriber if GDrive's lambda is ignored,
-    # but the internal logic means more calls.
-    # The simplest check is the final event:
+    assert mock_game.meta.local.owner == mock_game.meta.drive.owner
+    assert mock_game.meta.local.created_time == mock_game.meta.drive.created_time
+
     final_event = mock_subscriber.call_args_list[-1][0][0]
     assert isinstance(final_event, DoneEvent)
     assert final_event.success is True
@@ -198,54 +269,624 @@ def test_download_drive_metadata_missing(module_patch, _downloader, mock_game, m
     assert done_event.success is False
 
 
-def test_backup_directory_with_existing_backup(module_patch, copytree_mock, cleanup_directory_mock, removedirs_mock,
-                                               path_exists_mock):
+def test_download_rotates_backups(module_patch, _downloader, _saves_directory, _drive_archive, mock_game):
+    """
+    Test that older backups are shifted and the oldest one is removed.
+    """
+
+    from savegem.common.service.downloader import Downloader
+
+    mock_storage = module_patch("storage").return_value
+    module_patch("prop", return_value=3)
+    mock_storage.download_file_parallel.side_effect = _drive_archive
+
+    for index in range(3):
+        backup_directory = Path(Downloader.backup_directory(mock_game.local_path, index))
+        backup_directory.mkdir()
+        (backup_directory / "save_1.sav").write_bytes(f"backup {index}".encode())
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    backups = [Path(Downloader.backup_directory(mock_game.local_path, index)) for index in range(3)]
+
+    assert (backups[0] / "save_1.sav").read_bytes() == b"old save 1"
+    assert (backups[1] / "save_1.sav").read_bytes() == b"backup 0"
+    assert (backups[2] / "save_1.sav").read_bytes() == b"backup 1"
+    assert not Path(Downloader.backup_directory(mock_game.local_path, 3)).exists()
+
+
+def test_download_copies_files_when_saves_directory_is_locked(module_patch, _downloader, _saves_directory,
+                                                              _drive_archive, mock_game, mock_subscriber):
     """
-    Test the private backup method when a backup directory already exists.
+    Test that save files are copied and replaced one by one
+    when saves directory can't be renamed.
     """
 
     from savegem.common.service.downloader import Downloader
+    from savegem.common.service.subscriptable import DoneEvent
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file_parallel.side_effect = _drive_archive
 
-    module_patch("os.path.exists")
+    rename = os.rename
 
-    saves_dir = "/path/to/saves"
-    backup_dir = saves_dir + Downloader.BackupSuffix
+    def locked_rename(source, target):
+        if source == mock_game.local_path:
+            raise PermissionError("Directory is in use")
 
-    # Setup os.path.exists to return True for the backup directory check
-    def exists_side_effect(path):
-        return path == backup_dir
+        rename(source, target)
 
-    path_exists_mock.side_effect = exists_side_effect
+    module_patch("os.rename", side_effect=locked_rename)
 
     # ACT
-    Downloader._Downloader__backup_directory(saves_dir)  # noqa
+    _downloader.download(mock_game)
 
     # ASSERT
-    # 1. Existing backup should be cleaned up and removed
-    cleanup_directory_mock.assert_called_once_with(backup_dir)
-    removedirs_mock.assert_called_once_with(backup_dir)
+    backup_directory = Path(mock_game.local_path + Downloader.BackupSuffix)
+    assert (backup_directory / "save_1.sav").read_bytes() == b"old save 1"
+
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"new save 1"
+    assert (_saves_directory / "other.sav").read_bytes() == b"other"
+    assert _staging_workspaces(mock_game) == []
 
-    # 2. New backup should be created
-    copytree_mock.assert_called_once_with(saves_dir, backup_dir)
+    final_event = mock_subscriber.call_args_list[-1][0][0]
+    assert isinstance(final_event, DoneEvent)
+    assert final_event.success is True
 
 
-def test_backup_directory_with_no_existing_backup(copytree_mock, cleanup_directory_mock, removedirs_mock, module_patch):
+def test_download_restores_saves_directory_when_swap_failed(module_patch, _downloader, _saves_directory,
+                                                            _drive_archive, mock_game, mock_subscriber):
     """
-    Test the private backup method when no backup directory exists.
+    Test that existing save is put back when staging directory
+    fails to be renamed after saves directory became a backup.
     """
 
     from savegem.common.service.downloader import Downloader
+    from savegem.common.service.subscriptable import DoneEvent, ErrorEvent, EventKind
 
-    module_patch("os.path.exists", return_value=False)
-    saves_dir = "/path/to/saves"
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file_parallel.side_effect = _drive_archive
+
+    rename = os.rename
+
+    def failing_rename(source, target):
+        if target == mock_game.local_path and ".staging" in source:
+            raise PermissionError("Access is denied")
+
+        rename(source, target)
+
+    module_patch("os.rename", side_effect=failing_rename)
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"old save 1"
+    assert (_saves_directory / "other.sav").read_bytes() == b"other"
+    assert not os.path.exists(mock_game.local_path + Downloader.BackupSuffix)
+    assert _staging_workspaces(mock_game) == []
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    done_event = mock_subscriber.call_args_list[-1][0][0]
+
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorDownloadingFromDrive
+
+    assert isinstance(done_event, DoneEvent)
+    assert done_event.success is False
+
+
+def test_download_error_when_archive_download_failed(module_patch, _downloader, _saves_directory,
+                                                     mock_game, mock_subscriber):
+    """
+    Test that staged files are removed and existing save is untouched
+    when archive download fails.
+    """
+
+    from savegem.common.service.downloader import Downloader
+    from savegem.common.service.subscriptable import DoneEvent, ErrorEvent, EventKind
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file_parallel.return_value = None
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    assert not os.path.exists(mock_game.local_path + Downloader.BackupSuffix)
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"old save 1"
+    assert _staging_workspaces(mock_game) == []
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    done_event = mock_subscriber.call_args_list[-1][0][0]
+
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorDownloadingFromDrive
+
+    assert isinstance(done_event, DoneEvent)
+    assert done_event.success is False
+
+
+def test_download_error_when_staging_quota_is_exceeded(mocker: MockerFixture, module_patch, _downloader,
+                                                       _staging_area, _saves_directory, mock_game, mock_subscriber):
+    """
+    Test that existing save is untouched when
+    staging workspace could not be created.
+    """
+
+    from savegem.common.service.subscriptable import ErrorEvent, EventKind
+
+    mock_storage = module_patch("storage").return_value
+    mocker.patch.object(_staging_area, "workspace", side_effect=RuntimeError("Staging quota exceeded"))
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    mock_storage.download_file_parallel.assert_not_called()
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"old save 1"
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorDownloadingFromDrive
+
+
+@pytest.mark.parametrize("manifest, size", [(None, 1024), (_drive_manifest(), 20)])
+def test_download_reserves_size_of_extracted_save(mocker: MockerFixture, module_patch, _downloader, _staging_area,
+                                                  _saves_directory, mock_game, manifest, size):
+    """
+    Test that size of extracted save files is reserved in staging area,
+    size of the archive is used when manifest is not available.
+    """
+
+    module_patch("storage")
+    mock_game.meta.drive.manifest = manifest
+    workspace = mocker.patch.object(_staging_area, "workspace", side_effect=RuntimeError("Staging quota exceeded"))
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    workspace.assert_called_once_with(mock_game.local_path, size)
+
+
+def test_download_error_when_archive_is_corrupted(module_patch, _downloader, _saves_directory,
+                                                  _drive_archive, mock_game, mock_subscriber):
+    """
+    Test that existing save is untouched when archive is truncated.
+    """
+
+    from savegem.common.service.downloader import Downloader
+    from savegem.common.service.subscriptable import ErrorEvent, EventKind
+
+    mock_storage = module_patch("storage").return_value
+
+    def download_truncated(file_id, sink, *args, **kwargs):
+        archive = io.BytesIO()
+        _drive_archive(file_id, archive)
+        # Archive ends in the middle of the first member.
+        sink.write(archive.getvalue()[:zipfile.sizeFileHeader + 20])
+        return sink
+
+    mock_storage.download_file_parallel.side_effect = download_truncated
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    assert not os.path.exists(mock_game.local_path + Downloader.BackupSuffix)
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"old save 1"
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorDownloadingFromDrive
+
+
+def test_download_error_when_checksum_does_not_match(module_patch, _downloader, _saves_directory,
+                                                     _drive_archive, mock_game, mock_subscriber):
+    """
+    Test that existing save is untouched when extracted
+    files don't match checksum of the save.
+    """
+
+    from savegem.common.service.downloader import Downloader
+    from savegem.common.service.subscriptable import ErrorEvent, EventKind
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file_parallel.side_effect = _drive_archive
+    mock_game.meta.drive.checksum = "other_checksum"
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    assert not os.path.exists(mock_game.local_path + Downloader.BackupSuffix)
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"old save 1"
+    assert _staging_workspaces(mock_game) == []
+    assert mock_game.meta.local.checksum == "local_checksum_old"
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorDownloadingFromDrive
+
+
+def test_download_stores_snapshot_of_existing_save(module_patch, _downloader, _saves_directory, _drive_archive,
+                                                   _backup_store_mock, mock_game):
+    """
+    Test that snapshot of existing save is stored before it's replaced.
+    """
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file_parallel.side_effect = _drive_archive
+
+    def assert_existing_save(game_name, directory):
+        assert Path(directory, "save_1.sav").read_bytes() == b"old save 1"
+
+    _backup_store_mock.snapshot.side_effect = assert_existing_save
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    _backup_store_mock.snapshot.assert_called_once_with(mock_game.name, mock_game.local_path)
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"new save 1"
+
+
+def test_download_success_when_snapshot_failed(module_patch, _downloader, _saves_directory, _drive_archive,
+                                               _backup_store_mock, mock_game, mock_subscriber, logger_mock):
+    """
+    Test that failure to store snapshot doesn't fail download.
+    """
+
+    from savegem.common.service.subscriptable import DoneEvent
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file_parallel.side_effect = _drive_archive
+    _backup_store_mock.snapshot.side_effect = OSError("Disk is full")
 
     # ACT
-    Downloader._Downloader__backup_directory(saves_dir)  # noqa
+    _downloader.download(mock_game)
+
+    # ASSERT
+    logger_mock.warning.assert_called_once()
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"new save 1"
+
+    final_event = mock_subscriber.call_args_list[-1][0][0]
+    assert isinstance(final_event, DoneEvent)
+    assert final_event.success is True
+
+
+def test_download_error_when_compression_is_not_supported(module_patch, _downloader, _saves_directory,
+                                                          mock_game, mock_subscriber):
+    """
+    Test that archive compressed with unsupported codec is not downloaded.
+    """
+
+    from savegem.common.service.subscriptable import ErrorEvent, EventKind
+
+    mock_storage = module_patch("storage").return_value
+    mock_game.meta.drive.compression = "brotli"
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    mock_storage.download_file_parallel.assert_not_called()
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"old save 1"
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorDownloadingFromDrive
+
+
+def test_download_error_when_codec_is_not_available(mocker: MockerFixture, module_patch, _downloader,
+                                                    _saves_directory, mock_game, mock_subscriber):
+    """
+    Test that archive compressed with codec missing in this runtime is not downloaded.
+    """
+
+    from savegem.common.service.subscriptable import ErrorEvent, EventKind
+    from savegem.common.util.archive import Compression
+
+    mock_storage = module_patch("storage").return_value
+    mocker.patch.object(Compression, "is_supported", new_callable=mocker.PropertyMock, return_value=False)
+    mock_game.meta.drive.compression = "zstd"
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    mock_storage.download_file_parallel.assert_not_called()
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"old save 1"
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorDownloadingFromDrive
+
+
+def test_download_only_changed_files(module_patch, _downloader, _saves_directory, _drive_archive, mock_game,
+                                     mock_subscriber):
+    """
+    Test that only files which differ from manifest of the save are read from archive.
+    """
+
+    from savegem.common.service.subscriptable import DoneEvent
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.open_file.side_effect = lambda file_id, size: io.BytesIO(_archive_bytes())
+
+    manifest = _drive_manifest()
+    mock_game.meta.drive.manifest = manifest
+
+    # Second save file is already up to date.
+    (_saves_directory / "save_2.sav").write_bytes(b"new save 2")
+    mock_game.meta.local.calculate_manifest.return_value = {
+        "save_1.sav": [len(b"old save 1"), hashlib.sha256(b"old save 1").hexdigest()],
+        "save_2.sav": manifest["save_2.sav"]
+    }
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    mock_storage.download_file_parallel.assert_not_called()
+    mock_storage.open_file.assert_called_once_with("drive_file_id", 1024)
+
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"new save 1"
+    assert (_saves_directory / "save_2.sav").read_bytes() == b"new save 2"
+    assert (_saves_directory / ".metadata").read_bytes() == b"metadata"
+    assert (_saves_directory / "other.sav").read_bytes() == b"other"
+
+    final_event = mock_subscriber.call_args_list[-1][0][0]
+    assert isinstance(final_event, DoneEvent)
+    assert final_event.success is True
+
+
+def test_download_whole_archive_when_all_files_changed(module_patch, _downloader, _saves_directory, _drive_archive,
+                                                       mock_game):
+    """
+    Test that archive is downloaded in one pass when none of the files are up to date.
+    """
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file_parallel.side_effect = _drive_archive
+
+    mock_game.meta.drive.manifest = _drive_manifest()
+    mock_game.meta.local.calculate_manifest.return_value = {}
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    mock_storage.open_file.assert_not_called()
+    mock_storage.download_file_parallel.assert_called_once()
+    assert (_saves_directory / "save_2.sav").read_bytes() == b"new save 2"
+
+
+def test_download_error_when_changed_file_does_not_match_manifest(module_patch, _downloader, _saves_directory,
+                                                                  _drive_archive, mock_game, mock_subscriber):
+    """
+    Test that existing save is untouched when extracted file differs from manifest.
+    """
+
+    from savegem.common.service.subscriptable import ErrorEvent, EventKind
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.open_file.side_effect = lambda file_id, size: io.BytesIO(_archive_bytes())
+
+    manifest = _drive_manifest()
+    manifest["save_1.sav"] = [10, "other_digest"]
+    mock_game.meta.drive.manifest = manifest
+    mock_game.meta.local.calculate_manifest.return_value = {"save_2.sav": manifest["save_2.sav"]}
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"old save 1"
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorDownloadingFromDrive
+
+
+def test_download_error_when_manifest_has_unsafe_name(module_patch, _downloader, _saves_directory, _drive_archive,
+                                                      mock_game, mock_subscriber, tmp_path: Path):
+    """
+    Test that file outside of saves directory is never extracted.
+    """
+
+    from savegem.common.service.subscriptable import ErrorEvent, EventKind
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.open_file.side_effect = lambda file_id, size: io.BytesIO(_archive_bytes())
+
+    manifest = _drive_manifest()
+    manifest["../save_1.sav"] = manifest.pop("save_1.sav")
+    mock_game.meta.drive.manifest = manifest
+    mock_game.meta.local.calculate_manifest.return_value = {"save_2.sav": manifest["save_2.sav"]}
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    assert not (tmp_path / "save_1.sav").exists()
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"old save 1"
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorDownloadingFromDrive
+
+
+def test_download_restores_chunked_save(mocker: MockerFixture, module_patch, _downloader, _saves_directory,
+                                        _drive_archive, mock_game, mock_subscriber):
+    """
+    Test that save stored as chunks is restored from chunk store, reusing local save files.
+    """
+
+    import json
+    from savegem.common.service.chunk_store import ChunkStore
+    from savegem.common.service.subscriptable import DoneEvent
+
+    files = {
+        name: {"size": len(content), "digest": hashlib.sha256(content).hexdigest(), "chunks": [name]}
+        for name, content in _DRIVE_FILES.items()
+    }
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file.return_value = io.BytesIO(json.dumps({"files": files}).encode())
+
+    mock_game.meta.drive.is_chunked = True
+    mock_game.file_list = [str(_saves_directory / "save_1.sav"), str(_saves_directory / "other.sav")]
+
+    def download_files(record_files, target_directory, local_paths, subscriber=None):
+        for name in record_files:
+            Path(target_directory, name).write_bytes(_DRIVE_FILES[name])
+
+    download_files_mock = mocker.patch.object(ChunkStore, "download_files", side_effect=download_files)
+
+    # ACT
+    _downloader.download(mock_game)
 
     # ASSERT
-    # 1. Cleanup/Removal should NOT be called
-    cleanup_directory_mock.assert_not_called()
-    removedirs_mock.assert_not_called()
+    mock_storage.download_file.assert_called_once_with("drive_file_id")
+    mock_storage.download_file_parallel.assert_not_called()
+    assert download_files_mock.call_args[0][2] == mock_game.file_list
+
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"new save 1"
+    assert (_saves_directory / "save_2.sav").read_bytes() == b"new save 2"
+    assert (_saves_directory / "other.sav").read_bytes() == b"other"
+    assert mock_game.meta.local.checksum == mock_game.meta.drive.checksum
+
+    final_event = mock_subscriber.call_args_list[-1][0][0]
+    assert isinstance(final_event, DoneEvent)
+    assert final_event.success is True
+
+
+def test_download_error_when_chunk_record_download_failed(module_patch, _downloader, _saves_directory, mock_game,
+                                                          mock_subscriber):
+    """
+    Test that existing save is untouched when record of chunked save couldn't be downloaded.
+    """
+
+    from savegem.common.service.subscriptable import ErrorEvent, EventKind
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file.return_value = None
+    mock_game.meta.drive.is_chunked = True
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"old save 1"
+    assert _staging_workspaces(mock_game) == []
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorDownloadingFromDrive
+
+
+def test_download_save_without_checksum(module_patch, _downloader, _saves_directory, _drive_archive, mock_game,
+                                        mock_subscriber):
+    """
+    Test that save uploaded without checksum is restored without verification.
+    """
+
+    from savegem.common.service.subscriptable import DoneEvent
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file_parallel.side_effect = _drive_archive
+    mock_game.meta.drive.checksum = None
+
+    # ACT
+    _downloader.download(mock_game)
 
-    # 2. New backup should be created
-    copytree_mock.assert_called_once_with(saves_dir, saves_dir + Downloader.BackupSuffix)
+    # ASSERT
+    assert (_saves_directory / "save_1.sav").read_bytes() == b"new save 1"
+
+    final_event = mock_subscriber.call_args_list[-1][0][0]
+    assert isinstance(final_event, DoneEvent)
+    assert final_event.success is True
+
+
+def _progress(mock_subscriber):
+    from savegem.common.service.subscriptable import ProgressEvent
+
+    return [
+        call_args[0][0].progress for call_args in mock_subscriber.call_args_list
+        if isinstance(call_args[0][0], ProgressEvent)
+    ]
+
+
+def test_download_progress_ends_at_100(module_patch, _downloader, _saves_directory, _drive_archive, mock_game,
+                                       mock_subscriber):
+    """
+    Test that download stage is completed once, even though storage reports its completion.
+    """
+
+    mock_storage = module_patch("storage").return_value
+
+    def download(file_id, sink, size, concurrency, subscriber):
+        subscriber(0.5)
+        subscriber(1)
+        return _drive_archive(file_id, sink)
+
+    mock_storage.download_file_parallel.side_effect = download
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    progress = _progress(mock_subscriber)
+
+    assert progress[-1] == 100
+    assert progress == sorted(progress)
+
+
+def test_download_progress_of_changed_files_ends_at_100(module_patch, _downloader, _saves_directory, mock_game,
+                                                        mock_subscriber):
+    """
+    Test that download stage is completed once when only changed files are extracted.
+    """
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.open_file.side_effect = lambda file_id, size: io.BytesIO(_archive_bytes())
+
+    manifest = _drive_manifest()
+    mock_game.meta.drive.checksum = None
+    mock_game.meta.drive.manifest = manifest
+    mock_game.meta.local.calculate_manifest.return_value = {"save_2.sav": manifest["save_2.sav"]}
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    assert _progress(mock_subscriber)[-1] == 100
+
+
+def test_download_progress_of_chunked_save_ends_at_100(mocker: MockerFixture, module_patch, _downloader,
+                                                       _saves_directory, mock_game, mock_subscriber):
+    """
+    Test that download stage is completed once when save is restored from chunks.
+    """
+
+    import json
+    from savegem.common.service.chunk_store import ChunkStore
+
+    mock_storage = module_patch("storage").return_value
+    mock_storage.download_file.return_value = io.BytesIO(json.dumps({"files": {}}).encode())
+    mock_game.meta.drive.is_chunked = True
+    mock_game.meta.drive.checksum = None
+    mock_game.file_list = []
+
+    mocker.patch.object(ChunkStore, "download_files",
+                        side_effect=lambda files, target_directory, local_paths, subscriber: subscriber(1))
+
+    # ACT
+    _downloader.download(mock_game)
+
+    # ASSERT
+    assert _progress(mock_subscriber)[-1] == 100
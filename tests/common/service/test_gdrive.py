@@ -1,6 +1,11 @@
 import io
+import os
+import tracemalloc
+from pathlib import Path
 from unittest.mock import Mock
 
+import httplib2
+
 import pytest
 from google.auth.exceptions import RefreshError
 from google.oauth2.credentials import Credentials
@@ -11,12 +16,30 @@ from pytest_mock import MockerFixture
 @pytest.fixture(autouse=True)
 def _cleanup():
     """
-    Ensure GDrive.__drive is reset before each test.
+    Ensure Google Drive services and credentials are reset before each test.
     """
 
+    import threading
     from savegem.common.service.gdrive import GDrive
 
-    GDrive._GDrive__drive = None
+    GDrive._GDrive__local = threading.local()
+    GDrive._GDrive__credentials = None
+
+
+@pytest.fixture(autouse=True)
+def _retry_sleep_mock(mocker: MockerFixture):
+    """
+    Failed requests are retried without waiting.
+    """
+    return mocker.patch("savegem.common.service.retry.time.sleep")
+
+
+@pytest.fixture(autouse=True)
+def _rate_limiter_mock(module_patch):
+    """
+    Requests are not limited by shared quota.
+    """
+    return module_patch("rate_limiter").return_value
 
 
 @pytest.fixture
@@ -219,6 +242,66 @@ def test_get_credentials_missing_all(path_exists_mock):
         GDrive._GDrive__get_credentials()  # noqa
 
 
+def test_drive_service_per_thread(_google_build_mock, _get_creds_mock):
+    """
+    Test each thread gets its own service while credentials are loaded once.
+    """
+
+    import threading
+    from savegem.common.service.gdrive import GDrive
+
+    _google_build_mock.side_effect = lambda *args, **kwargs: Mock()
+    services = []
+
+    def get_drive():
+        services.append(GDrive._GDrive__get_drive())  # noqa
+        services.append(GDrive._GDrive__get_drive())  # noqa
+
+    threads = [threading.Thread(target=get_drive) for _ in range(3)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert len(services) == 6
+    assert len({id(service) for service in services}) == 3
+    assert _google_build_mock.call_count == 3
+    _get_creds_mock.assert_called_once()
+
+
+def test_drive_service_uses_timeout(_google_build_mock, _get_creds_mock):
+    """
+    Test service transport is created with timeout.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    GDrive._GDrive__get_drive()  # noqa
+
+    http = _google_build_mock.call_args.kwargs["http"]
+    assert http.http.timeout == GDrive.Timeout
+
+
+def test_shared_credentials_delegate_to_credentials(mocker: MockerFixture):
+    """
+    Test shared credentials wrapper delegates to wrapped credentials.
+    """
+
+    from savegem.common.service.gdrive import _SharedCredentials
+
+    credentials = mocker.Mock()
+    shared_credentials = _SharedCredentials(credentials)
+
+    shared_credentials.before_request("request", "GET", "url", {})
+    shared_credentials.refresh("request")
+
+    credentials.before_request.assert_called_once_with("request", "GET", "url", {})
+    credentials.refresh.assert_called_once_with("request")
+    assert shared_credentials.token is credentials.token
+
+
 def test_get_current_user(_google_build_mock, _drive_service_mock, _get_creds_mock):
     """
     Test get_current_user calls the correct Drive API endpoint.
@@ -233,6 +316,24 @@ def test_get_current_user(_google_build_mock, _drive_service_mock, _get_creds_mo
     assert user_info == {"displayName": "Test User"}
 
 
+def test_request_takes_token_before_each_attempt(mocker: MockerFixture, _google_build_mock, _drive_service_mock,
+                                                 _get_creds_mock, _rate_limiter_mock):
+    """
+    Test each attempt of request waits for its share of quota.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.about.return_value.get.return_value.execute.side_effect = [
+        HttpError(resp=mocker.Mock(status=503), content=b"Unavailable"),
+        {"user": {"displayName": "Test User"}}
+    ]
+
+    GDrive.get_current_user()
+
+    assert _rate_limiter_mock.acquire.call_args_list == [mocker.call(1), mocker.call(1)]
+
+
 def test_query_single_success(_google_build_mock, _drive_service_mock, _get_creds_mock):
     """
     Test query_single successful execution.
@@ -243,13 +344,14 @@ def test_query_single_success(_google_build_mock, _drive_service_mock, _get_cred
     q_str = "name='test'"
     fields_str = "files(id, name)"
 
-    result = GDrive.query_single(q_str, fields_str)
+    result = GDrive.query_single(q_str, fields_str, order_by="createdTime desc")
 
     # Assert
     _drive_service_mock.files().list.assert_called_once_with(
         q=q_str,
         spaces="drive",
         fields=fields_str,
+        orderBy="createdTime desc",
         pageToken=None,
         pageSize=1
     )
@@ -272,6 +374,355 @@ def test_query_single_http_error(logger_mock, http_error_mock, _google_build_moc
     assert result is None
 
 
+def test_query_all_reads_all_pages(_google_build_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test query_all follows page tokens until the last page.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.files().list().execute.side_effect = [
+        {"files": [{"id": "first"}], "nextPageToken": "token"},
+        {"files": [{"id": "second"}]}
+    ]
+
+    result = GDrive.query_all("q", "nextPageToken, files(id)")
+
+    assert result == [{"id": "first"}, {"id": "second"}]
+    assert _drive_service_mock.files().list.call_args[1]["pageToken"] == "token"
+    assert _drive_service_mock.files().list.call_args[1]["pageSize"] == GDrive.ListPageSize
+
+
+def test_query_all_http_error(http_error_mock, _google_build_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test query_all handling of HttpError.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.files().list().execute.side_effect = http_error_mock
+
+    assert GDrive.query_all("q", "f") is None
+
+
+@pytest.fixture
+def _batch_mock(mocker: MockerFixture, _drive_service_mock):
+    """
+    Batch request which executes its callback for each added request.
+    Requests which query 'error' are failing.
+    """
+
+    batches = []
+
+    def new_batch(callback):
+        requests = {}
+        batch = mocker.Mock()
+        batch.add.side_effect = lambda request, request_id: requests.__setitem__(request_id, request)
+
+        def execute():
+            for request_id, request in requests.items():
+                if request.get("q") == "error" or request.get("fileId") == "error":
+                    callback(request_id, None, Exception("Failed"))
+                elif "q" in request:
+                    callback(request_id, {"files": [{"id": request["q"]}]}, None)
+                elif "fields" in request:
+                    callback(request_id, {"id": request["fileId"]}, None)
+                else:
+                    # Deleted files have no response body.
+                    callback(request_id, None, None)
+
+        batch.execute.side_effect = execute
+        batches.append(requests)
+
+        return batch
+
+    _drive_service_mock.new_batch_http_request.side_effect = new_batch
+    _drive_service_mock.files.return_value.list.side_effect = lambda **kwargs: kwargs
+    _drive_service_mock.files.return_value.get.side_effect = lambda **kwargs: kwargs
+    _drive_service_mock.files.return_value.delete.side_effect = lambda **kwargs: kwargs
+
+    return batches
+
+
+def test_query_batch(_google_build_mock, _get_creds_mock, _batch_mock, _rate_limiter_mock):
+    """
+    Test query_batch returns response of each query in order.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    result = GDrive.query_batch([("q1", "files(id)"), ("error", "files(id)"), ("q3", "files(id)")])
+
+    assert result == [{"files": [{"id": "q1"}]}, None, {"files": [{"id": "q3"}]}]
+    assert len(_batch_mock) == 1
+    # Each request of batch is counted against quota.
+    _rate_limiter_mock.acquire.assert_called_once_with(3)
+    assert _batch_mock[0]["0"] == {
+        "q": "q1",
+        "spaces": "drive",
+        "fields": "files(id)",
+        "orderBy": None,
+        "pageToken": None,
+        "pageSize": 1
+    }
+
+
+def test_query_batch_retries_rate_limited_queries(mocker: MockerFixture, _google_build_mock, _get_creds_mock,
+                                                  _drive_service_mock, _retry_sleep_mock):
+    """
+    Test query_batch sends again only queries rejected due to rate limit.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    batches = []
+    rate_limit_error = HttpError(resp=mocker.Mock(status=429), content=b"Rate limit exceeded")
+
+    def new_batch(callback):
+        requests = {}
+        batch = mocker.Mock()
+        batch.add.side_effect = lambda request, request_id: requests.__setitem__(request_id, request)
+
+        def execute():
+            for request_id, request in requests.items():
+                if request["q"] == "limited" and len(batches) == 1:
+                    callback(request_id, None, rate_limit_error)
+                else:
+                    callback(request_id, {"files": [{"id": request["q"]}]}, None)
+
+        batch.execute.side_effect = execute
+        batches.append(requests)
+
+        return batch
+
+    _drive_service_mock.new_batch_http_request.side_effect = new_batch
+    _drive_service_mock.files.return_value.list.side_effect = lambda **kwargs: kwargs
+
+    result = GDrive.query_batch([("q1", "files(id)"), ("limited", "files(id)")])
+
+    assert result == [{"files": [{"id": "q1"}]}, {"files": [{"id": "limited"}]}]
+    assert [list(batch) for batch in batches] == [["0", "1"], ["1"]]
+    _retry_sleep_mock.assert_called_once()
+
+
+def test_query_batch_http_error(_google_build_mock, _get_creds_mock, _drive_service_mock, http_error_mock,
+                                logger_mock):
+    """
+    Test query_batch returns None for each query when whole batch has failed.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.new_batch_http_request.return_value.execute.side_effect = http_error_mock
+
+    assert GDrive.query_batch([("q1", "files(id)"), ("q2", "files(id)")]) == [None, None]
+    logger_mock.error.assert_any_call("Error executing batch request: %s", http_error_mock, exc_info=True)
+
+
+def test_query_batch_splits_queries(module_patch, _google_build_mock, _get_creds_mock, _batch_mock):
+    """
+    Test query_batch doesn't exceed maximum batch size.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    module_patch("GDrive.BatchSize", new=2)
+    queries = [(f"q{idx}", "files(id)") for idx in range(5)]
+
+    result = GDrive.query_batch(queries)
+
+    assert [len(batch) for batch in _batch_mock] == [2, 2, 1]
+    assert result == [{"files": [{"id": q}]} for q, _ in queries]
+
+
+def test_get_metadata_batch(_google_build_mock, _get_creds_mock, _batch_mock):
+    """
+    Test get_metadata_batch returns metadata of each file in order.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    result = GDrive.get_metadata_batch(["file_1", "error", "file_3"], "id")
+
+    assert result == [{"id": "file_1"}, None, {"id": "file_3"}]
+    assert _batch_mock[0]["0"] == {"fileId": "file_1", "fields": "id"}
+
+
+def test_delete_batch(_google_build_mock, _get_creds_mock, _batch_mock):
+    """
+    Test delete_batch returns only IDs of deleted files.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    assert GDrive.delete_batch(["file_1", "error", "file_3"]) == ["file_1", "file_3"]
+    assert _batch_mock[0]["0"] == {"fileId": "file_1"}
+
+
+def test_list_files(mocker: MockerFixture):
+    """
+    Test list_files queries all files of directory with provided types.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    query_all = mocker.patch.object(GDrive, "query_all", return_value=[{"id": "file_1"}])
+
+    assert GDrive.list_files("dir_id", "id", ("type_a", "type_b")) == [{"id": "file_1"}]
+    query_all.assert_called_once_with(
+        "(mimeType='type_a' or mimeType='type_b') and 'dir_id' in parents and trashed=false",
+        "nextPageToken, files(id)",
+        order_by=GDrive.LatestOrderBy
+    )
+
+
+def test_list_files_of_any_type(mocker: MockerFixture):
+    """
+    Test list_files queries all files of directory when types are not provided.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    query_all = mocker.patch.object(GDrive, "query_all", return_value=[])
+
+    GDrive.list_files("dir_id", "id")
+
+    assert query_all.call_args[0][0] == "'dir_id' in parents and trashed=false"
+
+
+@pytest.mark.parametrize("token_exists", [True, False])
+def test_is_authenticated(path_exists_mock, resolve_app_data_mock, token_exists):
+
+    from constants import File
+    from savegem.common.service.gdrive import GDrive
+
+    path_exists_mock.return_value = token_exists
+
+    assert GDrive.is_authenticated() is token_exists
+    resolve_app_data_mock.assert_called_once_with(File.GDriveToken)
+
+
+def test_list_latest_by_pointer(mocker: MockerFixture):
+    """
+    Test list_latest resolves latest file by pointer without querying directory.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    get_metadata_batch = mocker.patch.object(GDrive, "get_metadata_batch", side_effect=[
+        [{"appProperties": {GDrive.LatestFileProp: "file_1"}}],
+        [{"id": "file_1", "trashed": False}]
+    ])
+    query_batch = mocker.patch.object(GDrive, "query_batch")
+
+    assert GDrive.list_latest(["dir_id"], "id", ("type_a",)) == [{"id": "file_1", "trashed": False}]
+    assert get_metadata_batch.call_args_list[1].args == (["file_1"], "id, trashed")
+    query_batch.assert_not_called()
+
+
+@pytest.mark.parametrize("latest_file", [None, {"id": "file_1", "trashed": True}])
+def test_list_latest_with_stale_pointer(mocker: MockerFixture, latest_file):
+    """
+    Test list_latest queries directory when pointed file was removed.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    mocker.patch.object(GDrive, "get_metadata_batch", side_effect=[
+        [{"appProperties": {GDrive.LatestFileProp: "file_1"}}],
+        [latest_file]
+    ])
+    mocker.patch.object(GDrive, "query_batch", return_value=[{"files": [{"id": "file_2"}]}])
+
+    assert GDrive.list_latest(["dir_id"], "id", ("type_a",)) == [{"id": "file_2"}]
+
+
+def test_list_latest_in_batches(mocker: MockerFixture):
+    """
+    Test list_latest queries only directories without pointer, all in single batch.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    mocker.patch.object(GDrive, "get_metadata_batch", side_effect=[
+        [{"appProperties": {GDrive.LatestFileProp: "file_a"}}, None, {"appProperties": {}}, {}],
+        [{"id": "file_a"}]
+    ])
+    query_batch = mocker.patch.object(GDrive, "query_batch", return_value=[
+        {"files": [{"id": "file_b"}]}, {"files": []}, None
+    ])
+
+    result = GDrive.list_latest(["dir_a", "dir_b", "dir_c", "dir_d"], "id", ("type_a",))
+
+    assert result == [{"id": "file_a"}, {"id": "file_b"}, {}, None]
+    assert [query for query, _ in query_batch.call_args.args[0]] == [
+        "(mimeType='type_a') and 'dir_b' in parents and trashed=false",
+        "(mimeType='type_a') and 'dir_c' in parents and trashed=false",
+        "(mimeType='type_a') and 'dir_d' in parents and trashed=false"
+    ]
+
+
+def test_list_latest_skips_files_without_required_property(mocker: MockerFixture):
+    """
+    Test list_latest picks the latest file with required property when directory has no pointer.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    mocker.patch.object(GDrive, "get_metadata_batch", return_value=[{}, {}])
+    query_batch = mocker.patch.object(GDrive, "query_batch", return_value=[
+        {"files": [{"id": "file_2", "appProperties": {}}, {"id": "file_1", "appProperties": {"prop": "1"}}]},
+        {"files": [{"id": "file_3"}]}
+    ])
+
+    result = GDrive.list_latest(["dir_a", "dir_b"], "id", ("type_a",), "prop")
+
+    assert result == [{"id": "file_1", "appProperties": {"prop": "1"}}, {}]
+    assert query_batch.call_args.args[0][0][1] == "files(id, appProperties)"
+    assert query_batch.call_args.kwargs["page_size"] == GDrive.LatestPageSize
+
+
+def test_set_latest(mocker: MockerFixture):
+    """
+    Test set_latest stores pointer in properties of directory.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    update_properties = mocker.patch.object(GDrive, "update_properties")
+
+    GDrive.set_latest("dir_id", "file_id")
+
+    update_properties.assert_called_once_with("dir_id", {GDrive.LatestFileProp: "file_id"})
+
+
+def test_get_metadata_success(_google_build_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test get_metadata requests only provided fields of the file.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.files().get().execute.return_value = {"md5Checksum": "checksum"}
+
+    result = GDrive.get_metadata("file_id", "md5Checksum")
+
+    _drive_service_mock.files().get.assert_called_with(fileId="file_id", fields="md5Checksum")
+    assert result == {"md5Checksum": "checksum"}
+
+
+def test_get_metadata_http_error(http_error_mock, _google_build_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test get_metadata handling of HttpError.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.files().get().execute.side_effect = http_error_mock
+
+    assert GDrive.get_metadata("file_id", "md5Checksum") is None
+
+
 def test_next_chunk_progress():
     """
     Test __next_chunk correctly calculates and calls subscriber with progress.
@@ -288,7 +739,7 @@ def test_next_chunk_progress():
     mock_request.next_chunk.return_value = (mock_status, False)
 
     # Act
-    GDrive._GDrive__next_chunk(mock_request, mock_subscriber)  # noqa
+    GDrive._GDrive__next_chunk(mock_request, "files.get_media", mock_subscriber)  # noqa
 
     # Assert
     mock_request.next_chunk.assert_called_once()
@@ -310,7 +761,7 @@ def test_next_chunk_done():
     mock_request.next_chunk.return_value = (None, True)
 
     # Act
-    GDrive._GDrive__next_chunk(mock_request, mock_subscriber)  # noqa
+    GDrive._GDrive__next_chunk(mock_request, "files.get_media", mock_subscriber)  # noqa
 
     # Assert
     mock_subscriber.assert_called_once_with(1)
@@ -330,7 +781,7 @@ def test_next_chunk_no_status():
     mock_request.next_chunk.return_value = (None, False)
 
     # Act
-    GDrive._GDrive__next_chunk(mock_request, mock_subscriber)  # noqa
+    GDrive._GDrive__next_chunk(mock_request, "files.get_media", mock_subscriber)  # noqa
 
     # Assert
     mock_subscriber.assert_called_once_with(0)
@@ -349,7 +800,7 @@ def test_next_chunk_no_subscriber():
     mock_request.next_chunk.return_value = (Mock(), False)
 
     # Act
-    status, done = GDrive._GDrive__next_chunk(mock_request, None)  # noqa
+    status, done = GDrive._GDrive__next_chunk(mock_request, "files.get_media", None)  # noqa
 
     # Assert
     mock_request.next_chunk.assert_called_once()
@@ -399,58 +850,413 @@ def test_download_file_http_error(_google_build_mock, _next_chunk_mock, _media_b
     assert file_io is None
 
 
-def test_upload_file_success(_google_build_mock, _next_chunk_mock, _media_file_upload_mock,
-                             file_name_from_path_mock, _drive_service_mock, _get_creds_mock):
+def test_download_file_writes_into_sink(_google_build_mock, _next_chunk_mock, _media_base_download_mock,
+                                       _get_creds_mock):
     """
-    Test upload_file successful completion.
+    Test download_file writes into provided sink instead of in-memory buffer.
     """
 
-    from constants import ZIP_MIME_TYPE
     from savegem.common.service.gdrive import GDrive
 
-    file_name_from_path_mock.return_value = "test.zip"
-
-    # Setup: 2 chunks followed by done
-    _next_chunk_mock.side_effect = [(Mock(), False), (Mock(), False), (None, True)]
-
-    file_path = "/tmp/test.zip"
-    parent_id = "parent_folder"
-    props = {"prop_key": "prop_val"}
-
-    # Act
-    GDrive.upload_file(file_path, parent_id, properties=props)
-
-    # Assert
-    _media_file_upload_mock.assert_called_once_with(
-        file_path,
-        mimetype=ZIP_MIME_TYPE,
-        resumable=True,
-        chunksize=GDrive.ChunkSize
-    )
+    sink = Mock()
+    _next_chunk_mock.side_effect = [(Mock(), False), (None, True)]
 
-    expected_metadata = {
-        "name": "test.zip",
-        "parents": [parent_id],
-        "appProperties": props
-    }
+    result = GDrive.download_file("test_id", sink=sink)
 
-    _drive_service_mock.files().create.assert_called_once_with(
-        body=expected_metadata,
-        media_body=_media_file_upload_mock.return_value,
-        fields="id"
-    )
-    assert _next_chunk_mock.call_count == 3
+    assert result is sink
+    assert _media_base_download_mock.call_args[0][0] is sink
 
 
-def test_upload_file_http_error(_google_build_mock, http_error_mock, _next_chunk_mock, _media_file_upload_mock,
-                                file_name_from_path_mock, _get_creds_mock):
+def test_download_file_streaming_memory_is_bounded_by_chunk_size(module_patch, tmp_path: Path):
     """
-    Test upload_file handles HttpError by raising it.
+    Downloads large synthetic archive into file and verifies that
+    peak memory stays within few chunks regardless of archive size.
     """
 
     from savegem.common.service.gdrive import GDrive
 
-    file_name_from_path_mock.return_value = "test.zip"
+    chunk_size = 256 * 1024
+    archive_size = 64 * chunk_size
+    archive_path = tmp_path / "large.zip"
+
+    module_patch("GDrive.ChunkSize", new=chunk_size)
+
+    class _RangeServingHttp:
+        """
+        Serves requested byte ranges of synthetic archive.
+        """
+
+        def request(self, uri, method="GET", headers=None, **kwargs):
+            start, end = headers["range"].replace("bytes=", "").split("-")
+            start, end = int(start), min(int(end), archive_size - 1)
+
+            response = httplib2.Response({
+                "status": 206,
+                "content-range": f"bytes {start}-{end}/{archive_size}"
+            })
+
+            return response, bytes(end - start + 1)
+
+    request = Mock()
+    request.http = _RangeServingHttp()
+    request.uri = "https://drive/file"
+    request.headers = {}
+
+    drive = Mock()
+    drive.files.return_value.get_media.return_value = request
+    module_patch("GDrive._GDrive__get_drive", return_value=drive)
+
+    tracemalloc.start()
+
+    try:
+        with open(archive_path, "wb") as sink:
+            GDrive.download_file("large_file_id", sink=sink)
+
+        _, peak_memory = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    assert os.path.getsize(archive_path) == archive_size
+    assert peak_memory < 4 * chunk_size
+
+
+@pytest.fixture
+def _ranged_media_mock(mocker: MockerFixture, _drive_service_mock):
+    """
+    Serves requested ranges of file content,
+    content could be replaced by the test.
+    """
+
+    content = bytearray(os.urandom(10 * 1024 + 7))
+    requested_ranges = []
+
+    def get_media(fileId):  # noqa
+        request = mocker.Mock()
+        request.headers = {}
+
+        def execute():
+            start, end = map(int, request.headers["range"].removeprefix("bytes=").split("-"))
+            requested_ranges.append((start, end))
+
+            return bytes(content[start:end + 1])
+
+        request.execute.side_effect = execute
+        return request
+
+    _drive_service_mock.files.return_value.get_media.side_effect = get_media
+
+    return content, requested_ranges
+
+
+def test_download_file_parallel(module_patch, _google_build_mock, _get_creds_mock, _ranged_media_mock):
+    """
+    Test download_file_parallel downloads all ranges and writes them in order.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    content, requested_ranges = _ranged_media_mock
+    module_patch("GDrive.ChunkSize", new=1024)
+    sink = io.BytesIO()
+    subscriber = Mock()
+
+    result = GDrive.download_file_parallel("file_id", sink, len(content), 4, subscriber)
+
+    assert result is sink
+    assert sink.getvalue() == content
+    assert sorted(requested_ranges) == [
+        (start, min(start + 1024, len(content)) - 1) for start in range(0, len(content), 1024)
+    ]
+    assert subscriber.call_count == len(requested_ranges)
+    assert subscriber.call_args_list[-1] == ((1,),)
+
+
+def test_download_file_parallel_writes_ranges_in_order(module_patch, _google_build_mock, _get_creds_mock,
+                                                       _drive_service_mock, _ranged_media_mock):
+    """
+    Test ranges that were downloaded earlier are written only after preceding ranges.
+    """
+
+    import threading
+    from savegem.common.service.gdrive import GDrive
+
+    content, _ = _ranged_media_mock
+    module_patch("GDrive.ChunkSize", new=1024)
+    get_media = _drive_service_mock.files.return_value.get_media.side_effect
+    first_range_started = threading.Event()
+    second_range_done = threading.Event()
+
+    def slow_first_range(fileId):  # noqa
+        request = get_media(fileId)
+        execute = request.execute.side_effect
+
+        def execute_in_order():
+            if request.headers["range"].startswith("bytes=0-"):
+                first_range_started.set()
+                second_range_done.wait(5)
+                return execute()
+
+            first_range_started.wait(5)
+            data = execute()
+            second_range_done.set()
+
+            return data
+
+        request.execute.side_effect = execute_in_order
+        return request
+
+    _drive_service_mock.files.return_value.get_media.side_effect = slow_first_range
+    sink = io.BytesIO()
+
+    GDrive.download_file_parallel("file_id", sink, len(content), 2)
+
+    assert sink.getvalue() == content
+
+
+def test_download_file_parallel_small_file(module_patch):
+    """
+    Test download_file_parallel downloads small files sequentially.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    download_file_mock = module_patch("GDrive.download_file")
+    sink = io.BytesIO()
+
+    GDrive.download_file_parallel("file_id", sink, 4, 4)
+
+    download_file_mock.assert_called_once_with("file_id", None, sink)
+
+
+def test_download_file_parallel_http_error(module_patch, http_error_mock, _google_build_mock, _get_creds_mock,
+                                           _drive_service_mock):
+    """
+    Test download_file_parallel returns None when range download fails.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    module_patch("GDrive.ChunkSize", new=1024)
+    _drive_service_mock.files.return_value.get_media.return_value.execute.side_effect = http_error_mock
+
+    assert GDrive.download_file_parallel("file_id", io.BytesIO(), 4096, 2) is None
+
+
+def test_open_file_reads_requested_ranges(module_patch, _google_build_mock, _get_creds_mock, _ranged_media_mock):
+    """
+    Test file opened in drive downloads only ranges that are being read.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    content, requested_ranges = _ranged_media_mock
+    module_patch("GDrive.ReadBufferSize", new=100)
+
+    with GDrive.open_file("file_id", len(content)) as file:
+        file.seek(-10, io.SEEK_END)
+        assert file.read() == content[-10:]
+
+        file.seek(5000)
+        assert file.read(10) == content[5000:5010]
+        assert file.tell() == 5010
+
+    assert requested_ranges == [(len(content) - 10, len(content) - 1), (5000, 5099)]
+
+
+def test_open_file_as_zip_archive(module_patch, _google_build_mock, _get_creds_mock, _ranged_media_mock):
+    """
+    Test single member of archive could be read without downloading whole archive.
+    """
+
+    import zipfile
+    from savegem.common.service.gdrive import GDrive
+
+    files = {"first.sav": os.urandom(64 * 1024), "second.sav": b"second save"}
+    archive_bytes = io.BytesIO()
+
+    with zipfile.ZipFile(archive_bytes, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+
+    content, requested_ranges = _ranged_media_mock
+    content[:] = archive_bytes.getvalue()
+    module_patch("GDrive.ReadBufferSize", new=1024)
+
+    with GDrive.open_file("file_id", len(content)) as file, zipfile.ZipFile(file) as archive:
+        assert archive.read("second.sav") == b"second save"
+
+    assert sum(end - start + 1 for start, end in requested_ranges) < len(content) // 2
+
+
+def test_open_file_seeks_relative_to_position(module_patch, _google_build_mock, _get_creds_mock,
+                                             _ranged_media_mock):
+    """
+    Test position of file opened in drive could be moved relatively and never before the start.
+    """
+
+    from savegem.common.service.gdrive import DriveFileReader
+
+    content, _ = _ranged_media_mock
+    file = DriveFileReader("file_id", len(content))
+
+    file.seek(100)
+    assert file.seek(10, io.SEEK_CUR) == 110
+
+    with pytest.raises(ValueError):
+        file.seek(-1)
+
+
+def test_download_range_fails_when_range_is_incomplete(module_patch, _google_build_mock, _get_creds_mock,
+                                                       _ranged_media_mock):
+    """
+    Test download_range fails when less data than requested was received.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    content, _ = _ranged_media_mock
+
+    with pytest.raises(ValueError):
+        GDrive.download_range("file_id", len(content) - 10, len(content) + 10)
+
+
+def test_create_file_success(_google_build_mock, _media_base_upload_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test create_file uploads data into provided directory.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.files().create().execute.return_value = {"id": "created_file_id"}
+
+    assert GDrive.create_file("file.json", "{}", "parent_id") == "created_file_id"
+
+    _drive_service_mock.files().create.assert_called_with(
+        body={"name": "file.json", "parents": ["parent_id"], "appProperties": None},
+        media_body=_media_base_upload_mock.return_value,
+        fields="id"
+    )
+
+
+def test_create_file_http_error(_google_build_mock, _media_base_upload_mock, _drive_service_mock, http_error_mock,
+                                _get_creds_mock):
+    """
+    Test create_file handles HttpError by raising it.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.files().create().execute.side_effect = http_error_mock
+
+    with pytest.raises(HttpError):
+        GDrive.create_file("file.json", "{}", "parent_id")
+
+    # File could have been created, so request is not sent again.
+    _drive_service_mock.files().create().execute.assert_called_once()
+
+
+def test_create_file_retried_when_rate_limited(mocker: MockerFixture, _google_build_mock, _media_base_upload_mock,
+                                               _drive_service_mock, _get_creds_mock, _retry_sleep_mock):
+    """
+    Test create_file is sent again when request was rejected due to rate limit.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    rate_limit_error = HttpError(resp=mocker.Mock(status=429), content=b"Rate limit exceeded")
+    _drive_service_mock.files().create().execute.side_effect = [rate_limit_error, {"id": "created_file_id"}]
+
+    assert GDrive.create_file("file.json", "{}", "parent_id") == "created_file_id"
+    _retry_sleep_mock.assert_called_once()
+
+
+def test_create_folder_success(_google_build_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test create_folder creates folder inside of provided directory.
+    """
+
+    from constants import FOLDER_MIME_TYPE
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.files().create().execute.return_value = {"id": "folder_id"}
+
+    assert GDrive.create_folder("chunks", "parent_id") == "folder_id"
+
+    _drive_service_mock.files().create.assert_called_with(
+        body={"name": "chunks", "parents": ["parent_id"], "mimeType": FOLDER_MIME_TYPE},
+        fields="id"
+    )
+
+
+def test_create_folder_http_error(_google_build_mock, _drive_service_mock, http_error_mock, _get_creds_mock,
+                                  logger_mock):
+    """
+    Test create_folder handles HttpError by raising it.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.files().create().execute.side_effect = http_error_mock
+
+    with pytest.raises(HttpError):
+        GDrive.create_folder("chunks", "parent_id")
+
+    logger_mock.error.assert_called_once()
+
+
+def test_upload_file_success(_google_build_mock, _next_chunk_mock, _media_file_upload_mock,
+                             file_name_from_path_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test upload_file successful completion.
+    """
+
+    from constants import ZIP_MIME_TYPE
+    from savegem.common.service.gdrive import GDrive
+
+    file_name_from_path_mock.return_value = "test.zip"
+
+    # Setup: 2 chunks followed by done
+    _next_chunk_mock.side_effect = [(Mock(), False), (Mock(), False), (None, True)]
+
+    file_path = "/tmp/test.zip"
+    parent_id = "parent_folder"
+    props = {"prop_key": "prop_val"}
+
+    # Act
+    GDrive.upload_file(file_path, parent_id, properties=props)
+
+    # Assert
+    _media_file_upload_mock.assert_called_once_with(
+        file_path,
+        mimetype=ZIP_MIME_TYPE,
+        resumable=True,
+        chunksize=GDrive.ChunkSize
+    )
+
+    expected_metadata = {
+        "name": "test.zip",
+        "parents": [parent_id],
+        "appProperties": props
+    }
+
+    _drive_service_mock.files().create.assert_called_once_with(
+        body=expected_metadata,
+        media_body=_media_file_upload_mock.return_value,
+        fields="id"
+    )
+    assert _next_chunk_mock.call_count == 3
+
+
+def test_upload_file_http_error(_google_build_mock, http_error_mock, _next_chunk_mock, _media_file_upload_mock,
+                                file_name_from_path_mock, _get_creds_mock):
+    """
+    Test upload_file handles HttpError by raising it.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    file_name_from_path_mock.return_value = "test.zip"
 
     # Setup: HttpError occurs on the first chunk
     _next_chunk_mock.side_effect = http_error_mock
@@ -460,6 +1266,272 @@ def test_upload_file_http_error(_google_build_mock, http_error_mock, _next_chunk
         GDrive.upload_file("/tmp/test.zip", "parent_id")
 
 
+def test_stream_upload_reads_stream_sequentially():
+    """
+    Test StreamUpload returns requested ranges and
+    signals end of stream with short read.
+    """
+
+    from savegem.common.service.gdrive import StreamUpload
+
+    media = StreamUpload(io.BytesIO(b"0123456789"), "application/zip", 4)
+
+    assert media.size() is None
+    assert media.resumable() is True
+    assert media.has_stream() is False
+    assert media.chunksize() == 4
+    assert media.mimetype() == "application/zip"
+
+    assert media.getbytes(0, 4) == b"0123"
+    # Same chunk could be re-sent if it wasn't committed.
+    assert media.getbytes(0, 4) == b"0123"
+    # Chunk could be partially committed.
+    assert media.getbytes(2, 4) == b"2345"
+    assert media.getbytes(6, 4) == b"6789"
+    assert media.getbytes(10, 4) == b""
+
+
+def test_stream_upload_last_chunk_on_chunk_boundary():
+    """
+    Test StreamUpload makes last chunk recognizable
+    when stream ends exactly on chunk boundary.
+    """
+
+    from savegem.common.service.gdrive import StreamUpload
+
+    media = StreamUpload(io.BytesIO(b"01234567"), "application/zip", 4)
+
+    assert media.getbytes(0, media.chunksize()) == b"0123"
+    assert media.chunksize() == 4
+
+    assert media.getbytes(4, media.chunksize()) == b"4567"
+    assert len(b"4567") < media.chunksize()
+
+
+def test_stream_upload_could_not_rewind_committed_bytes():
+    """
+    Test StreamUpload fails when bytes that were committed are requested.
+    """
+
+    from savegem.common.service.gdrive import StreamUpload
+
+    media = StreamUpload(io.BytesIO(b"0123456789"), "application/zip", 4)
+    media.getbytes(4, 4)
+
+    with pytest.raises(ValueError):
+        media.getbytes(0, 4)
+
+
+def test_stream_upload_digest_of_committed_bytes():
+    """
+    Test StreamUpload calculates digest of committed bytes only.
+    """
+
+    import hashlib
+    from savegem.common.service.gdrive import StreamUpload
+
+    media = StreamUpload(io.BytesIO(b"0123456789"), "application/zip", 4)
+
+    media.getbytes(0, 4)
+    assert media.digest == hashlib.sha256(b"").hexdigest()
+
+    media.commit(3)
+    assert media.digest == hashlib.sha256(b"012").hexdigest()
+    assert media.getbytes(3, 4) == b"3456"
+
+
+def test_stream_upload_skips_to_resumed_offset():
+    """
+    Test StreamUpload skips bytes uploaded by previous session and verifies them.
+    """
+
+    import hashlib
+    from savegem.common.service.gdrive import StreamUpload
+
+    media = StreamUpload(io.BytesIO(b"0123456789"), "application/zip", 2, 5, hashlib.sha256(b"01234").hexdigest())
+
+    # Server could have acknowledged more than was recorded.
+    assert media.getbytes(6, 2) == b"67"
+    assert media.digest == hashlib.sha256(b"012345").hexdigest()
+
+
+def test_stream_upload_fails_when_stream_differs_from_session():
+    """
+    Test StreamUpload fails when stream doesn't match previously uploaded bytes.
+    """
+
+    import hashlib
+    from savegem.common.service.gdrive import StreamUpload
+
+    media = StreamUpload(io.BytesIO(b"0123456789"), "application/zip", 4, 5, hashlib.sha256(b"abcde").hexdigest())
+
+    with pytest.raises(ValueError):
+        media.getbytes(5, 4)
+
+
+def test_stream_upload_fails_when_stream_is_shorter_than_offset():
+    """
+    Test StreamUpload fails when stream ends before resumed offset.
+    """
+
+    from savegem.common.service.gdrive import StreamUpload
+
+    media = StreamUpload(io.BytesIO(b"0123"), "application/zip", 4)
+
+    with pytest.raises(ValueError):
+        media.getbytes(8, 4)
+
+
+def test_upload_stream_success(_google_build_mock, _next_chunk_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test upload_stream uploads stream and reports its progress.
+    """
+
+    from constants import ZIP_MIME_TYPE
+    from savegem.common.service.gdrive import GDrive, StreamUpload
+
+    stream = Mock()
+    stream.progress = 0.5
+    subscriber = Mock()
+    props = {"prop_key": "prop_val"}
+
+    _next_chunk_mock.side_effect = [(None, None), (None, {"id": "new_file_id"})]
+    _drive_service_mock.files().create.return_value.resumable_progress = 0
+
+    file_id = GDrive.upload_stream(stream, "test.zip", "parent_folder", properties=props, subscriber=subscriber)
+
+    assert file_id == "new_file_id"
+
+    create_kwargs = _drive_service_mock.files().create.call_args[1]
+    assert create_kwargs["body"] == {
+        "name": "test.zip",
+        "parents": ["parent_folder"],
+        "appProperties": props
+    }
+    assert isinstance(create_kwargs["media_body"], StreamUpload)
+    assert create_kwargs["media_body"].mimetype() == ZIP_MIME_TYPE
+
+    assert subscriber.call_args_list == [((0.5,),), ((1,),)]
+
+
+def test_upload_stream_completes_progress_once(_google_build_mock, _next_chunk_mock, _drive_service_mock,
+                                               _get_creds_mock):
+    """
+    Test upload_stream reports completion only once file is created, even if stream was read completely.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    stream = Mock()
+    stream.progress = 1
+    subscriber = Mock()
+
+    _next_chunk_mock.side_effect = [(None, None), (None, None), (None, {"id": "new_file_id"})]
+    _drive_service_mock.files().create.return_value.resumable_progress = 0
+
+    GDrive.upload_stream(stream, "test.zip", "parent_folder", subscriber=subscriber)
+
+    progress = [call_args.args[0] for call_args in subscriber.call_args_list]
+
+    assert progress[-1] == 1
+    assert all(value < 1 for value in progress[:-1])
+
+
+def test_upload_stream_reports_session(_google_build_mock, _drive_service_mock, _get_creds_mock, module_patch):
+    """
+    Test upload_stream reports session once chunk is uploaded.
+    """
+
+    import hashlib
+    from savegem.common.service.gdrive import GDrive, UploadSession
+
+    module_patch("GDrive.ChunkSize", new=4)
+    request = _drive_service_mock.files().create.return_value
+    request.resumable_uri = "session_uri"
+    request.resumable_progress = 0
+    on_session_update = Mock()
+    responses = iter([None, {"id": "new_file_id"}])
+
+    def next_chunk():
+        media = _drive_service_mock.files().create.call_args.kwargs["media_body"]
+        media.getbytes(request.resumable_progress, 4)
+        request.resumable_progress = 4
+
+        return None, next(responses)
+
+    request.next_chunk.side_effect = next_chunk
+
+    GDrive.upload_stream(io.BytesIO(b"0123456789"), "test.zip", "parent_id", on_session_update=on_session_update)
+
+    on_session_update.assert_called_once_with({
+        UploadSession.Uri: "session_uri",
+        UploadSession.Offset: 4,
+        UploadSession.Digest: hashlib.sha256(b"0123").hexdigest()
+    })
+
+
+def test_upload_stream_resumes_session(_google_build_mock, _next_chunk_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test upload_stream continues provided session.
+    """
+
+    from savegem.common.service.gdrive import GDrive, UploadSession
+
+    request = _drive_service_mock.files().create.return_value
+    _next_chunk_mock.return_value = (None, {"id": "new_file_id"})
+
+    file_id = GDrive.upload_stream(io.BytesIO(b""), "test.zip", "parent_id", session={
+        UploadSession.Uri: "session_uri",
+        UploadSession.Offset: 4,
+        UploadSession.Digest: "digest"
+    })
+
+    assert file_id == "new_file_id"
+    assert request.resumable_uri == "session_uri"
+    assert request._in_error_state is True
+
+
+def test_upload_stream_http_error(_google_build_mock, _next_chunk_mock, http_error_mock, _get_creds_mock):
+    """
+    Test upload_stream handles HttpError by raising it.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _next_chunk_mock.side_effect = http_error_mock
+
+    with pytest.raises(HttpError):
+        GDrive.upload_stream(Mock(), "test.zip", "parent_id")
+
+
+def test_update_properties_success(_google_build_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test update_properties updates only app properties of the file.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    GDrive.update_properties("file_id", {"key": "value"})
+
+    _drive_service_mock.files().update.assert_called_once_with(
+        fileId="file_id",
+        body={"appProperties": {"key": "value"}}
+    )
+
+
+def test_update_properties_http_error(_google_build_mock, _drive_service_mock, http_error_mock, _get_creds_mock):
+    """
+    Test update_properties handles HttpError by raising it.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.files().update().execute.side_effect = http_error_mock
+
+    with pytest.raises(HttpError):
+        GDrive.update_properties("file_id", {"key": "value"})
+
+
 def test_update_file_success(_google_build_mock, _next_chunk_mock, _media_base_upload_mock, _drive_service_mock,
                              _get_creds_mock):
     """
@@ -518,11 +1590,36 @@ def test_get_changes_no_start_token(_google_build_mock, _drive_service_mock, _ge
     # Assert: Then call list
     _drive_service_mock.changes().list.assert_called_once_with(
         pageToken="initial_token",
-        fields="changes(file(id, name, parents), removed), newStartPageToken"
+        pageSize=GDrive.ChangesPageSize,
+        spaces="drive",
+        fields="nextPageToken, newStartPageToken, changes(removed, file(id, parents))"
     )
     assert result == {"changes": [], "newStartPageToken": "new_token"}
 
 
+def test_get_changes_reads_all_pages(mocker, _google_build_mock, _drive_service_mock, _get_creds_mock):
+    """
+    Test get_changes follows next page token until the end of change feed.
+    """
+
+    from savegem.common.service.gdrive import GDrive
+
+    _drive_service_mock.changes.return_value.list.return_value.execute.side_effect = [
+        {"changes": [{"fileId": "1"}], "nextPageToken": "page_2"},
+        {"changes": [{"fileId": "2"}], "nextPageToken": "page_3"},
+        {"changes": [{"fileId": "3"}], "newStartPageToken": "new_token"}
+    ]
+
+    result = GDrive.get_changes("page_1")
+
+    assert [call.kwargs["pageToken"] for call in _drive_service_mock.changes().list.call_args_list] == \
+           ["page_1", "page_2", "page_3"]
+    assert result == {
+        "changes": [{"fileId": "1"}, {"fileId": "2"}, {"fileId": "3"}],
+        "newStartPageToken": "new_token"
+    }
+
+
 def test_get_changes_with_start_token(_google_build_mock, _drive_service_mock, _get_creds_mock):
     """
     Test get_changes uses provided start token.
@@ -541,6 +1638,8 @@ def test_get_changes_with_start_token(_google_build_mock, _drive_service_mock, _
     # Assert: Should call list with provided token
     _drive_service_mock.changes().list.assert_called_once_with(
         pageToken=start_token,
-        fields="changes(file(id, name, parents), removed), newStartPageToken"
+        pageSize=GDrive.ChangesPageSize,
+        spaces="drive",
+        fields="nextPageToken, newStartPageToken, changes(removed, file(id, parents))"
     )
     assert result == {"changes": [], "newStartPageToken": "new_token"}
@@ -0,0 +1,484 @@
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+
+class _FailingStream(io.BytesIO):
+    """
+    Stream which fails after first 4 bytes were read.
+    """
+
+    def read(self, size=-1):
+        if self.tell() >= 4:
+            raise OSError("Stream failed.")
+        return super().read(size)
+
+
+class _ProgressStream(io.BytesIO):
+    """
+    Stream which is read completely before its upload is complete, same as archive stream.
+    """
+
+    @property
+    def progress(self):
+        return self.tell() / len(self.getbuffer())
+
+
+@pytest.fixture
+def _storage(tmp_path: Path):
+    from savegem.common.service.local_storage import LocalStorage
+    return LocalStorage(str(tmp_path / "storage"), "User", "user@example.com")
+
+
+def test_get_current_user(_storage):
+
+    assert _storage.get_current_user() == {"displayName": "User", "emailAddress": "user@example.com"}
+    assert _storage.is_authenticated()
+
+
+def test_create_file(_storage):
+
+    file_id = _storage.create_file("config.json", '{"games": []}', "root", properties={"a": "1", "b": None})
+    metadata = _storage.get_metadata(file_id, "id")
+
+    assert json.loads(_storage.download_file(file_id).getvalue()) == {"games": []}
+    assert metadata["name"] == "config.json"
+    assert metadata["parents"] == ["root"]
+    assert metadata["appProperties"] == {"a": "1"}
+    assert metadata["md5Checksum"] == hashlib.md5(b'{"games": []}').hexdigest()
+    assert metadata["size"] == "13"
+
+
+def test_get_metadata_of_missing_file(_storage):
+
+    assert _storage.get_metadata("missing", "id") is None
+    assert _storage.get_metadata("../outside", "id") is None
+    assert _storage.get_metadata_batch(["missing"], "id") == [None]
+
+
+def test_update_file(_storage):
+
+    file_id = _storage.create_file("activity.json", "{}", "root")
+    _storage.update_file(file_id, '{"players": {}}')
+
+    assert json.loads(_storage.download_file(file_id).getvalue()) == {"players": {}}
+    assert _storage.get_metadata(file_id, "version")["version"] == "2"
+
+
+def test_update_missing_file(_storage):
+
+    from savegem.common.service.storage_backend import StorageError
+
+    with pytest.raises(StorageError):
+        _storage.update_file("missing", "{}")
+
+
+def test_update_properties(_storage):
+
+    file_id = _storage.create_file("save.zip", b"", "root", properties={"a": "1", "b": "2"})
+    _storage.update_properties(file_id, {"b": None, "c": "3"})
+
+    assert _storage.get_metadata(file_id, "appProperties")["appProperties"] == {"a": "1", "c": "3"}
+
+
+def test_list_files(_storage):
+
+    from constants import ZIP_MIME_TYPE, JSON_MIME_TYPE
+
+    first_id = _storage.create_file("first.zip", b"1", "dir", ZIP_MIME_TYPE)
+    second_id = _storage.create_file("second.zip", b"2", "dir", ZIP_MIME_TYPE)
+    _storage.create_file("config.json", "{}", "dir", JSON_MIME_TYPE)
+    _storage.create_file("other.zip", b"3", "other_dir", ZIP_MIME_TYPE)
+
+    files = _storage.list_files("dir", "id", (ZIP_MIME_TYPE,))
+
+    assert {file["id"] for file in files} == {first_id, second_id}
+    assert files[0]["createdTime"] >= files[1]["createdTime"]
+    assert len(_storage.list_files("dir", "id")) == 3
+    assert _storage.list_files("empty_dir", "id") == []
+
+
+def test_list_latest(_storage):
+
+    from constants import ZIP_MIME_TYPE
+
+    _storage.create_file("first.zip", b"1", "dir", ZIP_MIME_TYPE)
+    latest_id = _storage.create_file("second.zip", b"2", "dir", ZIP_MIME_TYPE)
+    _storage.set_latest("dir", latest_id)
+
+    result = _storage.list_latest(["dir", "empty_dir"], "id", (ZIP_MIME_TYPE,))
+
+    assert result[0]["id"] == _storage.list_files("dir", "id")[0]["id"]
+    assert result[1] == {}
+
+
+def test_list_latest_skips_files_without_required_property(_storage):
+
+    from constants import ZIP_MIME_TYPE
+
+    published_id = _storage.create_file("first.zip", b"1", "dir", ZIP_MIME_TYPE, properties={"checksum": "1"})
+    _storage.create_file("second.zip", b"2", "dir", ZIP_MIME_TYPE)
+
+    assert _storage.list_latest(["dir"], "id", (ZIP_MIME_TYPE,), "checksum")[0]["id"] == published_id
+
+
+def test_list_latest_reads_only_pointed_file(_storage, module_patch):
+
+    from constants import ZIP_MIME_TYPE
+
+    latest_id = _storage.create_file("first.zip", b"1", "dir", ZIP_MIME_TYPE, properties={"checksum": "1"})
+    _storage.set_latest("dir", latest_id)
+    # Save which is still being published.
+    _storage.create_file("second.zip", b"2", "dir", ZIP_MIME_TYPE, properties={"checksum": "2"})
+    scandir_mock = module_patch("os.scandir", wraps=os.scandir)
+
+    assert _storage.list_latest(["dir"], "id", (ZIP_MIME_TYPE,), "checksum")[0]["id"] == latest_id
+    scandir_mock.assert_not_called()
+
+
+@pytest.mark.parametrize("properties, mime_type", [
+    ({}, "application/zip"),
+    ({"checksum": "1"}, "application/json")
+])
+def test_list_latest_ignores_pointer_to_invalid_file(_storage, logger_mock, properties, mime_type):
+
+    from constants import ZIP_MIME_TYPE
+
+    latest_id = _storage.create_file("first.zip", b"1", "dir", ZIP_MIME_TYPE, properties={"checksum": "1"})
+    invalid_id = _storage.create_file("second.zip", b"2", "dir", mime_type, properties=properties)
+    _storage.set_latest("dir", invalid_id)
+
+    assert _storage.list_latest(["dir"], "id", (ZIP_MIME_TYPE,), "checksum")[0]["id"] == latest_id
+    logger_mock.warning.assert_called_once()
+
+
+def test_list_latest_ignores_pointer_to_removed_file(_storage, logger_mock):
+
+    from constants import ZIP_MIME_TYPE
+
+    latest_id = _storage.create_file("first.zip", b"1", "dir", ZIP_MIME_TYPE)
+    removed_id = _storage.create_file("second.zip", b"2", "dir", ZIP_MIME_TYPE)
+    _storage.set_latest("dir", removed_id)
+    _storage.delete_batch([removed_id])
+
+    assert _storage.list_latest(["dir"], "id", (ZIP_MIME_TYPE,)) == [_storage.get_metadata(latest_id, "id")]
+    logger_mock.warning.assert_called_once_with("Latest file %s of directory %s is missing.", removed_id, "dir")
+
+
+def test_list_latest_of_invalid_directory(_storage, logger_mock):
+
+    from constants import ZIP_MIME_TYPE
+
+    assert _storage.list_latest(["../outside"], "id", (ZIP_MIME_TYPE,)) == [{}]
+    logger_mock.warning.assert_called_once()
+
+
+def test_list_latest_when_listing_failed(_storage, module_patch):
+
+    from constants import ZIP_MIME_TYPE
+
+    latest_id = _storage.create_file("first.zip", b"1", "dir", ZIP_MIME_TYPE)
+    _storage.set_latest("dir", latest_id)
+    _storage.create_file("other.zip", b"2", "other_dir", ZIP_MIME_TYPE)
+    module_patch("os.scandir", side_effect=OSError("Share is not available."))
+
+    result = _storage.list_latest(["dir", "other_dir"], "id", (ZIP_MIME_TYPE,))
+
+    assert result[0]["id"] == latest_id
+    assert result[1] is None
+
+
+def test_set_latest_of_invalid_directory(_storage):
+
+    from savegem.common.service.storage_backend import StorageError
+
+    with pytest.raises(StorageError):
+        _storage.set_latest("../outside", "file_id")
+
+
+def test_create_folder(_storage):
+
+    from constants import FOLDER_MIME_TYPE
+
+    folder_id = _storage.create_folder("chunks", "dir")
+
+    assert _storage.list_files("dir", "id, name", (FOLDER_MIME_TYPE,)) == [_storage.get_metadata(folder_id, "id")]
+
+
+def test_delete_batch(_storage):
+
+    file_id = _storage.create_file("save.zip", b"1", "dir")
+
+    assert _storage.delete_batch([file_id, "missing", "../outside"]) == [file_id, "missing"]
+    assert _storage.get_metadata(file_id, "id") is None
+    assert _storage.list_files("dir", "id") == []
+
+
+def test_download_file_into_sink(_storage, mocker):
+
+    file_id = _storage.create_file("save.zip", b"content", "dir")
+    sink = io.BytesIO()
+    subscriber = mocker.Mock()
+
+    assert _storage.download_file_parallel(file_id, sink, 7, 4, subscriber) is sink
+    assert sink.getvalue() == b"content"
+    subscriber.assert_called_with(1)
+
+
+def test_download_missing_file(_storage):
+
+    assert _storage.download_file("missing") is None
+
+
+def test_open_file(_storage):
+
+    from savegem.common.service.storage_backend import StorageError
+
+    file_id = _storage.create_file("save.zip", b"content", "dir")
+
+    with _storage.open_file(file_id, 7) as file:
+        file.seek(3)
+        assert file.read() == b"tent"
+
+    with pytest.raises(StorageError):
+        _storage.open_file("missing", 0)
+
+
+def test_upload_stream(_storage, mocker):
+
+    from savegem.common.service.storage_backend import UploadSession
+
+    sessions = []
+    stream = io.BytesIO(b"x" * 10)
+
+    mocker.patch("savegem.common.service.local_storage.LocalStorage.ChunkSize", 4)
+    file_id = _storage.upload_stream(stream, "save.zip", "dir", properties={"a": "1"},
+                                     on_session_update=sessions.append)
+
+    assert _storage.download_file(file_id).getvalue() == b"x" * 10
+    assert _storage.get_metadata(file_id, "appProperties")["appProperties"] == {"a": "1"}
+    assert [session[UploadSession.Offset] for session in sessions] == [4, 8, 10]
+
+
+def test_upload_stream_resumes_session(_storage, mocker):
+
+    from savegem.common.service.storage_backend import StorageError
+
+    sessions = []
+    data = bytes(range(10))
+
+    mocker.patch("savegem.common.service.local_storage.LocalStorage.ChunkSize", 4)
+
+    with pytest.raises(StorageError):
+        _storage.upload_stream(_FailingStream(data), "save.zip", "dir", on_session_update=sessions.append)
+
+    file_id = _storage.upload_stream(io.BytesIO(data), "save.zip", "dir", session=sessions[-1])
+
+    assert _storage.download_file(file_id).getvalue() == data
+
+
+def test_upload_stream_rejects_different_stream(_storage, mocker):
+
+    from savegem.common.service.storage_backend import StorageError
+
+    sessions = []
+
+    mocker.patch("savegem.common.service.local_storage.LocalStorage.ChunkSize", 4)
+
+    with pytest.raises(StorageError):
+        _storage.upload_stream(_FailingStream(b"first stream"), "save.zip", "dir", on_session_update=sessions.append)
+
+    with pytest.raises(ValueError, match="doesn't match"):
+        _storage.upload_stream(io.BytesIO(b"other stream"), "save.zip", "dir", session=sessions[-1])
+
+
+def test_upload_stream_rejects_expired_session(_storage):
+
+    from savegem.common.service.storage_backend import UploadSession
+
+    with pytest.raises(ValueError, match="expired"):
+        _storage.upload_stream(io.BytesIO(b"data"), "save.zip", "dir", session={UploadSession.Uri: "missing"})
+
+
+def test_get_changes(_storage):
+
+    token = _storage.get_start_page_token()
+    file_id = _storage.create_file("save.zip", b"1", "dir")
+    _storage.delete_batch([file_id])
+
+    response = _storage.get_changes(token)
+
+    assert response["changes"] == [
+        {"removed": False, "file": {"id": file_id, "parents": ["dir"]}},
+        {"removed": True, "fileId": file_id}
+    ]
+    assert _storage.get_changes(response["newStartPageToken"])["changes"] == []
+
+
+@pytest.mark.parametrize("token", [None, "-1", "100000", "invalid"])
+def test_get_changes_resets_invalid_token(_storage, token):
+
+    _storage.create_file("save.zip", b"1", "dir")
+
+    response = _storage.get_changes(token)
+
+    assert response == {"changes": [], "newStartPageToken": _storage.get_start_page_token()}
+
+
+def test_list_files_when_listing_failed(_storage, module_patch):
+
+    _storage.create_file("save.zip", b"1", "dir")
+    module_patch("os.scandir", side_effect=OSError("Share is not available."))
+
+    assert _storage.list_files("dir", "id") is None
+
+
+def test_list_files_skips_corrupted_metadata(_storage, tmp_path: Path, logger_mock):
+
+    file_id = _storage.create_file("save.zip", b"1", "dir")
+    (tmp_path / "storage" / "files" / "corrupted.json").write_text("{", encoding="utf-8")
+
+    assert [file["id"] for file in _storage.list_files("dir", "id")] == [file_id]
+    logger_mock.warning.assert_called_once()
+
+
+def test_progress_is_reported_to_subscriber(_storage, mocker):
+
+    subscriber = mocker.Mock()
+
+    empty_id = _storage.create_file("empty.zip", b"", "dir")
+    _storage.download_file(empty_id, subscriber)
+    _storage.update_file(empty_id, "{}", subscriber=subscriber)
+    _storage.upload_stream(io.BytesIO(b"data"), "save.zip", "dir", subscriber=subscriber)
+
+    assert subscriber.call_args_list == [mocker.call(1), mocker.call(1), mocker.call(0), mocker.call(1)]
+
+
+@pytest.mark.parametrize("patched, action", [
+    ("save_file", lambda storage, file_id: storage.create_file("config.json", "{}", "dir")),
+    ("save_file", lambda storage, file_id: storage.create_folder("chunks", "dir")),
+    ("save_file", lambda storage, file_id: storage.update_properties(file_id, {"a": "1"})),
+    ("locked_file", lambda storage, file_id: storage.get_changes("0")),
+    ("locked_file", lambda storage, file_id: storage.get_start_page_token())
+])
+def test_storage_error_when_storage_is_not_writable(_storage, module_patch, patched, action):
+
+    from savegem.common.service.storage_backend import StorageError
+
+    file_id = _storage.create_file("save.zip", b"1", "dir")
+    module_patch(patched, side_effect=OSError("Access denied."))
+
+    with pytest.raises(StorageError):
+        action(_storage, file_id)
+
+
+def test_upload_stream_rejects_shorter_stream(_storage, mocker):
+
+    from savegem.common.service.storage_backend import StorageError
+
+    sessions = []
+
+    mocker.patch("savegem.common.service.local_storage.LocalStorage.ChunkSize", 4)
+
+    with pytest.raises(StorageError):
+        _storage.upload_stream(_FailingStream(b"first stream"), "save.zip", "dir", on_session_update=sessions.append)
+
+    with pytest.raises(ValueError, match="has ended"):
+        _storage.upload_stream(io.BytesIO(b"fi"), "save.zip", "dir", session=sessions[-1])
+
+
+def test_upload_stream_completes_progress_once(_storage, mocker):
+
+    subscriber = mocker.Mock()
+
+    mocker.patch("savegem.common.service.local_storage.LocalStorage.ChunkSize", 4)
+    _storage.upload_stream(_ProgressStream(b"x" * 8), "save.zip", "dir", subscriber=subscriber)
+
+    progress = [call_args.args[0] for call_args in subscriber.call_args_list]
+
+    assert progress[-1] == 1
+    assert all(value < 1 for value in progress[:-1])
+
+
+def test_list_files_reads_only_files_of_directory(_storage, tmp_path: Path, logger_mock):
+
+    # Storage is indexed once it's listed for the first time.
+    _storage.list_files("dir", "id")
+
+    file_id = _storage.create_file("save.zip", b"1", "dir")
+    other_id = _storage.create_file("other.zip", b"2", "other_dir")
+    (tmp_path / "storage" / "files" / f"{other_id}.json").write_text("{", encoding="utf-8")
+
+    assert [file["id"] for file in _storage.list_files("dir", "id")] == [file_id]
+    logger_mock.warning.assert_not_called()
+
+
+def test_list_files_indexes_existing_storage(_storage, tmp_path: Path):
+
+    import shutil
+
+    file_id = _storage.create_file("save.zip", b"1", "dir")
+    other_id = _storage.create_file("other.zip", b"2", "other_dir")
+    # Storage created before files were indexed by directory.
+    shutil.rmtree(tmp_path / "storage" / "directories")
+
+    assert [file["id"] for file in _storage.list_files("dir", "id")] == [file_id]
+    assert [file["id"] for file in _storage.list_files("other_dir", "id")] == [other_id]
+
+
+def test_list_files_skips_removed_file(_storage, tmp_path: Path, logger_mock):
+
+    file_id = _storage.create_file("save.zip", b"1", "dir")
+    _storage.list_files("dir", "id")
+    (tmp_path / "storage" / "files" / f"{file_id}.json").unlink()
+
+    assert _storage.list_files("dir", "id") == []
+    logger_mock.warning.assert_not_called()
+
+
+def test_get_changes_removes_changes_read_by_all_users(_storage, tmp_path: Path, mocker):
+
+    from savegem.common.service.local_storage import LocalStorage
+
+    mocker.patch.object(LocalStorage, "MaxChangesSize", 0)
+    other_storage = LocalStorage(str(tmp_path / "storage"), "Other")
+    other_token = other_storage.get_start_page_token()
+    token = _storage.get_start_page_token()
+
+    _storage.create_file("save.zip", b"1", "dir")
+    response = _storage.get_changes(token)
+
+    # Changes are kept until they are read by other user.
+    assert other_storage.get_changes(other_token)["changes"] == response["changes"]
+    assert (tmp_path / "storage" / "changes.log").stat().st_size == 0
+
+    file_id = _storage.create_file("save.zip", b"2", "dir")
+
+    assert _storage.get_changes(response["newStartPageToken"])["changes"] == [
+        {"removed": False, "file": {"id": file_id, "parents": ["dir"]}}
+    ]
+
+
+def test_get_changes_does_not_wait_for_inactive_users(_storage, tmp_path: Path, mocker):
+
+    from savegem.common.service.local_storage import LocalStorage
+
+    mocker.patch.object(LocalStorage, "MaxChangesSize", 0)
+    other_storage = LocalStorage(str(tmp_path / "storage"), "Other")
+    other_token = other_storage.get_start_page_token()
+    token = _storage.get_start_page_token()
+
+    for consumer in (tmp_path / "storage" / "consumers").iterdir():
+        os.utime(consumer, (0, 0))
+
+    _storage.create_file("save.zip", b"1", "dir")
+    response = _storage.get_changes(token)
+
+    assert len(response["changes"]) == 1
+    assert other_storage.get_changes(other_token) == {
+        "changes": [], "newStartPageToken": response["newStartPageToken"]
+    }
@@ -0,0 +1,128 @@
+import json
+
+import pytest
+from pytest_mock import MockerFixture
+
+
+def _http_error(status: int, reason: str = None, retry_after: str = None):
+    import httplib2
+    from googleapiclient.errors import HttpError
+
+    headers = {"status": status}
+
+    if retry_after is not None:
+        headers["retry-after"] = retry_after
+
+    errors = [{"domain": "usageLimits", "reason": reason}] if reason is not None else []
+    content = json.dumps({"error": {"code": status, "message": "Failed", "errors": errors}}).encode()
+
+    return HttpError(httplib2.Response(headers), content)
+
+
+@pytest.fixture
+def _sleep_mock(module_patch):
+    return module_patch("time.sleep")
+
+
+@pytest.fixture
+def _metrics(module_patch):
+    from savegem.common.util.metrics import Metrics
+
+    metrics = Metrics()
+    module_patch("metrics", return_value=metrics)
+
+    return metrics
+
+
+@pytest.mark.parametrize("error, is_idempotent, should_retry", [
+    (_http_error(429), False, True),
+    (_http_error(403, "userRateLimitExceeded"), False, True),
+    (_http_error(403, "rateLimitExceeded"), True, True),
+    (_http_error(403, "insufficientFilePermissions"), True, False),
+    (_http_error(503), True, True),
+    (_http_error(503), False, False),
+    (_http_error(404), True, False),
+    (TimeoutError(), True, True),
+    (TimeoutError(), False, False),
+    (ValueError(), True, False)
+])
+def test_should_retry(error, is_idempotent, should_retry):
+
+    from savegem.common.service.retry import RetryPolicy
+
+    assert RetryPolicy(is_idempotent=is_idempotent).should_retry(error) is should_retry
+
+
+def test_delay_grows_exponentially_with_jitter(module_patch):
+
+    from savegem.common.service.retry import RetryPolicy
+
+    uniform = module_patch("random.uniform", side_effect=lambda low, high: high)
+    policy = RetryPolicy(base_delay=1, max_delay=10)
+
+    assert [policy.delay(attempt, ValueError()) for attempt in range(5)] == [1, 2, 4, 8, 10]
+    assert all(args.args[0] == 0 for args in uniform.call_args_list)
+
+
+@pytest.mark.parametrize("retry_after, expected", [("30", 30), ("-1", 0), ("Thu, 01 Jan 1970 00:00:00 GMT", 0),
+                                                   ("invalid", None), (None, None)])
+def test_retry_after(retry_after, expected):
+
+    from savegem.common.service.retry import retry_after as get_retry_after
+
+    assert get_retry_after(_http_error(429, retry_after=retry_after)) == expected
+
+
+def test_delay_respects_retry_after(module_patch):
+
+    from savegem.common.service.retry import RetryPolicy
+
+    module_patch("random.uniform", return_value=0.5)
+
+    assert RetryPolicy().delay(0, _http_error(429, retry_after="20")) == 20
+
+
+def test_call_with_retry_succeeds_after_temporary_errors(mocker: MockerFixture, _sleep_mock, _metrics):
+
+    from savegem.common.service.retry import RetryPolicy, call_with_retry
+    from savegem.common.util.metrics import Metrics
+
+    function = mocker.Mock(side_effect=[_http_error(429), _http_error(500), "result"])
+
+    assert call_with_retry(function, "files.list", RetryPolicy()) == "result"
+    assert function.call_count == 3
+    assert _sleep_mock.call_count == 2
+
+    entry = _metrics.snapshot()["files.list"]
+    assert (entry[Metrics.Calls], entry[Metrics.Retries], entry[Metrics.Failures]) == (1, 2, 0)
+
+
+def test_call_with_retry_gives_up_after_max_attempts(mocker: MockerFixture, _sleep_mock, _metrics):
+
+    from googleapiclient.errors import HttpError
+    from savegem.common.service.retry import RetryPolicy, call_with_retry
+    from savegem.common.util.metrics import Metrics
+
+    function = mocker.Mock(side_effect=_http_error(503))
+
+    with pytest.raises(HttpError):
+        call_with_retry(function, "files.get", RetryPolicy(max_attempts=3))
+
+    assert function.call_count == 3
+
+    entry = _metrics.snapshot()["files.get"]
+    assert (entry[Metrics.Calls], entry[Metrics.Retries], entry[Metrics.Failures]) == (1, 2, 1)
+
+
+def test_call_with_retry_raises_permanent_error(mocker: MockerFixture, _sleep_mock, _metrics):
+
+    from googleapiclient.errors import HttpError
+    from savegem.common.service.retry import RetryPolicy, call_with_retry
+
+    function = mocker.Mock(side_effect=_http_error(404))
+
+    with pytest.raises(HttpError):
+        call_with_retry(function, "files.get", RetryPolicy())
+
+    function.assert_called_once()
+    _sleep_mock.assert_not_called()
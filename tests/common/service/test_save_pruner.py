@@ -0,0 +1,275 @@
+import io
+import json
+from datetime import datetime, timezone, timedelta
+
+import pytest
+from pytest_mock import MockerFixture
+
+from tests.test_data import PlayerTestData
+
+
+def _game(mocker: MockerFixture, name: str, retention, latest_id: str = "save_0"):
+    game = mocker.Mock()
+    game.name = name
+    game.retention = retention
+    game.meta.drive.id = latest_id
+    game.drive_directory = f"drive_{name}"
+
+    return game
+
+
+def _saves(ages_days: list[int], prefix: str = "save", owner: str = PlayerTestData.FirstPlayerName):
+    """
+    Used to build published saves sorted from the latest one, each save has manifest.
+    """
+
+    now = datetime.now(timezone.utc)
+
+    return [
+        {
+            "id": f"{prefix}_{index}",
+            "createdTime": (now - timedelta(days=age)).isoformat().replace("+00:00", "Z"),
+            "appProperties": {"manifest": f"{prefix}_{index}_manifest", "checksum": "checksum", "owner": owner}
+        }
+        for index, age in enumerate(ages_days)
+    ]
+
+
+def _chunked_saves(ages_days: list[int]):
+    """
+    Used to build published saves stored as chunks, each save references its own chunk.
+    """
+
+    from constants import CHUNKS_MIME_TYPE
+
+    saves = _saves(ages_days)
+
+    for save in saves:
+        save["mimeType"] = CHUNKS_MIME_TYPE
+        del save["appProperties"]["manifest"]
+
+    return saves
+
+
+def _chunk_record(file_id: str):
+    return io.BytesIO(json.dumps({"files": {"game.sav": {"chunks": [f"{file_id}_chunk"]}}}).encode())
+
+
+@pytest.fixture(autouse=True)
+def _setup(user_config_mock):
+    pass
+
+
+@pytest.fixture
+def _storage(module_patch):
+    storage = module_patch("storage").return_value
+    storage.delete_batch.side_effect = lambda file_ids: file_ids
+    storage.list_latest.side_effect = lambda directory_ids, *args: [{}] * len(directory_ids)
+
+    return storage
+
+
+def test_prune_removes_saves_exceeding_retention(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.core.save_meta import DriveMetadata, SaveMetaProp
+    from savegem.common.service.save_pruner import SavePruner
+
+    _storage.list_files.return_value = _saves([0, 1, 2, 3])
+
+    assert SavePruner.prune([_game(mocker, "Game", Retention(keep_last=2))]) == 4
+
+    _storage.list_latest.assert_called_once_with(["drive_Game"], "id", DriveMetadata.MimeTypes, SaveMetaProp.Checksum)
+    _storage.list_files.assert_called_once_with("drive_Game", SavePruner.Fields, DriveMetadata.MimeTypes)
+    _storage.delete_batch.assert_called_once_with(["save_2", "save_2_manifest", "save_3", "save_3_manifest"])
+
+
+def test_prune_deletes_saves_of_all_games_in_one_batch(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    saves = {"drive_A": _saves([0, 10], "a"), "drive_B": _saves([0, 1, 40], "b")}
+    _storage.list_files.side_effect = lambda directory_id, fields, mime_types: saves[directory_id]
+
+    SavePruner.prune([
+        _game(mocker, "A", Retention(keep_last=1), "a_0"),
+        _game(mocker, "B", Retention(max_age_days=30), "b_0")
+    ])
+
+    _storage.list_latest.assert_called_once()
+    _storage.delete_batch.assert_called_once_with(["a_1", "a_1_manifest", "b_2", "b_2_manifest"])
+
+
+def test_prune_keeps_latest_save(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    # Save was uploaded after metadata has been refreshed.
+    _storage.list_files.return_value = _saves([0, 100, 100])
+
+    SavePruner.prune([_game(mocker, "Game", Retention(keep_last=1), latest_id="save_1")])
+
+    _storage.delete_batch.assert_called_once_with(["save_2", "save_2_manifest"])
+
+
+def test_prune_keeps_save_pointed_as_latest(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    # Metadata of the game is not known in watcher process.
+    _storage.list_files.return_value = _saves([0, 100, 100])
+    _storage.list_latest.side_effect = None
+    _storage.list_latest.return_value = [{"id": "save_2"}]
+
+    SavePruner.prune([_game(mocker, "Game", Retention(keep_last=1), latest_id=None)])
+
+    _storage.delete_batch.assert_called_once_with(["save_1", "save_1_manifest"])
+
+
+def test_prune_does_not_count_unpublished_saves(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    saves = _saves([0, 5, 10])
+    unpublished = {"id": "unpublished", "createdTime": saves[0]["createdTime"], "appProperties": {}}
+    _storage.list_files.return_value = [unpublished, *saves]
+
+    SavePruner.prune([_game(mocker, "Game", Retention(keep_last=1), latest_id=None)])
+
+    _storage.delete_batch.assert_called_once_with(["save_1", "save_1_manifest", "save_2", "save_2_manifest"])
+
+
+def test_prune_removes_abandoned_unpublished_saves(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    saves = _saves([0, 2])
+
+    for save in saves:
+        del save["appProperties"]["checksum"]
+
+    _storage.list_files.return_value = saves
+
+    SavePruner.prune([_game(mocker, "Game", Retention(keep_last=5), latest_id=None)])
+
+    _storage.delete_batch.assert_called_once_with(["save_1", "save_1_manifest"])
+
+
+def test_prune_skips_saves_of_other_players(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    saves = _saves([0, 1, 2])
+    saves[1]["appProperties"]["owner"] = PlayerTestData.SecondPlayerName
+    _storage.list_files.return_value = saves
+
+    assert SavePruner.prune([_game(mocker, "Game", Retention(keep_last=1))]) == 2
+    _storage.delete_batch.assert_called_once_with(["save_2", "save_2_manifest"])
+
+
+def test_prune_skips_games_without_retention(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    assert SavePruner.prune([_game(mocker, "Game", Retention())]) == 0
+
+    _storage.list_latest.assert_not_called()
+    _storage.list_files.assert_not_called()
+    _storage.delete_batch.assert_not_called()
+
+
+def test_prune_skips_game_when_listing_failed(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    _storage.list_files.return_value = None
+
+    assert SavePruner.prune([_game(mocker, "Game", Retention(keep_last=1))]) == 0
+    _storage.delete_batch.assert_not_called()
+
+
+def test_prune_skips_game_when_latest_save_is_unknown(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    _storage.list_latest.side_effect = None
+    _storage.list_latest.return_value = [None]
+
+    assert SavePruner.prune([_game(mocker, "Game", Retention(keep_last=1))]) == 0
+
+    _storage.list_files.assert_not_called()
+    _storage.delete_batch.assert_not_called()
+
+
+def test_prune_removes_unreferenced_chunks(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner, ChunkStore
+
+    find_unreferenced_mock = mocker.patch.object(ChunkStore, "find_unreferenced", return_value=["save_2_chunk_id"])
+    _storage.list_files.return_value = _chunked_saves([0, 1, 2])
+    _storage.download_file.side_effect = _chunk_record
+
+    assert SavePruner.prune([_game(mocker, "Game", Retention(keep_last=2))]) == 2
+
+    referenced_ids, created_before = find_unreferenced_mock.call_args.args
+    assert referenced_ids == {"save_0_chunk", "save_1_chunk"}
+    assert created_before <= datetime.now(timezone.utc) - SavePruner.UnpublishedGracePeriod
+    _storage.delete_batch.assert_called_once_with(["save_2", "save_2_chunk_id"])
+
+
+def test_prune_does_not_read_chunks_of_archived_saves(mocker: MockerFixture, _storage, module_patch):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    chunk_store_mock = module_patch("ChunkStore")
+    _storage.list_files.return_value = _saves([0, 1])
+
+    SavePruner.prune([_game(mocker, "Game", Retention(keep_last=1))])
+
+    chunk_store_mock.assert_not_called()
+    _storage.download_file.assert_not_called()
+
+
+@pytest.mark.parametrize("download_file_result", [
+    None,
+    b"not json"
+])
+def test_prune_keeps_chunks_when_save_could_not_be_read(mocker: MockerFixture, _storage, download_file_result):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner
+
+    from savegem.common.service.save_pruner import ChunkStore
+
+    find_unreferenced_mock = mocker.patch.object(ChunkStore, "find_unreferenced")
+    _storage.list_files.return_value = _chunked_saves([0, 1])
+    _storage.download_file.return_value = None if download_file_result is None else io.BytesIO(download_file_result)
+
+    assert SavePruner.prune([_game(mocker, "Game", Retention(keep_last=1))]) == 1
+
+    find_unreferenced_mock.assert_not_called()
+    _storage.delete_batch.assert_called_once_with(["save_1"])
+
+
+def test_prune_keeps_chunks_when_listing_failed(mocker: MockerFixture, _storage):
+
+    from savegem.common.core.game_config import Retention
+    from savegem.common.service.save_pruner import SavePruner, ChunkStore
+
+    mocker.patch.object(ChunkStore, "find_unreferenced", side_effect=RuntimeError("Failed to list chunks."))
+    _storage.list_files.return_value = _chunked_saves([0, 1])
+    _storage.download_file.side_effect = _chunk_record
+
+    assert SavePruner.prune([_game(mocker, "Game", Retention(keep_last=1))]) == 1
+    _storage.delete_batch.assert_called_once_with(["save_1"])
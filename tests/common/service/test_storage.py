@@ -0,0 +1,57 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _reset_storage(module_patch):
+    module_patch("_storage", new=None)
+
+
+@pytest.fixture
+def _config(prop_mock):
+
+    config = {"storage.backend": "local", "storage.localPath": "/mnt/share/saves", "storage.userName": "User"}
+    prop_mock.side_effect = lambda name: config.get(name, {})
+
+    return config
+
+
+def test_storage_defaults_to_gdrive(prop_mock):
+
+    from savegem.common.service.gdrive import GDrive
+    from savegem.common.service.storage import storage
+
+    prop_mock.return_value = {}
+
+    assert isinstance(storage(), GDrive)
+    assert storage() is storage()
+
+
+def test_storage_local(_config):
+
+    from savegem.common.service.local_storage import LocalStorage
+    from savegem.common.service.storage import storage
+
+    result = storage()
+
+    assert isinstance(result, LocalStorage)
+    assert result.get_current_user() == {"displayName": "User", "emailAddress": None}
+
+
+def test_storage_local_without_path(_config):
+
+    from savegem.common.service.storage import storage
+
+    _config["storage.localPath"] = ""
+
+    with pytest.raises(ValueError):
+        storage()
+
+
+def test_storage_unknown_backend(_config):
+
+    from savegem.common.service.storage import storage
+
+    _config["storage.backend"] = "ftp"
+
+    with pytest.raises(ValueError):
+        storage()
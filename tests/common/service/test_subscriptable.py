@@ -75,6 +75,18 @@ def test_done_event_creation_failure():
     assert event.success is False
 
 
+def test_done_event_already_up_to_date():
+    """
+    Test DoneEvent for skipped work is successful.
+    """
+
+    from savegem.common.service.subscriptable import EventKind, DoneEvent
+
+    event = DoneEvent(EventKind.AlreadyUpToDate)
+    assert event.kind == EventKind.AlreadyUpToDate
+    assert event.success is True
+
+
 def test_subscribe_method(service, subscriber_mock):
     """
     Test that a subscriber is added to the internal list.
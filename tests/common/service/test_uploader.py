@@ -1,4 +1,9 @@
+import hashlib
+import io
+import json
+import zipfile
 from datetime import datetime
+from pathlib import Path
 from unittest.mock import call
 
 import pytest
@@ -8,29 +13,60 @@ from tests.test_data import PlayerTestData
 
 
 @pytest.fixture(autouse=True)
-def _setup(app_context, user_config_mock, path_exists_mock, resolve_temp_file_mock):
+def _setup(app_context, user_config_mock, path_exists_mock):
     path_exists_mock.return_value = True
-    resolve_temp_file_mock.return_value = "/tmp/test-game-archive"
+
+
+@pytest.fixture(autouse=True)
+def _upload_journal(module_patch, tmp_path: Path):
+    """
+    Keeps upload journal inside of test directory.
+    """
+
+    from savegem.common.core.upload_journal import UploadJournal
+
+    journal = UploadJournal(str(tmp_path / "uploads.json"))
+    module_patch("upload_journal", return_value=journal)
+
+    return journal
 
 
 @pytest.fixture
-def mock_game(mocker: MockerFixture):
+def _save_files(tmp_path: Path):
+    """
+    Creates save files and metadata file of the game.
+    """
+
+    (tmp_path / "file1.sav").write_bytes(b"first save file")
+    (tmp_path / "file2.sav").write_bytes(b"second save file")
+    (tmp_path / "meta.json").write_text("{}")
+
+    return tmp_path
+
+
+@pytest.fixture
+def mock_game(mocker: MockerFixture, _save_files):
     """
     Fixture to create a mock Game object with necessary nested mocks
     """
 
+    from savegem.common.util.archive import Compression
+
     mock_game = mocker.MagicMock()
     mock_game.name = "TestGame"
-    mock_game.local_path = "/path/to/saves"
-    mock_game.file_list = ["/path/to/saves/file1.sav", "/path/to/saves/file2.sav"]
-    mock_game.metadata_file_path = "/path/to/saves/meta.json"
+    mock_game.local_path = str(_save_files)
+    mock_game.file_list = [str(_save_files / "file1.sav"), str(_save_files / "file2.sav")]
+    mock_game.metadata_file_path = str(_save_files / "meta.json")
     mock_game.drive_directory = "Drive/Games/TestGame"
+    mock_game.compression = Compression()
 
     # Mock metadata calls
-    mock_game.meta.local.calculate_checksum.return_value = "NEW_CHECKSUM"
     mock_game.meta.local.checksum = None
     mock_game.meta.local.owner = None
     mock_game.meta.local.created_time = None
+    mock_game.meta.local.calculate_checksum.return_value = "local_checksum"
+    mock_game.meta.drive.is_present = True
+    mock_game.meta.drive.checksum = "drive_checksum"
 
     return mock_game
 
@@ -57,10 +93,18 @@ def uploader(mock_subscriber):
     return uploader
 
 
-def test_upload_success(path_exists_mock, resolve_temp_file_mock, makedirs_mock, copy_mock, make_archive_mock,
-                        gdrive_mock, datetime_mock, uploader, mock_game, mock_subscriber):
+def _expected_checksum():
+    checksum = hashlib.sha256()
+
+    for content in [b"first save file", b"second save file"]:
+        checksum.update(hashlib.sha256(content).hexdigest().encode())
+
+    return checksum.hexdigest()
+
+
+def test_upload_success(storage_mock, datetime_mock, uploader, mock_game, mock_subscriber):
     """
-    Test a successful full upload process, ensuring all 5 stages complete
+    Test a successful full upload process, ensuring all stages complete
     """
 
     from savegem.common.core.save_meta import SaveMetaProp
@@ -70,68 +114,193 @@ def test_upload_success(path_exists_mock, resolve_temp_file_mock, makedirs_mock,
     mock_now = datetime(2025, 10, 2, 12, 30, 0)
     datetime_mock.now.return_value = mock_now
 
-    target_archive_base = "/tmp/test-game-archive"
-    target_archive_zip = f"{target_archive_base}.zip"
+    uploaded = io.BytesIO()
+
+    def upload_stream(stream, *args, **kwargs):
+        uploaded.write(stream.read())
+        return "uploaded_file_id"
+
+    storage_mock.upload_stream.side_effect = upload_stream
+    storage_mock.create_file.return_value = "manifest_file_id"
 
     # ACT
     uploader.upload(mock_game)
 
-    # ASSERT - Execution Flow (5 stages + DoneEvent)
+    # ASSERT - Archive has been streamed to drive.
+    upload_args, upload_kwargs = storage_mock.upload_stream.call_args
+    assert upload_args[1] == "TestGame-2025-10-02-12-30-00.zip"
+    assert upload_args[2] == mock_game.drive_directory
+    assert 'subscriber' in upload_kwargs
 
-    # 1. Directory Existence Check
-    path_exists_mock.assert_called_with(mock_game.local_path)
+    # ASSERT - Properties known upfront are set on creation.
+    assert upload_kwargs["properties"] == {
+        SaveMetaProp.Owner: PlayerTestData.FirstPlayerName,
+        SaveMetaProp.Compression: "deflate"
+    }
 
-    # 2. Stage 1: Target directory creation
-    makedirs_mock.assert_called_once_with(target_archive_base)
+    with zipfile.ZipFile(uploaded) as archive:
+        assert archive.namelist() == ["file1.sav", "file2.sav"]
 
-    # 3. Stage 2: Save files copying
-    expected_copy_calls = [
-        call(mock_game.file_list[0], target_archive_base),
-        call(mock_game.file_list[1], target_archive_base)
-    ]
-    copy_mock.assert_has_calls(expected_copy_calls, any_order=False)
-    assert copy_mock.call_count == 3  # 2 game files + 1 metadata file (later)
-
-    # 4. Stage 3: Metadata update and copy
-    mock_game.meta.local.calculate_checksum.assert_called_once()
-    assert mock_game.meta.local.checksum == "NEW_CHECKSUM"
+    # ASSERT - Metadata has been updated.
+    assert mock_game.meta.local.checksum == _expected_checksum()
     assert mock_game.meta.local.owner == PlayerTestData.FirstPlayerName
     assert mock_game.meta.local.created_time == mock_now.isoformat()
-    # Check metadata file copy (the third call to mock_copy)
-    assert copy_mock.call_args_list[2] == call(mock_game.metadata_file_path, target_archive_base)
-
-    # 5. Stage 4: Archive creation
-    make_archive_mock.assert_called_once_with(
-        target_archive_base,
-        "zip",
-        target_archive_base
-    )
-
-    # 6. Stage 5: Upload to Drive
-    expected_props = {
-        SaveMetaProp.Owner: PlayerTestData.FirstPlayerName,
-        SaveMetaProp.Checksum: "NEW_CHECKSUM"
-    }
-    gdrive_mock.upload_file.assert_called_once()
 
-    # Check upload arguments
-    upload_args, upload_kwargs = gdrive_mock.upload_file.call_args
-    assert upload_args[0] == target_archive_zip  # file_path
-    assert upload_args[1] == mock_game.drive_directory  # drive_directory
-    assert upload_kwargs['properties'] == expected_props
-    assert 'subscriber' in upload_kwargs  # Check subscriber lambda is passed
+    # ASSERT - Properties published once checksum is known, then save becomes the latest one.
+    assert storage_mock.update_properties.call_args_list == [
+        call("uploaded_file_id", {
+            SaveMetaProp.Checksum: _expected_checksum(),
+            SaveMetaProp.Manifest: "manifest_file_id"
+        })
+    ]
+    storage_mock.set_latest.assert_called_once_with(mock_game.drive_directory, "uploaded_file_id")
 
-    # 7. Final event check
+    # Final event check
     final_event = mock_subscriber.call_args_list[-1][0][0]
     assert isinstance(final_event, DoneEvent)
     assert final_event.success is True
 
-    # Check the total number of progress calls (5 stages + 0% initial)
+    # 0% + 2 stages + first archived member (upload stage is completed by mocked storage).
     progress_calls = [c for c in mock_subscriber.call_args_list if not isinstance(c[0][0], DoneEvent)]
-    assert len(progress_calls) == 5  # 0% + 6 full stage completions -1 since GDrive.upload_file is being mocked.
+    assert len(progress_calls) == 4
+
+
+def test_upload_publishes_manifest(storage_mock, uploader, mock_game):
+    """
+    Test manifest with size and digest of each save file is uploaded next to archive.
+    """
+
+    from savegem.common.core.save_meta import manifest_checksum
+
+    storage_mock.upload_stream.side_effect = lambda stream, *args, **kwargs: stream.read() and "uploaded_file_id"
+
+    # ACT
+    uploader.upload(mock_game)
+
+    # ASSERT
+    file_name, data, parent_directory = storage_mock.create_file.call_args[0]
+    manifest = json.loads(data)
+
+    assert file_name == "uploaded_file_id.manifest.json"
+    assert parent_directory == mock_game.drive_directory
+    assert manifest == {
+        "file1.sav": [len(b"first save file"), hashlib.sha256(b"first save file").hexdigest()],
+        "file2.sav": [len(b"second save file"), hashlib.sha256(b"second save file").hexdigest()]
+    }
+    assert manifest_checksum(manifest) == _expected_checksum()
+
+
+def test_upload_publishes_save_without_manifest(storage_mock, uploader, mock_game, mock_subscriber, http_error_mock):
+    """
+    Test failure to upload manifest doesn't fail upload.
+    """
+
+    from savegem.common.core.save_meta import SaveMetaProp
+    from savegem.common.service.subscriptable import DoneEvent
+
+    storage_mock.upload_stream.side_effect = lambda stream, *args, **kwargs: stream.read() and "uploaded_file_id"
+    storage_mock.create_file.side_effect = http_error_mock
 
+    # ACT
+    uploader.upload(mock_game)
+
+    # ASSERT
+    properties = storage_mock.update_properties.call_args[0][1]
+    assert SaveMetaProp.Manifest not in properties
+
+    final_event = mock_subscriber.call_args_list[-1][0][0]
+    assert isinstance(final_event, DoneEvent)
+    assert final_event.success is True
 
-def test_upload_saves_directory_missing(path_exists_mock, makedirs_mock, uploader, mock_game, mock_subscriber):
+
+def test_upload_does_not_archive_metadata(storage_mock, uploader, mock_game):
+    """
+    Test metadata is not archived even if it matches save files filter.
+    """
+
+    mock_game.file_list = mock_game.file_list + [mock_game.metadata_file_path]
+    uploaded = io.BytesIO()
+
+    def upload_stream(stream, *args, **kwargs):
+        uploaded.write(stream.read())
+
+    storage_mock.upload_stream.side_effect = upload_stream
+
+    uploader.upload(mock_game)
+
+    with zipfile.ZipFile(uploaded) as archive:
+        assert archive.namelist() == ["file1.sav", "file2.sav"]
+
+    assert mock_game.meta.local.checksum == _expected_checksum()
+
+
+def test_upload_produces_reproducible_archive(storage_mock, uploader, mock_game, _save_files):
+    """
+    Test the same save files produce the same archive regardless of their order and timestamps.
+    """
+
+    import os
+
+    archives = []
+
+    def upload_stream(stream, *args, **kwargs):
+        archives.append(stream.read())
+        return "uploaded_file_id"
+
+    storage_mock.upload_stream.side_effect = upload_stream
+
+    uploader.upload(mock_game)
+
+    os.utime(_save_files / "file1.sav", (0, 1_000_000_000))
+    (_save_files / "meta.json").write_text('{"owner": "Other"}')
+    mock_game.file_list = list(reversed(mock_game.file_list))
+
+    uploader.upload(mock_game)
+
+    assert archives[0] == archives[1]
+
+
+def test_upload_skipped_when_save_is_up_to_date(storage_mock, uploader, mock_game, mock_subscriber):
+    """
+    Test nothing is uploaded when save files match save on Google Drive.
+    """
+
+    from savegem.common.service.subscriptable import DoneEvent, EventKind
+
+    mock_game.meta.local.calculate_checksum.return_value = "drive_checksum"
+
+    # ACT
+    uploader.upload(mock_game)
+
+    # ASSERT
+    storage_mock.upload_stream.assert_not_called()
+    storage_mock.create_file.assert_not_called()
+    storage_mock.update_properties.assert_not_called()
+    assert mock_game.meta.local.checksum == "drive_checksum"
+
+    final_event = mock_subscriber.call_args_list[-1][0][0]
+    assert isinstance(final_event, DoneEvent)
+    assert final_event.kind == EventKind.AlreadyUpToDate
+    assert final_event.success is True
+
+
+def test_upload_when_save_is_missing_on_drive(storage_mock, uploader, mock_game):
+    """
+    Test save is uploaded when there is no save on Google Drive, even if checksum is the same.
+    """
+
+    mock_game.meta.drive.is_present = False
+    mock_game.meta.local.calculate_checksum.return_value = "drive_checksum"
+    storage_mock.upload_stream.side_effect = lambda stream, *args, **kwargs: stream.read() and "uploaded_file_id"
+
+    # ACT
+    uploader.upload(mock_game)
+
+    # ASSERT
+    storage_mock.upload_stream.assert_called_once()
+
+
+def test_upload_saves_directory_missing(path_exists_mock, storage_mock, uploader, mock_game, mock_subscriber):
     """
     Test early exit and error handling when the local saves directory is missing
     """
@@ -161,36 +330,33 @@ def test_upload_saves_directory_missing(path_exists_mock, makedirs_mock, uploade
     assert done_event.kind == EventKind.SavesDirectoryMissing
 
     # ASSERT - Early Exit
-    makedirs_mock.assert_not_called()
+    storage_mock.upload_stream.assert_not_called()
 
 
-def test_upload_http_error(module_patch, path_exists_mock, resolve_temp_file_mock, makedirs_mock, copy_mock,
-                           make_archive_mock, gdrive_mock, datetime_mock, uploader, mock_game, mock_subscriber,
-                           http_error_mock):
+def test_upload_http_error(storage_mock, datetime_mock, uploader, mock_game, mock_subscriber, http_error_mock):
     """
-    Test error handling when GDrive.upload_file raises an HttpError
+    Test error handling when GDrive.upload_stream raises an HttpError
     """
 
     from savegem.common.service.subscriptable import DoneEvent, ErrorEvent, EventKind
 
-    # Setup GDrive mock to raise HttpError
-    gdrive_mock.upload_file.side_effect = http_error_mock
+    # Setup storage mock to raise HttpError
+    storage_mock.upload_stream.side_effect = http_error_mock
 
     # ACT
     uploader.upload(mock_game)
 
-    # ASSERT - GDrive was called
-    gdrive_mock.upload_file.assert_called_once()
+    # ASSERT - Storage was called, properties were not published
+    storage_mock.upload_stream.assert_called_once()
+    storage_mock.update_properties.assert_not_called()
+    storage_mock.set_latest.assert_not_called()
+    storage_mock.delete_batch.assert_not_called()
 
-    # ASSERT - Events Sent
-    # There should be 4 progress calls (0% + 3 completed stages) + ErrorEvent + DoneEvent
-    # The error occurs *before* the 5th stage can be fully completed by the subscriber lambda.
-
-    # 1. Check for initial 0% progress + 3 full stage progress calls
+    # 0% + 1 (collect save files)
     progress_calls = [c for c in mock_subscriber.call_args_list if c[0][0].type == c[0][0].type.Progress]
-    assert len(progress_calls) == 5  # 0% + 4 (makedirs, copy files, copy meta, make archive)
+    assert len(progress_calls) == 2
 
-    # 2. Check for ErrorEvent and DoneEvent (last two calls)
+    # Check for ErrorEvent and DoneEvent (last two calls)
     error_event = mock_subscriber.call_args_list[-2][0][0]
     done_event = mock_subscriber.call_args_list[-1][0][0]
 
@@ -200,3 +366,209 @@ def test_upload_http_error(module_patch, path_exists_mock, resolve_temp_file_moc
     assert isinstance(done_event, DoneEvent)
     assert done_event.success is False
     assert done_event.kind == EventKind.ErrorUploadingToDrive
+
+
+@pytest.mark.parametrize("failing_call", ["update_properties", "set_latest"])
+def test_upload_removes_save_when_publishing_failed(storage_mock, uploader, mock_game, mock_subscriber,
+                                                    http_error_mock, failing_call):
+    """
+    Test that archive and its manifest are removed when save fails to be published.
+    """
+
+    from savegem.common.service.subscriptable import ErrorEvent, EventKind
+
+    storage_mock.upload_stream.return_value = "uploaded_file_id"
+    storage_mock.create_file.return_value = "manifest_file_id"
+    storage_mock.delete_batch.side_effect = lambda file_ids: file_ids
+    getattr(storage_mock, failing_call).side_effect = http_error_mock
+
+    # ACT
+    uploader.upload(mock_game)
+
+    # ASSERT
+    storage_mock.delete_batch.assert_called_once_with(["uploaded_file_id", "manifest_file_id"])
+
+    error_event = mock_subscriber.call_args_list[-2][0][0]
+    assert isinstance(error_event, ErrorEvent)
+    assert error_event.kind == EventKind.ErrorUploadingToDrive
+
+
+def test_upload_warns_when_unpublished_save_could_not_be_removed(logger_mock, storage_mock, uploader, mock_game,
+                                                                 http_error_mock):
+    """
+    Test that failure to remove unpublished save is only logged.
+    """
+
+    storage_mock.upload_stream.return_value = "uploaded_file_id"
+    storage_mock.create_file.return_value = None
+    storage_mock.delete_batch.return_value = []
+    storage_mock.update_properties.side_effect = http_error_mock
+
+    # ACT
+    uploader.upload(mock_game)
+
+    # ASSERT
+    storage_mock.delete_batch.assert_called_once_with(["uploaded_file_id"])
+    logger_mock.warning.assert_called()
+
+
+def test_upload_records_session_in_journal(storage_mock, datetime_mock, uploader, mock_game, _upload_journal):
+    """
+    Test upload progress is recorded in journal and removed once upload is done.
+    """
+
+    from savegem.common.core.upload_journal import UploadJournal
+    from savegem.common.service.gdrive import UploadSession
+
+    mock_now = datetime(2025, 10, 2, 12, 30, 0)
+    datetime_mock.now.return_value = mock_now
+    fingerprint = UploadJournal.fingerprint(mock_game.file_list)
+    recorded = []
+
+    def upload_stream(stream, *args, on_session_update, **kwargs):
+        on_session_update({UploadSession.Uri: "session_uri", UploadSession.Offset: 4, UploadSession.Digest: "digest"})
+        recorded.append(_upload_journal.get(mock_game.name, fingerprint))
+        return "uploaded_file_id"
+
+    storage_mock.upload_stream.side_effect = upload_stream
+
+    uploader.upload(mock_game)
+
+    assert recorded == [{
+        UploadSession.Uri: "session_uri",
+        UploadSession.Offset: 4,
+        UploadSession.Digest: "digest",
+        UploadJournal.Fingerprint: fingerprint,
+        UploadJournal.FileName: "TestGame-2025-10-02-12-30-00.zip",
+        UploadJournal.CreatedTime: mock_now.isoformat()
+    }]
+    assert _upload_journal.get(mock_game.name, fingerprint) is None
+
+
+def test_upload_resumes_interrupted_upload(storage_mock, uploader, mock_game, _upload_journal):
+    """
+    Test interrupted upload is continued with same archive name and metadata.
+    """
+
+    from savegem.common.core.upload_journal import UploadJournal
+    from savegem.common.service.gdrive import UploadSession
+
+    session = {
+        UploadSession.Uri: "session_uri",
+        UploadSession.Offset: 4,
+        UploadSession.Digest: "digest",
+        UploadJournal.Fingerprint: UploadJournal.fingerprint(mock_game.file_list),
+        UploadJournal.FileName: "TestGame-2025-10-01-10-00-00.zip",
+        UploadJournal.CreatedTime: "2025-10-01T10:00:00"
+    }
+    _upload_journal.save(mock_game.name, session)
+
+    def upload_stream(stream, *args, **kwargs):
+        stream.read()
+        return "uploaded_file_id"
+
+    storage_mock.upload_stream.side_effect = upload_stream
+
+    uploader.upload(mock_game)
+
+    upload_args, upload_kwargs = storage_mock.upload_stream.call_args
+    assert upload_args[1] == "TestGame-2025-10-01-10-00-00.zip"
+    assert upload_kwargs["session"] == session
+    assert mock_game.meta.local.created_time == "2025-10-01T10:00:00"
+
+
+def test_upload_ignores_session_of_modified_files(storage_mock, uploader, mock_game, _upload_journal, _save_files):
+    """
+    Test upload is started from scratch when save files were modified.
+    """
+
+    from savegem.common.core.upload_journal import UploadJournal
+
+    _upload_journal.save(mock_game.name, {
+        UploadJournal.Fingerprint: UploadJournal.fingerprint(mock_game.file_list)
+    })
+    (_save_files / "file1.sav").write_bytes(b"modified save file")
+
+    uploader.upload(mock_game)
+
+    assert storage_mock.upload_stream.call_args.kwargs["session"] is None
+
+
+@pytest.mark.parametrize("error", ["expired", "mismatch"])
+def test_upload_restarts_when_session_could_not_be_resumed(mocker: MockerFixture, storage_mock, uploader, mock_game,
+                                                           mock_subscriber, _upload_journal, error):
+    """
+    Test upload is started from scratch when session has expired or archive has changed.
+    """
+
+    from googleapiclient.errors import HttpError
+    from savegem.common.core.upload_journal import UploadJournal
+
+    session = {UploadJournal.Fingerprint: UploadJournal.fingerprint(mock_game.file_list)}
+    _upload_journal.save(mock_game.name, session)
+
+    errors = {
+        "expired": HttpError(resp=mocker.Mock(status=404), content=b""),
+        "mismatch": ValueError("Stream doesn't match previous session")
+    }
+    storage_mock.upload_stream.side_effect = [errors[error], "uploaded_file_id"]
+
+    uploader.upload(mock_game)
+
+    sessions = [c.kwargs["session"] for c in storage_mock.upload_stream.call_args_list]
+    assert sessions == [session, None]
+    storage_mock.update_properties.assert_called_once()
+    storage_mock.set_latest.assert_called_once()
+    assert mock_subscriber.call_args_list[-1][0][0].success is True
+
+
+def test_upload_chunks(mocker: MockerFixture, module_patch, storage_mock, datetime_mock, uploader, mock_game,
+                       mock_subscriber):
+    """
+    Test save files are uploaded into chunk store when chunked storage is enabled.
+    """
+
+    from constants import CHUNKS_MIME_TYPE
+    from savegem.common.core.save_meta import SaveMetaProp
+    from savegem.common.service.chunk_store import ChunkStore
+    from savegem.common.service.subscriptable import DoneEvent
+
+    datetime_mock.now.return_value = datetime(2025, 10, 2, 12, 30, 0)
+    module_patch("prop", side_effect=lambda name: {"chunkedStorage.enabled": True}.get(name, {}))
+
+    def upload_files(file_paths, subscriber=None):
+        return {
+            file_path.rsplit("/", 1)[-1]: {"size": 1, "digest": f"{file_path}_digest", "chunks": ["chunk"]}
+            for file_path in file_paths
+        }
+
+    mocker.patch.object(ChunkStore, "upload_files", side_effect=upload_files)
+    storage_mock.create_file.side_effect = ["record_file_id", "manifest_file_id"]
+
+    # ACT
+    uploader.upload(mock_game)
+
+    # ASSERT - Archive is not uploaded.
+    storage_mock.upload_stream.assert_not_called()
+
+    # ASSERT - Version is recorded as chunks of each file.
+    file_name, data, parent_directory, mime_type = storage_mock.create_file.call_args_list[0][0]
+    assert file_name == "TestGame-2025-10-02-12-30-00.json"
+    assert parent_directory == mock_game.drive_directory
+    assert mime_type == CHUNKS_MIME_TYPE
+    assert set(json.loads(data)["files"]) == {"file1.sav", "file2.sav", "meta.json"}
+    assert storage_mock.create_file.call_args_list[0].kwargs["properties"] == {
+        SaveMetaProp.Owner: PlayerTestData.FirstPlayerName
+    }
+
+    assert storage_mock.update_properties.call_args_list == [
+        call("record_file_id", {
+            SaveMetaProp.Checksum: mock_game.meta.local.checksum,
+            SaveMetaProp.Manifest: "manifest_file_id"
+        })
+    ]
+    storage_mock.set_latest.assert_called_once_with(mock_game.drive_directory, "record_file_id")
+
+    final_event = mock_subscriber.call_args_list[-1][0][0]
+    assert isinstance(final_event, DoneEvent)
+    assert final_event.success is True
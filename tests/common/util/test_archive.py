@@ -0,0 +1,508 @@
+import gc
+import hashlib
+import io
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def _save_files(tmp_path: Path):
+    """
+    Creates few save files of different size.
+    """
+
+    files = {
+        "save_1.sav": os.urandom(3 * 1024 * 1024 + 17),
+        "save_2.sav": b"compressible" * 10000,
+        "empty.sav": b""
+    }
+
+    for name, content in files.items():
+        (tmp_path / name).write_bytes(content)
+
+    return {str(tmp_path / name): content for name, content in files.items()}
+
+
+def test_zip_stream_produces_valid_archive(_save_files):
+
+    from savegem.common.util.archive import ZipStream
+
+    stream = ZipStream(list(_save_files.keys()))
+    archive_bytes = io.BytesIO()
+
+    for chunk in iter(lambda: stream.read(64 * 1024), b""):
+        archive_bytes.write(chunk)
+
+    with zipfile.ZipFile(archive_bytes) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == [os.path.basename(path) for path in _save_files]
+
+        for path, content in _save_files.items():
+            assert archive.read(os.path.basename(path)) == content
+
+
+def test_zip_stream_reports_digest_of_each_file(mocker, _save_files):
+
+    from savegem.common.util.archive import ZipStream
+
+    callback = mocker.Mock()
+    stream = ZipStream(list(_save_files.keys()), on_file_archived=callback)
+
+    stream.read()
+
+    assert callback.call_args_list == [
+        mocker.call(path, hashlib.sha256(content).hexdigest()) for path, content in _save_files.items()
+    ]
+
+
+def test_zip_stream_consumes_files_lazily(_save_files):
+
+    from savegem.common.util.archive import ZipStream
+
+    consumed = []
+
+    def file_paths():
+        for path in _save_files:
+            consumed.append(path)
+            yield path
+
+    stream = ZipStream(file_paths())
+    stream.read(1)
+
+    assert len(consumed) == 1
+
+
+def test_zip_stream_does_not_wait_for_workers_when_abandoned(mocker, _save_files):
+
+    from concurrent.futures import ThreadPoolExecutor
+    from savegem.common.util.archive import ZipStream
+
+    shutdown = mocker.spy(ThreadPoolExecutor, "shutdown")
+
+    stream = ZipStream(list(_save_files))
+    stream.read(1)
+
+    # Stream could be collected in any thread, including one of its workers.
+    del stream
+    gc.collect()
+
+    shutdown.assert_called_once_with(mocker.ANY, wait=False, cancel_futures=True)
+
+
+@pytest.mark.parametrize("inline_size", [0, 1024, 64 * 1024 * 1024])
+def test_zip_stream_compresses_files_in_parallel(mocker, tmp_path: Path, _save_files, inline_size):
+
+    from savegem.common.util.archive import ZipStream
+
+    mocker.patch.object(ZipStream, "InlineSize", inline_size)
+
+    files = dict(_save_files)
+
+    for index in range(20):
+        path = tmp_path / f"small_{index}.sav"
+        path.write_bytes(f"small save {index}".encode() * 100)
+        files[str(path)] = path.read_bytes()
+
+    callback = mocker.Mock()
+    archive_bytes = ZipStream(list(files), on_file_archived=callback, concurrency=4).read()
+
+    # Members are written in order of files.
+    assert [c.args[0] for c in callback.call_args_list] == list(files)
+
+    with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == [os.path.basename(path) for path in files]
+
+    _extract(archive_bytes, tmp_path / "extracted", 64 * 1024)
+
+    for path, content in files.items():
+        assert (tmp_path / "extracted" / os.path.basename(path)).read_bytes() == content
+
+
+def test_zip_stream_consumes_files_ahead_by_concurrency(_save_files):
+
+    from savegem.common.util.archive import ZipStream
+
+    consumed = []
+
+    def file_paths():
+        for path in _save_files:
+            consumed.append(path)
+            yield path
+
+    stream = ZipStream(file_paths(), concurrency=2)
+    stream.read(1)
+
+    assert len(consumed) == 2
+
+
+@pytest.mark.parametrize("value", ["deflate", "lzma"])
+def test_zip_stream_is_reproducible(tmp_path: Path, _save_files, value):
+
+    from savegem.common.util.archive import ZipStream, Compression
+
+    compression = Compression.parse(value)
+    first = ZipStream(list(_save_files), compression=compression, concurrency=3).read()
+
+    for index, path in enumerate(_save_files):
+        os.chmod(path, 0o600)
+        os.utime(path, (0, 1_000_000_000 + index))
+
+    second = ZipStream(list(_save_files), compression=compression).read()
+
+    assert first == second
+
+    with zipfile.ZipFile(io.BytesIO(first)) as archive:
+        for member in archive.infolist():
+            assert member.date_time == ZipStream.MemberTime
+            assert member.external_attr >> 16 == ZipStream.MemberMode
+
+
+def test_zip_stream_writes_zip64_records(mocker, tmp_path: Path, _save_files):
+
+    from savegem.common.util.archive import ZipStream
+
+    # Offsets and sizes exceed lowered limit, so Zip64 records are required.
+    mocker.patch.object(zipfile, "ZIP64_LIMIT", 1024)
+    mocker.patch.object(zipfile, "ZIP_FILECOUNT_LIMIT", 2)
+
+    archive_bytes = ZipStream(list(_save_files), concurrency=2).read()
+
+    with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+        assert archive.testzip() is None
+
+        for path, content in _save_files.items():
+            assert archive.read(os.path.basename(path)) == content
+
+
+def test_zip_stream_writes_utf_8_names(tmp_path: Path):
+
+    from savegem.common.util.archive import ZipStream
+
+    path = tmp_path / "сейв.sav"
+    path.write_bytes(b"save")
+
+    archive_bytes = ZipStream([str(path)]).read()
+
+    with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+        assert archive.read("сейв.sav") == b"save"
+
+
+def test_zip_stream_short_read_only_at_the_end(_save_files):
+
+    from savegem.common.util.archive import ZipStream
+
+    chunk_size = 100 * 1024
+    stream = ZipStream(list(_save_files.keys()))
+    chunks = list(iter(lambda: stream.read(chunk_size), b""))
+
+    assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= chunk_size
+
+
+def test_zip_stream_progress(_save_files):
+
+    from savegem.common.util.archive import ZipStream
+
+    total_size = sum(len(content) for content in _save_files.values())
+    stream = ZipStream(list(_save_files.keys()), total_size=total_size)
+
+    assert stream.progress == 0
+
+    stream.read(1)
+    assert 0 < stream.progress < 1
+
+    stream.read()
+    assert stream.progress == 1
+
+
+def test_zip_stream_progress_without_total_size(_save_files):
+
+    from savegem.common.util.archive import ZipStream
+
+    stream = ZipStream(list(_save_files.keys()))
+    stream.read(1)
+
+    assert stream.progress == 0
+
+
+@pytest.mark.parametrize("value, codec, level", [
+    (None, "deflate", None),
+    ("store", "store", None),
+    ("deflate:9", "deflate", 9),
+    (" LZMA ", "lzma", None),
+    ("zstd:3", "zstd", 3)
+])
+def test_compression_parse(value, codec, level):
+
+    from savegem.common.util.archive import Compression
+
+    compression = Compression.parse(value)
+
+    assert (compression.codec, compression.level) == (codec, level)
+    assert Compression.parse(str(compression)) == compression
+
+
+@pytest.mark.parametrize("value", ["brotli", "deflate:10", "deflate:fast", "store:1", "lzma:6"])
+def test_compression_parse_invalid(value):
+
+    from savegem.common.util.archive import Compression
+
+    with pytest.raises(ValueError):
+        Compression.parse(value)
+
+
+@pytest.mark.parametrize("value, compress_type", [
+    ("store", zipfile.ZIP_DEFLATED),
+    ("deflate:1", zipfile.ZIP_DEFLATED),
+    ("lzma", zipfile.ZIP_LZMA)
+])
+def test_zip_stream_compression(_save_files, value, compress_type):
+
+    from savegem.common.util.archive import ZipStream, Compression
+
+    archive_bytes = ZipStream(list(_save_files.keys()), compression=Compression.parse(value)).read()
+
+    with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+        assert {member.compress_type for member in archive.infolist()} == {compress_type}
+
+        for path, content in _save_files.items():
+            assert archive.read(os.path.basename(path)) == content
+
+
+def test_zip_stream_store_does_not_compress(_save_files):
+
+    from savegem.common.util.archive import ZipStream, Compression
+
+    stored = ZipStream(list(_save_files.keys()), compression=Compression.parse("store")).read()
+
+    assert len(stored) > sum(len(content) for content in _save_files.values())
+
+
+def test_zip_stream_unsupported_compression(mocker, _save_files):
+
+    from savegem.common.util.archive import ZipStream, Compression
+
+    mocker.patch.object(Compression, "is_supported", new_callable=mocker.PropertyMock, return_value=False)
+
+    with pytest.raises(ValueError):
+        ZipStream(list(_save_files.keys()), compression=Compression.parse("zstd"))
+
+
+def _extract(archive: bytes, target_directory: Path, piece_size: int, callback=None):
+    from savegem.common.util.archive import ZipExtractor
+
+    extractor = ZipExtractor(str(target_directory), on_file_extracted=callback)
+
+    for offset in range(0, len(archive), piece_size):
+        extractor.write(archive[offset:offset + piece_size])
+
+    extractor.close()
+    return extractor
+
+
+def _seekable_archive(files: dict[str, bytes], compress_type=zipfile.ZIP_DEFLATED):
+    archive_bytes = io.BytesIO()
+
+    with zipfile.ZipFile(archive_bytes, "w", compress_type) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+
+    return archive_bytes.getvalue()
+
+
+@pytest.mark.parametrize("piece_size", [777, 64 * 1024, 10 * 1024 * 1024])
+def test_zip_extractor_extracts_streamed_archive(mocker, tmp_path: Path, _save_files, piece_size):
+
+    from savegem.common.util.archive import ZipStream
+
+    archive = ZipStream(list(_save_files.keys())).read()
+    target_directory = tmp_path / "extracted"
+    callback = mocker.Mock()
+
+    extractor = _extract(archive, target_directory, piece_size, callback)
+
+    assert extractor.finished is True
+    assert callback.call_count == len(_save_files)
+
+    for path, content in _save_files.items():
+        extracted_path = str(target_directory / os.path.basename(path))
+
+        assert Path(extracted_path).read_bytes() == content
+        callback.assert_any_call(extracted_path, hashlib.sha256(content).hexdigest())
+
+
+@pytest.mark.parametrize("compress_type", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_LZMA])
+def test_zip_extractor_extracts_archive_without_data_descriptors(tmp_path: Path, compress_type):
+
+    files = {"save.sav": b"save data" * 1000, "empty.sav": b"", "nested/save.sav": b"nested"}
+    archive = _seekable_archive(files, compress_type)
+
+    _extract(archive, tmp_path, 100)
+
+    for name, content in files.items():
+        assert (tmp_path / name).read_bytes() == content
+
+
+@pytest.mark.parametrize("value", ["store", "deflate:9", "lzma"])
+def test_zip_extractor_extracts_compressed_archive(tmp_path: Path, _save_files, value):
+
+    from savegem.common.util.archive import ZipStream, Compression
+
+    archive = ZipStream(list(_save_files.keys()), compression=Compression.parse(value)).read()
+
+    _extract(archive, tmp_path / "extracted", 777)
+
+    for path, content in _save_files.items():
+        assert (tmp_path / "extracted" / os.path.basename(path)).read_bytes() == content
+
+
+def test_zip_extractor_extracts_zip64_archive(tmp_path: Path):
+
+    from savegem.common.util.archive import _ArchiveBuffer
+
+    # Unseekable output, so member is followed by Zip64 data descriptor.
+    buffer = _ArchiveBuffer()
+
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("save.sav", "w", force_zip64=True) as member:
+            member.write(b"save data")
+
+    _extract(buffer.take(len(buffer)), tmp_path, 7)
+
+    assert (tmp_path / "save.sav").read_bytes() == b"save data"
+
+
+@pytest.mark.parametrize("name", ["../evil.sav", "/etc/evil.sav", "nested/../../evil.sav", "C:/evil.sav"])
+def test_zip_extractor_rejects_unsafe_paths(tmp_path: Path, name):
+
+    archive = _seekable_archive({name: b"evil"})
+
+    with pytest.raises(zipfile.BadZipFile):
+        _extract(archive, tmp_path / "target", 1024)
+
+    assert not (tmp_path / "evil.sav").exists()
+
+
+def test_zip_extractor_detects_corrupted_member(tmp_path: Path):
+
+    archive = bytearray(_seekable_archive({"save.sav": b"save data"}, zipfile.ZIP_STORED))
+    data_offset = archive.index(b"save data")
+    archive[data_offset] ^= 0xFF
+
+    with pytest.raises(zipfile.BadZipFile):
+        _extract(bytes(archive), tmp_path, 1024)
+
+
+def test_zip_extractor_detects_truncated_archive(tmp_path: Path, _save_files):
+
+    from savegem.common.util.archive import ZipStream
+
+    archive = ZipStream(list(_save_files.keys())).read()
+
+    with pytest.raises(zipfile.BadZipFile):
+        _extract(archive[:len(archive) // 2], tmp_path, 64 * 1024)
+
+
+def test_zip_extractor_closes_member_when_archive_is_incomplete(mocker, tmp_path: Path, _save_files):
+
+    from savegem.common.util.archive import ZipStream, ZipExtractor
+
+    archive = ZipStream(list(_save_files.keys())).read()
+    files = []
+
+    def tracked_open(*args, **kwargs):
+        files.append(open(*args, **kwargs))
+        return files[-1]
+
+    mocker.patch("savegem.common.util.archive.open", side_effect=tracked_open, create=True)
+
+    with ZipExtractor(str(tmp_path)) as extractor:
+        extractor.write(archive[:len(archive) // 2])
+
+        assert not all(file.closed for file in files)
+
+    assert len(files) > 0
+    assert all(file.closed for file in files)
+
+
+def test_zip_extractor_extracts_archive_byte_by_byte(tmp_path: Path):
+
+    from savegem.common.util.archive import ZipExtractor
+
+    archive = _seekable_archive({"save.sav": b"save data", "nested/": b"", "nested/save.sav": b"nested"})
+
+    with ZipExtractor(str(tmp_path)) as extractor:
+        for offset in range(len(archive)):
+            extractor.write(archive[offset:offset + 1])
+            # Extractor is used as sink of downloads.
+            extractor.flush()
+
+    assert extractor.finished is True
+    assert (tmp_path / "save.sav").read_bytes() == b"save data"
+    assert (tmp_path / "nested" / "save.sav").read_bytes() == b"nested"
+
+
+def test_zip_extractor_skips_unknown_extra_fields(tmp_path: Path):
+
+    import struct
+
+    archive_bytes = io.BytesIO()
+    member = zipfile.ZipInfo("save.sav")
+    # Extended timestamp field.
+    member.extra = struct.pack("<HHBL", 0x5455, 5, 1, 0)
+
+    with zipfile.ZipFile(archive_bytes, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(member, b"save data")
+
+    _extract(archive_bytes.getvalue(), tmp_path, 1024)
+
+    assert (tmp_path / "save.sav").read_bytes() == b"save data"
+
+
+@pytest.mark.parametrize("archive", [
+    b"not an archive",
+    _seekable_archive({"save.sav": b"save data"}, zipfile.ZIP_BZIP2)
+])
+def test_zip_extractor_rejects_unsupported_archive(tmp_path: Path, archive):
+
+    with pytest.raises(zipfile.BadZipFile):
+        _extract(archive, tmp_path, 1024)
+
+
+def test_zip_extractor_extracts_lzma_archive_byte_by_byte(tmp_path: Path):
+
+    archive = _seekable_archive({"save.sav": b"save data" * 100}, zipfile.ZIP_LZMA)
+
+    _extract(archive, tmp_path, 1)
+
+    assert (tmp_path / "save.sav").read_bytes() == b"save data" * 100
+
+
+def test_zip_extractor_detects_corrupted_lzma_properties(tmp_path: Path):
+
+    import struct
+
+    archive = bytearray(_seekable_archive({"save.sav": b"save data"}, zipfile.ZIP_LZMA))
+    # Member data follows local header and name, it starts with version and size of properties.
+    data_offset = 30 + len("save.sav")
+    archive[data_offset + 2:data_offset + 4] = struct.pack("<H", 4)
+
+    with pytest.raises(zipfile.BadZipFile, match="LZMA properties"):
+        _extract(bytes(archive), tmp_path, 1024)
+
+
+def test_zstd_codec_uses_zstandard_module(module_patch):
+
+    from savegem.common.util.archive import Compression, _ExtractedMember, _ZIP_ZSTANDARD
+
+    zstd_mock = module_patch("zstd")
+
+    assert Compression.parse("zstd:3").compressor() is zstd_mock.ZstdCompressor.return_value
+    zstd_mock.ZstdCompressor.assert_called_once_with(3)
+
+    _ExtractedMember(None, _ZIP_ZSTANDARD, None, None, None, False)
+    zstd_mock.ZstdDecompressor.assert_called_once_with()
@@ -0,0 +1,61 @@
+import io
+import os
+
+import pytest
+
+
+@pytest.fixture
+def _data():
+    return os.urandom(8 * 1024 * 1024 + 123)
+
+
+def _split(data: bytes, **kwargs):
+    from savegem.common.util.chunking import split_chunks
+    return list(split_chunks(io.BytesIO(data), **kwargs))
+
+
+def test_chunks_reassemble_data(_data):
+
+    chunks = _split(_data)
+
+    assert b"".join(chunks) == _data
+    assert len(chunks) > 1
+
+
+def test_chunks_respect_size_limits(_data):
+
+    chunks = _split(_data, min_size=64 * 1024, max_size=512 * 1024)
+
+    assert all(64 * 1024 <= len(chunk) <= 512 * 1024 for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= 512 * 1024
+
+
+def test_chunks_of_data_without_boundaries():
+
+    # Same class repeats, so there are no content boundaries at all.
+    chunks = _split(b"\0" * (1024 * 1024 + 1), min_size=1024, max_size=256 * 1024)
+
+    assert [len(chunk) for chunk in chunks] == [256 * 1024] * 4 + [1]
+
+
+def test_chunks_are_not_affected_by_distant_modification(_data):
+
+    chunks = _split(_data)
+    modified = _split(_data[:1000] + b"inserted bytes" + _data[1000:])
+
+    # Only chunk containing inserted data is different.
+    assert len(set(chunks) - set(modified)) == 1
+    assert chunks[1:] == modified[1:]
+
+
+def test_chunks_of_empty_stream():
+
+    assert _split(b"") == []
+
+
+def test_chunk_digest():
+
+    import hashlib
+    from savegem.common.util.chunking import chunk_digest
+
+    assert chunk_digest(b"chunk") == hashlib.sha256(b"chunk").hexdigest()
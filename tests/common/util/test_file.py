@@ -203,6 +203,74 @@ def test_save_file_as_json_text_mode(tmp_path):
     assert actual_data == data
 
 
+def test_save_file_atomically(tmp_path):
+
+    from savegem.common.util.file import save_file
+
+    file_path = tmp_path / "atomic.json"
+    save_file(str(file_path), {"old": True}, as_json=True)
+
+    save_file(str(file_path), {"new": True}, as_json=True, atomic=True)
+
+    with open(file_path, "r") as f:
+        assert json.load(f) == {"new": True}
+
+    # Temporary file should be replaced.
+    assert os.listdir(tmp_path) == ["atomic.json"]
+
+
+def test_save_file_atomically_retries_replace(mocker, tmp_path):
+
+    from savegem.common.util.file import save_file
+
+    file_path = tmp_path / "atomic.json"
+    sleep_mock = mocker.patch("savegem.common.util.file.time.sleep")
+    replace = os.replace
+
+    def locked_replace(source, target):
+        if replace_mock.call_count == 1:
+            raise PermissionError("File is in use")
+
+        replace(source, target)
+
+    replace_mock = mocker.patch("savegem.common.util.file.os.replace", side_effect=locked_replace)
+
+    save_file(str(file_path), {"new": True}, as_json=True, atomic=True)
+
+    assert json.loads(file_path.read_text()) == {"new": True}
+    assert replace_mock.call_count == 2
+    sleep_mock.assert_called_once()
+    assert os.listdir(tmp_path) == ["atomic.json"]
+
+
+def test_save_file_atomically_writes_in_place_when_file_is_locked(mocker, tmp_path):
+
+    from savegem.common.util.file import save_file
+
+    file_path = tmp_path / "atomic.json"
+    mocker.patch("savegem.common.util.file.time.sleep")
+    mocker.patch("savegem.common.util.file.os.replace", side_effect=PermissionError("File is in use"))
+
+    save_file(str(file_path), {"new": True}, as_json=True, atomic=True)
+
+    assert json.loads(file_path.read_text()) == {"new": True}
+    assert os.listdir(tmp_path) == ["atomic.json"]
+
+
+def test_save_file_atomically_uses_unique_temporary_files(mocker, tmp_path):
+
+    from savegem.common.util.file import save_file
+
+    file_path = tmp_path / "atomic.json"
+    replace_mock = mocker.patch("savegem.common.util.file.os.replace")
+
+    save_file(str(file_path), {}, as_json=True, atomic=True)
+    save_file(str(file_path), {}, as_json=True, atomic=True)
+
+    first, second = [call.args[0] for call in replace_mock.call_args_list]
+    assert first != second
+
+
 def test_should_delete_file(module_patch, path_exists_mock, remove_mock):
 
     from savegem.common.util.file import resolve_temp_file, \
@@ -235,6 +303,132 @@ def test_file_checksum_basic_sha256(tmp_path):
     assert actual_hash == expected_hash
 
 
+def test_file_checksum_without_file_digest(module_patch, tmp_path):
+
+    from savegem.common.util.file import file_checksum
+
+    module_patch("hasattr", return_value=False, create=True)
+
+    content = b"test" * 1000
+    file_path = tmp_path / "test_file.txt"
+    file_path.write_bytes(content)
+
+    assert file_checksum(str(file_path), block_size=7) == hashlib.sha256(content).hexdigest()
+
+
+@pytest.mark.parametrize("workers", [None, 1, 4])
+def test_file_checksums_preserves_order(tmp_path, workers):
+
+    from savegem.common.util.file import file_checksums
+
+    contents = [os.urandom(1024 * index) for index in range(10)]
+    file_paths = []
+
+    for index, content in enumerate(contents):
+        file_path = tmp_path / f"file_{index}.bin"
+        file_path.write_bytes(content)
+        file_paths.append(str(file_path))
+
+    assert file_checksums(file_paths, workers=workers) == [hashlib.sha256(content).hexdigest() for content in contents]
+
+
+def test_file_checksums_of_no_files():
+
+    from savegem.common.util.file import file_checksums
+
+    assert file_checksums([]) == []
+
+
+@pytest.mark.parametrize("reflink, copy_file_range", [(True, True), (False, True), (False, False)])
+def test_clone_file(module_patch, monkeypatch, tmp_path, reflink, copy_file_range):
+
+    from savegem.common.util.file import clone_file
+
+    if not reflink:
+        module_patch("fcntl", new=None)
+
+    if not copy_file_range:
+        monkeypatch.delattr(os, "copy_file_range", raising=False)
+
+    content = os.urandom(1024 * 1024 + 7)
+    source_path = tmp_path / "source.bin"
+    target_path = tmp_path / "target.bin"
+    source_path.write_bytes(content)
+    os.utime(source_path, ns=(10 ** 18, 10 ** 18))
+
+    clone_file(str(source_path), str(target_path))
+
+    assert target_path.read_bytes() == content
+    assert os.stat(target_path).st_mtime_ns == 10 ** 18
+
+
+def test_locked_file_on_posix(mocker: MockerFixture, module_patch, tmp_path):
+
+    from savegem.common.util.file import locked_file
+
+    fcntl_mock = module_patch("fcntl")
+
+    with locked_file(str(tmp_path / "shared.json")) as file:
+        file.write(b"{}")
+
+    assert (tmp_path / "shared.json").read_bytes() == b"{}"
+    fcntl_mock.flock.assert_called_once_with(mocker.ANY, fcntl_mock.LOCK_EX)
+
+
+def test_locked_file_on_windows(mocker: MockerFixture, module_patch, tmp_path):
+
+    from savegem.common.util.file import locked_file
+
+    module_patch("fcntl", new=None)
+    msvcrt_mock = module_patch("msvcrt", create=True)
+
+    with locked_file(str(tmp_path / "shared.json")) as file:
+        file.write(b"{}")
+
+    assert (tmp_path / "shared.json").read_bytes() == b"{}"
+    assert msvcrt_mock.locking.call_args_list == [
+        call(mocker.ANY, msvcrt_mock.LK_LOCK, 1),
+        call(mocker.ANY, msvcrt_mock.LK_UNLCK, 1)
+    ]
+
+
+def test_clone_file_shares_blocks(module_patch, tmp_path):
+
+    from savegem.common.util.file import clone_file
+
+    fcntl_mock = module_patch("fcntl")
+    copy_file_range_mock = module_patch("os.copy_file_range", create=True)
+
+    source_path = tmp_path / "source.bin"
+    source_path.write_bytes(b"save data")
+
+    clone_file(str(source_path), str(tmp_path / "target.bin"))
+
+    fcntl_mock.ioctl.assert_called_once()
+    copy_file_range_mock.assert_not_called()
+
+
+def test_clone_file_copies_when_file_system_cant_share_blocks(mocker: MockerFixture, module_patch, monkeypatch,
+                                                              tmp_path):
+
+    from savegem.common.util.file import clone_file
+
+    fcntl_mock = module_patch("fcntl")
+    fcntl_mock.ioctl.side_effect = OSError("Operation not supported.")
+    copy_file_range_mock = mocker.Mock(side_effect=[1, OSError("Cross-device link.")])
+    monkeypatch.setattr(os, "copy_file_range", copy_file_range_mock, raising=False)
+
+    source_path = tmp_path / "source.bin"
+    target_path = tmp_path / "target.bin"
+    source_path.write_bytes(b"save data")
+
+    clone_file(str(source_path), str(target_path))
+
+    assert target_path.read_bytes() == b"save data"
+    fcntl_mock.ioctl.assert_called_once()
+    assert copy_file_range_mock.call_count == 2
+
+
 def test_file_name_from_path(mock_path_separator):
 
     from savegem.common.util.file import file_name_from_path
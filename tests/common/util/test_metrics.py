@@ -0,0 +1,40 @@
+def test_record_aggregates_calls_of_endpoint():
+
+    from savegem.common.util.metrics import Metrics
+
+    metrics = Metrics()
+
+    metrics.record("files.get", 0.5, 0, False)
+    metrics.record("files.get", 1.5, 2, True)
+    metrics.record("files.list", 0.1, 0, False)
+
+    assert metrics.snapshot() == {
+        "files.get": {
+            Metrics.Calls: 2,
+            Metrics.Retries: 2,
+            Metrics.Failures: 1,
+            Metrics.TotalLatency: 2.0,
+            Metrics.MaxLatency: 1.5
+        },
+        "files.list": {
+            Metrics.Calls: 1,
+            Metrics.Retries: 0,
+            Metrics.Failures: 0,
+            Metrics.TotalLatency: 0.1,
+            Metrics.MaxLatency: 0.1
+        }
+    }
+
+
+def test_summary():
+
+    from savegem.common.util.metrics import Metrics
+
+    metrics = Metrics()
+
+    assert metrics.summary() == ""
+
+    metrics.record("files.get", 0.5, 1, False)
+    metrics.record("files.get", 1.5, 0, False)
+
+    assert metrics.summary() == "files.get: 2 call(s), 1 retry(ies), 0 failure(s), avg 1.000s, max 1.500s"
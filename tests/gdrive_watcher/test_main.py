@@ -3,8 +3,13 @@ from unittest.mock import MagicMock, call
 import pytest
 
 
+@pytest.fixture
+def _save_pruner(module_patch):
+    return module_patch("SavePruner")
+
+
 @pytest.fixture(autouse=True)
-def _setup(module_patch, resolve_temp_file_mock, path_exists_mock, games_config):
+def _setup(module_patch, resolve_temp_file_mock, path_exists_mock, games_config, _watcher_state, _save_pruner):
     # By default, assume GUI is initialized (flag file exists)
     resolve_temp_file_mock.return_value = "/mock/temp/gui_flag.txt"
     path_exists_mock.return_value = True
@@ -19,6 +24,21 @@ def _setup(module_patch, resolve_temp_file_mock, path_exists_mock, games_config)
     module_patch("Daemon.__init__", side_effect=mock_daemon_init)
 
 
+@pytest.fixture
+def _watcher_state(module_patch, resolve_app_data_mock):
+    """
+    In-memory replacement of persisted watcher state.
+    """
+
+    state = {}
+    holder = module_patch("EditableJsonConfigHolder").return_value
+
+    holder.get_value.side_effect = lambda name, default=None: state.get(name, default)
+    holder.set_value.side_effect = lambda name, value: state.__setitem__(name, value)
+
+    return holder
+
+
 def create_mock_changes_response(changes_list, new_token="NEXT_PAGE_TOKEN"):
     return {
         "newStartPageToken": new_token,
@@ -26,7 +46,7 @@ def create_mock_changes_response(changes_list, new_token="NEXT_PAGE_TOKEN"):
     }
 
 
-def test_work_returns_if_gui_not_initialized(path_exists_mock, app_context, gdrive_mock):
+def test_work_returns_if_gui_not_initialized(path_exists_mock, app_context, storage_mock):
     """
     Test _work exits early if the GUI flag file does not exist.
     """
@@ -40,30 +60,67 @@ def test_work_returns_if_gui_not_initialized(path_exists_mock, app_context, gdri
 
     # Assert that GDrive and app logic were not executed
     app_context.user.initialize.assert_not_called()
-    gdrive_mock.get_changes.assert_not_called()
+    storage_mock.get_changes.assert_not_called()
 
 
-def test_work_initializes_and_downloads_before_checking_changes(gdrive_mock, app_context):
+def test_work_initializes_and_downloads_before_checking_changes(storage_mock, app_context, games_config):
     """
-    Test that app initialization and download are run regardless of changes.
+    Test that app initialization and download are run on first iteration.
     """
 
     from savegem.gdrive_watcher.main import GDriveWatcher
 
     watcher = GDriveWatcher()
+    games_config.empty = True
 
     # Set get_changes to return empty list so the main logic runs fully
-    gdrive_mock.get_changes.return_value = create_mock_changes_response([])
+    storage_mock.get_changes.return_value = create_mock_changes_response([])
 
     watcher._work()
 
     # Assert initialization flow
     app_context.user.initialize.assert_called_once()
     app_context.games.download.assert_called_once()
-    gdrive_mock.get_changes.assert_called_once()
+    storage_mock.get_changes.assert_called_once()
 
 
-def test_get_changes_updates_token_and_extracts_ids(gdrive_mock):
+def test_work_skips_download_if_games_config_not_changed(storage_mock, games_config):
+    """
+    Test that game configuration is not downloaded when change feed doesn't contain it.
+    """
+
+    from savegem.gdrive_watcher.main import GDriveWatcher
+
+    watcher = GDriveWatcher()
+    games_config.empty = False
+    storage_mock.get_changes.return_value = create_mock_changes_response([
+        {"file": {"id": "SOME_FILE", "parents": ["SOME_DIR"]}, "removed": False}
+    ])
+
+    watcher._work()
+
+    games_config.download.assert_not_called()
+
+
+def test_work_downloads_games_config_when_changed(storage_mock, games_config, app_config, ui_socket_mock):
+    """
+    Test that game configuration is downloaded when change feed contains it.
+    """
+
+    from savegem.gdrive_watcher.main import GDriveWatcher
+
+    watcher = GDriveWatcher()
+    games_config.empty = False
+    storage_mock.get_changes.return_value = create_mock_changes_response([
+        {"file": {"id": app_config.games_config_file_id, "parents": ["CONFIG_DIR"]}, "removed": False}
+    ])
+
+    watcher._work()
+
+    games_config.download.assert_called_once()
+
+
+def test_get_changes_updates_token_and_extracts_ids(storage_mock):
     """
     Test __get_changes correctly processes changes and updates start_page_token.
     """
@@ -73,7 +130,7 @@ def test_get_changes_updates_token_and_extracts_ids(gdrive_mock):
     watcher = GDriveWatcher()
 
     # Arrange: Initial token is None
-    assert watcher._GDriveWatcher__start_page_token is None  # noqa
+    assert watcher.start_page_token is None
 
     changes_response = create_mock_changes_response([
         {
@@ -86,21 +143,77 @@ def test_get_changes_updates_token_and_extracts_ids(gdrive_mock):
         }
     ], new_token="NEW_TOKEN_123")
 
-    gdrive_mock.get_changes.return_value = changes_response
+    storage_mock.get_changes.return_value = changes_response
 
     # Act
     modified_files, affected_directories = watcher._GDriveWatcher__get_changes()  # noqa
 
     # Assert initial token was used and then updated
-    gdrive_mock.get_changes.assert_called_once_with(None)
-    assert watcher._GDriveWatcher__start_page_token == "NEW_TOKEN_123"  # noqa
+    storage_mock.get_changes.assert_called_once_with(None)
+    assert watcher.start_page_token == "NEW_TOKEN_123"
 
     # Assert data extraction
     assert modified_files == ["FILE_A", "FILE_B"]
     assert affected_directories == ["PARENT_1", "PARENT_2"]
 
 
-def test_get_changes_handles_removed_files_hack(gdrive_mock, app_context):
+def test_get_changes_uses_persisted_token(storage_mock, _watcher_state):
+    """
+    Test that change feed is resumed from persisted token and
+    that token is only stored when it has changed.
+    """
+
+    from savegem.gdrive_watcher.main import GDriveWatcher
+
+    watcher = GDriveWatcher()
+    watcher.start_page_token = "STORED_TOKEN"
+    _watcher_state.set_value.reset_mock()
+
+    storage_mock.get_changes.return_value = create_mock_changes_response([], new_token="STORED_TOKEN")
+    watcher._GDriveWatcher__get_changes()  # noqa
+
+    storage_mock.get_changes.assert_called_once_with("STORED_TOKEN")
+    _watcher_state.set_value.assert_not_called()
+
+
+@pytest.mark.parametrize("status", [400, 404])
+def test_get_changes_resets_invalid_token(mocker, storage_mock, status):
+    """
+    Test that token is reset when Google Drive rejects it.
+    """
+
+    from googleapiclient.errors import HttpError
+    from savegem.gdrive_watcher.main import GDriveWatcher
+
+    watcher = GDriveWatcher()
+    watcher.start_page_token = "EXPIRED_TOKEN"
+    storage_mock.get_changes.side_effect = HttpError(resp=mocker.Mock(status=status), content=b"")
+
+    with pytest.raises(HttpError):
+        watcher._GDriveWatcher__get_changes()  # noqa
+
+    assert watcher.start_page_token is None
+
+
+def test_get_changes_keeps_token_on_other_errors(storage_mock, http_error_mock):
+    """
+    Test that token is preserved on transient errors.
+    """
+
+    from googleapiclient.errors import HttpError
+    from savegem.gdrive_watcher.main import GDriveWatcher
+
+    watcher = GDriveWatcher()
+    watcher.start_page_token = "VALID_TOKEN"
+    storage_mock.get_changes.side_effect = http_error_mock
+
+    with pytest.raises(HttpError):
+        watcher._GDriveWatcher__get_changes()  # noqa
+
+    assert watcher.start_page_token == "VALID_TOKEN"
+
+
+def test_get_changes_handles_removed_files_hack(storage_mock, app_context):
     """
     Test that removed files are handled by assuming current game files were affected.
     """
@@ -121,7 +234,7 @@ def test_get_changes_handles_removed_files_hack(gdrive_mock, app_context):
         }  # Removed files don't contain file info
     ], new_token="NEW_TOKEN_2")
 
-    gdrive_mock.get_changes.return_value = changes_response
+    storage_mock.get_changes.return_value = changes_response
 
     # Act
     modified_files, affected_directories = watcher._GDriveWatcher__get_changes()  # noqa
@@ -131,7 +244,7 @@ def test_get_changes_handles_removed_files_hack(gdrive_mock, app_context):
     assert affected_directories == ["PARENT_X", app_dir]  # app_dir added due to removed=True
 
 
-def test_work_sends_refresh_for_all_relevant_changes(gdrive_mock, app_context, games_config, app_config,
+def test_work_sends_refresh_for_all_relevant_changes(storage_mock, app_context, games_config, app_config,
                                                      ui_socket_mock):
     """
     Test that all three relevant change types trigger the correct refresh events.
@@ -153,7 +266,7 @@ def test_work_sends_refresh_for_all_relevant_changes(gdrive_mock, app_context, g
         "some_other_dir_id"  # (Ignored)
     ]
 
-    gdrive_mock.get_changes.return_value = create_mock_changes_response([], new_token="T1")
+    storage_mock.get_changes.return_value = create_mock_changes_response([], new_token="T1")
     # Manually inject the results __get_changes would return
     watcher._GDriveWatcher__get_changes = MagicMock(return_value=(modified_files, affected_directories))
 
@@ -170,7 +283,7 @@ def test_work_sends_refresh_for_all_relevant_changes(gdrive_mock, app_context, g
     assert ui_socket_mock.send_ui_refresh_command.call_count == 3
 
 
-def test_work_sends_no_refresh_if_no_relevant_changes(ui_socket_mock, app_context, gdrive_mock):
+def test_work_sends_no_refresh_if_no_relevant_changes(ui_socket_mock, app_context, storage_mock):
     """
     Test no refresh commands are sent if unrelated changes occur.
     """
@@ -183,7 +296,7 @@ def test_work_sends_no_refresh_if_no_relevant_changes(ui_socket_mock, app_contex
     modified_files = ["unrelated_file_1", "unrelated_file_2"]
     affected_directories = ["unrelated_dir_1"]
 
-    gdrive_mock.get_changes.return_value = create_mock_changes_response([], new_token="T2")
+    storage_mock.get_changes.return_value = create_mock_changes_response([], new_token="T2")
     watcher._GDriveWatcher__get_changes = MagicMock(return_value=(modified_files, affected_directories))
 
     # Act
@@ -191,3 +304,49 @@ def test_work_sends_no_refresh_if_no_relevant_changes(ui_socket_mock, app_contex
 
     # Assert no refresh commands were sent
     ui_socket_mock.send_ui_refresh_command.assert_not_called()
+
+
+def test_work_prunes_saves_once_per_interval(storage_mock, games_config, _watcher_state, _save_pruner):
+    """
+    Test that saves are pruned on first iteration and then only once interval has passed.
+    """
+
+    from datetime import datetime, timezone, timedelta
+    from savegem.gdrive_watcher.main import GDriveWatcher
+
+    watcher = GDriveWatcher()
+    storage_mock.get_changes.return_value = create_mock_changes_response([])
+
+    watcher._work()
+    watcher._work()
+
+    _save_pruner.prune.assert_called_once_with(games_config.list)
+
+    # Interval has passed since last pruning.
+    last_prune_time = datetime.now(timezone.utc) - timedelta(hours=GDriveWatcher.DefaultPruneIntervalHours + 1)
+    _watcher_state.set_value(GDriveWatcher.LastPruneTime, last_prune_time.isoformat())
+
+    watcher._work()
+
+    assert _save_pruner.prune.call_count == 2
+
+
+def test_work_prunes_saves_with_configured_interval(storage_mock, _watcher_state, _save_pruner):
+    """
+    Test that interval of pruning could be configured.
+    """
+
+    from datetime import datetime, timezone, timedelta
+    from savegem.gdrive_watcher.main import GDriveWatcher
+    from tests.tools.mocks.mock_json_config_holder import MockJsonConfigHolder
+
+    watcher = GDriveWatcher()
+    watcher._initialize(MockJsonConfigHolder({"pruneIntervalHours": 1}))
+    storage_mock.get_changes.return_value = create_mock_changes_response([])
+
+    last_prune_time = datetime.now(timezone.utc) - timedelta(hours=2)
+    _watcher_state.set_value(GDriveWatcher.LastPruneTime, last_prune_time.isoformat())
+
+    watcher._work()
+
+    _save_pruner.prune.assert_called_once()
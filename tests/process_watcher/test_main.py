@@ -64,7 +64,7 @@ def _get_run_processes_mock(module_patch, _create_game_process: Callable) -> Mag
     return module_patch('get_running_game_processes')
 
 
-def test_work_initial_dependencies(app_context, gdrive_mock, _get_run_processes_mock):
+def test_work_initial_dependencies(app_context, storage_mock, _get_run_processes_mock):
     """
     Test that required initialization steps are called before process checking.
     """
@@ -78,7 +78,7 @@ def test_work_initial_dependencies(app_context, gdrive_mock, _get_run_processes_
 
     # 1. Initialize user with GDrive info
     app_context.user.initialize.assert_called_once_with(
-        gdrive_mock.get_current_user
+        storage_mock.get_current_user
     )
     # 2. Download games configuration
     app_context.games.download.assert_called_once()
@@ -159,7 +159,7 @@ def test_work_skips_auto_actions_when_disabled(app_context, downloader_mock, _ge
     app_context.activity.update.assert_called_once()
 
     # BUT, no download/upload should occur
-    proc_started.game.meta.drive.refresh.assert_not_called()
+    app_context.games.refresh_drive_metadata.assert_not_called()
     downloader_mock.mock_downloader.download.assert_not_called()
 
 
@@ -187,7 +187,7 @@ def test_auto_action_skip_if_game_auto_mode_disabled(app_context, downloader_moc
     watcher._work()
 
     # No refresh or download/upload
-    proc_started.game.meta.drive.refresh.assert_not_called()
+    app_context.games.refresh_drive_metadata.assert_called_once_with([])
     downloader_mock.download.assert_not_called()
 
 
@@ -213,7 +213,7 @@ def test_auto_action_skip_if_uptodate(app_context, downloader_mock, _get_run_pro
     watcher._work()
 
     # Metadata refresh MUST be called to get the status
-    proc_started.game.meta.drive.refresh.assert_called_once()
+    app_context.games.refresh_drive_metadata.assert_called_once_with([proc_started.game])
 
     # BUT, no download/upload should occur
     downloader_mock.download.assert_not_called()
@@ -249,7 +249,7 @@ def test_auto_skip_if_running(module_patch, app_context, downloader_mock, push_n
     downloader_mock.return_value.download.assert_called_once()
 
     # The running process MUST be skipped before refresh
-    proc_running_target.game.meta.drive.refresh.assert_not_called()
+    app_context.games.refresh_drive_metadata.assert_called_once_with([proc_started.game])
 
 
 def test_auto_action_download_on_started(app_context, downloader_mock, push_notification_mock, ui_socket_mock,
@@ -274,7 +274,7 @@ def test_auto_action_download_on_started(app_context, downloader_mock, push_noti
     watcher = ProcessWatcher()
     watcher._work()
 
-    proc_started.game.meta.drive.refresh.assert_called_once()
+    app_context.games.refresh_drive_metadata.assert_called_once_with([proc_started.game])
 
     downloader_mock.return_value.download.assert_called_once_with(proc_started.game)
 
@@ -305,7 +305,7 @@ def test_auto_action_upload_on_closed(app_context, uploader_mock, push_notificat
     watcher = ProcessWatcher()
     watcher._work()
 
-    proc_closed.game.meta.drive.refresh.assert_called_once()
+    app_context.games.refresh_drive_metadata.assert_called_once_with([proc_closed.game])
     uploader_mock.return_value.upload.assert_called_once_with(proc_closed.game)
     push_notification_mock.assert_called_once_with("Translated(notification_SaveHasBeenUploaded)")
     ui_socket_mock.send_ui_refresh_command.assert_not_called()
@@ -9,6 +9,14 @@ def gdrive_mock(module_patch):
     return module_patch("GDrive")
 
 
+@pytest.fixture
+def storage_mock(module_patch):
+    """
+    Mocks storage backend.
+    """
+    return module_patch("storage").return_value
+
+
 @pytest.fixture
 def downloader_mock(module_patch):
     return module_patch("Downloader")